@@ -1,14 +1,12 @@
 #!/usr/bin/env python3
 
-import pandas as pd
-import json
-from datetime import datetime
+import argparse
 from utils.csv_manager import CSVManager
 from utils.config import get_s3_bucket
 from utils.s3_manager import get_s3_client
-from utils.constants import CSVConstants
+from utils.s3_rekey import S3BulkRekeyer, sniffed_extension_rule, rewrite_csv_s3_paths, rewrite_ledger_s3_keys
 
-def fix_s3_file_extensions():
+def fix_s3_file_extensions(sniff=False, dry_run=False, workers=None):
     """Fix the .bin extensions on S3 files to proper media extensions."""
     
     # DRY CONSOLIDATION: Use centralized S3 client
@@ -57,126 +55,62 @@ def fix_s3_file_extensions():
         }
     }
     
-    # Create backup of CSV
-    backup_path = f"outputs/output.csv.backup_extension_fix_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-    import os
-    os.system(f"cp outputs/output.csv {backup_path}")
-    print(f"✅ Created CSV backup: {backup_path}")
-    
-    print(f"\\n{'='*70}")
-    print(f"🔧 FIXING S3 FILE EXTENSIONS")
-    print(f"{'='*70}")
-    
-    fixed_mappings = {}
-    
     # DRY CONSOLIDATION - Step 1: Import S3Manager for key generation
     from utils.s3_manager import UnifiedS3Manager
     
-    for uuid, info in file_mappings.items():
-        old_key = UnifiedS3Manager.generate_uuid_s3_key(uuid, '.bin')
-        new_key = UnifiedS3Manager.generate_uuid_s3_key(uuid, info['extension'])
-        filename = info['filename']
-        content_type = info['content_type']
-        
-        print(f"\\n📄 {filename}")
-        print(f"   UUID: {uuid}")
-        print(f"   From: {old_key}")
-        print(f"   To: {new_key}")
-        
-        try:
-            # Check if old file exists
-            try:
-                s3_client.head_object(Bucket=bucket_name, Key=old_key)
-            except s3_client.exceptions.ClientError as e:
-                if e.response['Error']['Code'] == '404':
-                    print(f"   ⚠️  Source file not found: {old_key}")
-                    continue
-                else:
-                    raise
-            
-            # Copy with new extension and content type
-            copy_source = {'Bucket': bucket_name, 'Key': old_key}
-            
-            # Get original metadata
-            original = s3_client.head_object(Bucket=bucket_name, Key=old_key)
-            original_metadata = original.get('Metadata', {})
-            
-            # Add filename to metadata
-            new_metadata = original_metadata.copy()
-            new_metadata['original_filename'] = filename
-            
-            s3_client.copy_object(
-                Bucket=bucket_name,
-                CopySource=copy_source,
-                Key=new_key,
-                MetadataDirective='REPLACE',
-                Metadata=new_metadata,
-                ContentType=content_type
-            )
-            
-            # Delete old file
-            s3_client.delete_object(Bucket=bucket_name, Key=old_key)
-            
-            fixed_mappings[uuid] = new_key
-            print(f"   ✅ SUCCESS: Fixed extension and content type")
-            
-        except Exception as e:
-            print(f"   ❌ ERROR: {e}")
-            continue
+    print(f"\n{'='*70}")
+    print(f"🔧 FIXING S3 FILE EXTENSIONS")
+    print(f"{'='*70}")
     
-    # Update CSV with corrected S3 paths
-    print(f"\\n📝 Updating CSV with corrected file paths...")
+    rekeyer = S3BulkRekeyer(s3_client, bucket_name, max_workers=workers)
+    if sniff:
+        # Re-type every remaining .bin object from its first bytes
+        operations = rekeyer.plan_from_rule(sniffed_extension_rule(s3_client, bucket_name), prefix='files/')
+    else:
+        operations = rekeyer.plan_from_mapping({
+            UnifiedS3Manager.generate_uuid_s3_key(uuid, '.bin'): {
+                'new_key': UnifiedS3Manager.generate_uuid_s3_key(uuid, info['extension']),
+                'content_type': info['content_type'],
+                'metadata': {'original_filename': info['filename']},
+            }
+            for uuid, info in file_mappings.items()
+        })
     
-    # DRY CONSOLIDATION - Step 1: Use atomic CSV operations to prevent corruption
-    from utils.csv_manager import CSVManager
-    csv_manager = CSVManager('outputs/output.csv')
-    df = csv_manager.safe_csv_read('outputs/output.csv')
+    for operation in operations:
+        print(f"📄 {operation.old_key} → {operation.new_key} ({operation.content_type})")
     
-    for row_id in [476, 484]:
-        mask = df[CSVConstants.Columns.ROW_ID] == row_id
-        if mask.any():
-            s3_paths = df.loc[mask, CSVConstants.Columns.S3_PATHS].iloc[0]
-            
-            if s3_paths and s3_paths not in ['[]', '{}', None]:
-                try:
-                    # DRY: Use CSVManager for loading S3 paths
-                    row = df.loc[mask].iloc[0]
-                    paths_dict = CSVManager.load_s3_paths(row)
-                    updated_paths = {}
-                    
-                    for uuid, old_path in paths_dict.items():
-                        if uuid in fixed_mappings:
-                            updated_paths[uuid] = fixed_mappings[uuid]
-                            print(f"   ✅ Updated path for {uuid[:8]}...")
-                        else:
-                            updated_paths[uuid] = old_path
-                    
-                    # DRY: Use CSVManager for saving S3 paths
-                    df.loc[mask, CSVConstants.Columns.S3_PATHS] = CSVManager.save_s3_paths(updated_paths)
-                    
-                except Exception as e:
-                    print(f"   ❌ Error updating CSV for row {row_id}: {e}")
+    report = rekeyer.run(operations, dry_run=dry_run)
     
-    # Save updated CSV atomically to prevent corruption
-    csv_manager.safe_csv_write(df, "fix_s3_extensions")
-    print(f"\\n✅ CSV updated with corrected file extensions")
+    # Update CSV with corrected S3 paths (one pass, backed up by CSVManager)
+    if not dry_run:
+        print(f"\n📝 Updating CSV with corrected file paths...")
+        report.csv_rows_updated = rewrite_csv_s3_paths(report.moved, CSVManager(), "fix_s3_extensions")
+        report.ledger_entries_updated = rewrite_ledger_s3_keys(report.moved, bucket_name)
     
     # Summary
-    print(f"\\n{'='*70}")
+    print(f"\n{'='*70}")
     print(f"📊 EXTENSION FIX SUMMARY")
     print(f"{'='*70}")
     
-    for uuid, new_key in fixed_mappings.items():
-        filename = file_mappings[uuid]['filename']
-        extension = file_mappings[uuid]['extension']
+    for old_key, new_key in report.moved.items():
         print(f"✅ s3://{bucket_name}/{new_key}")
-        print(f"   File: {filename}")
-        print(f"   Fixed: .bin → {extension}")
-        print()
+        print(f"   Fixed: {old_key}")
+    for old_key in report.missing:
+        print(f"⚠️  Source file not found: {old_key}")
+    for old_key, error in report.failed.items():
+        print(f"❌ {old_key}: {error}")
     
-    print(f"🎯 FIXED {len(fixed_mappings)} FILES WITH PROPER EXTENSIONS!")
+    prefix = "WOULD FIX" if dry_run else "FIXED"
+    print(f"\n🎯 {prefix} {len(report.moved)} FILES WITH PROPER EXTENSIONS! "
+          f"({report.csv_rows_updated} CSV rows updated, {report.ledger_entries_updated} ledger entries)")
     
-    return fixed_mappings
+    return report.moved
 
 if __name__ == "__main__":
-    fix_s3_file_extensions()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Fix .bin extensions and content types of S3 files")
+    parser.add_argument('--sniff', action='store_true',
+                        help='Detect the type of every .bin object from its first bytes instead of the built-in list')
+    parser.add_argument('--dry-run', action='store_true', help='Show planned moves without copying anything')
+    parser.add_argument('--workers', type=int, help='Concurrent copies (default: s3_rekey.max_workers)')
+    args = parser.parse_args()
+    fix_s3_file_extensions(sniff=args.sniff, dry_run=args.dry_run, workers=args.workers)
@@ -12,7 +12,6 @@ Target people with missing media:
 """
 
 import argparse
-import json
 import logging
 import os
 import uuid
@@ -30,10 +29,12 @@ from utils.downloader import UnifiedDownloader, DownloadStrategy, DownloadConfig
 from utils.csv_manager import CSVManager
 from utils.row_context import RowContext
 from utils.logging_config import get_logger, print_section_header
+from utils.progress_store import open_progress_store
+from utils.s3_metadata_loader import S3MetadataLoader
 # Setup logging
 logger = get_logger(__name__)
 
-# Progress tracking file
+# Progress tracking file (kept in metadata_download_progress.sqlite; the JSON file is imported once)
 PROGRESS_FILE = "metadata_download_progress.json"
 
 class MetadataDownloadProcessor:
@@ -47,7 +48,8 @@ class MetadataDownloadProcessor:
         self.bucket_name = 'typing-clients-uuid-system'
         self.s3_manager = UnifiedS3Manager()
         self.csv_manager = CSVManager()
-        self.progress = self._load_progress()
+        self.progress = open_progress_store(PROGRESS_FILE, collections=('processed', 'failed'))
+        self._csv_rows = None
         self.stats = {
             'metadata_found': 0,
             'downloads_attempted': 0,
@@ -56,66 +58,47 @@ class MetadataDownloadProcessor:
             'csv_updated': 0
         }
         
-    def _load_progress(self) -> Dict:
-        """Load progress tracking from file."""
-        if os.path.exists(PROGRESS_FILE):
-            try:
-                with open(PROGRESS_FILE, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.warning(f"Could not load progress file: {e}")
-        return {'processed': [], 'failed': {}}
-    
-    def _save_progress(self):
-        """Save progress tracking to file."""
-        try:
-            with open(PROGRESS_FILE, 'w') as f:
-                json.dump(self.progress, f, indent=2)
-        except Exception as e:
-            logger.error(f"Could not save progress: {e}")
-    
     def load_metadata_from_s3(self) -> List[Dict]:
-        """Load all metadata files from S3 clients/ directory."""
+        """Load all metadata files from S3 clients/ directory (concurrent, ETag-cached)."""
         metadata_list = []
+        loader = S3MetadataLoader(self.s3_client, self.bucket_name, prefix='clients/')
+        
+        def already_processed(key):
+            if self.progress.contains('processed', key):
+                logger.info(f"Skipping already processed: {key}")
+                return True
+            return False
         
         try:
-            paginator = self.s3_client.get_paginator('list_objects_v2')
-            for page in paginator.paginate(Bucket=self.bucket_name, Prefix='clients/'):
-                for obj in page.get('Contents', []):
-                    if obj['Key'].endswith('.json'):
-                        try:
-                            # Skip if already processed
-                            if obj['Key'] in self.progress['processed']:
-                                logger.info(f"Skipping already processed: {obj['Key']}")
-                                continue
-                                
-                            response = self.s3_client.get_object(
-                                Bucket=self.bucket_name, 
-                                Key=obj['Key']
-                            )
-                            metadata = json.loads(response['Body'].read())
-                            metadata['_s3_key'] = obj['Key']
-                            metadata_list.append(metadata)
-                            self.stats['metadata_found'] += 1
-                            
-                        except Exception as e:
-                            logger.error(f"Error reading {obj['Key']}: {e}")
-                            
+            metadata_list = loader.load(skip=already_processed)
+            self.stats['metadata_found'] += len(metadata_list)
+            logger.info(f"Metadata: {loader.stats['fetched']} fetched, {loader.stats['cached']} from cache, "
+                        f"{loader.stats['errors']} unreadable")
         except Exception as e:
             logger.error(f"Error listing metadata files: {e}")
+        finally:
+            loader.close()
             
         return metadata_list
     
+    def _csv_rows_by_id(self) -> Dict[str, Dict]:
+        """Output CSV rows by row_id, read once per run (first occurrence wins)."""
+        if self._csv_rows is None:
+            self._csv_rows = {}
+            df = self.csv_manager.read('outputs/output.csv')
+            for row in df.to_dict('records'):
+                self._csv_rows.setdefault(str(row.get('row_id', '')).strip(), row)
+        return self._csv_rows
+    
     def verify_csv_rows(self, target_rows: List[int]) -> Dict[int, Dict]:
         """Verify that target CSV rows exist and get their data."""
         csv_data = {}
         
         try:
-            df = self.csv_manager.read('outputs/output.csv')
-            for _, row in df.iterrows():
-                row_id = str(row.get('row_id', '')).strip()
-                if row_id and row_id.isdigit() and int(row_id) in target_rows:
-                    csv_data[int(row_id)] = row.to_dict()
+            targets = set(target_rows)
+            for row_id, row in self._csv_rows_by_id().items():
+                if row_id and row_id.isdigit() and int(row_id) in targets:
+                    csv_data[int(row_id)] = dict(row)
                     
             # Check which rows are missing
             missing = set(target_rows) - set(csv_data.keys())
@@ -217,20 +200,15 @@ class MetadataDownloadProcessor:
     def check_existing_media(self, row_id: int) -> bool:
         """Check if person already has media files in S3."""
         try:
-            # Check for files in S3 files/ directory
-            prefix = f"files/"
-            paginator = self.s3_client.get_paginator('list_objects_v2')
-            
-            # Get CSV data to check s3_paths
-            df = self.csv_manager.read('outputs/output.csv')
-            for _, row in df.iterrows():
-                if str(row.get('row_id', '')).strip() == str(row_id):
-                    # DRY: Use CSVManager for S3 path loading
-                    paths = CSVManager.load_s3_paths(row)
-                    if paths:
-                            logger.info(f"Row {row_id} already has {len(paths)} files in S3")
-                            return True
-                            
+            # Check the row's s3_paths in the CSV index
+            row = self._csv_rows_by_id().get(str(row_id))
+            if row is not None:
+                # DRY: Use CSVManager for S3 path loading
+                paths = CSVManager.load_s3_paths(row)
+                if paths:
+                    logger.info(f"Row {row_id} already has {len(paths)} files in S3")
+                    return True
+                    
         except Exception as e:
             logger.error(f"Error checking existing media: {e}")
             
@@ -338,6 +316,10 @@ class MetadataDownloadProcessor:
                 logger.error(f"Failed to update row {row_id}")
                 return False
             
+            # Keep the run's CSV index in step with the file
+            if self._csv_rows is not None and str(row_id) in self._csv_rows:
+                self._csv_rows[str(row_id)].update(updates)
+            
             logger.info(f"Updated CSV row {row_id} with {len(downloaded_files)} files")
             logger.info(f"  s3_paths: {CSVManager.save_s3_paths(s3_paths)}")
             logger.info(f"  file_uuids: {CSVManager.save_file_uuids(file_uuids)}")
@@ -405,12 +387,11 @@ class MetadataDownloadProcessor:
                 self.update_csv_with_results(row_id, files)
                 
                 # Mark as processed
-                self.progress['processed'].append(metadata['_s3_key'])
-                self._save_progress()
+                self.progress.add('processed', metadata['_s3_key'])
             else:
                 # Track failure
-                self.progress['failed'][metadata['_s3_key']] = datetime.now().isoformat()
-                self._save_progress()
+                self.progress.put('failed', metadata['_s3_key'], {'value': datetime.now().isoformat()})
+        self.progress.flush()
         
         # Report statistics
         print_section_header("PROCESSING COMPLETE")
@@ -115,7 +115,7 @@ def stream_drive_folders_direct():
                         
                         uploaded_files.append({
                             'uuid': file_uuid,
-                            's3_key': s3_key,
+                            's3_key': result.s3_key,
                             'description': f"From folder: {file_name} ({file_size_mb:.1f} MB)",
                             'original_filename': file_name,
                             'file_size_bytes': result.file_size or 0,
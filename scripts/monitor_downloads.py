@@ -54,7 +54,7 @@ def monitor_downloads():
     
     if yt_running:
         print("\n   Latest activity:")
-        log_content = get_latest_log_content('youtube_downloads_*.log')
+        log_content = get_latest_log_content('logs/batch/youtube_downloads*.jsonl')
         for line in log_content.strip().split('\n'):
             print(f"   {line}")
     
@@ -71,7 +71,7 @@ def monitor_downloads():
     
     if drive_running:
         print("\n   Latest activity:")
-        log_content = get_latest_log_content('drive_downloads_*.log')
+        log_content = get_latest_log_content('logs/batch/drive_downloads*.jsonl')
         for line in log_content.strip().split('\n'):
             print(f"   {line}")
     
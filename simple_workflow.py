@@ -16,17 +16,23 @@ from urllib.parse import urlparse
 import os
 import urllib.parse
 import time
-from bs4 import BeautifulSoup
+import atexit
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 # Import centralized configuration, path utilities, error handling, patterns, and CSV operations (DRY)
 from utils.config import get_config, ensure_parent_dir, ensure_directory, format_error_message, load_json_state, save_json_state
-from utils.patterns import PatternRegistry, extract_youtube_id, extract_drive_id, clean_url, normalize_whitespace, cleanup_selenium_driver, get_selenium_driver
-from utils.extract_links import extract_google_doc_text, extract_actual_url, extract_text_with_retry
-from utils.csv_manager import CSVManager
-from utils.http_pool import get as http_get  # Centralized HTTP requests (DRY)
+from utils.patterns import scan_links, extract_youtube_id, extract_drive_id, clean_url, normalize_whitespace, cleanup_selenium_driver, get_selenium_driver
+from utils.extract_links import extract_google_doc_text, extract_actual_url, extract_text_with_retry, get_extraction_timing_summary
+from utils.csv_manager import CSVManager, RowIndex
+from utils.csv_journal import CSVJournal, filter_records
+from utils.fingerprints import get_fingerprint_store, doc_fingerprint, html_fingerprint
+from utils.progress_store import open_progress_store
+from utils.metrics import timed, start_metrics_exporter
+from utils.sheet_parser import parse_sheet
+from utils.concurrency import run_ordered, host_slot
+from utils.http_pool import get as http_get, get_http_cache_stats  # Centralized HTTP requests (DRY)
 from utils.streaming_integration import stream_extracted_links
 from utils.constants import CSVConstants, URLPatterns
 from utils.s3_manager import UnifiedS3Manager, S3Config, UploadMode
@@ -58,6 +64,7 @@ def save_failed_docs(failed_list):
 
 # Selenium driver functions moved to patterns.py (DRY consolidation)
 
+@timed('workflow_step_seconds', step='1')
 def step1_download_sheet():
     """Step 1: Download a local copy of the Google Sheet"""
     print("Step 1: Downloading Google Sheet...")
@@ -65,35 +72,21 @@ def step1_download_sheet():
     # First try HTTP request (faster)
     try:
         print("  Trying HTTP download...")
-        response = http_get(config.get("google_sheets.url"))
+        # Conditional GET: an unchanged sheet is served from the HTTP cache
+        response = http_get(config.get("google_sheets.url"), use_cache=True)
         response.raise_for_status()
         html_content = response.text
         
-        # Quick check if we got actual data
-        soup = BeautifulSoup(html_content, "html.parser")
-        
-        # Look for the specific div with target ID
-        target_div = soup.find("div", {"id": str(config.get("google_sheets.target_div_id"))})
-        if target_div:
-            table = target_div.find("table")
-        else:
-            # Fallback to any table
-            table = soup.find("table", {"class": "waffle"})
-            if not table:
-                tables = soup.find_all("table")
-                table = tables[0] if tables else None
-        
-        # Check if we found a table with rows
-        if table:
-            rows = table.find_all("tr")
-            if len(rows) > 1:  # More than just header
-                # Save the HTML
-                sheet_cache_path = get_config().get('paths.sheet_cache', 'sheet.html')
-                with open(sheet_cache_path, "w", encoding="utf-8") as f:
-                    f.write(html_content)
-                
-                print(f"  ✓ Sheet downloaded via HTTP (found {len(rows)} rows)")
-                return html_content
+        # Quick check if we got actual data (step 2 reuses this parse)
+        row_count = parse_sheet(html_content).row_count
+        if row_count > 1:  # More than just header
+            # Save the HTML
+            sheet_cache_path = get_config().get('paths.sheet_cache', 'sheet.html')
+            with open(sheet_cache_path, "w", encoding="utf-8") as f:
+                f.write(html_content)
+            
+            print(f"  ✓ Sheet downloaded via HTTP (found {row_count} rows)")
+            return html_content
         
         print("  ✗ HTTP download incomplete (no table data found)")
         print("  Falling back to Selenium...")
@@ -161,69 +154,52 @@ def step1_download_sheet():
         if driver:
             driver.quit()
 
+def people_from_sheet_rows(rows):
+    """Turn SheetRow tuples (cell texts, name-cell href) into person dicts, skipping headers and short rows"""
+    people_data = []
+    for cells, name_href in rows:
+        # Need at least 5 cells (row_id, name, email, type)
+        if len(cells) < 5:
+            continue
+        
+        # Extract data using the correct column indices from the working code
+        row_id, name, email, type_val = cells[0], cells[2], cells[3], cells[4]
+        
+        # Skip header rows and invalid data
+        if not name or name.lower() == "name" or row_id == "#" or "name" in name.lower() and "email" in email.lower():
+            continue
+        
+        # Skip any row that looks like a header (contains "Name", "Email", "Type" pattern)
+        if "Email" in email and "Type" in type_val and any("Name" in cell for cell in cells):
+            continue
+        
+        # Look for Google Doc link in the name cell
+        doc_link = None
+        if name_href and name_href.startswith("https://www.google.com/url?q="):
+            doc_link = extract_actual_url(name_href)
+        
+        people_data.append({
+            "row_id": row_id,
+            "name": name,
+            "email": email,
+            "type": type_val,
+            "doc_link": doc_link if doc_link else ""
+        })
+    return people_data
+
+@timed('workflow_step_seconds', step='2')
 def step2_extract_people_and_docs(html_content):
     """Step 2: Extract people data and Google Doc links from the sheet"""
     print("Step 2: Extracting people data and Google Doc links...")
     
-    soup = BeautifulSoup(html_content, "html.parser")
-    
-    # Look for the specific div with target ID
-    target_div = soup.find("div", {"id": str(config.get("google_sheets.target_div_id"))})
-    if target_div:
-        table = target_div.find("table")
-    else:
-        # Fallback to any table
-        table = soup.find("table", {"class": "waffle"})
-        if not table:
-            tables = soup.find_all("table")
-            table = tables[0] if tables else None
+    # Shares the parse step 1 made of the same HTML
+    sheet = parse_sheet(html_content)
     
     people_data = []
-    if table:
-        rows = table.find_all("tr")
-        print(f"Found {len(rows)} rows in the table")
-        
+    if sheet.row_count:
+        print(f"Found {sheet.row_count} rows in the table")
         # Process rows starting from row 1 (skip header)
-        for row_index in range(1, len(rows)):
-            row = rows[row_index]
-            cells = row.find_all("td")
-            
-            # Need at least 5 cells (row_id, name, email, type)
-            if len(cells) < 5:
-                continue
-            
-            # Extract data using the correct column indices from the working code
-            row_id = cells[0].get_text(strip=True)
-            name = cells[2].get_text(strip=True)  # Name in column 2
-            email = cells[3].get_text(strip=True)  # Email in column 3  
-            type_val = cells[4].get_text(strip=True)  # Type in column 4
-            
-            # Skip header rows and invalid data
-            if not name or name.lower() == "name" or row_id == "#" or "name" in name.lower() and "email" in email.lower():
-                continue
-            
-            # Skip any row that looks like a header (contains "Name", "Email", "Type" pattern)
-            if any(["Name" in str(cell.get_text(strip=True)) and "Email" in str(cells[3].get_text(strip=True)) and "Type" in str(cells[4].get_text(strip=True)) for cell in cells]):
-                continue
-            
-            # Look for Google Doc link in the name cell
-            doc_link = None
-            name_cell = cells[2]
-            a_tags = name_cell.find_all("a")
-            if a_tags:
-                a_tag = a_tags[0]
-                if a_tag.has_attr("href"):
-                    href = a_tag["href"]
-                    if href.startswith("https://www.google.com/url?q="):
-                        doc_link = extract_actual_url(href)
-            
-            people_data.append({
-                "row_id": row_id,
-                "name": name,
-                "email": email,
-                "type": type_val,
-                "doc_link": doc_link if doc_link else ""
-            })
+        people_data = people_from_sheet_rows(sheet.iter_rows(start=1))
     
     print(f"✓ Found {len(people_data)} people records")
     
@@ -248,36 +224,43 @@ def step2_extract_people_and_docs(html_content):
     
     return people_data, people_with_docs
 
-def step3_scrape_doc_contents(doc_url):
-    """Step 3: Scrape contents and text of a Google Doc"""
+def fetch_doc_html(doc_url):
+    """HTML of a doc page via a conditional GET through the HTTP cache ("" on failure)"""
+    try:
+        with host_slot(doc_url):
+            response = http_get(doc_url, use_cache=True)  # Use centralized HTTP pool (DRY)
+        response.raise_for_status()
+        return response.text
+    except Exception as e:
+        print(f"✗ Failed to scrape HTML: {e}")
+        return ""
+
+
+@timed('workflow_step_seconds', step='3')
+def step3_scrape_doc_contents(doc_url, html_content=None):
+    """Step 3: Scrape contents and text of a Google Doc
+    
+    ``html_content`` is the page HTML if the caller already fetched it.
+    """
     print(f"Step 3: Scraping doc: {doc_url}")
+    if html_content is None:
+        html_content = fetch_doc_html(doc_url)
     
-    # For Google Docs, use Selenium to get both HTML and text
+    # For Google Docs, use Selenium to get the text as well
     if "docs.google.com/document" in doc_url:
-        # Extract the document text using Selenium
-        doc_text = extract_google_doc_text(doc_url)
-        
-        # Also get the HTML for link extraction
-        try:
-            response = http_get(doc_url)  # Use centralized HTTP pool (DRY)
-            response.raise_for_status()
-            html_content = response.text
+        # Extract the document text using Selenium (per-host cap when running with --workers)
+        with host_slot(doc_url):
+            doc_text = extract_google_doc_text(doc_url)
+        if html_content:
             print("✓ Doc scraped successfully (HTML + text)")
-            return html_content, doc_text
-        except Exception as e:
-            print(f"✗ Failed to scrape HTML: {e}")
-            return "", doc_text
-    else:
-        # For other URLs, just get HTML
-        try:
-            response = http_get(doc_url)  # Use centralized HTTP pool (DRY)
-            response.raise_for_status()
-            print("✓ Doc scraped successfully (HTML only)")
-            return response.text, ""
-        except Exception as e:
-            print(f"✗ Failed to scrape doc: {e}")
-            return "", ""
+        return html_content, doc_text
+    
+    # For other URLs, just get HTML
+    if html_content:
+        print("✓ Doc scraped successfully (HTML only)")
+    return html_content, ""
 
+@timed('workflow_step_seconds', step='4')
 def step4_extract_links(doc_content, doc_text=""):
     """Step 4: Extract links from scraped content and document text"""
     print("Step 4: Extracting links from doc content...")
@@ -286,87 +269,16 @@ def step4_extract_links(doc_content, doc_text=""):
     combined_content = doc_content + " " + doc_text
     
     # Decode Unicode escapes commonly found in Google Docs HTML
-    try:
-        combined_content = combined_content.encode('utf-8').decode('unicode-escape')
-    except:
-        # If decoding fails, continue with original content
-        pass
-    
-    links = {
-        'youtube': [],
-        'drive_files': [],
-        'drive_folders': [],
-        'all_links': []
-    }
-    
-    # Use centralized YouTube patterns (DRY)
-    youtube_patterns = [
-        PatternRegistry.YOUTUBE_VIDEO_FULL,
-        PatternRegistry.YOUTUBE_SHORT_FULL,
-        PatternRegistry.YOUTUBE_PLAYLIST_FULL
-    ]
-    
-    for pattern in youtube_patterns:
-        matches = pattern.findall(combined_content)
-        for match in matches:
-            if pattern == PatternRegistry.YOUTUBE_PLAYLIST_FULL:
-                clean_link = URLPatterns.youtube_playlist_url(match)
-            else:
-                clean_link = URLPatterns.youtube_watch_url(match)
-            
-            if clean_link not in links['youtube']:
-                links['youtube'].append(clean_link)
-    
-    # Also try to find YouTube playlists with Unicode escapes (common in Google Docs)
-    import re
-    escaped_playlist_pattern = re.compile(r'youtube\.com/playlist\?list\\u003d([a-zA-Z0-9_-]+)')
-    escaped_matches = escaped_playlist_pattern.findall(combined_content)
-    for match in escaped_matches:
-        clean_link = URLPatterns.youtube_playlist_url(match)
-        if clean_link not in links['youtube']:
-            links['youtube'].append(clean_link)
-    
-    # Use centralized Google Drive patterns (DRY)
-    drive_patterns = [
-        PatternRegistry.DRIVE_FILE_FULL,
-        PatternRegistry.DRIVE_OPEN_FULL,
-        PatternRegistry.DRIVE_FOLDER_FULL
-    ]
+    # (a no-op for plain ASCII without backslashes, so skip the copy then)
+    if '\\' in combined_content or not combined_content.isascii():
+        try:
+            combined_content = combined_content.encode('utf-8').decode('unicode-escape')
+        except:
+            # If decoding fails, continue with original content
+            pass
     
-    for pattern in drive_patterns:
-        matches = pattern.findall(combined_content)
-        for match in matches:
-            if pattern == PatternRegistry.DRIVE_FOLDER_FULL:
-                clean_link = URLPatterns.drive_folder_url(match)
-                if clean_link not in links['drive_folders']:
-                    links['drive_folders'].append(clean_link)
-            else:
-                clean_link = URLPatterns.drive_file_url(match, view=True)
-                if clean_link not in links['drive_files']:
-                    links['drive_files'].append(clean_link)
-    
-    # Extract all HTTP(S) links for comprehensive coverage using centralized pattern (DRY)
-    all_found_links = PatternRegistry.HTTP_URL.findall(combined_content)
-    
-    # Clean and categorize all links
-    for link in all_found_links:
-        clean_link = clean_url(link)
-        if clean_link and clean_link not in links['all_links']:
-            links['all_links'].append(clean_link)
-            
-            # Additional categorization for missed links
-            if ('youtube.com' in clean_link or 'youtu.be' in clean_link) and clean_link not in links['youtube']:
-                links['youtube'].append(clean_link)
-            elif 'drive.google.com/file' in clean_link and clean_link not in links['drive_files']:
-                links['drive_files'].append(clean_link)
-            elif 'drive.google.com/drive/folders' in clean_link and clean_link not in links['drive_folders']:
-                links['drive_folders'].append(clean_link)
-    
-    # Remove duplicates
-    links['youtube'] = list(set(links['youtube']))
-    links['drive_files'] = list(set(links['drive_files']))
-    links['drive_folders'] = list(set(links['drive_folders']))
-    links['all_links'] = list(set(links['all_links']))
+    # One pass classifies YouTube, Drive file and Drive folder links (DRY)
+    links = scan_links(combined_content)
     
     total_links = len(links['youtube']) + len(links['drive_files']) + len(links['drive_folders'])
     print(f"✓ Found {total_links} targeted links (YT: {len(links['youtube'])}, Files: {len(links['drive_files'])}, Folders: {len(links['drive_folders'])})")
@@ -518,6 +430,7 @@ def filter_meaningful_links(links):
         'drive_folders': meaningful_drive_folders
     }
 
+@timed('workflow_step_seconds', step='5')
 def step5_process_extracted_data(person, links, doc_text=""):
     """Step 5: Process extracted data and stream to S3, then format for CSV"""
     print("Step 5: Processing extracted data...")
@@ -585,6 +498,7 @@ def step5_process_extracted_data(person, links, doc_text=""):
 
 # extract_text_with_retry function moved to utils/extract_links.py (DRY consolidation)
 
+@timed('workflow_step_seconds', step='6')
 def step6_map_data(processed_records, basic_mode=False, text_mode=False, output_file=None):
     """Step 6: Map data to CSV"""
     print("Step 6: Mapping data to CSV...")
@@ -654,18 +568,52 @@ def step6_map_data(processed_records, basic_mode=False, text_mode=False, output_
     return df
 
 
-def update_csv_incrementally(all_records, current_index, record, basic_mode=False, text_mode=False, output_file=None):
-    """Update CSV incrementally after each successful S3 process"""
+def get_required_columns(basic_mode=False, text_mode=False):
+    """Get the CSV column set for the current processing mode (DRY: use config)"""
+    if basic_mode:
+        return config.get('csv_columns.basic')
+    elif text_mode:
+        return config.get('csv_columns.text')
+    return config.get('csv_columns.full')
+
+
+def resolve_output_file(output_file=None, basic_mode=False, text_mode=False):
+    """Determine the output CSV for the current processing mode"""
+    if output_file:
+        return output_file
+    if text_mode:
+        return "text_extraction_output.csv"
+    return config.get("paths.output_csv", "simple_output.csv")
+
+
+def create_csv_journal(basic_mode=False, text_mode=False, output_file=None):
+    """Create the write-ahead journal used for incremental CSV output"""
+    return CSVJournal(
+        resolve_output_file(output_file, basic_mode, text_mode),
+        get_required_columns(basic_mode, text_mode)
+    )
+
+
+def update_csv_incrementally(all_records, current_index, record, basic_mode=False, text_mode=False, output_file=None, journal=None):
+    """Update CSV incrementally after each successful S3 process
+    
+    With a journal, the record is appended to the write-ahead journal and the
+    CSV is only rewritten when the journal decides a compaction is due.
+    """
     # Update the record at the current index
     all_records[current_index] = record
     
+    if journal is not None:
+        journal.append(current_index, record)
+        if not journal.should_compact(len(all_records)):
+            return True
+        csv_success = journal.compact(all_records, operation_name=f"incremental_update_{current_index}")
+        if not csv_success:
+            print(f"  ❌ Failed to compact CSV journal after processing record {current_index}")
+        return csv_success
+    
     # Handle different column sets based on processing mode
-    if basic_mode:
-        required_columns = config.get('csv_columns.basic')
-    elif text_mode:
-        required_columns = config.get('csv_columns.text')
-    else:
-        required_columns = config.get('csv_columns.full')
+    required_columns = get_required_columns(basic_mode, text_mode)
     
     # Ensure all required columns are present in all records
     for rec in all_records:
@@ -674,19 +622,10 @@ def update_csv_incrementally(all_records, current_index, record, basic_mode=Fals
                 rec[col] = ''
     
     # Filter records to only include required columns in correct order
-    filtered_records = []
-    for rec in all_records:
-        filtered_record = {col: rec.get(col, '') for col in required_columns}
-        filtered_records.append(filtered_record)
+    filtered_records = filter_records(all_records, required_columns)
     
     # Determine output file
-    if not output_file:
-        if basic_mode:
-            output_file = config.get("paths.output_csv", "simple_output.csv")
-        elif text_mode:
-            output_file = "text_extraction_output.csv"
-        else:
-            output_file = config.get("paths.output_csv", "simple_output.csv")
+    output_file = resolve_output_file(output_file, basic_mode, text_mode)
     
     # Create DataFrame for CSV operations
     df = pd.DataFrame(filtered_records)
@@ -700,6 +639,129 @@ def update_csv_incrementally(all_records, current_index, record, basic_mode=Fals
     
     return csv_success
 
+def process_doc_row(person, fingerprints=None, previous_record=None):
+    """Run steps 3-5 for a row whose link is a document
+    
+    With ``fingerprints`` (incremental mode), the page HTML is fetched first
+    with a conditional GET; if it matches the last successful run, the row
+    keeps ``previous_record`` without a Selenium extraction. Otherwise a doc
+    whose text and link set still match keeps ``previous_record``'s links and
+    S3 files instead of streaming them again.
+    """
+    html_content = None
+    html_print = None
+    if fingerprints is not None and previous_record is not None:
+        html_content = fetch_doc_html(person['doc_link'])
+        html_print = html_fingerprint(html_content) if html_content else None
+        if html_print and fingerprints.html_unchanged(person['row_id'], html_print):
+            print("  → Doc page unchanged since last run, keeping previous record")
+            fingerprints.carry_forward(person['row_id'])
+            return dict(previous_record, **CSVManager.create_record(person, mode='basic'))
+    
+    # Step 3: Scrape doc content and text
+    doc_content, doc_text = step3_scrape_doc_contents(person['doc_link'], html_content)
+    
+    # Step 4: Extract links from HTML content and document text
+    links = step4_extract_links(doc_content, doc_text)
+    
+    if fingerprints is not None and (doc_content or doc_text):
+        fingerprint = doc_fingerprint(doc_text, links)
+        unchanged = previous_record is not None and fingerprints.doc_unchanged(person['row_id'], fingerprint)
+        fingerprints.stage_doc(person['row_id'], fingerprint, html_print or html_fingerprint(doc_content))
+        if unchanged:
+            print("  → Doc unchanged since last run, keeping previous links and S3 files")
+            return dict(previous_record, **CSVManager.create_record(person, mode='basic'))
+    
+    # Step 5: Process extracted data (includes S3 streaming)
+    return step5_process_extracted_data(person, links, doc_text)
+
+
+def links_to_doc(person, people_with_docs_dict):
+    """True if FULL MODE scrapes the person's link as a document (steps 3-4) rather than streaming it directly"""
+    link = (person.get('doc_link') or '').lower()
+    if not link:
+        return False
+    if person.get('row_id') in people_with_docs_dict:
+        return True
+    return not ("youtube.com" in link or "youtu.be" in link or "drive.google.com/file" in link)
+
+
+def process_person_full(person, people_with_docs_dict, fingerprints=None, previous_record=None):
+    """Run steps 3-5 for one person in FULL MODE and return their record
+    
+    Safe to call from worker threads: network calls are capped per host and
+    nothing here touches the shared record list or the CSV.
+    """
+    # Check if this person has a link
+    if not person.get('doc_link'):
+        print(f"  → No document")
+        # Create record for person without document using factory (DRY)
+        return CSVManager.create_record(person, mode='full', doc_text='', links=None)
+    
+    link = person['doc_link'].lower()
+    
+    # Check if it's a Google Doc that needs scraping
+    if person.get('row_id') in people_with_docs_dict:
+        print(f"  → Has Google Doc: {person['doc_link']}")
+        return process_doc_row(person, fingerprints, previous_record)
+    
+    # Handle direct YouTube/Drive links (Case 2)
+    if "youtube.com" in link or "youtu.be" in link or "drive.google.com/file" in link:
+        print(f"  → Has direct link: {person['doc_link']}")
+        
+        # For direct links, create the links structure directly without scraping
+        links = {
+            'youtube': [],
+            'drive_files': [],
+            'drive_folders': [],
+            'all_links': []
+        }
+        
+        # Add the direct link to appropriate category
+        if "youtube.com" in link or "youtu.be" in link:
+            links['youtube'].append(person['doc_link'])
+        elif "drive.google.com/file" in link:
+            links['drive_files'].append(person['doc_link'])
+        
+        links['all_links'].append(person['doc_link'])
+        
+        # Process without doc scraping (includes S3 streaming)
+        return step5_process_extracted_data(person, links, '')
+    
+    print(f"  → Has unknown link type: {person['doc_link']}")
+    # Unknown link type, process as doc for safety
+    return process_doc_row(person, fingerprints, previous_record)
+
+
+def load_previous_records(basic_mode=False, text_mode=False, output_file=None):
+    """Records of the previous run's output CSV by row_id ({} if there is none)"""
+    output_file = resolve_output_file(output_file, basic_mode, text_mode)
+    if not os.path.exists(output_file):
+        return {}
+    previous = CSVManager.safe_csv_read(output_file, 'all_string').fillna('')
+    return {str(rec.get('row_id', '')): rec for rec in previous.to_dict('records')}
+
+
+def restore_completed_records(all_records, completed_row_ids, basic_mode=False, text_mode=False, output_file=None,
+                              previous_by_id=None):
+    """Reload records finished by a previous run from the output CSV (FULL MODE resume / incremental)
+    
+    Returns:
+        Set of row_ids whose records were restored
+    """
+    if not completed_row_ids:
+        return set()
+    if previous_by_id is None:
+        previous_by_id = load_previous_records(basic_mode, text_mode, output_file)
+    
+    restored = set()
+    for idx, rec in enumerate(all_records):
+        row_id = str(rec.get('row_id', ''))
+        if row_id in completed_row_ids and row_id in previous_by_id:
+            all_records[idx] = dict(rec, **previous_by_id[row_id])
+            restored.add(row_id)
+    return restored
+
 def parse_arguments():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(description='Simple 6-Step Workflow - Unified Processing')
@@ -717,13 +779,20 @@ def parse_arguments():
     parser.add_argument('--batch-size', type=int, metavar='N', default=10,
                        help='Process N documents per batch (default: 10)')
     parser.add_argument('--resume', action='store_true',
-                       help='Resume from previous extraction progress')
+                       help='Resume from previous extraction progress (text and full modes)')
     parser.add_argument('--retry-failed', action='store_true',
                        help='Retry previously failed extractions')
     parser.add_argument('--output', type=str, metavar='FILE',
                        help='Override output CSV filename')
     parser.add_argument('--no-yt-dlp-update', action='store_true',
                        help='Skip automatic yt-dlp update before processing')
+    parser.add_argument('--no-journal', action='store_true',
+                       help='Rewrite the full CSV after every record instead of journaling')
+    parser.add_argument('--workers', type=int, metavar='N', default=1,
+                       help='Process N people (full mode) or documents (text mode) concurrently (default: 1)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Full mode: only process rows whose sheet data changed since the last run '
+                            'and skip S3 streaming for docs whose text and links are unchanged')
     
     return parser.parse_args()
 
@@ -749,11 +818,23 @@ def main():
     
     limit_text = f" (limited to {test_limit})" if test_limit else ""
     resume_text = " [RESUMING]" if args.resume else ""
+    resume_text += " [INCREMENTAL]" if args.incremental and not (basic_mode or text_mode) else ""
     retry_text = " [RETRY FAILED]" if args.retry_failed else ""
     
     print(f"STARTING SIMPLE 6-STEP WORKFLOW - {mode}{limit_text}{resume_text}{retry_text}")
     print("=" * 80)
     
+    # Periodic Prometheus textfile / JSON metrics (metrics.enabled)
+    start_metrics_exporter()
+    
+    # Write-ahead journal for incremental CSV updates (basic mode writes once, no journal needed)
+    journal = None
+    if not basic_mode and not args.no_journal and config.get("csv_journal.enabled", True):
+        journal = create_csv_journal(basic_mode=basic_mode, text_mode=text_mode, output_file=output_file)
+        recovered = journal.replay()
+        if recovered > 0:
+            print(f"📝 Recovered {recovered} records from an interrupted run's CSV journal")
+    
     processed_records = []
     
     # Step 1: Download sheet
@@ -776,6 +857,10 @@ def main():
         basic_record = CSVManager.create_record(person, mode='basic')
         all_records.append(basic_record)
     
+    # Guarantee the final compaction even if the run is interrupted
+    if journal is not None:
+        atexit.register(journal.close, all_records)
+    
     # Determine processing approach based on mode
     if basic_mode:
         print(f"\n🚀 BASIC MODE: Processing {len(all_people)} people (basic data only)...")
@@ -792,10 +877,12 @@ def main():
     elif text_mode:
         print(f"\n🚀 TEXT EXTRACTION MODE: Processing {len(people_with_docs)} documents...")
         
-        # Load previous progress if resuming
-        # Load progress using centralized state management (DRY)
-        default_progress = {"completed": [], "failed": [], "last_batch": 0, "total_processed": 0}
-        progress = load_json_state(config.get("paths.extraction_progress", "extraction_progress.json"), default_progress) if args.resume else default_progress
+        # Progress lives in a SQLite store next to the old JSON file (imported once when resuming)
+        progress = open_progress_store(config.get("paths.extraction_progress", "extraction_progress.json"), collections=('completed', 'failed'))
+        if not args.resume:
+            progress.clear()
+        completed_docs = set(progress.ids('completed'))
+        total_processed = progress.get_value('total_processed', 0)
         failed_docs = load_failed_docs() if args.retry_failed else []
         
         # Update all_records to text mode format
@@ -813,7 +900,7 @@ def main():
             docs_to_process = [person for person in people_with_docs if person['doc_link'] in failed_docs]
             print(f"  Retrying {len(docs_to_process)} previously failed documents...")
         elif args.resume:
-            docs_to_process = [person for person in people_with_docs if person['doc_link'] not in progress['completed']]
+            docs_to_process = [person for person in people_with_docs if person['doc_link'] not in completed_docs]
             print(f"  Resuming: {len(docs_to_process)} remaining documents...")
         else:
             docs_to_process = people_with_docs
@@ -826,7 +913,19 @@ def main():
         
         # Process documents in batches
         current_failed = []
-        batch_start = progress.get('last_batch', 0) if args.resume else 0
+        record_positions = RowIndex.from_records(all_records)
+        batch_start = progress.get_value('last_batch', 0) if args.resume else 0
+        workers = max(1, args.workers)
+        if workers > 1:
+            print(f"  Running {workers} workers (Selenium pool: {config.get('web_scraping.selenium.pool_size', 2)} drivers)")
+        
+        def extract_one(person):
+            # Extract text with retry logic (per-host cap when running with --workers)
+            with host_slot(person['doc_link']):
+                return extract_text_with_retry(person['doc_link'])
+        
+        def on_extract_error(j, person, error):
+            return "", str(error)
         
         for i in range(batch_start, len(docs_to_process), batch_size):
             batch = docs_to_process[i:i + batch_size]
@@ -836,42 +935,44 @@ def main():
             print(f"\n📦 BATCH {batch_num}/{total_batches} ({len(batch)} documents)")
             print("-" * 50)
             
-            for j, person in enumerate(batch):
+            def commit_doc(j, person, outcome):
+                # Called in batch order on the main thread, so CSV and progress stay consistent
+                nonlocal total_processed
+                doc_text, error = outcome
                 doc_index = i + j + 1
                 print(f"\n[{doc_index}/{len(docs_to_process)}] Processing: {person['name']}")
                 print(f"  Document: {person['doc_link']}")
                 
-                # Extract text with retry logic
-                doc_text, error = extract_text_with_retry(person['doc_link'])
-                
                 if error:
                     print(f"  ✗ Failed: {error}")
                     current_failed.append(person['doc_link'])
-                    progress['failed'].append(person['doc_link'])
+                    progress.add('failed', person['doc_link'])
                     record = CSVManager.create_error_record(person, mode='text', error_message=error)
                 else:
                     print(f"  ✓ Success: {len(doc_text)} characters extracted")
-                    progress['completed'].append(person['doc_link'])
+                    progress.add('completed', person['doc_link'])
                     record = CSVManager.create_record(person, mode='text', doc_text=doc_text)
                 
                 # Find the index in all_records for this person
-                record_index = next((idx for idx, rec in enumerate(all_records) if rec['row_id'] == person['row_id']), -1)
+                record_index = record_positions.get(person['row_id'], -1)
                 if record_index >= 0:
                     # Update CSV incrementally after each document extraction
                     print("  📝 Updating CSV...")
-                    update_csv_incrementally(all_records, record_index, record, basic_mode=basic_mode, text_mode=text_mode, output_file=output_file)
+                    update_csv_incrementally(all_records, record_index, record, basic_mode=basic_mode, text_mode=text_mode, output_file=output_file, journal=journal)
                 
-                progress['total_processed'] += 1
+                total_processed += 1
+                progress.set_value('total_processed', total_processed)
                 
-                # Add delay between documents
-                if j < len(batch) - 1:  # Don't delay after last document in batch
+                # Sequential runs keep the delay between documents
+                if workers == 1 and j < len(batch) - 1:
                     delay = config.get("retry.base_delay", 2.0)
                     time.sleep(delay)
             
+            run_ordered(batch, extract_one, commit_doc, max_workers=workers, on_error=on_extract_error)
+            
             # Save progress after each batch
-            progress['last_batch'] = i + batch_size
-            # Save progress using centralized state management (DRY)
-            save_json_state(config.get("paths.extraction_progress", "extraction_progress.json"), progress)
+            progress.set_value('last_batch', i + batch_size)
+            progress.flush()
             save_failed_docs(current_failed)
             
             print(f"\n✓ Batch {batch_num} complete")
@@ -882,90 +983,100 @@ def main():
             print(f"  Failed: {failed_in_batch}")
         
         print(f"\n🎉 TEXT EXTRACTION COMPLETE")
-        print(f"  Total processed: {progress['total_processed']}")
-        print(f"  Successful extractions: {len(progress['completed'])}")
+        print(f"  Total processed: {total_processed}")
+        print(f"  Successful extractions: {progress.count('completed')}")
+        progress.close()
         print(f"  Failed extractions: {len(current_failed)}")
+        timings = get_extraction_timing_summary()
+        if timings['documents']:
+            print(f"  Selenium timing: avg {timings['avg_total']:.2f}s/doc (settle {timings['avg_settle']:.2f}s), "
+                  f"max {timings['max_total']:.2f}s, {timings['unstable']} hit the stability timeout")
     
     else:
         print(f"\n🚀 FULL MODE: Processing {len(all_people)} people (with document processing)...")
         # Full processing of all people (both with and without docs)
         people_to_process = all_people[:test_limit] if test_limit else all_people
         
+        # Resume: keep records finished by a previous run and skip those people
+        full_progress_file = config.get("paths.full_progress", "full_progress.json")
+        progress = open_progress_store(full_progress_file, collections=('completed',))
+        if args.resume:
+            restored = restore_completed_records(all_records, set(progress.ids('completed')), basic_mode=basic_mode, text_mode=text_mode, output_file=output_file)
+            people_to_process = [person for person in people_to_process if str(person['row_id']) not in restored]
+            progress.retain('completed', restored)
+            print(f"  Resuming: {len(restored)} people already done, {len(people_to_process)} remaining...")
+        else:
+            progress.clear()
+        total_processed = progress.get_value('total_processed', 0)
+        
+        # Incremental: carry forward the previous record of every unchanged row without a doc.
+        # Doc rows are rechecked with a conditional GET of the page (the doc can change while its
+        # sheet row does not); Selenium and step 5 only run for docs whose page changed.
+        fingerprints = None
+        previous_records = {}
+        if args.incremental:
+            fingerprints = get_fingerprint_store(resolve_output_file(output_file, basic_mode, text_mode))
+            fingerprints.retain(person['row_id'] for person in all_people)
+            previous_records = load_previous_records(basic_mode, text_mode, output_file)
+            unchanged = {str(person['row_id']) for person in people_to_process
+                         if fingerprints.row_unchanged(person) and not links_to_doc(person, people_with_docs_dict)}
+            restored = restore_completed_records(all_records, unchanged, previous_by_id=previous_records)
+            people_to_process = [person for person in people_to_process if str(person['row_id']) not in restored]
+            print(f"  Incremental: {len(restored)} unchanged rows carried forward, {len(people_to_process)} to process...")
+        fingerprint_save_every = max(1, int(config.get('incremental.save_every', 50)))
+        
         # Write initial CSV with all basic records
         print("\n📝 Writing initial CSV with basic data for all people...")
         update_csv_incrementally(all_records, 0, all_records[0], basic_mode=basic_mode, text_mode=text_mode, output_file=output_file)
         
-        for i, person in enumerate(people_to_process):
-            print(f"\nProcessing person {i+1}/{len(people_to_process)}: {person['name']} (Row {person.get('row_id', 'Unknown')})")
-            
-            # Find the index in all_records for this person
-            record_index = next((idx for idx, rec in enumerate(all_records) if rec['row_id'] == person['row_id']), i)
+        record_positions = RowIndex.from_records(all_records)
+        workers = max(1, args.workers)
+        if workers > 1:
+            print(f"  Running {workers} workers (per-host caps: {config.get('parallel.host_limits', {})})")
+        
+        def process_one(person):
+            print(f"\nProcessing person: {person['name']} (Row {person.get('row_id', 'Unknown')})")
+            return process_person_full(person, people_with_docs_dict, fingerprints,
+                                       previous_records.get(str(person['row_id'])))
+        
+        def on_person_error(i, person, error):
+            print(f"  ❌ Failed to process {person['name']}: {error}")
+            return None
+        
+        def commit_person(i, person, record):
+            # Called in row order on the main thread, so CSV and progress stay consistent
+            nonlocal total_processed
+            if record is None:
+                record = CSVManager.create_error_record(person, mode='full', error_message='processing failed')
+            record_index = record_positions.get(person['row_id'], i)
+            print(f"  📝 Updating CSV ({i+1}/{len(people_to_process)}: {person['name']})...")
+            update_csv_incrementally(all_records, record_index, record, basic_mode=basic_mode, text_mode=text_mode, output_file=output_file, journal=journal)
             
-            # Check if this person has a link
-            if person.get('doc_link'):
-                link = person['doc_link'].lower()
-                
-                # Check if it's a Google Doc that needs scraping
-                if person.get('row_id') in people_with_docs_dict:
-                    print(f"  → Has Google Doc: {person['doc_link']}")
-                    
-                    # Step 3: Scrape doc content and text
-                    doc_content, doc_text = step3_scrape_doc_contents(person['doc_link'])
-                    
-                    # Step 4: Extract links from HTML content and document text
-                    links = step4_extract_links(doc_content, doc_text)
-                    
-                    # Step 5: Process extracted data (includes S3 streaming)
-                    record = step5_process_extracted_data(person, links, doc_text)
-                    
-                    # Update CSV incrementally after successful S3 process
-                    print("  📝 Updating CSV...")
-                    update_csv_incrementally(all_records, record_index, record, basic_mode=basic_mode, text_mode=text_mode, output_file=output_file)
-                
-                # Handle direct YouTube/Drive links (Case 2)
-                elif "youtube.com" in link or "youtu.be" in link or "drive.google.com/file" in link:
-                    print(f"  → Has direct link: {person['doc_link']}")
-                    
-                    # For direct links, create the links structure directly without scraping
-                    links = {
-                        'youtube': [],
-                        'drive_files': [],
-                        'drive_folders': [],
-                        'all_links': []
-                    }
-                    
-                    # Add the direct link to appropriate category
-                    if "youtube.com" in link or "youtu.be" in link:
-                        links['youtube'].append(person['doc_link'])
-                    elif "drive.google.com/file" in link:
-                        links['drive_files'].append(person['doc_link'])
-                    
-                    links['all_links'].append(person['doc_link'])
-                    
-                    # Process without doc scraping (includes S3 streaming)
-                    record = step5_process_extracted_data(person, links, '')
-                    
-                    # Update CSV incrementally after successful S3 process
-                    print("  📝 Updating CSV...")
-                    update_csv_incrementally(all_records, record_index, record, basic_mode=basic_mode, text_mode=text_mode, output_file=output_file)
-                
+            # Failed people stay out of progress (and fingerprints) so the next run retries them
+            succeeded = not str(record.get('document_text', '')).startswith('EXTRACTION_FAILED')
+            if succeeded:
+                progress.add('completed', person['row_id'])
+            total_processed += 1
+            progress.set_value('total_processed', total_processed)
+            if fingerprints is not None:
+                if succeeded:
+                    fingerprints.commit(person)
                 else:
-                    print(f"  → Has unknown link type: {person['doc_link']}")
-                    # Unknown link type, process as doc for safety
-                    doc_content, doc_text = step3_scrape_doc_contents(person['doc_link'])
-                    links = step4_extract_links(doc_content, doc_text)
-                    record = step5_process_extracted_data(person, links, doc_text)
-                    
-                    # Update CSV incrementally after successful S3 process
-                    print("  📝 Updating CSV...")
-                    update_csv_incrementally(all_records, record_index, record, basic_mode=basic_mode, text_mode=text_mode, output_file=output_file)
-            else:
-                print(f"  → No document")
-                # Create record for person without document using factory (DRY)
-                record = CSVManager.create_record(person, mode='full', doc_text='', links=None)
-                
-                # Update CSV incrementally (even for no-doc cases to maintain consistency)
-                update_csv_incrementally(all_records, record_index, record, basic_mode=basic_mode, text_mode=text_mode, output_file=output_file)
+                    fingerprints.discard(person['row_id'])
+                # Rewriting the whole file per row is O(n) each; rows lost in a crash are just rechecked
+                if total_processed % fingerprint_save_every == 0:
+                    fingerprints.save()
+        
+        try:
+            run_ordered(people_to_process, process_one, commit_person, max_workers=workers, on_error=on_person_error)
+        finally:
+            if fingerprints is not None:
+                fingerprints.save()
+            progress.close()
+    
+    # Fold any journaled records into the final CSV
+    if journal is not None:
+        journal.close(all_records)
     
     # Step 6 is now done incrementally, so just print summary
     print("\n" + "=" * 50)
@@ -973,6 +1084,10 @@ def main():
     print(f"  Total people processed: {len(people_to_process) if 'people_to_process' in locals() else len(processed_records)}")
     print(f"  CSV updated incrementally after each S3 process")
     print(f"  Final CSV location: {output_file}")
+    cache_stats = get_http_cache_stats()
+    if cache_stats:
+        print(f"  HTTP cache: {cache_stats['hits']} not modified, {cache_stats['misses']} fetched, "
+              f"{cache_stats['bytes_saved'] / 1024:.0f} KB not re-downloaded")
     
     # Cleanup Selenium driver
     cleanup_selenium_driver()
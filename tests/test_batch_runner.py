@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the in-process batch download runner.
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+import csv
+import json
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from utils.batch_runner import (BatchRunner, items_from_csv, parse_shard, shard_items, split_link_cell)
+from utils.row_context import DownloadResult
+
+
+class StubHandler:
+    """Stands in for download_drive_with_context; fails URLs containing 'bad'"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, url, row_context):
+        with self.lock:
+            self.calls.append(url)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        ok = 'bad' not in url
+        return DownloadResult(success=ok, files_downloaded=[url.rsplit('/', 1)[-1]] if ok else [],
+                              media_id=url.rsplit('/', 1)[-1], error_message=None if ok else 'HTTP 404',
+                              metadata_file=None, row_context=row_context, download_type='drive')
+
+
+class TestBatchRunner(unittest.TestCase):
+    """Test CSV parsing, the JSONL log, resume and sharding"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = Path(self.temp_dir) / 'output.csv'
+        self.log_path = Path(self.temp_dir) / 'drive_downloads.jsonl'
+        with open(self.csv_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['row_id', 'name', 'email', 'type', 'google_drive'])
+            writer.writeheader()
+            for i in range(10):
+                links = f"https://drive.google.com/file/d/f{i}a|https://drive.google.com/file/d/f{i}b"
+                writer.writerow({'row_id': i, 'name': f'P{i}', 'email': '', 'type': 'FF', 'google_drive': links})
+            writer.writerow({'row_id': 10, 'name': 'Bad', 'email': '', 'type': 'FF',
+                             'google_drive': "['https://drive.google.com/file/d/bad']"})
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_split_link_cell(self):
+        self.assertEqual(split_link_cell("['https://a/1', \"https://a/2\"]"), ['https://a/1', 'https://a/2'])
+        self.assertEqual(split_link_cell('https://a/1 | https://a/1|nan'), ['https://a/1'])
+        self.assertEqual(split_link_cell('nan'), [])
+
+    def test_concurrent_run_logs_every_item_and_resume_skips_successes(self):
+        items = items_from_csv(self.csv_path, ['google_drive'])
+        self.assertEqual(len(items), 21)
+        handler = StubHandler(delay=0.05)
+
+        counts = BatchRunner(self.log_path, workers=4, handlers={'google_drive': handler}).run(items)
+        self.assertEqual(counts, {'ok': 20, 'failed': 1, 'skipped': 0})
+        self.assertGreater(handler.peak, 1)
+        records = [json.loads(line) for line in self.log_path.read_text().splitlines()]
+        self.assertEqual(sorted(r['key'] for r in records), sorted(item.key for item in items))
+        self.assertEqual([r['error'] for r in records if r['status'] == 'failed'], ['HTTP 404'])
+
+        handler = StubHandler()
+        counts = BatchRunner(self.log_path, workers=4, handlers={'google_drive': handler}).run(items, resume=True)
+        self.assertEqual(counts, {'ok': 0, 'failed': 1, 'skipped': 20})
+        self.assertEqual(handler.calls, ['https://drive.google.com/file/d/bad'])
+
+    def test_slow_item_does_not_hold_back_later_records(self):
+        items = items_from_csv(self.csv_path, ['google_drive'])[:12]
+        slow_url = items[0].url
+        logged_before_slow = []
+
+        def handler(url, row_context):
+            if url == slow_url:
+                time.sleep(0.5)
+                logged_before_slow.extend(self.log_path.read_text().splitlines())
+            return StubHandler()(url, row_context)
+
+        BatchRunner(self.log_path, workers=2, handlers={'google_drive': handler}).run(items)
+        # With an in-order commit window of 4 x workers, nothing could be logged before item 0
+        self.assertEqual(len(logged_before_slow), 11)
+        records = [json.loads(line) for line in self.log_path.read_text().splitlines()]
+        self.assertEqual(records[-1]['url'], slow_url)
+
+    def test_shards_partition_the_items(self):
+        items = items_from_csv(self.csv_path, ['google_drive'])
+        shards = [shard_items(items, i, 3) for i in range(3)]
+        keys = sorted(item.key for shard in shards for item in shard)
+        self.assertEqual(keys, sorted(item.key for item in items))
+        self.assertEqual(parse_shard('2/3'), (2, 3))
+        with self.assertRaises(ValueError):
+            parse_shard('3/3')
+
+
+if __name__ == '__main__':
+    unittest.main()
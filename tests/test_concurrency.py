@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the ordered worker pool and per-host concurrency caps.
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+import random
+import threading
+import time
+
+from utils.concurrency import HostConcurrencyLimiter, run_ordered
+
+
+class TestRunOrdered(unittest.TestCase):
+    """Test that results are committed in input order"""
+
+    def test_commits_in_input_order(self):
+        """Out-of-order completion is still committed in order, on the caller thread"""
+        committed = []
+        caller = threading.get_ident()
+
+        def worker(item):
+            time.sleep(random.uniform(0, 0.01))
+            return item * 2
+
+        def commit(index, item, result):
+            self.assertEqual(threading.get_ident(), caller)
+            committed.append((index, result))
+
+        count = run_ordered(range(50), worker, commit, max_workers=8, max_pending=10)
+        self.assertEqual(count, 50)
+        self.assertEqual(committed, [(i, i * 2) for i in range(50)])
+
+    def test_errors_map_to_results(self):
+        """on_error turns a failed item into a committed result"""
+        committed = []
+
+        def worker(item):
+            if item == 3:
+                raise ValueError('boom')
+            return item
+
+        run_ordered(range(6), worker, lambda i, item, result: committed.append(result),
+                    max_workers=3, on_error=lambda i, item, e: None)
+        self.assertEqual(committed, [0, 1, 2, None, 4, 5])
+
+    def test_errors_propagate_without_handler(self):
+        """Without on_error the worker exception is raised to the caller"""
+        def worker(item):
+            raise ValueError('boom')
+
+        with self.assertRaises(ValueError):
+            run_ordered(range(3), worker, lambda *args: None, max_workers=2)
+
+
+class TestHostConcurrencyLimiter(unittest.TestCase):
+    """Test host resolution and per-host caps"""
+
+    def setUp(self):
+        self.limiter = HostConcurrencyLimiter({'youtube.com': 2, 'drive.google.com': 3})
+
+    def test_resolve_host(self):
+        """Subdomains and aliases share their parent host's budget"""
+        self.assertEqual(self.limiter.resolve_host('https://www.youtube.com/watch?v=x'), 'youtube.com')
+        self.assertEqual(self.limiter.resolve_host('https://youtu.be/x'), 'youtube.com')
+        self.assertEqual(self.limiter.resolve_host('drive.usercontent.google.com'), 'drive.google.com')
+        self.assertIsNone(self.limiter.resolve_host('https://example.com/'))
+
+    def test_cap_is_enforced(self):
+        """No more than the configured number of slots are held at once"""
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def worker(item):
+            nonlocal active, peak
+            with self.limiter.slot('https://youtu.be/abc'):
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.01)
+                with lock:
+                    active -= 1
+
+        run_ordered(range(20), worker, lambda *args: None, max_workers=8)
+        self.assertEqual(peak, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
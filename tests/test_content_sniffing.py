@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Unit tests for magic-byte sniffing and extension detection during Drive streaming.
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+from unittest.mock import patch, MagicMock
+
+from utils.content_sniffing import sniff_extension, detect_file_type, filename_from_content_disposition
+from utils.s3_manager import UnifiedS3Manager, S3Config
+
+MP4_HEAD = b'\x00\x00\x00\x18ftypmp42\x00\x00\x00\x00mp42isom' + b'\x00' * 100
+
+
+class TestSniffing(unittest.TestCase):
+    """Test signatures and the header/magic priority order"""
+
+    def test_signatures(self):
+        self.assertEqual(sniff_extension(MP4_HEAD), '.mp4')
+        self.assertEqual(sniff_extension(b'\x00\x00\x00\x14ftypqt  '), '.mov')
+        self.assertEqual(sniff_extension(b'ID3\x04\x00'), '.mp3')
+        self.assertEqual(sniff_extension(b'%PDF-1.7'), '.pdf')
+        self.assertEqual(sniff_extension(b'PK\x03\x04....[Content_Types].xml....word/document.xml'), '.docx')
+        self.assertEqual(sniff_extension(b'\x1a\x45\xdf\xa3\x9f\x42\x86\x81\x01webm'), '.webm')
+        self.assertIsNone(sniff_extension(b'plain text'))
+
+    def test_content_disposition(self):
+        header = "attachment; filename=\"Blooper 1.mp4\"; filename*=UTF-8''Blooper%201%20%C3%A9.mp4"
+        self.assertEqual(filename_from_content_disposition(header), 'Blooper 1 é.mp4')
+        self.assertEqual(filename_from_content_disposition('attachment; filename=notes.docx'), 'notes.docx')
+
+    def test_detect_priority(self):
+        """Served filename beats magic bytes, which beat a generic Content-Type"""
+        self.assertEqual(detect_file_type(MP4_HEAD, {'Content-Disposition': 'attachment; filename="a.mov"'})[:2],
+                         ('.mov', 'video/quicktime'))
+        self.assertEqual(detect_file_type(MP4_HEAD, {'Content-Type': 'application/octet-stream'})[:2],
+                         ('.mp4', 'video/mp4'))
+        self.assertEqual(detect_file_type(b'???', {'Content-Type': 'application/pdf'})[:2],
+                         ('.pdf', 'application/pdf'))
+        self.assertEqual(detect_file_type(b'???', {})[0], '.bin')
+
+    def test_unknown_filename_suffix_falls_back_to_magic(self):
+        """Dotted names and names with spaces don't become extensions"""
+        for name in ('Session 3.5.2024', 'call w/ Dr. Smith', 'v1.final cut'):
+            header = {'Content-Disposition': f'attachment; filename="{name}"'}
+            self.assertEqual(detect_file_type(MP4_HEAD, header)[:2], ('.mp4', 'video/mp4'), name)
+        self.assertEqual(detect_file_type(b'???', {'Content-Disposition': 'attachment; filename="Q3.2024"'})[0],
+                         '.bin')
+
+
+class TestDriveStreamExtension(unittest.TestCase):
+    """Test that the first write already uses the detected extension"""
+
+    def setUp(self):
+        with patch('utils.s3_manager.get_s3_client', MagicMock()):
+            self.manager = UnifiedS3Manager(S3Config(bucket_name='test-bucket', add_metadata=False))
+
+    def stream(self, s3_key, headers):
+        response = MagicMock()
+        response.headers = headers
+        response.iter_content.side_effect = lambda chunk_size: iter([MP4_HEAD[:10], MP4_HEAD[10:]])
+        session = MagicMock()
+        session.get.return_value = response
+        with patch('utils.s3_manager.requests.Session', return_value=session):
+            return self.manager.stream_drive_to_s3('drive-id', s3_key)
+
+    def test_placeholder_key_gets_detected_extension(self):
+        result = self.stream('files/abc.bin', {'Content-Type': 'application/octet-stream'})
+
+        self.assertTrue(result.success, result.error)
+        self.assertEqual(result.s3_key, 'files/abc.mp4')
+        put = self.manager.s3_client.put_object.call_args.kwargs
+        self.assertEqual((put['Key'], put['ContentType'], put['Body']), ('files/abc.mp4', 'video/mp4', MP4_HEAD))
+        self.manager.s3_client.copy_object.assert_not_called()
+
+    def test_explicit_extension_is_kept(self):
+        result = self.stream('files/abc.pdf', {'Content-Type': 'application/pdf'})
+        self.assertEqual(result.s3_key, 'files/abc.pdf')
+
+
+if __name__ == '__main__':
+    unittest.main()
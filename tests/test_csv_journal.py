@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the CSV write-ahead journal used by incremental workflow output.
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+import pandas as pd
+
+from utils.csv_manager import CSVManager
+from utils.csv_journal import CSVJournal, filter_records
+
+COLUMNS = ['row_id', 'name', 'email', 'type', 'link', 'document_text']
+
+
+def make_records(count):
+    return [{'row_id': str(i), 'name': f'Person {i}', 'email': f'p{i}@example.com',
+             'type': 'FF-Fi/Se', 'link': ''} for i in range(count)]
+
+
+@patch('utils.csv_manager.get_csv_versioning', MagicMock())
+@patch('utils.csv_manager.get_csv_uploader', MagicMock())
+class TestCSVJournal(unittest.TestCase):
+    """Test journal append, compaction and crash recovery"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = Path(self.temp_dir) / 'output.csv'
+        self.expected_path = Path(self.temp_dir) / 'expected.csv'
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_expected(self, records):
+        """Write records the way the full-rewrite path does"""
+        df = pd.DataFrame(filter_records(records, COLUMNS))
+        CSVManager(csv_path=str(self.expected_path), auto_backup=False).safe_csv_write(df)
+
+    def test_final_csv_matches_full_rewrite(self):
+        """Journaled output is byte-identical to rewriting the CSV every time"""
+        records = make_records(40)
+        journal = CSVJournal(self.csv_path, COLUMNS, compact_ratio=0.5, min_compact_records=5,
+                             compact_interval=3600, fsync=False)
+        journal.compact(records)
+
+        for i in range(0, 40, 3):
+            record = dict(records[i], document_text=f'text {i}')
+            records[i] = record
+            journal.append(i, record)
+            if journal.should_compact(len(records)):
+                journal.compact(records)
+        journal.close(records)
+
+        self.write_expected(records)
+        self.assertEqual(self.csv_path.read_bytes(), self.expected_path.read_bytes())
+        self.assertFalse(journal.journal_path.exists())
+
+    def test_compaction_threshold_scales_with_records(self):
+        """Pending threshold grows with the record count"""
+        journal = CSVJournal(self.csv_path, COLUMNS, compact_ratio=0.1, min_compact_records=2,
+                             compact_interval=3600, fsync=False)
+        for i in range(5):
+            journal.append(i, make_records(1)[0])
+        self.assertTrue(journal.should_compact(total_records=10))
+        self.assertFalse(journal.should_compact(total_records=1000))
+
+    def test_replay_recovers_interrupted_run(self):
+        """Entries left behind by a crash are folded into the CSV"""
+        records = make_records(5)
+        journal = CSVJournal(self.csv_path, COLUMNS, min_compact_records=100,
+                             compact_interval=3600, fsync=False)
+        journal.compact(records)
+
+        records[2] = dict(records[2], document_text='recovered')
+        journal.append(2, records[2])
+        # Simulate a crash: drop the journal object without closing it
+        del journal
+
+        recovered = CSVJournal(self.csv_path, COLUMNS, fsync=False)
+        self.assertEqual(recovered.replay(), 1)
+
+        df = CSVManager.safe_csv_read(str(self.csv_path), 'all_string')
+        self.assertEqual(df.loc[2, 'document_text'], 'recovered')
+        self.assertEqual(len(df), 5)
+        self.assertFalse(recovered.journal_path.exists())
+
+    def test_torn_trailing_line_is_ignored(self):
+        """A partially written last line does not break recovery"""
+        journal = CSVJournal(self.csv_path, COLUMNS, fsync=False)
+        journal.append(0, make_records(1)[0])
+        with open(journal.journal_path, 'a', encoding='utf-8') as f:
+            f.write('{"index": 1, "row_')
+
+        self.assertEqual(len(journal.read_entries()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
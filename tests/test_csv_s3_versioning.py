@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Unit tests for debounced, content-hashed CSV version uploads.
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from utils.csv_s3_versioning import DebouncedCSVUploader
+
+
+class TestDebouncedCSVUploader(unittest.TestCase):
+    """Test coalescing, hash skipping, early triggers and flush"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = Path(self.temp_dir) / 'output.csv'
+        self.csv_path.write_text('row_id,name\n1,A\n')
+        self.versioning = MagicMock()
+        self.versioning.upload_csv_version.return_value = {'success': True, 'versioned_name': 'output_v.csv'}
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def make_uploader(self, **kwargs):
+        kwargs.setdefault('debounce_seconds', 60)
+        kwargs.setdefault('max_pending_writes', 1000)
+        return DebouncedCSVUploader(versioning_factory=lambda: self.versioning, skip_unchanged=True, **kwargs)
+
+    def test_burst_coalesces_into_one_upload(self):
+        """Many writes inside the window become a single upload at flush"""
+        uploader = self.make_uploader()
+        for i in range(100):
+            uploader.schedule(str(self.csv_path), {'operation': f'write_{i}'})
+        self.assertEqual(self.versioning.upload_csv_version.call_count, 0)
+
+        self.assertTrue(uploader.flush(timeout=5))
+        self.assertEqual(self.versioning.upload_csv_version.call_count, 1)
+        metadata = self.versioning.upload_csv_version.call_args[0][1]
+        self.assertEqual(metadata['operation'], 'write_99')
+        self.assertEqual(metadata['coalesced_writes'], '100')
+
+    def test_unchanged_content_is_skipped(self):
+        """A second version with the same bytes is not uploaded"""
+        uploader = self.make_uploader()
+        uploader.schedule(str(self.csv_path))
+        uploader.flush(timeout=5)
+        uploader.schedule(str(self.csv_path))
+        uploader.flush(timeout=5)
+        self.assertEqual(self.versioning.upload_csv_version.call_count, 1)
+        self.assertEqual(uploader.stats['skipped_unchanged'], 1)
+
+        self.csv_path.write_text('row_id,name\n1,B\n')
+        uploader.schedule(str(self.csv_path))
+        uploader.flush(timeout=5)
+        self.assertEqual(self.versioning.upload_csv_version.call_count, 2)
+
+    def test_write_count_and_window_trigger_upload(self):
+        """Uploads happen without a flush once the count or window is reached"""
+        uploader = self.make_uploader(max_pending_writes=3)
+        for _ in range(3):
+            uploader.schedule(str(self.csv_path))
+        self.wait_for(lambda: self.versioning.upload_csv_version.call_count == 1)
+
+        self.csv_path.write_text('row_id,name\n1,C\n')
+        uploader.debounce_seconds = 0.1
+        uploader.schedule(str(self.csv_path))
+        self.wait_for(lambda: self.versioning.upload_csv_version.call_count == 2)
+
+    def test_schedule_does_not_block_on_slow_upload(self):
+        """The writer returns immediately while S3 is slow"""
+        self.versioning.upload_csv_version.side_effect = lambda *args: time.sleep(0.5) or {'success': True, 'versioned_name': 'v'}
+        uploader = self.make_uploader(max_pending_writes=1)
+        start = time.monotonic()
+        for _ in range(5):
+            uploader.schedule(str(self.csv_path))
+        self.assertLess(time.monotonic() - start, 0.2)
+        self.assertTrue(uploader.flush(timeout=5))
+
+    def wait_for(self, condition, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            self.assertLess(time.monotonic(), deadline, 'condition not reached')
+            time.sleep(0.02)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the single-pass Drive folder parser, subfolder recursion and listing cache.
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+from utils.download_drive import parse_folder_listing, list_folder_files, FOLDER_MIME_TYPE
+
+ROOT = 'RootFolderId0001'
+SUB = 'SubFolderId00002'
+
+ROOT_PAGE = f'''
+<html><body>
+<div class="flip-entry" id="entry-FileAaaaaaaa01">
+  <a href="https://drive.google.com/file/d/FileAaaaaaaa01/view?usp=drive_web" target="_blank">
+    <div class="flip-entry-info"><div class="flip-entry-title">Lifting weight.mp4</div></div></a></div>
+<div data-id="FileBbbbbbbb02" aria-label="Notes &amp; answers.docx" data-mime-type="application/vnd.google-apps.document"></div>
+<a href="https://drive.google.com/drive/folders/{SUB}" title="Bloopers">Bloopers</a>
+<a href="https://drive.google.com/drive/folders/{ROOT}">this folder</a>
+<script>var files = ["/file/d/FileCccccccc03/view"];</script>
+</body></html>
+'''
+SUB_PAGE = f'''
+<a href="/file/d/FileDddddddd04/view" title="Blooper 1.mp4">Blooper 1.mp4</a>
+<a href="https://drive.google.com/drive/folders/{ROOT}">parent</a>
+'''
+
+
+class TestParseFolderListing(unittest.TestCase):
+    """Test entry extraction from one folder page"""
+
+    def test_entries_names_and_mime(self):
+        entries = parse_folder_listing(ROOT_PAGE, ROOT)
+        self.assertEqual(entries, [
+            ('FileAaaaaaaa01', 'Lifting weight.mp4', 'video/mp4'),
+            ('FileBbbbbbbb02', 'Notes & answers.docx', 'application/vnd.google-apps.document'),
+            (SUB, 'Bloopers', FOLDER_MIME_TYPE),
+            ('FileCccccccc03', 'file_FileCccc', None),
+        ])
+
+
+class TestListFolderFiles(unittest.TestCase):
+    """Test recursion into subfolders and the on-disk listing cache"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        settings = {'cache_dir': Path(self.temp_dir), 'cache_ttl': 3600, 'recursive': True,
+                    'max_depth': 5, 'max_concurrency': 2}
+        patcher = patch('utils.download_drive._folder_listing_settings', return_value=settings)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch('utils.download_drive._validate_folder_response', return_value=(True, None))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    @staticmethod
+    def fake_get(url, **kwargs):
+        response = MagicMock(status_code=200)
+        response.text = SUB_PAGE if url.endswith(SUB) else ROOT_PAGE
+        return response
+
+    def test_recurses_and_caches(self):
+        with patch('http_pool.get', side_effect=self.fake_get) as http_get:
+            files = list_folder_files(f'https://drive.google.com/drive/folders/{ROOT}')
+            again = list_folder_files(ROOT)
+
+        self.assertEqual(http_get.call_count, 2)  # one page per folder, second run served from cache
+        self.assertEqual(files, again)
+        self.assertEqual([(f['id'], f['path']) for f in files], [
+            ('FileAaaaaaaa01', ''), ('FileBbbbbbbb02', ''), ('FileCccccccc03', ''),
+            ('FileDddddddd04', 'Bloopers/'),
+        ])
+
+    def test_non_recursive_and_failures_not_cached(self):
+        failing = MagicMock(status_code=403)
+        with patch('http_pool.get', return_value=failing):
+            self.assertEqual(list_folder_files(ROOT), [])
+        with patch('http_pool.get', side_effect=self.fake_get) as http_get:
+            files = list_folder_files(ROOT, recursive=False)
+        self.assertEqual(http_get.call_count, 1)
+        self.assertEqual(len(files), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Unit tests for row/doc fingerprints used by incremental FULL MODE runs.
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import simple_workflow
+from utils.fingerprints import FingerprintStore, doc_fingerprint, html_fingerprint
+
+PERSON = {'row_id': '7', 'name': 'Ada', 'email': 'ada@example.com', 'type': 'FF',
+          'doc_link': 'https://docs.google.com/document/d/abc/edit'}
+LINKS = {'youtube': [], 'drive_files': [], 'drive_folders': [], 'all_links': ['https://youtu.be/x', 'https://a.b']}
+
+
+class TestFingerprintStore(unittest.TestCase):
+    """Test change detection and persistence"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = Path(self.temp_dir) / 'output.csv.fingerprints.json'
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_committed_rows_are_unchanged_until_edited(self):
+        store = FingerprintStore(self.path)
+        self.assertFalse(store.row_unchanged(PERSON))
+        store.stage_doc('7', doc_fingerprint('text', LINKS))
+        store.commit(PERSON)
+        store.save()
+
+        reopened = FingerprintStore(self.path)
+        self.assertTrue(reopened.row_unchanged(PERSON))
+        self.assertFalse(reopened.row_unchanged(dict(PERSON, email='new@example.com')))
+        # Link order does not matter, link content does
+        reversed_links = dict(LINKS, all_links=LINKS['all_links'][::-1])
+        self.assertTrue(reopened.doc_unchanged('7', doc_fingerprint('text', reversed_links)))
+        self.assertFalse(reopened.doc_unchanged('7', doc_fingerprint('text changed', LINKS)))
+
+    def test_discard_and_retain(self):
+        store = FingerprintStore(self.path)
+        store.commit(PERSON)
+        store.commit(dict(PERSON, row_id='8'))
+        store.retain(['8'])
+        self.assertEqual(len(store), 1)
+        store.discard('8')
+        self.assertEqual(len(store), 0)
+
+
+class TestIncrementalDocRow(unittest.TestCase):
+    """Test that an unchanged doc keeps its previous record without streaming"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = FingerprintStore(Path(self.temp_dir) / 'fp.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    @patch('simple_workflow.fetch_doc_html', return_value='<html>')
+    @patch('simple_workflow.step5_process_extracted_data', return_value={'row_id': '7', 's3_paths': 'new'})
+    @patch('simple_workflow.step4_extract_links', return_value=LINKS)
+    @patch('simple_workflow.step3_scrape_doc_contents', return_value=('<html>', 'text'))
+    def test_unchanged_doc_skips_step5(self, step3, step4, step5, fetch_html):
+        self.store.stage_doc('7', doc_fingerprint('text', LINKS))
+        self.store.commit(PERSON)
+        previous = {'row_id': '7', 'name': 'Old name', 's3_paths': '{"u": "files/u.mp4"}'}
+
+        edited = dict(PERSON, name='Ada L.')
+        record = simple_workflow.process_doc_row(edited, self.store, previous)
+
+        step5.assert_not_called()
+        self.assertEqual((record['name'], record['s3_paths']), ('Ada L.', '{"u": "files/u.mp4"}'))
+
+        step3.return_value = ('<html>', 'new text')
+        record = simple_workflow.process_doc_row(edited, self.store, previous)
+        self.assertEqual(record['s3_paths'], 'new')
+
+    @patch('simple_workflow.step5_process_extracted_data')
+    @patch('simple_workflow.extract_google_doc_text', return_value='text')
+    @patch('simple_workflow.fetch_doc_html', return_value='<html>page</html>')
+    def test_unchanged_page_skips_selenium(self, fetch_html, extract_text, step5):
+        self.store.stage_doc('7', doc_fingerprint('text', LINKS), html_fingerprint('<html>page</html>'))
+        self.store.commit(PERSON)
+        previous = {'row_id': '7', 'name': 'Ada', 's3_paths': '{"u": "files/u.mp4"}'}
+
+        record = simple_workflow.process_doc_row(PERSON, self.store, previous)
+
+        extract_text.assert_not_called()
+        step5.assert_not_called()
+        self.assertEqual(record['s3_paths'], '{"u": "files/u.mp4"}')
+        # The carried-forward fingerprints survive the commit, so the next run skips it too
+        self.store.commit(PERSON)
+        self.assertTrue(self.store.html_unchanged('7', html_fingerprint('<html>page</html>')))
+        self.assertTrue(self.store.doc_unchanged('7', doc_fingerprint('text', LINKS)))
+
+        fetch_html.return_value = '<html>edited</html>'
+        with patch('simple_workflow.step4_extract_links', return_value=LINKS):
+            simple_workflow.process_doc_row(PERSON, self.store, previous)
+        extract_text.assert_called_once()
+
+    def test_doc_rows_are_never_carried_forward_on_row_fingerprint_alone(self):
+        # Their doc can be edited without the sheet row changing, so steps 3-4 run again
+        self.assertTrue(simple_workflow.links_to_doc(PERSON, {}))
+        self.assertTrue(simple_workflow.links_to_doc(dict(PERSON, doc_link='https://example.com/page'), {}))
+        self.assertFalse(simple_workflow.links_to_doc(dict(PERSON, doc_link='https://youtu.be/x'), {}))
+        self.assertFalse(simple_workflow.links_to_doc(dict(PERSON, doc_link=''), {'7': {}}))
+
+
+if __name__ == '__main__':
+    unittest.main()
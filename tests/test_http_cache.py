@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the conditional-GET response cache in HTTPPool, run against a local HTTP server.
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+import shutil
+import tempfile
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+from utils.http_pool import HTTPPool, HTTPResponseCache
+
+PAGES = {}
+REQUESTS = []
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    """Serves PAGES[path] = (body, etag), answering 304 to a matching If-None-Match"""
+
+    def do_GET(self):
+        body, etag = PAGES[self.path]
+        REQUESTS.append((self.path, self.headers.get('If-None-Match')))
+        if etag and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHTTPResponseCache(unittest.TestCase):
+    """Test revalidation, 304 serving, LRU eviction and counters"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), ETagHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        PAGES.clear()
+        REQUESTS.clear()
+        self.pool = HTTPPool(max_retries=1, backoff_factor=0.1, verify_ssl=False,
+                             cache=HTTPResponseCache(self.temp_dir, max_bytes=250))
+
+    def tearDown(self):
+        self.pool.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_not_modified_is_served_from_disk(self):
+        PAGES['/sheet'] = ('<table>row é</table>'.encode('utf-8'), '"v1"')
+        first = self.pool.get(f"{self.base}/sheet", use_cache=True)
+        second = self.pool.get(f"{self.base}/sheet", use_cache=True)
+
+        self.assertEqual(REQUESTS, [('/sheet', None), ('/sheet', '"v1"')])
+        self.assertEqual((second.status_code, second.text), (200, first.text))
+        self.assertTrue(second.from_cache)
+        self.assertEqual(self.pool.cache_stats()['hits'], 1)
+
+        # A changed page is fetched in full and replaces the entry
+        PAGES['/sheet'] = (b'<table>new</table>', '"v2"')
+        third = self.pool.get(f"{self.base}/sheet", use_cache=True)
+        self.assertEqual(third.text, '<table>new</table>')
+        self.assertFalse(getattr(third, 'from_cache', False))
+
+    def test_lru_eviction_and_uncacheable_responses(self):
+        for name in ('a', 'b', 'c'):
+            PAGES[f'/{name}'] = (name.encode() * 100, f'"{name}"')
+        PAGES['/plain'] = (b'no validators', None)
+
+        self.pool.get(f"{self.base}/a", use_cache=True)
+        self.pool.get(f"{self.base}/b", use_cache=True)
+        self.pool.get(f"{self.base}/a", use_cache=True)  # a is now most recently used
+        self.pool.get(f"{self.base}/c", use_cache=True)  # over 250 bytes: evicts b
+        self.pool.get(f"{self.base}/plain", use_cache=True)
+
+        stats = self.pool.cache_stats()
+        self.assertEqual((stats['entries'], stats['evictions'], stats['bytes']), (2, 1, 200))
+        cache = self.pool.cache
+        self.assertIsNotNone(cache.lookup(f"{self.base}/a"))
+        self.assertIsNone(cache.lookup(f"{self.base}/b"))
+
+        # The LRU order survives a restart
+        reopened = HTTPResponseCache(self.temp_dir, max_bytes=250)
+        self.assertEqual(reopened.snapshot()['entries'], 2)
+
+    def test_cache_is_opt_in(self):
+        PAGES['/doc'] = (b'doc', '"d"')
+        self.pool.get(f"{self.base}/doc")
+        self.pool.get(f"{self.base}/doc")
+        self.assertEqual(REQUESTS, [('/doc', None), ('/doc', None)])
+
+
+if __name__ == '__main__':
+    unittest.main()
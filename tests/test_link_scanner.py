@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the single-pass step 4 link scanner.
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+
+from utils.patterns import scan_links
+
+
+class TestScanLinks(unittest.TestCase):
+    """Test classification, dedupe order and findall-equivalent overlap handling"""
+
+    def test_classifies_and_normalizes(self):
+        """YouTube and Drive links are normalized and categorized in one pass"""
+        text = ('<a href="https://www.youtube.com/watch?v=abcdefghijk&t=5">a</a> '
+                'https://youtu.be/abcdefghijk, https://youtube.com/playlist?list=PL123 '
+                'https://drive.google.com/open?id=FILE1 https://drive.google.com/file/d/FILE2/view '
+                'https://drive.google.com/drive/folders/FOLDER1?usp=sharing '
+                'https://example.com/page.')
+        links = scan_links(text)
+
+        self.assertEqual(links['youtube'][:2], ['https://www.youtube.com/watch?v=abcdefghijk',
+                                                'https://www.youtube.com/playlist?list=PL123'])
+        self.assertEqual(links['drive_files'][:2], ['https://drive.google.com/file/d/FILE1/view',
+                                                    'https://drive.google.com/file/d/FILE2/view'])
+        self.assertIn('https://drive.google.com/drive/folders/FOLDER1', links['drive_folders'])
+        self.assertIn('https://example.com/page', links['all_links'])
+        self.assertEqual(len(links['all_links']), len(set(links['all_links'])))
+
+    def test_generic_links_fill_categories(self):
+        """HTTP links the specific patterns miss are still categorized"""
+        links = scan_links('https://www.youtube.com/shorts/xyz https://drive.google.com/file/u/0/d/ID')
+        self.assertEqual(links['youtube'], ['https://www.youtube.com/shorts/xyz'])
+        self.assertEqual(links['drive_files'], ['https://drive.google.com/file/u/0/d/ID'])
+
+    def test_embedded_urls_match_separate_findall(self):
+        """A URL nested in a targeted match is found by the other patterns but not twice by the same one"""
+        text = 'https://www.youtube.com/watch?v=abcdefghijk&next=https://drive.google.com/drive/folders/F1'
+        links = scan_links(text)
+
+        self.assertEqual(links['drive_folders'], ['https://drive.google.com/drive/folders/F1'])
+        self.assertEqual(links['all_links'], [text])
+
+    def test_escaped_playlist(self):
+        """Escaped '=' playlist links from raw Docs HTML are recognised"""
+        links = scan_links(r'"youtube.com/playlist?list\u003dPLabc"')
+        self.assertEqual(links['youtube'], ['https://www.youtube.com/playlist?list=PLabc'])
+
+
+if __name__ == '__main__':
+    unittest.main()
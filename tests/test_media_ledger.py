@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the source-keyed media ledger and its use by the streaming pipeline.
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+from utils.media_ledger import MediaLedger
+from utils.s3_manager import UploadResult
+from utils.streaming_integration import stream_drive_file, stream_drive_folder, stream_youtube_links, StreamingProgress
+
+
+def make_s3_manager():
+    manager = MagicMock()
+    manager.config.bucket_name = 'test-bucket'
+    manager.s3_client.head_object.return_value = {'ContentLength': 2048}
+
+    def upload(source, s3_key, *args):
+        return UploadResult(success=True, s3_key=s3_key, file_size=2048, upload_time=0.1, checksum='abc')
+
+    manager.stream_drive_to_s3.side_effect = upload
+    manager.stream_youtube_to_s3.side_effect = upload
+    return manager
+
+
+class TestMediaLedger(unittest.TestCase):
+    """Test ledger persistence and S3 verification"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = Path(self.temp_dir) / 'ledger.db'
+        self.ledger = MediaLedger(self.db_path)
+
+    def tearDown(self):
+        self.ledger.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_entries_persist_across_instances(self):
+        """A recorded upload is visible to a new ledger on the same file"""
+        self.ledger.record('youtube:abc', 'bucket', 'uuid-1', 'files/uuid-1.mp4', size=10, checksum='ff')
+        reopened = MediaLedger(self.db_path)
+        entry = reopened.get('youtube:abc')
+        reopened.close()
+
+        self.assertEqual(entry['s3_key'], 'files/uuid-1.mp4')
+        self.assertEqual(entry['checksum'], 'ff')
+
+    def test_stale_entries_are_dropped(self):
+        """Missing objects, other buckets and size mismatches are not reused"""
+        self.ledger.record('drive:1', 'bucket', 'uuid-1', 'files/uuid-1.bin', size=10)
+        client = MagicMock()
+
+        self.assertIsNone(self.ledger.find_reusable('drive:1', 'other-bucket', client))
+
+        client.head_object.return_value = {'ContentLength': 10}
+        self.assertIsNotNone(self.ledger.find_reusable('drive:1', 'bucket', client))
+
+        client.head_object.return_value = {'ContentLength': 11}
+        self.assertIsNone(self.ledger.find_reusable('drive:1', 'bucket', client))
+        self.assertIsNone(self.ledger.get('drive:1'))
+
+
+class TestStreamingReusesLedger(unittest.TestCase):
+    """Test that a second run of the same links moves no media"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.ledger = MediaLedger(Path(self.temp_dir) / 'ledger.db')
+        patcher = patch('utils.streaming_integration.get_media_ledger', return_value=self.ledger)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.person = {'name': 'Test', 'row_id': 1}
+
+    def tearDown(self):
+        self.ledger.close()
+        shutil.rmtree(self.temp_dir)
+
+    def run_twice(self, stream):
+        first, second = {'file_uuids': {}, 's3_paths': {}}, {'file_uuids': {}, 's3_paths': {}}
+        manager = make_s3_manager()
+        stream(first, manager)
+        uploads = manager.stream_drive_to_s3.call_count + manager.stream_youtube_to_s3.call_count
+        stream(second, manager)
+        uploads_after = manager.stream_drive_to_s3.call_count + manager.stream_youtube_to_s3.call_count
+        return first, second, uploads, uploads_after
+
+    def test_drive_file(self):
+        url = 'https://drive.google.com/file/d/1AbCdEfGhIjKlMnOpQrStUvWxYz/view'
+        first, second, uploads, uploads_after = self.run_twice(
+            lambda results, manager: stream_drive_file(url, self.person, results, manager))
+        self.assertEqual((uploads, uploads_after), (1, 1))
+        self.assertEqual(first, second)
+
+    def test_youtube(self):
+        urls = ['https://www.youtube.com/watch?v=abcdefghijk']
+        first, second, uploads, uploads_after = self.run_twice(
+            lambda results, manager: stream_youtube_links(urls, self.person, results, manager, max_workers=1))
+        self.assertEqual((uploads, uploads_after), (1, 1))
+        self.assertEqual(first, second)
+
+    @patch('utils.streaming_integration.list_folder_files',
+           return_value=[{'id': 'child1', 'name': 'a.mp4'}, {'id': 'child2', 'name': 'b.pdf'}])
+    def test_drive_folder_children(self, list_files):
+        url = 'https://drive.google.com/drive/folders/1FolderIdAbCdEfGhIjKlMnOpQr'
+        first, second, uploads, uploads_after = self.run_twice(
+            lambda results, manager: stream_drive_folder(url, self.person, results, manager, StreamingProgress(1)))
+        self.assertEqual((uploads, uploads_after), (2, 2))
+        self.assertEqual(first, second)
+        self.assertIsNotNone(self.ledger.get(MediaLedger.drive_folder_key('1FolderIdAbCdEfGhIjKlMnOpQr', 'child2')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the metrics registry and its Prometheus textfile / JSON export.
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from utils import metrics
+from utils.metrics import MetricsRegistry, MetricsExporter
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test histograms, text exposition, the exporter and the disabled fast path"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.registry = MetricsRegistry(enabled=True, namespace='tc')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_prometheus_text(self):
+        histogram = self.registry.histogram('workflow_step_seconds')
+        for value in (0.004, 0.2, 0.3, 2000):
+            histogram.observe(value, step='3')
+        self.registry.counter('http_requests_total').inc(host='docs.google.com', status=200)
+        self.registry.counter('http_requests_total').inc(host='docs.google.com', status=200)
+
+        text = self.registry.render_prometheus()
+        self.assertIn('# TYPE tc_workflow_step_seconds histogram', text)
+        self.assertIn('tc_workflow_step_seconds_bucket{step="3",le="0.005"} 1', text)
+        self.assertIn('tc_workflow_step_seconds_bucket{step="3",le="0.25"} 2', text)
+        self.assertIn('tc_workflow_step_seconds_bucket{step="3",le="900"} 3', text)
+        self.assertIn('tc_workflow_step_seconds_bucket{step="3",le="+Inf"} 4', text)
+        self.assertIn('tc_workflow_step_seconds_count{step="3"} 4', text)
+        self.assertIn('tc_http_requests_total{host="docs.google.com",status="200"} 2', text)
+
+    def test_exporter_writes_textfile_and_json(self):
+        self.registry.gauge('s3_upload_bytes_per_second').set(1048576, kind='drive_stream')
+        textfile = Path(self.temp_dir) / 'metrics' / 'tc.prom'
+        json_file = Path(self.temp_dir) / 'metrics' / 'metrics.json'
+        MetricsExporter(self.registry, textfile, json_file).write()
+
+        self.assertIn('tc_s3_upload_bytes_per_second{kind="drive_stream"} 1048576', textfile.read_text())
+        snapshot = json.loads(json_file.read_text())
+        series = snapshot['metrics']['tc_s3_upload_bytes_per_second']['series']
+        self.assertEqual(series, [{'labels': {'kind': 'drive_stream'}, 'value': 1048576.0}])
+
+    def test_helpers_are_no_ops_when_disabled(self):
+        disabled = MetricsRegistry(enabled=False)
+        with patch.object(metrics, '_registry', disabled):
+            with metrics.timer('workflow_step_seconds', step='1'):
+                pass
+            metrics.inc('http_requests_total', host='a')
+            metrics.record_s3_upload('file', 10, 1.0)
+        self.assertEqual(disabled.render_prometheus(), '\n')
+
+        with patch.object(metrics, '_registry', self.registry):
+            timed_step = metrics.timed('workflow_step_seconds', step='6')(lambda: 'done')
+            self.assertEqual(timed_step(), 'done')
+            metrics.record_s3_upload('file', 10, 2.0)
+        snapshot = self.registry.snapshot()['metrics']
+        self.assertEqual(snapshot['tc_workflow_step_seconds']['series'][0]['count'], 1)
+        self.assertEqual(snapshot['tc_s3_upload_bytes_total']['series'][0]['value'], 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the SQLite progress store and the ProgressTracker built on it.
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+import json
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from utils.progress_store import ProgressStore, open_progress_store
+from utils.json_utils import ProgressTracker, BatchProgressTracker
+
+
+class TestProgressStore(unittest.TestCase):
+    """Test membership, batched commits and the legacy JSON import"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = Path(self.temp_dir) / 'progress.sqlite'
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_add_contains_and_order(self):
+        with ProgressStore(self.db_path) as store:
+            self.assertTrue(store.add('completed', 'b'))
+            self.assertTrue(store.add('completed', 'a'))
+            self.assertFalse(store.add('completed', 'b'))
+            store.put('failed', 7, {'error': 'timeout'})
+            self.assertTrue(store.contains('completed', 'a'))
+            self.assertFalse(store.contains('failed', 'a'))
+            self.assertEqual(store.ids('completed'), ['b', 'a'])
+            self.assertEqual(store.get('failed', '7'), {'error': 'timeout'})
+            store.retain('completed', ['a'])
+            self.assertEqual(store.count('completed'), 1)
+
+    def test_writes_are_batched(self):
+        writer = ProgressStore(self.db_path, batch_size=3, flush_interval=60)
+        reader = ProgressStore(self.db_path)
+        writer.add('completed', 1)
+        writer.add('completed', 2)
+        self.assertEqual(reader.count('completed'), 0)
+        writer.add('completed', 3)
+        self.assertEqual(reader.count('completed'), 3)
+        writer.add('completed', 4)
+        writer.flush()
+        self.assertEqual(reader.count('completed'), 4)
+        writer.close()
+        reader.close()
+
+    def test_timer_commits_a_partial_batch(self):
+        writer = ProgressStore(self.db_path, batch_size=100, flush_interval=0.1)
+        reader = ProgressStore(self.db_path)
+        for item in range(3):
+            writer.add('completed', item)
+            deadline = time.monotonic() + 5
+            while reader.count('completed') == item and time.monotonic() < deadline:
+                time.sleep(0.05)
+            self.assertEqual(reader.count('completed'), item + 1)
+        # One long-lived flusher thread, not one per transaction
+        flushers = [t for t in threading.enumerate() if t.name == 'progress-flush-progress']
+        self.assertEqual(len(flushers), 1)
+        writer.close()
+        flushers[0].join(timeout=5)
+        self.assertFalse(flushers[0].is_alive())
+        reader.close()
+
+    def test_imports_legacy_json_once(self):
+        json_path = Path(self.temp_dir) / 'extraction_progress.json'
+        json_path.write_text(json.dumps({'completed': ['doc1', 'doc2'], 'failed': {'doc3': '2025-01-01'},
+                                         'last_batch': 10}))
+        with open_progress_store(json_path, collections=('completed', 'failed')) as store:
+            self.assertTrue(store.contains('completed', 'doc2'))
+            self.assertEqual(store.get('failed', 'doc3'), {'value': '2025-01-01'})
+            self.assertEqual(store.get_value('last_batch'), 10)
+            store.add('completed', 'doc4')
+
+        json_path.write_text(json.dumps({'completed': ['other']}))
+        with open_progress_store(json_path, collections=('completed',)) as store:
+            self.assertEqual(store.ids('completed'), ['doc1', 'doc2', 'doc4'])
+
+
+class TestProgressTracker(unittest.TestCase):
+    """Test the ProgressTracker API on the store"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.progress_file = Path(self.temp_dir) / 'uploads_progress.json'
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_marks_survive_reopen_and_export(self):
+        tracker = ProgressTracker(self.progress_file, 'uploads')
+        tracker.mark_processed('a', {'size': 1})
+        tracker.mark_processed('a')
+        tracker.mark_failed('b', 'HTTP 500')
+        tracker.mark_skipped('c', 'exists')
+        tracker.close()
+
+        tracker = ProgressTracker(self.progress_file, 'uploads')
+        self.assertTrue(tracker.is_processed('a'))
+        self.assertTrue(tracker.is_failed('b'))
+        self.assertTrue(tracker.is_skipped('c'))
+        summary = tracker.get_summary()
+        self.assertEqual(summary['stats']['completed'], 1)
+        self.assertEqual(summary['total_failed'], 1)
+        exported = tracker.export_json()
+        self.assertEqual(exported['processed'][0]['id'], 'a')
+        self.assertEqual(exported['processed'][0]['size'], 1)
+        self.assertEqual(exported['failed']['b']['error'], 'HTTP 500')
+        tracker.close()
+
+    def test_batch_marks_survive_close(self):
+        with BatchProgressTracker('uploads', 5, progress_file=self.progress_file) as batch:
+            for i in range(5):
+                batch.complete_item(f'item{i}')
+
+        tracker = ProgressTracker(self.progress_file, 'uploads')
+        self.assertTrue(all(tracker.is_processed(f'item{i}') for i in range(5)))
+        tracker.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Unit tests for adaptive backoff and cross-process sharing in the rate limiter.
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from utils.rate_limiter import (RateLimiter, ServiceRateLimiter, SQLiteBucketStore,
+                                parse_retry_after, throttle_signal)
+
+
+class TestAdaptiveRate(unittest.TestCase):
+    """Test slowing down on 429/403 and recovering on success"""
+
+    def test_throttle_and_recover(self):
+        limiter = RateLimiter(rate=10.0, burst=2)
+        limiter.recovery_successes = 3
+        limiter.throttled()
+        self.assertAlmostEqual(limiter.rate, 5.0)
+        self.assertFalse(limiter.acquire(blocking=False))  # bucket drained
+
+        for _ in range(3):
+            limiter.succeeded()
+        self.assertAlmostEqual(limiter.rate, 6.25)
+
+        for _ in range(30):
+            limiter.throttled()
+        self.assertAlmostEqual(limiter.rate, 1.0)  # floor at min_rate_fraction
+
+    def test_retry_after_pauses_the_service(self):
+        services = ServiceRateLimiter()
+        services.report('google_drive', 429, retry_after=0.3)
+        self.assertFalse(services.acquire('google_drive', blocking=False))
+        self.assertTrue(services.acquire('youtube', blocking=False))
+
+        start = time.monotonic()
+        self.assertTrue(services.acquire('google_drive'))
+        self.assertGreaterEqual(time.monotonic() - start, 0.25)
+
+    def test_throttle_signals(self):
+        response = MagicMock(status_code=429, headers={'Retry-After': '12'})
+        self.assertEqual(throttle_signal(MagicMock(response=response)), (True, 12.0))
+        self.assertEqual(throttle_signal(Exception('ERROR: HTTP Error 429: Too Many Requests')), (True, None))
+        self.assertEqual(throttle_signal(ValueError('no formats')), (False, None))
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+        self.assertEqual(parse_retry_after('9999'), 300.0)
+
+
+class TestSharedBuckets(unittest.TestCase):
+    """Test that limiters backed by the same SQLite file share one budget"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = Path(self.temp_dir) / 'rate_limits.sqlite'
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_two_stores_share_tokens_and_backoff(self):
+        first = RateLimiter(rate=1.0, burst=3, name='youtube', store=SQLiteBucketStore(self.path))
+        second = RateLimiter(rate=1.0, burst=3, name='youtube', store=SQLiteBucketStore(self.path))
+
+        taken = [first.acquire(blocking=False), second.acquire(blocking=False),
+                 first.acquire(blocking=False), second.acquire(blocking=False)]
+        self.assertEqual(taken, [True, True, True, False])
+
+        first.throttled()
+        self.assertAlmostEqual(second.rate, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
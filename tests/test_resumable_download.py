@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Unit tests for resumable and segmented downloads, run against a local range-capable HTTP server.
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+import os
+import re
+import shutil
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+
+import requests
+
+from utils.resumable_download import ResumableDownload
+
+BODY = bytes(range(256)) * 4096  # 1 MiB
+SERVER = {'etag': '"v1"', 'cut_after': None}
+REQUESTS = []
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Serves BODY with ETag and Range/If-Range support; optionally drops the connection mid-body"""
+
+    def do_GET(self):
+        byte_range = self.headers.get('Range')
+        if_range = self.headers.get('If-Range')
+        REQUESTS.append(byte_range)
+        start, end = 0, len(BODY) - 1
+        match = re.match(r'bytes=(\d+)-(\d*)', byte_range or '')
+        partial = match is not None and (if_range is None or if_range == SERVER['etag'])
+        if partial:
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else end
+        payload = BODY[start:end + 1]
+
+        self.send_response(206 if partial else 200)
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('ETag', SERVER['etag'])
+        self.send_header('Accept-Ranges', 'bytes')
+        if partial:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{len(BODY)}')
+        self.end_headers()
+        cut = SERVER['cut_after']
+        if cut is not None and not partial:
+            self.wfile.write(payload[:cut])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestResumableDownload(unittest.TestCase):
+    """Test Range resume, stale partial files and parallel segments"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), RangeHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/file.bin"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.output = Path(self.temp_dir) / 'file.bin'
+        self.session = requests.Session()
+        SERVER.update(etag='"v1"', cut_after=None)
+        REQUESTS.clear()
+
+    def tearDown(self):
+        self.session.close()
+        shutil.rmtree(self.temp_dir)
+
+    def download(self, segments=1):
+        response = self.session.get(self.url, stream=True)
+        return ResumableDownload(self.session, self.output, segments=segments).run(response)
+
+    def test_dropped_connection_resumes_from_last_byte(self):
+        SERVER['cut_after'] = 600000
+        with self.assertRaises((requests.RequestException, IOError)):
+            self.download()
+        kept = os.path.getsize(f"{self.output}.tmp")
+        self.assertGreater(kept, 0)
+        self.assertTrue(Path(f"{self.output}.tmp.json").exists())
+
+        SERVER['cut_after'] = None
+        self.assertEqual(self.download(), self.output)
+        self.assertEqual(self.output.read_bytes(), BODY)
+        self.assertEqual(REQUESTS[-1], f'bytes={kept}-')
+        self.assertFalse(Path(f"{self.output}.tmp").exists())
+        self.assertFalse(Path(f"{self.output}.tmp.json").exists())
+
+    def test_changed_file_starts_over(self):
+        SERVER['cut_after'] = 600000
+        with self.assertRaises((requests.RequestException, IOError)):
+            self.download()
+
+        SERVER.update(etag='"v2"', cut_after=None)
+        self.download()
+        self.assertEqual(self.output.read_bytes(), BODY)
+        self.assertEqual(REQUESTS[-1], None)
+
+    def test_parallel_segments(self):
+        downloader = ResumableDownload(self.session, self.output, segments=4)
+        downloader.settings['min_size'] = 1
+        downloader.run(self.session.get(self.url, stream=True))
+        self.assertEqual(self.output.read_bytes(), BODY)
+        self.assertEqual(sorted(r for r in REQUESTS if r),
+                         ['bytes=0-262143', 'bytes=262144-524287', 'bytes=524288-786431', 'bytes=786432-1048575'])
+
+    def test_segments_resume_from_sidecar(self):
+        downloader = ResumableDownload(self.session, self.output, segments=2)
+        downloader.settings['min_size'] = 1
+        half = len(BODY) // 2
+        state = {'etag': '"v1"', 'last_modified': None, 'length': len(BODY),
+                 'segments': [[0, half - 1, half], [half, len(BODY) - 1, 1000]]}
+        with open(f"{self.output}.tmp", 'wb') as f:
+            f.truncate(len(BODY))
+            f.write(BODY[:half])
+            f.seek(half)
+            f.write(BODY[half:half + 1000])
+        downloader._save_state(state)
+
+        downloader.run(self.session.get(self.url, stream=True))
+        self.assertEqual(self.output.read_bytes(), BODY)
+        self.assertEqual(REQUESTS[-1], f'bytes={half + 1000}-{len(BODY) - 1}')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Unit tests for row_id indexing in CSVManager and the workflow record list.
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import os
+import unittest
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+import pandas as pd
+
+from utils.csv_manager import CSVManager, RowIndex
+
+
+@patch('utils.csv_manager.get_csv_versioning', MagicMock())
+@patch('utils.csv_manager.get_csv_uploader', MagicMock())
+class TestCSVManagerRowIndex(unittest.TestCase):
+    """Test indexed lookups, mtime invalidation and deferred updates"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = Path(self.temp_dir) / 'output.csv'
+        pd.DataFrame({'row_id': [str(i) for i in range(1, 6)],
+                      'name': [f'Person {i}' for i in range(1, 6)],
+                      'document_text': [''] * 5}).to_csv(self.csv_path, index=False)
+        self.manager = CSVManager(csv_path=str(self.csv_path), auto_backup=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_find_and_update_by_id(self):
+        """Lookups use the index and updates reach the file"""
+        self.assertEqual(self.manager.find_row_by_id(3)['name'], 'Person 3')
+        self.assertIsNone(self.manager.find_row_by_id(99))
+
+        self.assertTrue(self.manager.update_row_by_id('4', {'document_text': 'hello'}))
+        on_disk = CSVManager.safe_csv_read(str(self.csv_path), 'all_string')
+        self.assertEqual(on_disk.loc[3, 'document_text'], 'hello')
+
+    def test_external_write_invalidates_cache(self):
+        """A change to the file by someone else is picked up via mtime/size"""
+        self.manager.find_row_by_id(1)
+        df = pd.read_csv(self.csv_path, dtype=str)
+        df = pd.concat([df.iloc[::-1], pd.DataFrame({'row_id': ['6'], 'name': ['Person 6']})])
+        df.to_csv(self.csv_path, index=False)
+        os.utime(self.csv_path, ns=(0, 1))
+
+        self.assertEqual(self.manager.find_row_by_id(6)['name'], 'Person 6')
+        self.assertEqual(self.manager.find_row_by_id(1)['name'], 'Person 1')
+
+    def test_deferred_updates_flush_once(self):
+        """write=False batches updates into a single flush"""
+        with patch.object(self.manager, 'safe_csv_write', wraps=self.manager.safe_csv_write) as write:
+            for row_id in range(1, 6):
+                self.manager.update_row_by_id(row_id, {'document_text': f'text {row_id}'}, write=False)
+            self.assertEqual(write.call_count, 0)
+            self.assertTrue(self.manager.flush())
+            self.assertEqual(write.call_count, 1)
+
+        on_disk = CSVManager.safe_csv_read(str(self.csv_path), 'all_string')
+        self.assertEqual(list(on_disk['document_text']), [f'text {i}' for i in range(1, 6)])
+
+    def test_failed_write_does_not_leave_changes_in_cache(self):
+        """A failed write drops the in-place edit instead of serving it from the cache"""
+        with patch.object(self.manager, 'safe_csv_write', return_value=False):
+            self.assertFalse(self.manager.update_row_by_id(2, {'name': 'Unsaved'}))
+            self.assertFalse(self.manager.update_s3_mappings(3, {'u': 'files/u.mp4'}, {'u.mp4': 'u'}))
+        self.assertEqual(self.manager.find_row_by_id(2)['name'], 'Person 2')
+        self.assertNotEqual(self.manager.find_row_by_id(3).get('s3_paths'), '{"u": "files/u.mp4"}')
+
+    def test_record_index_keeps_first_duplicate(self):
+        """RowIndex matches the old first-match scan"""
+        index = RowIndex.from_records([{'row_id': '1'}, {'row_id': '2'}, {'row_id': '1'}])
+        self.assertEqual(index.get(1), 0)
+        self.assertEqual(index.get('2'), 1)
+        self.assertIsNone(index.get('3'))
+
+
+if __name__ == '__main__':
+    unittest.main()
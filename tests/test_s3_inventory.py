@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Unit tests for inventory-diff verification of database files (runs against moto's in-memory S3).
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+from unittest.mock import patch, MagicMock
+
+import boto3
+
+try:
+    from moto import mock_aws
+except ImportError:
+    mock_aws = None
+
+from utils import s3_inventory
+from utils.s3_inventory import covering_prefixes, verify_keys
+from utils.s3_manager import UnifiedS3Manager, S3Config
+
+BUCKET = 'inventory-test'
+
+
+class TestCoveringPrefixes(unittest.TestCase):
+    """Test the prefix set listed for a group of keys"""
+
+    def test_nested_prefixes_collapse(self):
+        keys = ['files/a.mp4', 'files/sub/b.mp4', 'clients/1/c.json', 'clients/2/d.json']
+        self.assertEqual(covering_prefixes(keys), ['clients/1/', 'clients/2/', 'files/'])
+        self.assertEqual(covering_prefixes(['top.txt', 'files/a.mp4']), [''])
+
+
+@unittest.skipIf(mock_aws is None, "moto not installed")
+class TestInventoryVerification(unittest.TestCase):
+    """Test missing keys, size mismatches and the database sync report"""
+
+    def setUp(self):
+        self.mock = mock_aws()
+        self.mock.start()
+        self.addCleanup(self.mock.stop)
+        self.s3 = boto3.client('s3', region_name='us-east-1')  # mock_aws supplies fake credentials
+        self.s3.create_bucket(Bucket=BUCKET)
+        for i in range(1200):
+            self.s3.put_object(Bucket=BUCKET, Key=f'files/{i:04d}.bin', Body=b'x' * 10)
+
+    def test_verify_keys(self):
+        expected = {f'files/{i:04d}.bin': 10 for i in range(1100)}
+        expected['files/0005.bin'] = 99
+        expected['files/missing.bin'] = None
+        report = verify_keys(self.s3, BUCKET, expected, use_listing=True)
+
+        self.assertEqual(report.missing, {'files/missing.bin'})
+        self.assertEqual(report.size_mismatches, {'files/0005.bin': (99, 10)})
+        totals = report.totals()
+        self.assertEqual((totals['expected'], totals['verified'], totals['objects_listed']), (1101, 1099, 1200))
+
+    def test_small_key_sets_are_headed(self):
+        expected = {'files/0001.bin': 10, 'files/0002.bin': 99, 'files/missing.bin': None}
+        with patch.object(s3_inventory, 'list_inventory') as listing:
+            report = verify_keys(self.s3, BUCKET, expected)
+
+        listing.assert_not_called()
+        self.assertEqual(report.missing, {'files/missing.bin'})
+        self.assertEqual(report.size_mismatches, {'files/0002.bin': (99, 10)})
+        self.assertEqual(report.totals()['objects_headed'], 3)
+
+    def make_db(self):
+        db = MagicMock()
+        db.get_person_by_row_id.side_effect = lambda row_id: {'name': f'Person {row_id}'}
+        db.get_person_files.side_effect = lambda row_id: [
+            {'file_id': f'{row_id}-{n}', 'storage_path': f'files/{row_id * 10 + n:04d}.bin',
+             'original_filename': f'{n}.bin', 'file_size': 10} for n in range(3)
+        ] + ([{'file_id': 'gone', 'storage_path': 'files/gone.bin', 'original_filename': 'gone.bin'}]
+             if row_id == 2 else [])
+        return db
+
+    def sync(self, verify_with_inventory=None):
+        with patch('utils.s3_manager.get_s3_client', return_value=self.s3):
+            manager = UnifiedS3Manager(S3Config(bucket_name=BUCKET, verify_with_inventory=verify_with_inventory))
+        with patch('utils.s3_manager.get_database_manager', return_value=self.make_db()), \
+                patch.object(manager, 'check_s3_exists') as head:
+            result = manager.sync_database_files(target_rows=[1, 2])
+
+        head.assert_not_called()
+        self.assertEqual(len(result[1]), 3)
+        self.assertEqual(len(result[2]), 3)
+        self.assertEqual([e['file_id'] for e in manager.upload_report['errors']], ['gone'])
+        self.assertEqual(manager.upload_report['verification']['missing'], 1)
+        return manager.upload_report['verification']
+
+    def test_sync_database_files_lists_when_asked(self):
+        totals = self.sync(verify_with_inventory=True)
+        self.assertEqual((totals['objects_listed'], totals['objects_headed']), (1200, 0))
+
+    def test_targeted_sync_heads_its_few_files(self):
+        totals = self.sync()
+        self.assertEqual((totals['objects_listed'], totals['objects_headed']), (0, 7))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the concurrent, ETag-cached S3 metadata loader (runs against moto's in-memory S3).
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+import boto3
+
+try:
+    from moto import mock_aws
+except ImportError:
+    mock_aws = None
+
+from utils.s3_metadata_loader import S3MetadataLoader
+
+BUCKET = 'metadata-test'
+
+
+@unittest.skipIf(mock_aws is None, "moto not installed")
+class TestS3MetadataLoader(unittest.TestCase):
+    """Test listing order, the ETag cache and skipped keys"""
+
+    def setUp(self):
+        self.mock = mock_aws()
+        self.mock.start()
+        self.addCleanup(self.mock.stop)
+        self.s3 = boto3.client('s3', region_name='us-east-1')  # mock_aws supplies fake credentials
+        self.s3.create_bucket(Bucket=BUCKET)
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.cache_path = Path(self.temp_dir) / 's3_metadata.sqlite'
+        for i in range(20):
+            self.put(f'clients/{i:03d}/metadata.json', {'row_id': i})
+        self.s3.put_object(Bucket=BUCKET, Key='clients/readme.txt', Body=b'not metadata')
+        self.s3.put_object(Bucket=BUCKET, Key='clients/broken.json', Body=b'{')
+
+    def put(self, key, metadata):
+        self.s3.put_object(Bucket=BUCKET, Key=key, Body=json.dumps(metadata).encode('utf-8'))
+
+    def load(self, **kwargs):
+        loader = S3MetadataLoader(self.s3, BUCKET, max_workers=4, cache_path=self.cache_path)
+        try:
+            return loader.load(**kwargs), loader.stats
+        finally:
+            loader.close()
+
+    def test_second_run_only_fetches_changed_objects(self):
+        metadata, stats = self.load()
+        self.assertEqual([m['row_id'] for m in metadata], list(range(20)))
+        self.assertEqual(metadata[0]['_s3_key'], 'clients/000/metadata.json')
+        self.assertEqual((stats['fetched'], stats['cached'], stats['errors']), (20, 0, 1))
+
+        self.put('clients/005/metadata.json', {'row_id': 5, 'person': 'Changed'})
+        metadata, stats = self.load()
+        self.assertEqual((stats['fetched'], stats['cached']), (1, 19))
+        self.assertEqual(metadata[5]['person'], 'Changed')
+
+    def test_skip_predicate(self):
+        metadata, stats = self.load(skip=lambda key: key.startswith('clients/01'))
+        self.assertEqual([m['row_id'] for m in metadata], list(range(10)))
+        self.assertEqual(stats['fetched'], 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the bounded-memory multipart uploader used by Drive streaming.
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+import hashlib
+import threading
+import time
+
+from utils.s3_manager import MultipartStreamUploader, get_multipart_part_size, S3_MIN_PART_SIZE
+
+MB = 1024 * 1024
+
+
+def chunked(data, size=MB):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+class FakeS3Client:
+    """Records multipart calls and tracks how many parts are uploading at once"""
+
+    def __init__(self, fail_part=None):
+        self.parts = {}
+        self.completed = None
+        self.aborted = False
+        self.put = None
+        self.active = 0
+        self.peak = 0
+        self.fail_part = fail_part
+        self._lock = threading.Lock()
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.put = Body
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        return {'UploadId': 'upload-1'}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.01)
+        with self._lock:
+            self.active -= 1
+        if PartNumber == self.fail_part:
+            raise IOError('part failed')
+        self.parts[PartNumber] = Body
+        return {'ETag': f'"etag-{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.completed = MultipartUpload['Parts']
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.aborted = True
+
+
+class TestMultipartStreamUploader(unittest.TestCase):
+    """Test part packing, ordering, concurrency bound and cleanup"""
+
+    def test_large_stream_uses_ordered_parts(self):
+        """Parts reassemble to the original bytes and complete in order"""
+        data = bytes(range(256)) * (23 * MB // 256)
+        client = FakeS3Client()
+        uploader = MultipartStreamUploader(client, 'bucket', 'key', part_size=5 * MB, max_in_flight=2)
+
+        self.assertEqual(uploader.upload(chunked(data)), len(data))
+        self.assertEqual([p['PartNumber'] for p in client.completed], [1, 2, 3, 4, 5])
+        self.assertEqual(b''.join(client.parts[n] for n in sorted(client.parts)), data)
+        self.assertLessEqual(client.peak, 2)
+        self.assertIsNone(client.put)
+        self.assertEqual(uploader.sha256, hashlib.sha256(data).hexdigest())
+
+    def test_small_stream_uses_single_put(self):
+        """Objects smaller than one part skip multipart entirely"""
+        client = FakeS3Client()
+        uploader = MultipartStreamUploader(client, 'bucket', 'key', part_size=5 * MB)
+
+        self.assertEqual(uploader.upload(chunked(b'x' * 1000, 100)), 1000)
+        self.assertEqual(client.put, b'x' * 1000)
+        self.assertIsNone(client.completed)
+
+    def test_failed_part_aborts_upload(self):
+        """A failed part aborts the multipart upload and re-raises"""
+        client = FakeS3Client(fail_part=2)
+        uploader = MultipartStreamUploader(client, 'bucket', 'key', part_size=5 * MB)
+
+        with self.assertRaises(IOError):
+            uploader.upload(chunked(b'\0' * 16 * MB))
+        self.assertTrue(client.aborted)
+        self.assertIsNone(client.completed)
+
+    def test_part_size_respects_s3_limits(self):
+        """Part size is at least 5MB and keeps huge files under 10,000 parts"""
+        self.assertEqual(get_multipart_part_size(MB), S3_MIN_PART_SIZE)
+        self.assertGreaterEqual(get_multipart_part_size(200 * 1024 * MB) * 10000, 200 * 1024 * MB)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the bulk S3 re-key engine (runs against moto's in-memory S3).
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+import boto3
+import pandas as pd
+
+try:
+    from moto import mock_aws
+except ImportError:
+    mock_aws = None
+
+from utils.csv_manager import CSVManager
+from utils.media_ledger import MediaLedger
+from utils.s3_rekey import (S3BulkRekeyer, RekeyOperation, sniffed_extension_rule, rewrite_csv_s3_paths,
+                            rewrite_ledger_s3_keys)
+
+BUCKET = 'rekey-test'
+MP4_HEAD = b'\x00\x00\x00\x18ftypmp42\x00\x00\x00\x00mp42isom'
+
+
+@unittest.skipIf(mock_aws is None, "moto not installed")
+class TestS3BulkRekeyer(unittest.TestCase):
+    """Test copies, multipart copies, batched deletes and rule planning"""
+
+    def setUp(self):
+        self.mock = mock_aws()
+        self.mock.start()
+        self.addCleanup(self.mock.stop)
+        self.s3 = boto3.client('s3', region_name='us-east-1')  # mock_aws supplies fake credentials
+        self.s3.create_bucket(Bucket=BUCKET)
+
+    def keys(self):
+        return sorted(obj['Key'] for obj in self.s3.list_objects_v2(Bucket=BUCKET).get('Contents', []))
+
+    def test_mapping_moves_objects_and_replaces_metadata(self):
+        self.s3.put_object(Bucket=BUCKET, Key='files/a.bin', Body=b'a' * 10, Metadata={'source': 'drive'})
+        self.s3.put_object(Bucket=BUCKET, Key='files/b.bin', Body=b'b' * 20)
+        rekeyer = S3BulkRekeyer(self.s3, BUCKET, max_workers=4)
+        operations = rekeyer.plan_from_mapping({
+            'files/a.bin': {'new_key': 'files/a.mp4', 'content_type': 'video/mp4',
+                            'metadata': {'title': 'a.mp4'}},
+            'files/b.bin': 'files/b.pdf',
+            'files/missing.bin': 'files/missing.mp4',
+        })
+
+        report = rekeyer.run(operations)
+
+        self.assertEqual(self.keys(), ['files/a.mp4', 'files/b.pdf'])
+        self.assertEqual(report.missing, ['files/missing.bin'])
+        self.assertEqual((report.deleted, report.bytes_copied), (2, 30))
+        head = self.s3.head_object(Bucket=BUCKET, Key='files/a.mp4')
+        self.assertEqual(head['ContentType'], 'video/mp4')
+        self.assertEqual(head['Metadata'], {'source': 'drive', 'title': 'a.mp4'})
+
+    def test_ledger_follows_moved_objects(self):
+        self.s3.put_object(Bucket=BUCKET, Key='files/a.bin', Body=b'a' * 10)
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        ledger = MediaLedger(Path(temp_dir) / 'ledger.db')
+        self.addCleanup(ledger.close)
+        ledger.record('drive:a', BUCKET, 'a', 'files/a.bin', size=10)
+        ledger.record('drive:other', 'other-bucket', 'a', 'files/a.bin', size=10)
+
+        rekeyer = S3BulkRekeyer(self.s3, BUCKET)
+        report = rekeyer.run(rekeyer.plan_from_mapping({'files/a.bin': 'files/a.mp4'}))
+        self.assertEqual(rewrite_ledger_s3_keys(report.moved, BUCKET, ledger), 1)
+
+        entry = ledger.find_reusable('drive:a', BUCKET, self.s3)
+        self.assertEqual(entry['s3_key'], 'files/a.mp4')
+        self.assertEqual(ledger.get('drive:other')['s3_key'], 'files/a.bin')
+
+    def test_large_objects_use_upload_part_copy(self):
+        body = bytes(range(256)) * (12 * 1024 * 1024 // 256)
+        self.s3.put_object(Bucket=BUCKET, Key='files/big.bin', Body=body)
+        rekeyer = S3BulkRekeyer(self.s3, BUCKET, multipart_threshold=5 * 1024 * 1024,
+                                part_size=5 * 1024 * 1024)
+
+        with patch.object(self.s3, 'copy_object', side_effect=AssertionError('single copy used')):
+            report = rekeyer.run([RekeyOperation('files/big.bin', 'files/big.mp4', 'video/mp4')])
+
+        self.assertEqual(report.failed, {})
+        copied = self.s3.get_object(Bucket=BUCKET, Key='files/big.mp4')
+        self.assertEqual(copied['Body'].read(), body)
+        self.assertEqual(copied['ContentType'], 'video/mp4')
+
+    def test_deletes_are_batched(self):
+        rekeyer = S3BulkRekeyer(self.s3, BUCKET)
+        for i in range(1500):
+            self.s3.put_object(Bucket=BUCKET, Key=f'tmp/{i}', Body=b'')
+        with patch.object(self.s3, 'delete_objects', wraps=self.s3.delete_objects) as delete_objects:
+            deleted = rekeyer.delete_keys([f'tmp/{i}' for i in range(1500)])
+        self.assertEqual((deleted, delete_objects.call_count), (1500, 2))
+
+    def test_sniffed_extension_rule(self):
+        self.s3.put_object(Bucket=BUCKET, Key='files/video.bin', Body=MP4_HEAD + b'\x00' * 100)
+        self.s3.put_object(Bucket=BUCKET, Key='files/unknown.bin', Body=b'???')
+        self.s3.put_object(Bucket=BUCKET, Key='files/done.mp4', Body=MP4_HEAD)
+        rekeyer = S3BulkRekeyer(self.s3, BUCKET)
+
+        operations = rekeyer.plan_from_rule(sniffed_extension_rule(self.s3, BUCKET), prefix='files/')
+
+        self.assertEqual(operations, [RekeyOperation('files/video.bin', 'files/video.mp4', 'video/mp4')])
+
+
+class TestRewriteCsvS3Paths(unittest.TestCase):
+    """Test the single-pass s3_paths rewrite"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = Path(self.temp_dir) / 'output.csv'
+        pd.DataFrame({
+            'row_id': ['1', '2'],
+            's3_paths': ['{"u1": "files/u1.bin", "u2": "files/u2.mp3"}', '{"u3": "files/u3.mp4"}'],
+        }).to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    @patch('utils.csv_manager.get_csv_uploader', MagicMock())
+    @patch('utils.csv_manager.get_csv_versioning', MagicMock())
+    def test_only_rows_with_moved_keys_change(self):
+        manager = CSVManager(str(self.csv_path))
+        # A backup was just taken, so the per-CSV interval would normally skip the next one
+        settings = {'csv_backup.min_interval_seconds': 3600}
+        recent = {str(self.csv_path.resolve()): time.monotonic()}
+        with patch.object(manager, 'create_backup') as create_backup, \
+                patch('utils.csv_manager._last_backup_at', recent), \
+                patch('utils.csv_manager.config.get', side_effect=lambda key, default=None: settings.get(key, default)):
+            updated = rewrite_csv_s3_paths({'files/u1.bin': 'files/u1.mp4'}, manager)
+
+        self.assertEqual(updated, 1)
+        create_backup.assert_called_once()
+        df = pd.read_csv(self.csv_path, dtype=str)
+        self.assertEqual(CSVManager.load_s3_paths(df.iloc[0]), {'u1': 'files/u1.mp4', 'u2': 'files/u2.mp3'})
+        self.assertEqual(CSVManager.load_s3_paths(df.iloc[1]), {'u3': 'files/u3.mp4'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the pooled Selenium driver farm, run against a local HTTP server.
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+import shutil
+import tempfile
+import threading
+import urllib.request
+from functools import partial
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+from pathlib import Path
+from unittest.mock import patch
+
+from utils.concurrency import run_ordered
+from utils.patterns import SeleniumDriverPool, wait_for_dom_stable
+from utils.extract_links import get_html_with_selenium, record_extraction_timing, get_extraction_timing_summary
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeDriver:
+    """Minimal WebDriver stand-in that loads pages over plain HTTP"""
+
+    def __init__(self):
+        self.page_source = ''
+        self.alive = True
+        self.quit_called = False
+
+    @property
+    def title(self):
+        if not self.alive:
+            raise RuntimeError('browser crashed')
+        return ''
+
+    def get(self, url):
+        with urllib.request.urlopen(url) as response:
+            self.page_source = response.read().decode('utf-8')
+
+    def find_element(self, by, value):
+        return object()
+
+    def set_script_timeout(self, seconds):
+        self.script_timeout = seconds
+
+    def execute_async_script(self, script, *args):
+        self.script_args = args
+        return {'stable': True, 'elapsed_ms': 5, 'mutations': 0, 'length': len(self.page_source)}
+
+    def quit(self):
+        self.quit_called = True
+
+
+class TestSeleniumDriverPool(unittest.TestCase):
+    """Test checkout/checkin, concurrency, recycling and health checks"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.fixture_dir = tempfile.mkdtemp()
+        for i in range(8):
+            Path(cls.fixture_dir, f'doc{i}.html').write_text(f'<html><body>Document {i}</body></html>')
+        handler = partial(QuietHandler, directory=cls.fixture_dir)
+        cls.server = HTTPServer(('127.0.0.1', 0), handler)
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        shutil.rmtree(cls.fixture_dir)
+
+    def setUp(self):
+        self.drivers = []
+
+        def factory():
+            driver = FakeDriver()
+            self.drivers.append(driver)
+            return driver
+
+        self.pool = SeleniumDriverPool(size=2, max_pages=3, driver_factory=factory, checkout_timeout=5)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_concurrent_leases_share_bounded_drivers(self):
+        """Workers render pages in parallel without exceeding the pool size"""
+        def render(i):
+            with self.pool.lease() as driver:
+                driver.get(f'{self.base_url}/doc{i}.html')
+                return driver.page_source
+
+        pages = []
+        run_ordered(range(8), render, lambda i, item, html: pages.append(html), max_workers=4)
+
+        self.assertEqual(pages, [f'<html><body>Document {i}</body></html>' for i in range(8)])
+        self.assertLessEqual(self.pool.stats['created'] - self.pool.stats['recycled'], 2)
+        self.assertEqual(self.pool.stats['checkouts'], 8)
+
+    def test_driver_recycled_after_max_pages(self):
+        """A driver is quit and replaced once it has served max_pages pages"""
+        for _ in range(4):
+            driver = self.pool.checkout()
+            self.pool.checkin(driver)
+
+        self.assertTrue(self.drivers[0].quit_called)
+        self.assertEqual(self.pool.stats['recycled'], 1)
+        self.assertEqual(len(self.drivers), 2)
+
+    def test_unresponsive_driver_replaced_on_checkout(self):
+        """A driver that died while idle is discarded rather than handed out"""
+        driver = self.pool.checkout()
+        self.pool.checkin(driver)
+        driver.alive = False
+
+        replacement = self.pool.checkout()
+        self.assertIsNot(replacement, driver)
+        self.assertTrue(driver.quit_called)
+        self.assertEqual(self.pool.stats['unhealthy'], 1)
+
+    def test_get_html_with_selenium_uses_pool(self):
+        """get_html_with_selenium renders through a pooled driver"""
+        with patch('utils.extract_links.get_selenium_pool', return_value=self.pool), \
+                patch('utils.extract_links.time.sleep'):
+            html = get_html_with_selenium(f'{self.base_url}/doc3.html')
+
+        self.assertIn('Document 3', html)
+        self.assertEqual(self.pool.stats['checkouts'], 1)
+        self.assertEqual(self.drivers[0].script_args[3], False)
+
+
+class TestDomStabilityWait(unittest.TestCase):
+    """Test the MutationObserver wait wrapper and per-document timings"""
+
+    def test_passes_window_in_milliseconds(self):
+        """Quiet window, timeout and scroll flag reach the in-page script"""
+        driver = FakeDriver()
+        result = wait_for_dom_stable(driver, quiet_period=0.5, timeout=10, min_chars=100)
+
+        self.assertTrue(result['stable'])
+        self.assertEqual(driver.script_args, (500, 10000, 100, True))
+        self.assertGreater(driver.script_timeout, 10)
+
+    def test_script_failure_reports_unstable(self):
+        """A driver that cannot run async scripts falls through as not stable"""
+        driver = FakeDriver()
+
+        def broken_script(*args):
+            raise RuntimeError('no js')
+
+        driver.execute_async_script = broken_script
+
+        result = wait_for_dom_stable(driver, quiet_period=0.5, timeout=1)
+        self.assertFalse(result['stable'])
+
+    def test_timing_summary(self):
+        """Recorded timings are averaged for the run summary"""
+        before = get_extraction_timing_summary()['documents']
+        record_extraction_timing('https://docs.google.com/document/d/x', 1.0, 0.5, 2.0, 300, True)
+        summary = get_extraction_timing_summary()
+
+        self.assertEqual(summary['documents'], before + 1)
+        self.assertGreater(summary['avg_total'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared sheet parse used by workflow steps 1 and 2.
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+from unittest.mock import patch
+
+from utils import sheet_parser
+from utils.sheet_parser import parse_sheet, SheetRow
+from simple_workflow import people_from_sheet_rows
+
+DOC = 'https://www.google.com/url?q=https://docs.google.com/document/d/abc123/edit&amp;sa=D'
+SHEET = f'''<html><body>
+<table><tr><td>decoy</td></tr></table>
+<div id="42"><table class="waffle"><tbody>
+<tr><th>1</th><td>#</td><td></td><td>Name</td><td>Email</td><td>Type</td></tr>
+<tr><th>2</th><td> 7 </td><td></td><td><a href="{DOC}">Ada <b>Lovelace</b></a></td><td>ada@example.com</td><td>FF<!-- note --></td></tr>
+<tr><th>3</th><td>8</td><td></td><td>Bob &amp; Co</td><td>bob@example.com</td><td>TT</td></tr>
+<tr><th>4</th><td>9</td><td></td><td>Header Name</td><td>Email address</td><td>Type</td></tr>
+<tr><th>5</th><td>10</td><td>short</td></tr>
+</tbody></table></div></body></html>'''
+
+
+class TestParseSheet(unittest.TestCase):
+    """Test table selection, row tuples and backend parity"""
+
+    def setUp(self):
+        sheet_parser._last_parse = (None, None, None)
+
+    def test_backends_agree(self):
+        fast = parse_sheet(SHEET, '42', use_lxml=True)
+        slow = parse_sheet(SHEET, '42', use_lxml=False)
+        self.assertEqual(list(fast.iter_rows()), list(slow.iter_rows()))
+        self.assertEqual(slow.row_count, 5)
+        self.assertEqual(list(slow.iter_rows())[1], SheetRow(('7', '', 'AdaLovelace', 'ada@example.com', 'FF'), DOC.replace('&amp;', '&')))
+
+    def test_people_from_rows(self):
+        people = people_from_sheet_rows(parse_sheet(SHEET, '42').iter_rows(start=1))
+        self.assertEqual([(p['row_id'], p['name'], p['doc_link']) for p in people], [
+            ('7', 'AdaLovelace', 'https://docs.google.com/document/d/abc123/edit'),
+            ('8', 'Bob & Co', ''),
+        ])
+
+    def test_same_html_is_parsed_once(self):
+        with patch('utils.sheet_parser._soup_rows', wraps=sheet_parser._soup_rows) as soup_rows:
+            first = parse_sheet(SHEET, '42', use_lxml=False)
+            second = parse_sheet(SHEET, '42', use_lxml=False)
+        self.assertIs(first, second)
+        self.assertEqual(soup_rows.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
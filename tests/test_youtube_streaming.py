@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Unit tests for signal-free YouTube-to-S3 streaming and the concurrent video pool.
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+import sys
+import threading
+import time
+from unittest.mock import patch, MagicMock
+
+from utils.s3_manager import UnifiedS3Manager, S3Config, UploadResult
+from utils.streaming_integration import stream_youtube_links
+
+
+def fake_yt_dlp(script):
+    """get_yt_dlp_command replacement that runs a Python snippet instead of yt-dlp"""
+    return lambda extra_args=None: [sys.executable, '-c', script]
+
+
+@patch('utils.s3_manager.ensure_yt_dlp_updated', MagicMock(return_value=True))
+class TestStreamYoutubeToS3(unittest.TestCase):
+    """Test stdout streaming, failures and the per-call deadline"""
+
+    def setUp(self):
+        with patch('utils.s3_manager.get_s3_client', MagicMock()):
+            self.manager = UnifiedS3Manager(S3Config(bucket_name='test-bucket', add_metadata=False))
+
+    def test_streams_stdout_to_s3(self):
+        """yt-dlp stdout is uploaded as-is, off the main thread"""
+        script = "import sys; sys.stdout.buffer.write(b'v' * 300000)"
+        outcome = {}
+
+        def run():
+            outcome['result'] = self.manager.stream_youtube_to_s3('https://youtu.be/x', 'files/a.mp4', 'Test')
+
+        with patch('utils.s3_manager.get_yt_dlp_command', fake_yt_dlp(script)):
+            worker = threading.Thread(target=run)
+            worker.start()
+            worker.join()
+
+        result = outcome['result']
+        self.assertTrue(result.success, result.error)
+        self.assertEqual(result.file_size, 300000)
+        body = self.manager.s3_client.put_object.call_args.kwargs['Body']
+        self.assertEqual(body, b'v' * 300000)
+
+    def test_nonzero_exit_fails_and_cleans_up(self):
+        """A failing yt-dlp after partial output deletes the truncated object"""
+        script = "import sys; sys.stdout.buffer.write(b'v' * 10); sys.stderr.write('boom'); sys.exit(1)"
+        with patch('utils.s3_manager.get_yt_dlp_command', fake_yt_dlp(script)):
+            result = self.manager.stream_youtube_to_s3('https://youtu.be/x', 'files/a.mp4', 'Test')
+
+        self.assertFalse(result.success)
+        self.assertIn('boom', result.error)
+        self.manager.s3_client.delete_object.assert_called_once()
+
+    def test_deadline_kills_stalled_download(self):
+        """A stalled yt-dlp is killed at the deadline without signals"""
+        script = "import sys, time; sys.stdout.buffer.write(b'v'); sys.stdout.flush(); time.sleep(30)"
+        start = time.monotonic()
+        with patch('utils.s3_manager.get_yt_dlp_command', fake_yt_dlp(script)):
+            result = self.manager.stream_youtube_to_s3('https://youtu.be/x', 'files/a.mp4', 'Test', timeout=0.5)
+
+        self.assertFalse(result.success)
+        self.assertIn('timed out', result.error)
+        self.assertLess(time.monotonic() - start, 10)
+
+
+@patch('utils.streaming_integration.get_media_ledger', MagicMock(return_value=None))
+class TestStreamYoutubeLinks(unittest.TestCase):
+    """Test the concurrent per-person video pool"""
+
+    def test_videos_run_concurrently_and_merge_in_order(self):
+        """Videos upload in parallel up to max_workers; mappings keep URL order"""
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def stream(url, s3_key, person_name):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return UploadResult(success=not url.endswith('bad'), s3_key=s3_key,
+                                file_size=1024, upload_time=0.05, error='failed')
+
+        manager = MagicMock()
+        manager.stream_youtube_to_s3.side_effect = stream
+        urls = [f'https://www.youtube.com/watch?v=video{i:06d}' for i in range(5)] + ['https://youtu.be/bad']
+        s3_results = {'file_uuids': {}, 's3_paths': {}}
+
+        count = stream_youtube_links(urls, {'name': 'Test'}, s3_results, manager, max_workers=3)
+
+        self.assertEqual(count, 5)
+        self.assertEqual(peak, 3)
+        self.assertEqual(list(s3_results['file_uuids']),
+                         [f'YouTube: video{i:06d}' for i in range(5)])
+
+
+if __name__ == '__main__':
+    unittest.main()
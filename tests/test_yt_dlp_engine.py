@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the in-process yt-dlp engine, using a stub YoutubeDL.
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from utils import download_youtube
+from utils.yt_dlp_engine import YoutubeDLPool, YtDlpEngine
+
+
+class StubYoutubeDL:
+    """Records calls and writes the files yt-dlp would write for the given params"""
+
+    instances = []
+    extract_calls = []
+    lock = threading.Lock()
+
+    def __init__(self, params):
+        self.params = params
+        with self.lock:
+            self.instances.append(self)
+
+    def extract_info(self, url, download=True, process=True):
+        with self.lock:
+            self.extract_calls.append(url)
+        if 'list=' in url:
+            return {'_type': 'playlist', 'entries': [{'id': 'aaaaaaaaaaa'}, {'id': 'bbbbbbbbbbb'}]}
+        video_id = url.rsplit('=', 1)[-1]
+        time.sleep(0.01 if video_id.endswith('1') else 0)
+        return {'id': video_id, 'title': f'Title {video_id}', 'subtitles': {'en': []}}
+
+    def process_ie_result(self, info, download=True):
+        info['processed'] = True  # must not leak into the shared info dict
+        template = self.params['outtmpl']['default'].replace('%(id)s', info['id'])
+        if self.params.get('writesubtitles'):
+            fmt = self.params['subtitlesformat']
+            Path(template.replace('%(ext)s', f'en.{fmt}')).write_text('WEBVTT')
+        if not self.params.get('skip_download'):
+            Path(template).write_bytes(b'video')
+        return info
+
+
+class TestYtDlpEngine(unittest.TestCase):
+    """Test info reuse, instance pooling and the batch API"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        StubYoutubeDL.instances.clear()
+        StubYoutubeDL.extract_calls.clear()
+        self.engine = YtDlpEngine(YoutubeDLPool(2, ydl_factory=StubYoutubeDL), max_workers=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_info_is_extracted_once_and_instances_are_reused(self):
+        for _ in range(2):
+            result = self.engine.download('https://www.youtube.com/watch?v=abcdefghijk', self.temp_dir)
+            self.assertIsNone(result.error)
+        self.assertEqual(StubYoutubeDL.extract_calls, ['https://www.youtube.com/watch?v=abcdefghijk'] * 2)
+        self.assertEqual(result.title, 'Title abcdefghijk')
+        self.assertEqual(result.video_file, Path(self.temp_dir) / 'abcdefghijk.mp4')
+        self.assertEqual([f.name for f in result.subtitle_files], ['abcdefghijk_transcript.en.vtt'])
+        # One instance per option profile (info, subtitles, media), reused for the second video
+        self.assertEqual(self.engine.pool.stats, {'created': 3, 'reused': 3})
+
+    def test_batch_keeps_input_order(self):
+        urls = [f'https://www.youtube.com/watch?v=video{i:06d}' for i in range(6)]
+        results = self.engine.download_batch(urls, self.temp_dir, subtitles=False)
+        self.assertEqual([r.video_id for r in results], [f'video{i:06d}' for i in range(6)])
+        self.assertTrue(all(r.video_file.exists() for r in results))
+        self.assertLessEqual(len(StubYoutubeDL.instances), 4)
+
+    def test_playlist_ids(self):
+        ids = self.engine.playlist_video_ids('https://www.youtube.com/playlist?list=PL1')
+        self.assertEqual(ids, ['aaaaaaaaaaa', 'bbbbbbbbbbb'])
+
+
+class TestDownloadSingleVideoEngine(unittest.TestCase):
+    """Test that download_single_video runs no subprocess when the engine is available"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        StubYoutubeDL.extract_calls.clear()
+        self.engine = YtDlpEngine(YoutubeDLPool(2, ydl_factory=StubYoutubeDL))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_single_extraction_for_info_transcript_and_video(self):
+        with patch.object(download_youtube, 'get_yt_dlp_engine', return_value=self.engine), \
+             patch.object(download_youtube, 'DOWNLOADS_DIR', self.temp_dir), \
+             patch.object(download_youtube, 'retry_subprocess') as subprocess_call:
+            video_file, transcript_file = download_youtube.download_single_video(
+                'https://www.youtube.com/watch?v=abcdefghijk')
+
+        subprocess_call.assert_not_called()
+        self.assertEqual(len(StubYoutubeDL.extract_calls), 1)
+        self.assertEqual(Path(video_file).name, 'abcdefghijk.mp4')
+        self.assertEqual(Path(transcript_file).name, 'abcdefghijk_transcript.vtt')
+        self.assertTrue(Path(transcript_file).exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the cached yt-dlp update check and binary lookup.
+"""
+
+# Standardized project imports
+from utils.config import setup_project_imports
+setup_project_imports()
+import unittest
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+import utils.yt_dlp_updater as updater
+
+
+class TestYtDlpCache(unittest.TestCase):
+    """Update checks and binary probes run once per TTL"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_file = str(Path(self.temp_dir) / 'yt_dlp_state.json')
+        self.ttl = 3600
+        settings = patch.object(updater, '_cache_settings', lambda: (self.cache_file, self.ttl))
+        settings.start()
+        self.addCleanup(settings.stop)
+        self.reset_process()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def reset_process(self):
+        """Simulate a fresh process: drop the in-memory cache"""
+        updater._state = {}
+        updater._state_loaded = False
+
+    @patch.object(updater, 'get_current_yt_dlp_version', return_value='2025.01.01')
+    @patch.object(updater, 'update_yt_dlp', return_value=True)
+    def test_update_check_runs_once(self, mock_update, mock_version):
+        """Repeated calls, and a new process within the TTL, skip the update"""
+        for _ in range(5):
+            updater.ensure_yt_dlp_updated()
+        self.reset_process()
+        self.assertTrue(updater.ensure_yt_dlp_updated())
+        self.assertEqual(mock_update.call_count, 1)
+
+        updater.ensure_yt_dlp_updated(force=True)
+        self.assertEqual(mock_update.call_count, 2)
+
+    @patch.object(updater, 'get_current_yt_dlp_version', return_value='2025.01.01')
+    @patch.object(updater, 'update_yt_dlp', return_value=True)
+    def test_expired_ttl_rechecks(self, mock_update, mock_version):
+        """Once the TTL passes the check runs again"""
+        updater.ensure_yt_dlp_updated()
+        self.ttl = 0
+        updater.ensure_yt_dlp_updated()
+        self.assertEqual(mock_update.call_count, 2)
+
+    @patch.object(updater, 'get_current_yt_dlp_version', return_value='2025.01.01')
+    @patch.object(updater, 'update_yt_dlp', return_value=False)
+    def test_failed_update_is_not_retried_within_backoff(self, mock_update, mock_version):
+        """A failing pip run is attempted once, not once per video or per process"""
+        for _ in range(5):
+            updater.ensure_yt_dlp_updated()
+        self.reset_process()
+        updater.ensure_yt_dlp_updated()
+        self.assertEqual(mock_update.call_count, 1)
+
+        with patch.object(updater, '_is_fresh', return_value=False):
+            updater.ensure_yt_dlp_updated()
+        self.assertEqual(mock_update.call_count, 2)
+
+    @patch.object(updater, 'ensure_yt_dlp_updated', return_value=True)
+    @patch('utils.yt_dlp_updater.subprocess.run')
+    def test_binary_probe_is_cached(self, mock_run, mock_ensure):
+        """get_yt_dlp_command resolves the binary once"""
+        def run(cmd, **kwargs):
+            if cmd[0] != 'yt-dlp':
+                raise FileNotFoundError(cmd[0])
+            return MagicMock(returncode=0, stdout='2025.01.01\n')
+        mock_run.side_effect = run
+        first = updater.get_yt_dlp_command(['--version'])
+        second = updater.get_yt_dlp_command(['--version'])
+
+        self.assertEqual(first, ['yt-dlp', '--version'])
+        self.assertEqual(first, second)
+        self.assertEqual(mock_run.call_count, 2)  # one probe per candidate path, first call only
+
+    @patch('utils.yt_dlp_updater.subprocess.run')
+    def test_missing_binary_is_not_cached(self, mock_run):
+        """A failed probe is retried on the next call"""
+        mock_run.side_effect = FileNotFoundError('yt-dlp')
+        self.assertIsNone(updater.check_yt_dlp_binary())
+
+        mock_run.side_effect = None
+        mock_run.return_value = MagicMock(returncode=0, stdout='2025.01.01\n')
+        self.assertIsNotNone(updater.check_yt_dlp_binary())
+
+
+if __name__ == '__main__':
+    unittest.main()
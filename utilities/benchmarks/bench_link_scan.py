@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: step 4 link extraction, seven findall passes vs the single-pass scanner.
+
+Runs both implementations over every saved document in minimal/ and
+filtered_content/ (plus a synthetic link-heavy doc), checks that they find the
+same links and reports the time per pass.
+
+Usage:
+    python utilities/benchmarks/bench_link_scan.py [--repeat 200] [--synthetic-links 5000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import utilities
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from utils.constants import URLPatterns
+from utils.patterns import PatternRegistry, clean_url, scan_links
+
+ROOT = Path(__file__).parent.parent.parent
+CORPUS_DIRS = ['minimal', 'filtered_content']
+
+
+def legacy_extract_links(content):
+    """Previous step4_extract_links body: one findall per pattern and list membership dedupe"""
+    links = {'youtube': [], 'drive_files': [], 'drive_folders': [], 'all_links': []}
+
+    for pattern in [PatternRegistry.YOUTUBE_VIDEO_FULL, PatternRegistry.YOUTUBE_SHORT_FULL,
+                    PatternRegistry.YOUTUBE_PLAYLIST_FULL]:
+        for match in pattern.findall(content):
+            if pattern == PatternRegistry.YOUTUBE_PLAYLIST_FULL:
+                clean_link = URLPatterns.youtube_playlist_url(match)
+            else:
+                clean_link = URLPatterns.youtube_watch_url(match)
+            if clean_link not in links['youtube']:
+                links['youtube'].append(clean_link)
+
+    for match in PatternRegistry.YOUTUBE_PLAYLIST_ESCAPED.findall(content):
+        clean_link = URLPatterns.youtube_playlist_url(match)
+        if clean_link not in links['youtube']:
+            links['youtube'].append(clean_link)
+
+    for pattern in [PatternRegistry.DRIVE_FILE_FULL, PatternRegistry.DRIVE_OPEN_FULL,
+                    PatternRegistry.DRIVE_FOLDER_FULL]:
+        for match in pattern.findall(content):
+            if pattern == PatternRegistry.DRIVE_FOLDER_FULL:
+                clean_link = URLPatterns.drive_folder_url(match)
+                if clean_link not in links['drive_folders']:
+                    links['drive_folders'].append(clean_link)
+            else:
+                clean_link = URLPatterns.drive_file_url(match, view=True)
+                if clean_link not in links['drive_files']:
+                    links['drive_files'].append(clean_link)
+
+    for link in PatternRegistry.HTTP_URL.findall(content):
+        clean_link = clean_url(link)
+        if clean_link and clean_link not in links['all_links']:
+            links['all_links'].append(clean_link)
+            if ('youtube.com' in clean_link or 'youtu.be' in clean_link) and clean_link not in links['youtube']:
+                links['youtube'].append(clean_link)
+            elif 'drive.google.com/file' in clean_link and clean_link not in links['drive_files']:
+                links['drive_files'].append(clean_link)
+            elif 'drive.google.com/drive/folders' in clean_link and clean_link not in links['drive_folders']:
+                links['drive_folders'].append(clean_link)
+
+    return {category: list(set(found)) for category, found in links.items()}
+
+
+def load_corpus():
+    docs = []
+    for directory in CORPUS_DIRS:
+        for path in sorted((ROOT / directory).glob('*')):
+            if path.is_file():
+                docs.append((f'{directory}/{path.name}', path.read_text(encoding='utf-8', errors='replace')))
+    return docs
+
+
+def synthetic_doc(count):
+    """Link-heavy doc where list-membership dedupe goes quadratic"""
+    parts = []
+    for i in range(count):
+        parts.append(f'<a href="https://www.youtube.com/watch?v={i:011d}">video</a>')
+        parts.append(f'<a href="https://drive.google.com/file/d/{i:028d}/view">file</a>')
+        parts.append(f'see https://example.com/page/{i}.')
+    return ' '.join(parts)
+
+
+def timed(func, docs, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, content in docs:
+            func(content)
+    return time.perf_counter() - start
+
+
+def same_links(old, new):
+    return all(set(old[category]) == set(new[category]) for category in old)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark step 4 link extraction')
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--synthetic-links', type=int, default=5000)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    synthetic = [('synthetic', synthetic_doc(args.synthetic_links))]
+
+    for name, content in corpus + synthetic:
+        assert same_links(legacy_extract_links(content), scan_links(content)), f'link mismatch in {name}'
+    print(f"Outputs match on {len(corpus)} saved docs and the synthetic doc")
+
+    size = sum(len(content) for _, content in corpus)
+    print(f"\nSaved docs: {len(corpus)} files, {size / 1024:.0f} KB, x{args.repeat}")
+    legacy_time = timed(legacy_extract_links, corpus, args.repeat)
+    scan_time = timed(scan_links, corpus, args.repeat)
+    print(f"  {'seven findall passes':<30} {legacy_time * 1000:10.1f} ms")
+    print(f"  {'single-pass scanner':<30} {scan_time * 1000:10.1f} ms")
+    print(f"  speedup: {legacy_time / scan_time:.1f}x")
+
+    print(f"\nSynthetic doc: {args.synthetic_links * 3:,} links, x1")
+    legacy_time = timed(legacy_extract_links, synthetic, 1)
+    scan_time = timed(scan_links, synthetic, 1)
+    print(f"  {'seven findall passes':<30} {legacy_time * 1000:10.1f} ms")
+    print(f"  {'single-pass scanner':<30} {scan_time * 1000:10.1f} ms")
+    print(f"  speedup: {legacy_time / scan_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
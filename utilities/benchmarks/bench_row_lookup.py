@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: row_id lookups by linear scan vs RowIndex.
+
+Compares, on synthetic rows:
+1. simple_workflow's per-person slot lookup (next(...) scan vs RowIndex)
+2. CSVManager.find_row_by_id (re-read + mask per call vs cached frame + index)
+
+Usage:
+    python utilities/benchmarks/bench_row_lookup.py [--rows 50000] [--lookups 2000]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Add parent directory to path to import utilities
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from utils.csv_manager import CSVManager, RowIndex
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<40} {elapsed * 1000:10.1f} ms")
+    return elapsed, result
+
+
+def bench_records(rows, lookups):
+    """Per-person slot lookup over the in-memory record list"""
+    records = [{'row_id': str(i), 'name': f'Person {i}'} for i in range(rows)]
+    targets = [str(random.randrange(rows)) for _ in range(lookups)]
+
+    print(f"\nRecord list: {rows:,} rows, {lookups:,} lookups")
+    scan_time, scanned = timed("linear scan (next(...))", lambda: [
+        next((idx for idx, rec in enumerate(records) if rec['row_id'] == row_id), -1) for row_id in targets])
+
+    def indexed():
+        index = RowIndex.from_records(records)
+        return [index.get(row_id, -1) for row_id in targets]
+    index_time, found = timed("RowIndex (build + lookups)", indexed)
+
+    assert scanned == found
+    print(f"  speedup: {scan_time / index_time:.0f}x")
+
+
+def bench_csv(rows, lookups):
+    """CSVManager.find_row_by_id against a CSV on disk"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_path = Path(temp_dir) / 'output.csv'
+        # Row ids start at 1 (find_row_by_id rejects 0 as invalid)
+        pd.DataFrame({'row_id': [str(i) for i in range(1, rows + 1)],
+                      'name': [f'Person {i}' for i in range(1, rows + 1)],
+                      'document_text': ['x' * 50] * rows}).to_csv(csv_path, index=False)
+        targets = [str(random.randrange(1, rows + 1)) for _ in range(lookups)]
+        manager = CSVManager(csv_path=str(csv_path), auto_backup=False)
+
+        print(f"\nCSVManager.find_row_by_id: {rows:,}-row CSV, {lookups:,} lookups")
+
+        def reread_and_scan(row_ids):
+            # Previous behaviour: read the CSV and build a mask for every call
+            results = []
+            for row_id in row_ids:
+                df = CSVManager.safe_csv_read(str(csv_path), 'all_string')
+                mask = df['row_id'].astype(str) == row_id
+                results.append(df[mask].iloc[0]['name'])
+            return results
+
+        # The old path re-reads the file per call; time a sample and extrapolate
+        sample = max(1, lookups // 100)
+        sample_time, _ = timed(f"re-read + scan ({sample} calls sampled)", lambda: reread_and_scan(targets[:sample]))
+        scan_time = sample_time * lookups / sample
+        print(f"  {'re-read + scan (extrapolated)':<40} {scan_time * 1000:10.1f} ms")
+
+        index_time, found = timed("cached frame + RowIndex",
+                                  lambda: [manager.find_row_by_id(row_id)['name'] for row_id in targets])
+        assert found == [f'Person {row_id}' for row_id in targets]
+        print(f"  speedup: {scan_time / index_time:.0f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark row_id lookups')
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--lookups', type=int, default=2000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    bench_records(args.rows, args.lookups)
+    bench_csv(args.rows, args.lookups)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: loading metadata JSON from S3 serially vs with S3MetadataLoader.
+
+Runs against moto's in-memory S3 with thousands of metadata objects under
+clients/. Each GetObject sleeps --latency ms first, standing in for the
+network round trip moto does not have. Compares:
+1. The old serial loop (get_object + json.loads per object)
+2. S3MetadataLoader with an empty cache (concurrent fetches)
+3. S3MetadataLoader again (everything served from the ETag cache)
+
+Usage:
+    python utilities/benchmarks/bench_s3_metadata.py [--objects 3000] [--latency 20] [--workers 8]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import boto3
+from moto import mock_aws
+
+# Add parent directory to path to import utilities
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from utils.s3_metadata_loader import S3MetadataLoader
+
+BUCKET = 'bench-metadata'
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<40} {elapsed * 1000:10.1f} ms")
+    return elapsed, result
+
+
+def serial_load(s3):
+    """Previous MetadataDownloadProcessor.load_metadata_from_s3 loop"""
+    metadata_list = []
+    paginator = s3.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=BUCKET, Prefix='clients/'):
+        for obj in page.get('Contents', []):
+            if obj['Key'].endswith('.json'):
+                response = s3.get_object(Bucket=BUCKET, Key=obj['Key'])
+                metadata = json.loads(response['Body'].read())
+                metadata['_s3_key'] = obj['Key']
+                metadata_list.append(metadata)
+    return metadata_list
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark S3 metadata loading')
+    parser.add_argument('--objects', type=int, default=3000)
+    parser.add_argument('--latency', type=float, default=20.0, help='Simulated GetObject latency (ms)')
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    with mock_aws(), tempfile.TemporaryDirectory() as temp_dir:
+        s3 = boto3.client('s3', region_name='us-east-1')  # mock_aws supplies fake credentials
+        s3.create_bucket(Bucket=BUCKET)
+        print(f"Uploading {args.objects:,} metadata objects...")
+        for i in range(args.objects):
+            body = {'row_id': i, 'person': f'Person {i}', 'links': [f'https://youtu.be/{i:011d}']}
+            s3.put_object(Bucket=BUCKET, Key=f'clients/{i:05d}/metadata.json', Body=json.dumps(body).encode('utf-8'))
+
+        def network_delay(**kwargs):
+            time.sleep(args.latency / 1000)
+        s3.meta.events.register('before-call.s3.GetObject', network_delay)
+
+        print(f"\n{args.objects:,} objects, {args.latency:.0f} ms per GetObject, {args.workers} workers")
+        cache_path = Path(temp_dir) / 's3_metadata.sqlite'
+
+        def loader_run():
+            loader = S3MetadataLoader(s3, BUCKET, max_workers=args.workers, cache_path=cache_path)
+            try:
+                return loader.load()
+            finally:
+                loader.close()
+
+        serial_time, serial = timed("serial get_object loop", lambda: serial_load(s3))
+        cold_time, cold = timed("S3MetadataLoader (empty cache)", loader_run)
+        warm_time, warm = timed("S3MetadataLoader (ETag cache)", loader_run)
+
+        assert serial == cold == warm
+        print(f"  speedup (concurrent): {serial_time / cold_time:.1f}x")
+        print(f"  speedup (cached):     {serial_time / warm_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: steps 1-2 sheet parsing, two BeautifulSoup parses vs one shared parse.
+
+Runs the previous step 1 row count + step 2 extraction (each parsing the HTML
+with html.parser) against parse_sheet + people_from_sheet_rows, on sheet.html
+and on a synthetic sheet, checks that both produce the same people and
+reports the time of each path (lxml and BeautifulSoup backends).
+
+Usage:
+    python utilities/benchmarks/bench_sheet_parse.py [--rows 50000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+# Add parent directory to path to import utilities
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from utils import sheet_parser
+from utils.extract_links import extract_actual_url
+from utils.sheet_parser import parse_sheet
+from simple_workflow import people_from_sheet_rows
+
+ROOT = Path(__file__).parent.parent.parent
+TARGET_DIV_ID = '1159146182'
+
+
+def legacy_find_table(soup):
+    target_div = soup.find("div", {"id": TARGET_DIV_ID})
+    if target_div:
+        return target_div.find("table")
+    table = soup.find("table", {"class": "waffle"})
+    if not table:
+        tables = soup.find_all("table")
+        table = tables[0] if tables else None
+    return table
+
+
+def legacy_steps(html_content):
+    """Previous step 1 row count and step 2 body: two html.parser parses, get_text per access"""
+    table = legacy_find_table(BeautifulSoup(html_content, "html.parser"))
+    row_count = len(table.find_all("tr")) if table else 0
+
+    table = legacy_find_table(BeautifulSoup(html_content, "html.parser"))
+    people_data = []
+    if table:
+        rows = table.find_all("tr")
+        for row_index in range(1, len(rows)):
+            cells = rows[row_index].find_all("td")
+            if len(cells) < 5:
+                continue
+            row_id = cells[0].get_text(strip=True)
+            name = cells[2].get_text(strip=True)
+            email = cells[3].get_text(strip=True)
+            type_val = cells[4].get_text(strip=True)
+            if not name or name.lower() == "name" or row_id == "#" or "name" in name.lower() and "email" in email.lower():
+                continue
+            if any(["Name" in str(cell.get_text(strip=True)) and "Email" in str(cells[3].get_text(strip=True)) and "Type" in str(cells[4].get_text(strip=True)) for cell in cells]):
+                continue
+            doc_link = None
+            a_tags = cells[2].find_all("a")
+            if a_tags and a_tags[0].has_attr("href"):
+                href = a_tags[0]["href"]
+                if href.startswith("https://www.google.com/url?q="):
+                    doc_link = extract_actual_url(href)
+            people_data.append({"row_id": row_id, "name": name, "email": email, "type": type_val,
+                                "doc_link": doc_link if doc_link else ""})
+    return row_count, people_data
+
+
+def shared_parse(html_content, use_lxml):
+    # Drop the memo so every timed call really parses
+    sheet_parser._last_parse = (None, None, None)
+    sheet = parse_sheet(html_content, TARGET_DIV_ID, use_lxml=use_lxml)
+    sheet = parse_sheet(html_content, TARGET_DIV_ID, use_lxml=use_lxml)  # step 2 reuses step 1's parse
+    return sheet.row_count, people_from_sheet_rows(sheet.iter_rows(start=1))
+
+
+def synthetic_sheet(rows):
+    parts = [f'<html><body><div id="{TARGET_DIV_ID}"><table class="waffle"><tbody>',
+             '<tr><td>#</td><td></td><td>Name</td><td>Email</td><td>Type</td><td>Status</td></tr>']
+    for i in range(rows):
+        doc = f'https://www.google.com/url?q=https://docs.google.com/document/d/{i:044d}/edit&amp;sa=D'
+        parts.append(f'<tr><th>{i}</th><td>{i}</td><td class="s1"></td>'
+                     f'<td class="s2"><a target="_blank" href="{doc}">Person {i}</a></td>'
+                     f'<td>p{i}@example.com</td><td>FF</td><td>  done </td></tr>')
+    parts.append('</tbody></table></div></body></html>')
+    return ''.join(parts)
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<40} {elapsed * 1000:10.1f} ms")
+    return elapsed, result
+
+
+def compare(title, html_content):
+    print(f"\n{title}: {len(html_content) / 1024:.0f} KB")
+    legacy_time, legacy = timed('two html.parser parses (previous)', lambda: legacy_steps(html_content))
+    soup_time, soup = timed('one shared parse, html.parser', lambda: shared_parse(html_content, False))
+    assert soup == legacy, 'html.parser path differs from the previous output'
+    if sheet_parser.lxml_html is not None:
+        lxml_time, fast = timed('one shared parse, lxml', lambda: shared_parse(html_content, True))
+        assert fast == legacy, 'lxml path differs from the previous output'
+        print(f"  speedup: {legacy_time / soup_time:.1f}x (html.parser), {legacy_time / lxml_time:.1f}x (lxml)")
+    else:
+        print(f"  speedup: {legacy_time / soup_time:.1f}x (lxml not installed)")
+    print(f"  {legacy[0]:,} rows, {len(legacy[1]):,} people, outputs identical")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark steps 1-2 sheet parsing')
+    parser.add_argument('--rows', type=int, default=50000, help='Rows in the synthetic sheet')
+    args = parser.parse_args()
+
+    sheet_path = ROOT / 'sheet.html'
+    if sheet_path.exists():
+        compare('sheet.html', sheet_path.read_text(encoding='utf-8'))
+    compare(f'Synthetic sheet ({args.rows:,} rows)', synthetic_sheet(args.rows))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Batch Runner - run CSV download backfills in-process on a bounded worker pool
+
+Each Drive file/folder or YouTube link in the output CSV becomes one item,
+handled by ``download_drive_with_context`` / ``download_youtube_with_context``
+in this process (no interpreter per item). Items run on a worker pool with
+the per-host caps from ``parallel.host_limits``; request rates are enforced
+by the per-service token buckets inside the download functions.
+
+Every finished item is appended to a JSONL log as soon as it finishes (in
+completion order, so one slow download holds back neither the pool nor the
+records of other items), which is also what ``--resume`` reads to skip items that already succeeded. ``--shard i/N``
+splits the items between N processes by a stable hash of the item key.
+"""
+
+import ast
+import csv
+import json
+import os
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+try:
+    from .config import get_config, get_project_root, ensure_directory
+    from .logging_config import get_logger
+    from .concurrency import run_unordered, host_slot
+    from .row_context import RowContext
+except ImportError:
+    from config import get_config, get_project_root, ensure_directory
+    from logging_config import get_logger
+    from concurrency import run_unordered, host_slot
+    from row_context import RowContext
+
+logger = get_logger(__name__)
+
+# CSV column holding each service's links
+SERVICE_COLUMNS = {
+    'google_drive': 'google_drive',
+    'youtube': 'youtube_playlist',
+}
+
+# Log file prefix per service (matches the downloads directories)
+SERVICE_LOG_NAMES = {
+    'google_drive': 'drive_downloads',
+    'youtube': 'youtube_downloads',
+}
+
+
+@dataclass
+class BatchItem:
+    """One link of one CSV row"""
+    service: str
+    url: str
+    row: RowContext
+
+    @property
+    def key(self) -> str:
+        """Stable identity used for resume and sharding"""
+        return f"{self.service}:{self.row.row_id}:{self.url}"
+
+
+def split_link_cell(value: Any) -> List[str]:
+    """
+    Links in a CSV cell: pipe-separated (current format) or a Python/JSON
+    list literal (older exports). Non-http entries and 'nan'/'None' are dropped.
+    """
+    text = str(value or '').strip()
+    if not text or text in ('nan', 'None', '[]'):
+        return []
+    if text.startswith('['):
+        try:
+            parts = ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            parts = text.strip('[]').split(',')
+    else:
+        parts = text.split('|')
+
+    links = []
+    for part in parts:
+        link = str(part).strip().strip('\'"')
+        if link.startswith('http') and link not in links:
+            links.append(link)
+    return links
+
+
+def items_from_csv(csv_path: Union[str, Path], services: Iterable[str]) -> List[BatchItem]:
+    """One BatchItem per link per row, in CSV order"""
+    items = []
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        for index, row in enumerate(csv.DictReader(f)):
+            context = RowContext(
+                row_id=str(row.get('row_id', index)),
+                row_index=index,
+                type=row.get('type', '') or '',
+                name=row.get('name', 'Unknown') or 'Unknown',
+                email=row.get('email', '') or '',
+            )
+            for service in services:
+                for url in split_link_cell(row.get(SERVICE_COLUMNS[service])):
+                    items.append(BatchItem(service, url, context))
+    return items
+
+
+def parse_shard(spec: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Parse ``i/N`` (0 <= i < N) into (i, N)"""
+    if not spec:
+        return None
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"Shard must look like i/N, got {spec!r}")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Shard index must be in 0..{count - 1}, got {spec!r}")
+    return index, count
+
+
+def shard_items(items: Iterable[BatchItem], index: int, count: int) -> List[BatchItem]:
+    """Items belonging to shard ``index`` of ``count`` (stable across runs and machines)"""
+    return [item for item in items if zlib.crc32(item.key.encode('utf-8')) % count == index]
+
+
+class ResultLog:
+    """
+    Append-only JSONL log of item results.
+
+    Each record is written with a single O_APPEND write, so several shard
+    processes can share one log file.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        ensure_directory(self.path.parent)
+        self._lock = threading.Lock()
+
+    def append(self, record: Dict[str, Any]) -> None:
+        line = (json.dumps(record, ensure_ascii=False, default=str) + '\n').encode('utf-8')
+        with self._lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+
+    def completed_keys(self) -> Set[str]:
+        """Keys of items whose latest record succeeded (or failed permanently)"""
+        latest = {}
+        if not self.path.exists():
+            return set()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by a crash
+                latest[record.get('key')] = record
+        return {key for key, record in latest.items()
+                if record.get('status') == 'ok' or record.get('permanent_failure')}
+
+
+def _default_handlers() -> Dict[str, Callable[[str, RowContext], Any]]:
+    # Imported here so the runner (and its tests) don't load the download stacks up front
+    try:
+        from .download_drive import download_drive_with_context
+        from .download_youtube import download_youtube_with_context
+    except ImportError:
+        from download_drive import download_drive_with_context
+        from download_youtube import download_youtube_with_context
+    return {'google_drive': download_drive_with_context, 'youtube': download_youtube_with_context}
+
+
+class BatchRunner:
+    """
+    Run BatchItems on a bounded pool and log one JSONL record per item.
+
+    Args:
+        log_path: JSONL results log (appended to)
+        workers: Concurrent items (defaults to batch_processing.runner.workers)
+        handlers: service -> callable(url, row_context) returning a DownloadResult
+    """
+
+    def __init__(self, log_path: Union[str, Path], workers: Optional[int] = None,
+                 handlers: Optional[Dict[str, Callable[[str, RowContext], Any]]] = None):
+        config = get_config()
+        self.log = ResultLog(log_path)
+        self.workers = max(1, int(workers or config.get('batch_processing.runner.workers',
+                                                        config.get('parallel.max_workers', 4))))
+        self.handlers = handlers
+
+    def _run_item(self, item: BatchItem) -> Dict[str, Any]:
+        handler = self.handlers[item.service]
+        started = time.monotonic()
+        with host_slot(item.url):
+            result = handler(item.url, item.row)
+        return {
+            'status': 'ok' if result.success else 'failed',
+            'files': list(result.files_downloaded or []),
+            'media_id': result.media_id,
+            'error': result.error_message if not result.success else None,
+            'permanent_failure': bool(getattr(result, 'permanent_failure', False)),
+            'seconds': round(time.monotonic() - started, 3),
+        }
+
+    def run(self, items: List[BatchItem], resume: bool = False,
+            shard: Optional[Tuple[int, int]] = None, limit: Optional[int] = None) -> Dict[str, int]:
+        """
+        Process ``items`` and return counts by status (plus 'skipped' for resumed items).
+
+        Args:
+            items: Items in CSV order
+            resume: Skip items the log already records as completed
+            shard: (i, N) to process only this process's share of the items
+            limit: Process at most this many of the remaining items
+        """
+        if self.handlers is None:
+            self.handlers = _default_handlers()
+        if shard:
+            items = shard_items(items, *shard)
+        skipped = 0
+        if resume:
+            done = self.log.completed_keys()
+            remaining = [item for item in items if item.key not in done]
+            skipped = len(items) - len(remaining)
+            items = remaining
+            if skipped:
+                logger.info(f"Resuming: skipping {skipped} items already completed in {self.log.path}")
+        if limit:
+            items = items[:limit]
+
+        counts = {'ok': 0, 'failed': 0, 'skipped': skipped}
+        finished = 0
+        total = len(items)
+        logger.info(f"Processing {total} items with {self.workers} workers"
+                    + (f" (shard {shard[0]}/{shard[1]})" if shard else ""))
+
+        def on_error(index, item, error):
+            return {'status': 'failed', 'files': [], 'media_id': None, 'error': str(error),
+                    'permanent_failure': False, 'seconds': None}
+
+        def commit(index, item, outcome):
+            nonlocal finished
+            finished += 1
+            counts[outcome['status']] += 1
+            record = {'key': item.key, 'service': item.service, 'url': item.url,
+                      'row_id': item.row.row_id, 'name': item.row.name, 'type': item.row.type}
+            record.update(outcome)
+            record['finished_at'] = datetime.now().isoformat()
+            if shard:
+                record['shard'] = f"{shard[0]}/{shard[1]}"
+            self.log.append(record)
+            mark = '✓' if outcome['status'] == 'ok' else '✗'
+            logger.info(f"[{finished}/{total}] {mark} {item.row.name}: {item.url}"
+                        + (f" ({outcome['error']})" if outcome['error'] else ""))
+
+        run_unordered(items, self._run_item, commit, max_workers=self.workers, on_error=on_error)
+        return counts
+
+
+def add_batch_arguments(parser) -> None:
+    """Options shared by the batch download scripts"""
+    parser.add_argument('--csv', help='CSV to read links from (default: paths.output_csv)')
+    parser.add_argument('--workers', type=int, help='Items processed concurrently')
+    parser.add_argument('--resume', action='store_true', help='Skip items that already succeeded in the log')
+    parser.add_argument('--shard', help='Process only shard i of N (0-based), e.g. 0/4')
+    parser.add_argument('--log', help='JSONL results log (default: logs/batch/<service>_downloads.jsonl)')
+    parser.add_argument('--max-downloads', type=int, help='Maximum number of items to process')
+
+
+def run_batch_cli(service: str, args) -> int:
+    """Run one service's backfill from parsed ``add_batch_arguments`` options; returns an exit code"""
+    config = get_config()
+    csv_path = args.csv or str(get_project_root() / config.get('paths.output_csv', 'outputs/output.csv'))
+    log_path = args.log or str(get_project_root() / config.get('batch_processing.runner.log_dir', 'logs/batch')
+                               / f"{SERVICE_LOG_NAMES[service]}.jsonl")
+    try:
+        shard = parse_shard(args.shard)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 2
+
+    items = items_from_csv(csv_path, [service])
+    if not items:
+        print(f"No {service} links found in {csv_path}")
+        return 0
+
+    counts = BatchRunner(log_path, workers=args.workers).run(items, resume=args.resume, shard=shard,
+                                                              limit=args.max_downloads)
+    print(f"\n{counts['ok']} succeeded, {counts['failed']} failed, {counts['skipped']} skipped")
+    print(f"Results log: {log_path}")
+    return 1 if counts['failed'] else 0
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Concurrency helpers for network-bound workflow stages
+
+- HostConcurrencyLimiter: per-host caps on in-flight requests (docs, drive, youtube)
+- run_ordered: bounded worker pool whose results are committed in input order
+- run_unordered: bounded worker pool whose results are committed as they finish
+"""
+
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+try:
+    from .config import get_config
+    from .logging_config import get_logger
+except ImportError:
+    from config import get_config
+    from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Hosts that share a concurrency budget with a configured host
+HOST_ALIASES = {
+    'youtu.be': 'youtube.com',
+    'drive.usercontent.google.com': 'drive.google.com',
+}
+
+
+class HostConcurrencyLimiter:
+    """Bounded semaphores keyed by host, shared by all worker threads"""
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            limits: Host -> max concurrent operations (e.g. {'youtube.com': 2})
+        """
+        self.limits = dict(limits or {})
+        self._semaphores = {host: threading.BoundedSemaphore(max(1, int(limit)))
+                            for host, limit in self.limits.items()}
+
+    def resolve_host(self, url_or_host: str) -> Optional[str]:
+        """Map a URL or hostname to the configured host it is limited under"""
+        if not url_or_host:
+            return None
+        host = urlparse(url_or_host).hostname if '://' in url_or_host else url_or_host
+        host = (host or '').lower()
+        host = HOST_ALIASES.get(host, host)
+
+        for limited_host in self._semaphores:
+            if host == limited_host or host.endswith('.' + limited_host):
+                return limited_host
+        return None
+
+    @contextmanager
+    def slot(self, url_or_host: str):
+        """Hold one concurrency slot for the host of ``url_or_host`` (no-op if unlimited)"""
+        host = self.resolve_host(url_or_host)
+        if host is None:
+            yield
+            return
+
+        semaphore = self._semaphores[host]
+        semaphore.acquire()
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+
+_host_limiter = None
+_host_limiter_lock = threading.Lock()
+
+
+def get_host_limiter() -> HostConcurrencyLimiter:
+    """Get singleton host limiter configured from parallel.host_limits"""
+    global _host_limiter
+    if _host_limiter is None:
+        with _host_limiter_lock:
+            if _host_limiter is None:
+                _host_limiter = HostConcurrencyLimiter(get_config().get('parallel.host_limits', {}))
+    return _host_limiter
+
+
+def host_slot(url_or_host: str):
+    """Convenience wrapper: ``with host_slot(url): ...``"""
+    return get_host_limiter().slot(url_or_host)
+
+
+def run_ordered(items: Iterable[Any],
+                worker: Callable[[Any], Any],
+                commit: Callable[[int, Any, Any], None],
+                max_workers: int = 1,
+                on_error: Optional[Callable[[int, Any, Exception], Any]] = None,
+                max_pending: Optional[int] = None) -> int:
+    """
+    Run ``worker`` over ``items`` on a bounded pool, committing results in input order.
+
+    ``commit(index, item, result)`` is always called from the calling thread, in
+    the same order as ``items``, so callers can write output and progress
+    without extra locking. At most ``max_pending`` items are in flight or
+    waiting to be committed, which bounds memory when an early item is slow.
+
+    Args:
+        items: Work items
+        worker: Function run on a pool thread for each item
+        commit: Called in order with each finished result
+        max_workers: Pool size (1 runs everything inline)
+        on_error: Maps a worker exception to a result; re-raised if not provided
+        max_pending: In-flight window (defaults to 4 x max_workers)
+
+    Returns:
+        Number of items committed
+    """
+    items = list(items)
+
+    def run_one(index):
+        try:
+            return worker(items[index])
+        except Exception as e:
+            if on_error is None:
+                raise
+            logger.error(f"Worker failed on item {index}: {e}")
+            return on_error(index, items[index], e)
+
+    if max_workers <= 1:
+        for index, item in enumerate(items):
+            commit(index, item, run_one(index))
+        return len(items)
+
+    max_pending = max_pending or max_workers * 4
+    finished = {}
+    next_submit = 0
+    next_commit = 0
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='workflow') as executor:
+        in_flight = {}
+        try:
+            while next_commit < len(items):
+                # Keep the window full
+                while next_submit < len(items) and next_submit - next_commit < max_pending:
+                    in_flight[executor.submit(run_one, next_submit)] = next_submit
+                    next_submit += 1
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finished[in_flight.pop(future)] = future.result()
+
+                # Commit the contiguous prefix that is ready
+                while next_commit in finished:
+                    commit(next_commit, items[next_commit], finished.pop(next_commit))
+                    next_commit += 1
+        except BaseException:
+            for future in in_flight:
+                future.cancel()
+            raise
+
+    return next_commit
+
+
+def run_unordered(items: Iterable[Any],
+                  worker: Callable[[Any], Any],
+                  commit: Callable[[int, Any, Any], None],
+                  max_workers: int = 1,
+                  on_error: Optional[Callable[[int, Any, Exception], Any]] = None,
+                  max_pending: Optional[int] = None) -> int:
+    """
+    Like ``run_ordered``, but ``commit`` is called as soon as each item finishes.
+
+    For work whose output does not need input order: a slow item never holds
+    back the results of later ones, and the pool keeps up to ``max_pending``
+    items in flight around it. ``commit`` is still only called from the
+    calling thread.
+
+    Returns:
+        Number of items committed
+    """
+    items = list(items)
+
+    def run_one(index):
+        try:
+            return worker(items[index])
+        except Exception as e:
+            if on_error is None:
+                raise
+            logger.error(f"Worker failed on item {index}: {e}")
+            return on_error(index, items[index], e)
+
+    if max_workers <= 1:
+        for index, item in enumerate(items):
+            commit(index, item, run_one(index))
+        return len(items)
+
+    max_pending = max_pending or max_workers * 4
+    next_submit = 0
+    committed = 0
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='workflow') as executor:
+        in_flight = {}
+        try:
+            while committed < len(items):
+                while next_submit < len(items) and len(in_flight) < max_pending:
+                    in_flight[executor.submit(run_one, next_submit)] = next_submit
+                    next_submit += 1
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = in_flight.pop(future)
+                    commit(index, items[index], future.result())
+                    committed += 1
+        except BaseException:
+            for future in in_flight:
+                future.cancel()
+            raise
+
+    return committed
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Content Sniffing - work out a download's real file type from its first bytes
+
+Used by the streaming path to pick the S3 key extension and ContentType
+before the first byte is written, instead of uploading ``.bin`` objects and
+repairing them afterwards.
+"""
+
+import mimetypes
+import re
+import urllib.parse
+from pathlib import Path
+from typing import Mapping, Optional, Tuple
+
+# Bytes to buffer before deciding (zip-based Office files name their parts a little way in)
+SNIFF_BYTES = 8192
+
+PLACEHOLDER_EXTENSION = '.bin'
+
+# ISO base media (ftyp) brands -> extension
+FTYP_BRANDS = {
+    b'qt  ': '.mov',
+    b'M4A ': '.m4a',
+    b'M4B ': '.m4a',
+    b'M4V ': '.m4v',
+    b'heic': '.heic',
+    b'heix': '.heic',
+    b'mif1': '.heic',
+    b'3gp4': '.3gp',
+    b'3gp5': '.3gp',
+}
+
+# Zip member prefixes that identify Office Open XML documents
+OFFICE_ZIP_MARKERS = (
+    (b'word/', '.docx'),
+    (b'xl/', '.xlsx'),
+    (b'ppt/', '.pptx'),
+)
+
+EXTENSION_CONTENT_TYPES = {
+    '.mp4': 'video/mp4',
+    '.m4v': 'video/x-m4v',
+    '.mov': 'video/quicktime',
+    '.webm': 'video/webm',
+    '.mkv': 'video/x-matroska',
+    '.avi': 'video/x-msvideo',
+    '.3gp': 'video/3gpp',
+    '.mp3': 'audio/mpeg',
+    '.m4a': 'audio/mp4',
+    '.wav': 'audio/wav',
+    '.ogg': 'audio/ogg',
+    '.flac': 'audio/flac',
+    '.pdf': 'application/pdf',
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.heic': 'image/heic',
+    '.zip': 'application/zip',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    '.pptx': 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+}
+
+
+def sniff_extension(head: bytes) -> Optional[str]:
+    """
+    Identify a file type from its leading bytes.
+
+    Args:
+        head: First bytes of the file (SNIFF_BYTES is plenty)
+
+    Returns:
+        Extension with leading dot, or None if unrecognised
+    """
+    if len(head) >= 12 and head[4:8] == b'ftyp':
+        return FTYP_BRANDS.get(head[8:12], '.mp4')
+    if head.startswith(b'\x1a\x45\xdf\xa3'):
+        return '.webm' if b'webm' in head[:64] else '.mkv'
+    if head.startswith(b'RIFF') and len(head) >= 12:
+        return {b'WAVE': '.wav', b'AVI ': '.avi'}.get(head[8:12])
+    if head.startswith(b'ID3') or head[:2] in (b'\xff\xfb', b'\xff\xf3', b'\xff\xf2'):
+        return '.mp3'
+    if head.startswith(b'OggS'):
+        return '.ogg'
+    if head.startswith(b'fLaC'):
+        return '.flac'
+    if head.startswith(b'%PDF'):
+        return '.pdf'
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return '.png'
+    if head.startswith(b'\xff\xd8\xff'):
+        return '.jpg'
+    if head.startswith((b'GIF87a', b'GIF89a')):
+        return '.gif'
+    if head.startswith(b'PK\x03\x04'):
+        for marker, extension in OFFICE_ZIP_MARKERS:
+            if marker in head:
+                return extension
+        return '.zip'
+    return None
+
+
+def filename_from_content_disposition(header: Optional[str]) -> Optional[str]:
+    """Filename from a Content-Disposition header (RFC 5987 ``filename*`` preferred)"""
+    if not header:
+        return None
+    match = re.search(r"filename\*\s*=\s*[^']*'[^']*'([^;]+)", header, re.IGNORECASE)
+    if match:
+        return urllib.parse.unquote(match.group(1).strip().strip('"'))
+    match = re.search(r'filename\s*=\s*"([^"]+)"|filename\s*=\s*([^;]+)', header, re.IGNORECASE)
+    if match:
+        return (match.group(1) or match.group(2)).strip()
+    return None
+
+
+def content_type_for_extension(extension: str) -> str:
+    """MIME type for an extension, falling back to application/octet-stream"""
+    extension = extension.lower()
+    return (EXTENSION_CONTENT_TYPES.get(extension)
+            or mimetypes.guess_type(f'file{extension}')[0]
+            or 'application/octet-stream')
+
+
+def known_extension(filename: Optional[str]) -> str:
+    """Suffix of ``filename`` if it is a recognised file extension, else ''
+
+    Names like "Session 3.5.2024" or "call w/ Dr. Smith" have suffixes that
+    are not file types and must not become S3 key extensions.
+    """
+    if not filename:
+        return ''
+    extension = Path(filename).suffix.lower()
+    if extension in EXTENSION_CONTENT_TYPES or extension in mimetypes.types_map:
+        return extension
+    return ''
+
+
+def detect_file_type(head: bytes, headers: Optional[Mapping[str, str]] = None) -> Tuple[str, str, Optional[str]]:
+    """
+    Decide extension and ContentType for a download before uploading it.
+
+    The served filename's extension wins when it is a known file extension
+    (it is what the owner named the file), then the magic bytes, then a
+    specific Content-Type header.
+
+    Args:
+        head: First bytes of the body
+        headers: Response headers (Content-Disposition, Content-Type)
+
+    Returns:
+        Tuple of (extension, content_type, original_filename); extension is
+        '.bin' when nothing identifies the type
+    """
+    headers = headers or {}
+    filename = filename_from_content_disposition(headers.get('Content-Disposition'))
+    header_type = (headers.get('Content-Type') or '').split(';')[0].strip().lower()
+
+    extension = known_extension(filename)
+    if not extension:
+        extension = sniff_extension(head) or ''
+    if not extension and header_type and header_type != 'application/octet-stream':
+        extension = mimetypes.guess_extension(header_type) or ''
+    if not extension:
+        return PLACEHOLDER_EXTENSION, header_type or 'application/octet-stream', filename
+
+    if header_type and header_type not in ('application/octet-stream', 'binary/octet-stream') \
+            and mimetypes.guess_extension(header_type) == extension:
+        content_type = header_type
+    else:
+        content_type = content_type_for_extension(extension)
+    return extension, content_type, filename
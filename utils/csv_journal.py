@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+CSV Journal - Append-only write-ahead journal in front of CSVManager writes
+
+Incremental workflows used to rebuild and rewrite the whole output CSV after
+every record. The journal instead appends each finished record as one JSON
+line next to the CSV and only folds the in-memory records back into the CSV
+("compaction") periodically and at exit, so per-record cost stays constant.
+"""
+
+import os
+import json
+import time
+import threading
+import pandas as pd
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Union
+
+try:
+    from .config import get_config
+    from .csv_manager import CSVManager
+    from .logging_config import get_logger
+except ImportError:
+    from config import get_config
+    from csv_manager import CSVManager
+    from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+JOURNAL_SUFFIX = '.journal'
+
+
+def filter_records(records: List[Dict[str, Any]], columns: List[str]) -> List[Dict[str, Any]]:
+    """Project records onto the given columns in order, filling gaps with ''"""
+    return [{col: rec.get(col, '') for col in columns} for rec in records]
+
+
+class CSVJournal:
+    """
+    Write-ahead journal for incremental CSV output.
+
+    Each appended record is written as a single JSON line to
+    ``<csv_path>.journal``. Compaction writes the full record set through
+    ``CSVManager.safe_csv_write`` (backup, lock, S3 version) and truncates
+    the journal. Compaction is due when the number of pending records
+    reaches ``max(min_compact_records, compact_ratio * total_records)`` or
+    when ``compact_interval`` seconds have passed since the last one, which
+    keeps the amortised cost per record independent of the sheet size.
+    """
+
+    def __init__(self,
+                 csv_path: Union[str, Path],
+                 columns: List[str],
+                 compact_ratio: Optional[float] = None,
+                 min_compact_records: Optional[int] = None,
+                 compact_interval: Optional[float] = None,
+                 fsync: Optional[bool] = None):
+        """
+        Initialize the journal.
+
+        Args:
+            csv_path: Output CSV the journal is compacted into
+            columns: Ordered CSV columns (records are projected onto these)
+            compact_ratio: Fraction of total records pending before compaction
+            min_compact_records: Lower bound on pending records before compaction
+            compact_interval: Maximum seconds between compactions
+            fsync: Whether to fsync the journal after every append
+        """
+        config = get_config()
+        self.csv_path = Path(csv_path)
+        self.journal_path = Path(str(self.csv_path) + JOURNAL_SUFFIX)
+        self.columns = list(columns)
+        self.compact_ratio = compact_ratio if compact_ratio is not None else config.get('csv_journal.compact_ratio', 0.1)
+        self.min_compact_records = (min_compact_records if min_compact_records is not None
+                                    else config.get('csv_journal.min_compact_records', 25))
+        self.compact_interval = (compact_interval if compact_interval is not None
+                                 else config.get('csv_journal.compact_interval', 300.0))
+        self.fsync = fsync if fsync is not None else config.get('csv_journal.fsync', True)
+
+        self.pending = 0
+        self.compactions = 0
+        self._last_compact = time.monotonic()
+        self._lock = threading.Lock()
+        self._fh = None
+
+    # === APPEND ===
+
+    def append(self, index: int, record: Dict[str, Any]) -> None:
+        """
+        Append a finished record to the journal.
+
+        Args:
+            index: Position of the record in the full record list
+            record: Record dict (projected onto the journal columns)
+        """
+        entry = {
+            'index': index,
+            'row_id': record.get('row_id', ''),
+            'record': {col: record.get(col, '') for col in self.columns}
+        }
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+
+        with self._lock:
+            if self._fh is None:
+                self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+                self._fh = open(self.journal_path, 'a', encoding='utf-8')
+            self._fh.write(line)
+            self._fh.flush()
+            if self.fsync:
+                os.fsync(self._fh.fileno())
+            self.pending += 1
+
+    def should_compact(self, total_records: int) -> bool:
+        """Check whether enough work is pending to justify a compaction"""
+        if self.pending == 0:
+            return False
+        threshold = max(self.min_compact_records, int(total_records * self.compact_ratio))
+        if self.pending >= threshold:
+            return True
+        return time.monotonic() - self._last_compact >= self.compact_interval
+
+    # === COMPACTION ===
+
+    def compact(self, records: List[Dict[str, Any]], operation_name: str = 'journal_compact') -> bool:
+        """
+        Write the full record set to the CSV and truncate the journal.
+
+        Args:
+            records: Complete, current list of records
+            operation_name: Operation name passed to CSVManager (backup naming)
+
+        Returns:
+            True if the CSV was written successfully
+        """
+        with self._lock:
+            df = pd.DataFrame(filter_records(records, self.columns), columns=self.columns)
+            csv_manager = CSVManager(csv_path=str(self.csv_path))
+            success = csv_manager.safe_csv_write(df, operation_name=operation_name)
+
+            if success:
+                self._truncate()
+                self.compactions += 1
+                self._last_compact = time.monotonic()
+                logger.debug(f"Compacted journal into {self.csv_path} ({len(records)} records)")
+            else:
+                # Keep the journal: it is still the durable copy of pending records
+                logger.warning(f"Journal compaction failed, keeping {self.pending} pending records")
+            return success
+
+    def _truncate(self) -> None:
+        """Drop all journal entries (caller holds the lock)"""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+        self.pending = 0
+
+    def close(self, records: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """
+        Final flush: compact any pending records and close the journal.
+
+        Args:
+            records: Complete record list; if None, pending entries are replayed from disk
+
+        Returns:
+            True if nothing was pending or the final compaction succeeded
+        """
+        if records is not None:
+            success = self.compact(records, operation_name='journal_final') if self.pending else True
+        else:
+            success = self.replay() >= 0
+
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+        return success
+
+    # === RECOVERY ===
+
+    def read_entries(self) -> List[Dict[str, Any]]:
+        """Read all journal entries, skipping a torn trailing line"""
+        entries = []
+        if not self.journal_path.exists():
+            return entries
+
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping corrupt journal line {line_number} in {self.journal_path}")
+        return entries
+
+    def replay(self) -> int:
+        """
+        Fold a leftover journal (e.g. from a crashed run) into the CSV on disk.
+
+        Returns:
+            Number of entries applied, or -1 if the CSV could not be rewritten
+        """
+        entries = self.read_entries()
+        if not entries:
+            with self._lock:
+                self._truncate()
+            return 0
+
+        if self.csv_path.exists():
+            df = CSVManager.safe_csv_read(str(self.csv_path), 'all_string').fillna('')
+            records = df.to_dict('records')
+        else:
+            records = []
+
+        positions = {str(rec.get('row_id', '')): i for i, rec in enumerate(records)}
+        for entry in entries:
+            record = entry.get('record', {})
+            row_id = str(entry.get('row_id', ''))
+            index = entry.get('index')
+
+            if isinstance(index, int) and index < len(records) and str(records[index].get('row_id', '')) == row_id:
+                records[index] = record
+            elif row_id in positions:
+                records[positions[row_id]] = record
+            else:
+                positions[row_id] = len(records)
+                records.append(record)
+
+        logger.info(f"Replaying {len(entries)} journal entries into {self.csv_path}")
+        self.pending = len(entries)
+        return len(entries) if self.compact(records, operation_name='journal_replay') else -1
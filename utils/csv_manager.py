@@ -14,6 +14,8 @@ import tempfile
 import gzip
 import glob
 import re
+import time
+import threading
 import warnings
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Callable, Union, Tuple
@@ -36,7 +38,7 @@ try:
     )
     from .logging_config import get_logger
     # Import CSV S3 versioning
-    from .csv_s3_versioning import get_csv_versioning
+    from .csv_s3_versioning import get_csv_versioning, get_csv_uploader
 except ImportError:
     from .file_lock import file_lock
     from .sanitization import sanitize_error_message, sanitize_csv_field
@@ -52,7 +54,7 @@ except ImportError:
     )
     from .logging_config import get_logger
     # Import CSV S3 versioning
-    from .csv_s3_versioning import get_csv_versioning
+    from .csv_s3_versioning import get_csv_versioning, get_csv_uploader
 
 # Setup module logger
 logger = get_logger(__name__)
@@ -69,6 +71,10 @@ CSV_SCHEMA = {
 # Get configuration
 config = get_config()
 
+# Last automatic backup per CSV path (shared by all CSVManager instances)
+_last_backup_at = {}
+_backup_lock = threading.Lock()
+
 
 def safe_get_na_value(column_name: str = None, dtype: str = 'string') -> Any:
     """
@@ -93,6 +99,46 @@ def safe_get_na_value(column_name: str = None, dtype: str = 'string') -> Any:
         return None
 
 
+class RowIndex:
+    """
+    row_id -> position index over a record list or DataFrame (DRY).
+    
+    Replaces per-lookup linear scans. The first occurrence wins for duplicate
+    row_ids, matching the old ``mask.iloc[0]`` / ``next(...)`` behaviour.
+    """
+    
+    def __init__(self, row_ids=()):
+        self._positions = {}
+        for position, row_id in enumerate(row_ids):
+            self._positions.setdefault(str(row_id), position)
+    
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> 'RowIndex':
+        """Index a list of record dicts by their 'row_id'"""
+        return cls(rec.get('row_id', '') for rec in records)
+    
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'RowIndex':
+        """Index DataFrame rows (positional, as for ``df.iloc``) by 'row_id'"""
+        if 'row_id' not in df.columns:
+            return cls()
+        return cls(df['row_id'].astype(str))
+    
+    def get(self, row_id: Union[int, str], default: Optional[int] = None) -> Optional[int]:
+        """Position of ``row_id`` or ``default``"""
+        return self._positions.get(str(row_id), default)
+    
+    def add(self, row_id: Union[int, str], position: int) -> None:
+        """Register a newly appended row"""
+        self._positions.setdefault(str(row_id), position)
+    
+    def __contains__(self, row_id) -> bool:
+        return str(row_id) in self._positions
+    
+    def __len__(self) -> int:
+        return len(self._positions)
+
+
 class CSVManager:
     """Unified CSV operations manager with atomic, streaming, tracking, and integrity capabilities"""
     
@@ -113,9 +159,11 @@ class CSVManager:
         self.timeout = timeout
         self.encoding = encoding
         
-        # Initialize tracking state
+        # Initialize tracking state (cached frame + row index, invalidated by file mtime/size)
         self._df_cache = None
         self._last_modified = None
+        self._row_index = None
+        self._dirty = False
     
     # === CORE OPERATIONS ===
     
@@ -172,9 +220,82 @@ class CSVManager:
         """
         return self.safe_csv_read(str(self.csv_path), dtype_spec)
     
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the CSV, or None if it does not exist"""
+        try:
+            stat = self.csv_path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+    
+    def read_csv_safe(self) -> pd.DataFrame:
+        """
+        Read the CSV (all columns as strings) through an mtime-validated cache.
+        
+        Repeated row operations reuse the cached frame and its row index until
+        the file changes on disk. Callers may modify the returned frame and pass
+        it to ``write_csv``.
+        """
+        signature = self._file_signature()
+        if self._dirty:
+            if signature != self._last_modified:
+                logger.warning(f"{self.csv_path} changed on disk with unflushed row updates pending; keeping in-memory copy")
+            return self._df_cache
+        if self._df_cache is None or signature != self._last_modified:
+            self._df_cache = self.safe_csv_read(str(self.csv_path), 'all_string')
+            self._last_modified = signature
+            self._row_index = None
+        return self._df_cache
+    
+    def get_row_index(self) -> RowIndex:
+        """row_id -> position index for the current CSV contents"""
+        df = self.read_csv_safe()
+        if self._row_index is None:
+            self._row_index = RowIndex.from_dataframe(df)
+        return self._row_index
+    
+    def write_csv(self, df: pd.DataFrame, operation_name: str = "write", rows_changed: bool = True,
+                  backup: Optional[bool] = None) -> bool:
+        """
+        Write ``df`` via safe_csv_write and keep it as the cached frame.
+        
+        Args:
+            df: DataFrame to write
+            operation_name: Name of the operation for backup naming
+            rows_changed: False if only cell values changed (row order and row_ids intact),
+                so the row index can be kept instead of rebuilt
+            backup: True forces a backup first (see safe_csv_write)
+        """
+        row_index = None if rows_changed else self._row_index
+        if not self.safe_csv_write(df, operation_name=operation_name, backup=backup):
+            self._discard_unwritten_changes()
+            return False
+        self._df_cache = df
+        self._last_modified = self._file_signature()
+        self._row_index = row_index
+        self._dirty = False
+        return True
+    
+    def _discard_unwritten_changes(self) -> None:
+        """
+        Drop the cached frame after a failed write: callers change it in place,
+        so it may hold values that are not on disk. Pending ``write=False``
+        updates are kept (still dirty) so a later ``flush()`` retries them.
+        """
+        if not self._dirty:
+            self._df_cache = None
+            self._last_modified = None
+            self._row_index = None
+    
+    def flush(self, operation_name: str = "deferred_update") -> bool:
+        """Write updates made with ``update_row_by_id(..., write=False)``"""
+        if not self._dirty or self._df_cache is None:
+            return True
+        return self.write_csv(self._df_cache, operation_name=operation_name, rows_changed=False)
+    
     @handle_file_operations("CSV write operation")
     def safe_csv_write(self, df: pd.DataFrame, operation_name: str = "write", 
-                      expected_columns: Optional[List[str]] = None) -> bool:
+                      expected_columns: Optional[List[str]] = None, backup: Optional[bool] = None) -> bool:
         """
         Standardized CSV writing with validation and backup.
         
@@ -182,11 +303,14 @@ class CSVManager:
             df: DataFrame to write
             operation_name: Name of the operation for backup naming
             expected_columns: Expected columns for validation
+            backup: None backs up per auto_backup (at most once per csv_backup.min_interval_seconds);
+                True always backs up first (before destructive rewrites); False skips the backup
             
         Returns:
             True if successful, False otherwise
         """
-        if self.auto_backup and self.csv_path.exists():
+        wants_backup = self.auto_backup if backup is None else backup
+        if wants_backup and self.csv_path.exists() and self._backup_due(force=backup is True):
             backup_path = self.create_backup(operation_name)
             logger.debug(f"Created backup: {backup_path}")
         
@@ -208,17 +332,21 @@ class CSVManager:
             try:
                 # Check if S3 storage is enabled
                 if config.get('downloads.storage_mode', 'local') == 's3':
-                    versioning = get_csv_versioning()
                     metadata = {
                         'operation': operation_name,
                         'row_count': str(len(df)),
                         'column_count': str(len(df.columns))
                     }
-                    upload_result = versioning.upload_csv_version(str(self.csv_path), metadata)
-                    if upload_result['success']:
-                        logger.info(f"CSV version uploaded to S3: {upload_result['versioned_name']}")
+                    if config.get('csv_versioning.mode', 'debounced') == 'debounced':
+                        # Coalesced, hash-deduplicated upload on a background thread
+                        get_csv_uploader().schedule(str(self.csv_path), metadata)
                     else:
-                        logger.warning(f"Failed to upload CSV version to S3: {upload_result.get('error')}")
+                        versioning = get_csv_versioning()
+                        upload_result = versioning.upload_csv_version(str(self.csv_path), metadata)
+                        if upload_result['success']:
+                            logger.info(f"CSV version uploaded to S3: {upload_result['versioned_name']}")
+                        else:
+                            logger.warning(f"Failed to upload CSV version to S3: {upload_result.get('error')}")
             except Exception as s3_error:
                 # Don't fail the operation if S3 upload fails
                 logger.warning(f"CSV S3 versioning error (non-fatal): {str(s3_error)}")
@@ -758,18 +886,21 @@ class CSVManager:
         """
         try:
             df = self.read_csv_safe()
-            mask = df['row_id'].astype(str) == str(row_id)
+            position = self.get_row_index().get(row_id)
             
-            if not df[mask].empty:
-                df.loc[mask, 's3_paths'] = self.save_s3_paths(s3_paths)
-                df.loc[mask, 'file_uuids'] = self.save_file_uuids(file_uuids)
-                self.write_csv(df)
-                return True
+            if position is not None:
+                for column, value in (('s3_paths', self.save_s3_paths(s3_paths)),
+                                      ('file_uuids', self.save_file_uuids(file_uuids))):
+                    if column not in df.columns:
+                        df[column] = pd.Series(pd.NA, index=df.index, dtype='string')
+                    df.iat[position, df.columns.get_loc(column)] = value
+                return self.write_csv(df, operation_name="update_s3_mappings", rows_changed=False)
             else:
                 logger.warning(f"Row ID {row_id} not found in CSV")
                 return False
         except Exception as e:
             logger.error(f"Error updating S3 mappings: {e}")
+            self._discard_unwritten_changes()
             return False
     
     # === CSV ROW OPERATIONS (DRY) ===
@@ -792,11 +923,10 @@ class CSVManager:
             logger.warning(f"Invalid row ID provided: {row_id}")
             return None
         
-        df = self.read_csv_safe()
-        mask = df['row_id'].astype(str) == str(validated_id)
+        position = self.get_row_index().get(validated_id)
         
-        if mask.any():
-            return df[mask].iloc[0]
+        if position is not None:
+            return self.read_csv_safe().iloc[position]
         return None
     
     def find_rows_by_criteria(self, criteria: Dict[str, Any]) -> pd.DataFrame:
@@ -818,41 +948,47 @@ class CSVManager:
         
         return df[mask]
     
-    def update_row_by_id(self, row_id: Union[int, str], updates: Dict[str, Any]) -> bool:
+    def update_row_by_id(self, row_id: Union[int, str], updates: Dict[str, Any], write: bool = True) -> bool:
         """
         Update a row by row_id with given values.
         
         Args:
             row_id: Row ID to update
             updates: Dictionary of column:value pairs to update
+            write: Write the CSV now; pass False to batch updates and call ``flush()`` once
             
         Returns:
             True if successful, False otherwise
         """
         try:
             df = self.read_csv_safe()
-            mask = df['row_id'].astype(str) == str(row_id)
+            position = self.get_row_index().get(row_id)
             
-            if not mask.any():
+            if position is None:
                 logger.warning(f"Row ID {row_id} not found in CSV")
                 return False
             
-            # Get the index of the row
-            row_index = df.index[mask].tolist()[0]
-            
             # Update each field
             for column, value in updates.items():
                 if column in df.columns:
-                    df.at[row_index, column] = value
+                    # Cached frame is all-string: store values the way they round-trip through the CSV
+                    df.iat[position, df.columns.get_loc(column)] = value if value is None or isinstance(value, str) else str(value)
                 else:
                     logger.warning(f"Column '{column}' not found in CSV")
             
+            if 'row_id' in updates:
+                self._row_index = None
+            
+            if not write:
+                self._dirty = True
+                return True
+            
             # Save the updated dataframe
-            self.write_csv(df)
-            return True
+            return self.write_csv(df, operation_name="update_row", rows_changed='row_id' in updates)
             
         except Exception as e:
             logger.error(f"Error updating row {row_id}: {e}")
+            self._discard_unwritten_changes()
             return False
     
     def iterate_rows(self, filter_func=None):
@@ -905,6 +1041,18 @@ class CSVManager:
     
     # === BACKUP & UTILITY OPERATIONS ===
     
+    def _backup_due(self, force: bool = False) -> bool:
+        """Rate-limit automatic pre-write backups per CSV (csv_backup.min_interval_seconds); ``force`` bypasses it"""
+        min_interval = config.get('csv_backup.min_interval_seconds', 0)
+        key = str(self.csv_path.resolve())
+        now = time.monotonic()
+        with _backup_lock:
+            last = _last_backup_at.get(key)
+            if not force and last is not None and now - last < min_interval:
+                return False
+            _last_backup_at[key] = now
+        return True
+    
     def create_backup(self, operation_name: str = "backup") -> str:
         """Create a compressed backup of the CSV file"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -1,20 +1,32 @@
 #!/usr/bin/env python3
 """
 CSV S3 Versioning - Automatically upload CSV files to S3 with timestamps
+
+In debounced mode (csv_versioning.mode), writes are coalesced by a background
+uploader: one version per debounce window or write-count burst, skipped when
+the content hash matches the last uploaded version, flushed at exit.
 """
 
 import boto3
+import atexit
+import hashlib
+import shutil
+import tempfile
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 
 try:
     from .logging_config import get_logger
     from .config import get_config
+    from .file_lock import file_lock
 except ImportError:
     from logging_config import get_logger
     from config import get_config
+    from file_lock import file_lock
 
 logger = get_logger(__name__)
 config = get_config()
@@ -221,4 +233,176 @@ def upload_csv_to_s3(csv_path: str, metadata: Optional[Dict[str, Any]] = None) -
         Upload result dict
     """
     versioning = get_csv_versioning()
-    return versioning.upload_csv_version(csv_path, metadata)
\ No newline at end of file
+    return versioning.upload_csv_version(csv_path, metadata)
+
+class DebouncedCSVUploader:
+    """
+    Background, coalescing uploader for CSV versions.
+    
+    ``schedule()`` only records that a CSV changed and returns immediately.
+    A worker thread uploads each path once ``debounce_seconds`` have passed
+    since its first pending write, or sooner once ``max_pending_writes``
+    writes have piled up. The file is snapshotted under its file lock, and
+    the upload is skipped when its SHA-256 matches the last version uploaded
+    for that path.
+    """
+    
+    def __init__(self,
+                 versioning_factory: Callable[[], CSVS3Versioning] = None,
+                 debounce_seconds: Optional[float] = None,
+                 max_pending_writes: Optional[int] = None,
+                 skip_unchanged: Optional[bool] = None):
+        """
+        Initialize the uploader.
+        
+        Args:
+            versioning_factory: Returns the CSVS3Versioning used for uploads
+            debounce_seconds: Quiet period before a pending CSV is uploaded
+            max_pending_writes: Upload early once this many writes are pending for a path
+            skip_unchanged: Skip uploads whose content hash matches the last upload
+        """
+        self.versioning_factory = versioning_factory or get_csv_versioning
+        self.debounce_seconds = (debounce_seconds if debounce_seconds is not None
+                                 else config.get('csv_versioning.debounce_seconds', 30.0))
+        self.max_pending_writes = (max_pending_writes if max_pending_writes is not None
+                                   else config.get('csv_versioning.max_pending_writes', 50))
+        self.skip_unchanged = (skip_unchanged if skip_unchanged is not None
+                               else config.get('csv_versioning.skip_unchanged', True))
+        
+        self.stats = {'scheduled': 0, 'uploaded': 0, 'skipped_unchanged': 0, 'failed': 0}
+        self._pending = {}      # path -> {'writes', 'first_at', 'metadata'}
+        self._last_hash = {}    # path -> sha256 of the last uploaded content
+        self._in_flight = 0
+        self._flush_requests = 0
+        self._cond = threading.Condition()
+        self._thread = None
+    
+    def schedule(self, local_csv_path: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Record that ``local_csv_path`` changed; returns without touching S3"""
+        path = str(local_csv_path)
+        with self._cond:
+            entry = self._pending.setdefault(path, {'writes': 0, 'first_at': time.monotonic()})
+            entry['writes'] += 1
+            entry['metadata'] = dict(metadata or {})
+            self.stats['scheduled'] += 1
+            
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='csv-version-uploader', daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Upload everything pending now and wait for it to finish.
+        
+        Returns:
+            True if nothing is left pending within ``timeout``
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if not self._pending and not self._in_flight:
+                return True
+            self._flush_requests += 1
+            self._cond.notify_all()
+            try:
+                while self._pending or self._in_flight:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        logger.warning(f"CSV version flush timed out with {len(self._pending)} pending")
+                        return False
+                    self._cond.wait(remaining)
+                return True
+            finally:
+                self._flush_requests -= 1
+    
+    def _due_paths(self):
+        """Paths ready to upload (caller holds the condition)"""
+        now = time.monotonic()
+        return [path for path, entry in self._pending.items()
+                if self._flush_requests
+                or entry['writes'] >= self.max_pending_writes
+                or now - entry['first_at'] >= self.debounce_seconds]
+    
+    def _run(self):
+        """Worker loop: wait for due paths, upload them outside the lock"""
+        while True:
+            with self._cond:
+                due = self._due_paths()
+                while not due:
+                    if not self._pending:
+                        # Idle: exit; schedule() starts a new worker when needed
+                        self._thread = None
+                        return
+                    next_due = min(entry['first_at'] for entry in self._pending.values()) + self.debounce_seconds
+                    self._cond.wait(max(0.0, next_due - time.monotonic()))
+                    due = self._due_paths()
+                batch = [(path, self._pending.pop(path)) for path in due]
+                self._in_flight += len(batch)
+            
+            for path, entry in batch:
+                try:
+                    self._upload(path, entry)
+                except Exception as e:
+                    self.stats['failed'] += 1
+                    logger.warning(f"CSV S3 versioning error (non-fatal): {e}")
+            
+            with self._cond:
+                self._in_flight -= len(batch)
+                self._cond.notify_all()
+    
+    def _upload(self, path: str, entry: Dict[str, Any]) -> None:
+        """Snapshot ``path`` under its lock and upload it unless unchanged"""
+        local_path = Path(path)
+        if not local_path.exists():
+            return
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            snapshot = Path(temp_dir) / local_path.name
+            with file_lock(path, timeout=30.0):
+                shutil.copyfile(local_path, snapshot)
+            
+            digest = hashlib.sha256(snapshot.read_bytes()).hexdigest()
+            if self.skip_unchanged and self._last_hash.get(path) == digest:
+                self.stats['skipped_unchanged'] += 1
+                logger.debug(f"CSV version unchanged, skipping upload: {path}")
+                return
+            
+            metadata = dict(entry.get('metadata', {}))
+            metadata['content_sha256'] = digest
+            metadata['coalesced_writes'] = str(entry['writes'])
+            result = self.versioning_factory().upload_csv_version(str(snapshot), metadata)
+        
+        if result.get('success'):
+            self._last_hash[path] = digest
+            self.stats['uploaded'] += 1
+            logger.info(f"CSV version uploaded to S3: {result['versioned_name']} ({entry['writes']} writes coalesced)")
+        else:
+            self.stats['failed'] += 1
+            logger.warning(f"Failed to upload CSV version to S3: {result.get('error')}")
+
+
+_csv_uploader = None
+_csv_uploader_lock = threading.Lock()
+
+
+def get_csv_uploader() -> DebouncedCSVUploader:
+    """Get or create singleton debounced CSV uploader"""
+    global _csv_uploader
+    if _csv_uploader is None:
+        with _csv_uploader_lock:
+            if _csv_uploader is None:
+                _csv_uploader = DebouncedCSVUploader()
+    return _csv_uploader
+
+
+def flush_csv_uploads(timeout: Optional[float] = None) -> bool:
+    """Upload any pending CSV versions now (no-op if nothing was scheduled)"""
+    if _csv_uploader is None:
+        return True
+    if timeout is None:
+        timeout = config.get('csv_versioning.flush_timeout', 120.0)
+    return _csv_uploader.flush(timeout)
+
+
+# Registered at import so it runs after exit handlers registered later (e.g. journal compaction)
+atexit.register(flush_csv_uploads)
@@ -4,7 +4,9 @@ import sys
 import json
 import time
 import argparse
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.parse import urlparse, parse_qs
 try:
@@ -12,11 +14,12 @@ try:
     from validation import validate_google_drive_url, validate_file_path, ValidationError
     from retry_utils import retry_request, get_with_retry, retry_with_backoff
     from file_lock import file_lock, safe_file_operation
-    from rate_limiter import rate_limit, wait_for_rate_limit
+    from rate_limiter import rate_limit, wait_for_rate_limit, report_response
     from row_context import RowContext, DownloadResult
     from sanitization import sanitize_error_message, SafeDownloadError, validate_csv_field_safety
     from config import get_drive_downloads_dir, create_download_dir, Constants
-    from download_utils import download_file_with_progress
+    from config import get_config, get_project_root, ensure_directory, load_json_state
+    from resumable_download import download_response_resumable
     # DRY CONSOLIDATION - Step 1: Import centralized URL patterns
     from constants import URLPatterns
 except ImportError:
@@ -24,11 +27,12 @@ except ImportError:
     from .validation import validate_google_drive_url, validate_file_path, ValidationError
     from .retry_utils import retry_request, get_with_retry, retry_with_backoff
     from .file_lock import file_lock, safe_file_operation
-    from .rate_limiter import rate_limit, wait_for_rate_limit
+    from .rate_limiter import rate_limit, wait_for_rate_limit, report_response
     from .row_context import RowContext, DownloadResult
     from .sanitization import sanitize_error_message, SafeDownloadError, validate_csv_field_safety
     from .config import get_drive_downloads_dir, create_download_dir, Constants
-    from .download_utils import download_file_with_progress
+    from .config import get_config, get_project_root, ensure_directory, load_json_state
+    from .resumable_download import download_response_resumable
     # DRY CONSOLIDATION - Step 1: Import centralized URL patterns
     from .constants import URLPatterns
 
@@ -158,114 +162,223 @@ def is_folder_url(url):
     return '/drive/folders/' in url or 'folders/' in url
 
 
-def list_folder_files(folder_url, logger=None):
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+# One pass over a folder page: every tag that references a Drive ID (data-id, a
+# /file/d/ or folders/ link) together with its attributes and text, the
+# "flip-entry-title" divs the embedded folder view puts after each link, and
+# bare /file/d/ references elsewhere (e.g. in inline scripts)
+_FOLDER_ENTRY_PATTERN = re.compile(
+    r'<[a-zA-Z][\w-]*(?P<attrs>[^>]*?(?:data-id="[\w-]{11,}"|href="[^"]*/(?:file/d|folders)/[\w-]{11,}[^"]*")[^>]*)>'
+    r'(?P<text>[^<]*)'
+    r'|class="flip-entry-title"[^>]*>(?P<title>[^<]+)<'
+    r'|/file/d/(?P<bare>[\w-]{11,})'
+)
+_ENTRY_ATTR_PATTERN = re.compile(r'([\w:-]+)="([^"]*)"')
+_ENTRY_LINK_PATTERN = re.compile(r'/(file/d|folders)/([\w-]{11,})')
+
+
+def parse_folder_listing(html_content, folder_id=None):
+    """
+    Extract the entries of a public Drive folder page in a single scan.
+    
+    Args:
+        html_content: Folder page HTML
+        folder_id: The listed folder's own ID (excluded from the entries)
+    
+    Returns:
+        List of (id, name, mime) tuples in page order; subfolders have
+        mime FOLDER_MIME_TYPE, files a type guessed from their name or None
+    """
+    import html
+    import mimetypes
+    
+    entries = {}  # id -> [name, mime]
+    last_id = None
+    for match in _FOLDER_ENTRY_PATTERN.finditer(html_content):
+        if match.group('title') is not None:
+            # Embedded view: the title follows the entry's link
+            if last_id and not entries[last_id][0]:
+                entries[last_id][0] = match.group('title').strip()
+            continue
+        if match.group('bare') is not None:
+            if match.group('bare') != folder_id:
+                entries.setdefault(match.group('bare'), ['', None])
+            continue
+        
+        attrs = dict(_ENTRY_ATTR_PATTERN.findall(match.group('attrs')))
+        link = _ENTRY_LINK_PATTERN.search(attrs.get('href', ''))
+        entry_id = attrs.get('data-id') or (link.group(2) if link else None)
+        if not entry_id or len(entry_id) <= 10 or entry_id in ('_gd', '_folder') or entry_id == folder_id:
+            continue
+        
+        mime = attrs.get('data-mime-type') or attrs.get('data-mimetype')
+        if not mime and link and link.group(1) == 'folders' and link.group(2) == entry_id:
+            mime = FOLDER_MIME_TYPE
+        name = (attrs.get('aria-label') or attrs.get('title') or attrs.get('data-tooltip')
+                or match.group('text')).strip()
+        
+        entry = entries.setdefault(entry_id, ['', None])
+        if name and len(name) > 1 and not entry[0]:
+            entry[0] = html.unescape(name)
+        if mime and not entry[1]:
+            entry[1] = mime
+        last_id = entry_id
+    
+    listing = []
+    for entry_id, (name, mime) in entries.items():
+        if not mime and name:
+            mime = mimetypes.guess_type(name)[0]
+        listing.append((entry_id, name or f"file_{entry_id[:8]}", mime))
+    return listing
+
+
+def _folder_listing_settings():
+    """Folder listing options from downloads.drive.folder_listing"""
+    config = get_config()
+    cache_dir = Path(config.get('downloads.drive.folder_listing.cache_dir', 'cache/drive_folders'))
+    if not cache_dir.is_absolute():
+        cache_dir = get_project_root() / cache_dir
+    return {
+        'cache_dir': cache_dir,
+        'cache_ttl': config.get('downloads.drive.folder_listing.cache_ttl', 3600),
+        'recursive': config.get('downloads.drive.folder_listing.recursive', True),
+        'max_depth': config.get('downloads.drive.folder_listing.max_depth', 5),
+        'max_concurrency': config.get('downloads.drive.folder_listing.max_concurrency', 4),
+    }
+
+
+def _read_cached_listing(folder_id, settings):
+    """Cached (id, name, mime) entries for ``folder_id`` if younger than the TTL"""
+    cached = load_json_state(str(settings['cache_dir'] / f"{folder_id}.json"), {})
+    if cached and time.time() - cached.get('fetched_at', 0) < settings['cache_ttl']:
+        return [tuple(entry) for entry in cached.get('entries', [])]
+    return None
+
+
+def _write_cached_listing(folder_id, entries, settings):
+    """Atomically store a folder's entries; failures only cost a re-fetch"""
+    cache_file = settings['cache_dir'] / f"{folder_id}.json"
+    try:
+        ensure_directory(settings['cache_dir'])
+        temp_file = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        temp_file.write_text(json.dumps({'fetched_at': time.time(), 'entries': entries}))
+        os.replace(temp_file, cache_file)
+    except OSError as e:
+        logger.debug(f"Could not cache folder listing {folder_id}: {e}")
+
+
+def fetch_folder_entries(folder_id, logger=None, use_cache=True):
+    """
+    List one folder level as (id, name, mime) tuples, via the disk cache.
+    
+    Returns:
+        List of entries, or None if the folder page could not be read
+        (failures are not cached)
+    """
+    if not logger:
+        logger = globals()['logger']  # Use module-level logger
+    
+    settings = _folder_listing_settings()
+    if use_cache:
+        cached = _read_cached_listing(folder_id, settings)
+        if cached is not None:
+            logger.info(f"Using cached listing for folder {folder_id} ({len(cached)} entries)")
+            return cached
+    
+    # Import here to avoid circular imports
+    try:
+        from http_pool import get as http_get
+    except ImportError:
+        from .http_pool import get as http_get
+    
+    # DRY CONSOLIDATION - Step 1: Use centralized URL construction
+    folder_page_url = URLPatterns.drive_folder_url(folder_id)
+    logger.info(f"Attempting to list files in folder: {folder_id}")
+    
+    response = http_get(folder_page_url, timeout=30)
+    
+    if response.status_code != 200:
+        if response.status_code == 404:
+            logger.error(f"Folder not found or not publicly accessible (HTTP 404)")
+        elif response.status_code == 403:
+            logger.error(f"Permission denied - folder is private (HTTP 403)")
+        else:
+            logger.error(f"Failed to access folder page: HTTP {response.status_code}")
+        return None
+    
+    # Validate response to prevent CSV corruption from HTML/JavaScript content
+    is_valid, validation_error = _validate_folder_response(response, logger)
+    if not is_valid:
+        safe_error = sanitize_error_message(validation_error)
+        logger.error(f"Invalid folder response: {safe_error}")
+        return None
+    
+    entries = parse_folder_listing(response.text, folder_id)
+    if use_cache:
+        _write_cached_listing(folder_id, entries, settings)
+    return entries
+
+
+def list_folder_files(folder_url, logger=None, recursive=None, use_cache=True):
     """
     List files in a Google Drive folder by scraping the public folder page
-    Returns list of file dictionaries with id and name
+    Returns list of file dictionaries with id, name, mime, url and path
+    (the subfolder path relative to the listed folder, '' at the top level)
+    
+    Subfolders are descended level by level (downloads.drive.folder_listing)
+    and every folder page is cached on disk for cache_ttl seconds.
     """
     if not logger:
         logger = globals()['logger']  # Use module-level logger
     
-    folder_id = extract_folder_id(folder_url)
+    # Accept a bare folder ID as well as a folder URL
+    folder_id = extract_folder_id(folder_url) or (
+        folder_url if re.fullmatch(r'[\w-]{11,}', folder_url or '') else None)
     if not folder_id:
         logger.error(f"Could not extract folder ID from URL: {folder_url}")
         return []
     
-    try:
-        # Import here to avoid circular imports
+    settings = _folder_listing_settings()
+    if recursive is None:
+        recursive = settings['recursive']
+    
+    def fetch(folder):
         try:
-            from http_pool import get as http_get
-        except ImportError:
-            from .http_pool import get as http_get
-        
-        # Try to access the folder page
-        # DRY CONSOLIDATION - Step 1: Use centralized URL construction
-        folder_page_url = URLPatterns.drive_folder_url(folder_id)
-        logger.info(f"Attempting to list files in folder: {folder_id}")
-        
-        response = http_get(folder_page_url, timeout=30)
-        
-        if response.status_code != 200:
-            if response.status_code == 404:
-                logger.error(f"Folder not found or not publicly accessible (HTTP 404)")
-            elif response.status_code == 403:
-                logger.error(f"Permission denied - folder is private (HTTP 403)")
-            else:
-                logger.error(f"Failed to access folder page: HTTP {response.status_code}")
-            return []
-        
-        # Validate response to prevent CSV corruption from HTML/JavaScript content
-        is_valid, validation_error = _validate_folder_response(response, logger)
-        if not is_valid:
-            safe_error = sanitize_error_message(validation_error)
-            logger.error(f"Invalid folder response: {safe_error}")
-            return []
-        
-        html_content = response.text
-        
-        # Parse the HTML to find file references
-        files = []
-        
-        # Look for file patterns in the HTML
-        # Google Drive embeds file information in JSON-like structures
-        import re
-        
-        # Extract file IDs using simpler, more reliable patterns
-        file_id_patterns = [
-            r'/file/d/([a-zA-Z0-9_-]+)',  # /file/d/{fileId}
-            r'data-id="([a-zA-Z0-9_-]+)"',  # data-id="{fileId}"
-        ]
-        
-        found_file_ids = set()
-        for pattern in file_id_patterns:
-            matches = re.findall(pattern, html_content)
-            for file_id in matches:
-                # Filter out invalid IDs (too short, system IDs, etc.)
-                if len(file_id) > 10 and file_id not in ['_gd', '_folder']:
-                    found_file_ids.add(file_id)
-        
-        # For each file ID, try to extract a name from surrounding context
-        for file_id in found_file_ids:
-            # Try to find the file name near the file ID
-            name = f"file_{file_id[:8]}"  # Default name
-            
-            # Look for aria-label or title attributes near this file ID
-            context_patterns = [
-                rf'data-id="{re.escape(file_id)}"[^>]*aria-label="([^"]+)"',
-                rf'/file/d/{re.escape(file_id)}[^"]*"[^>]*title="([^"]+)"',
-                rf'/file/d/{re.escape(file_id)}[^"]*"[^>]*>([^<]+)<',
-            ]
-            
-            for context_pattern in context_patterns:
-                context_match = re.search(context_pattern, html_content)
-                if context_match:
-                    potential_name = context_match.group(1).strip()
-                    if potential_name and len(potential_name) > 1:
-                        name = potential_name
-                        break
-            
-            files.append({
-                'id': file_id,
-                'name': name,
-                # DRY CONSOLIDATION - Step 1: Use centralized URL construction
-                'url': URLPatterns.drive_file_url(file_id, view=True)
-            })
-        
-        # Remove duplicates based on file ID
-        seen_ids = set()
-        unique_files = []
-        for file_info in files:
-            if file_info['id'] not in seen_ids:
-                seen_ids.add(file_info['id'])
-                unique_files.append(file_info)
-        
-        logger.info(f"Found {len(unique_files)} files in folder")
-        return unique_files
-        
-    except Exception as e:
-        safe_error = sanitize_error_message(str(e))
-        logger.error(f"Error listing folder contents: {safe_error}")
-        return []
+            return fetch_folder_entries(folder, logger, use_cache)
+        except Exception as e:
+            safe_error = sanitize_error_message(str(e))
+            logger.error(f"Error listing folder contents: {safe_error}")
+            return None
+    
+    files = []
+    seen_ids = {folder_id}
+    level = [(folder_id, '')]
+    depth = 0
+    with ThreadPoolExecutor(max_workers=settings['max_concurrency']) as executor:
+        while level:
+            next_level = []
+            for (_, path), entries in zip(level, executor.map(fetch, [folder for folder, _ in level])):
+                for entry_id, name, mime in entries or []:
+                    if entry_id in seen_ids:
+                        continue
+                    seen_ids.add(entry_id)
+                    if mime == FOLDER_MIME_TYPE:
+                        next_level.append((entry_id, f"{path}{name}/"))
+                        continue
+                    files.append({
+                        'id': entry_id,
+                        'name': name,
+                        'mime': mime,
+                        # DRY CONSOLIDATION - Step 1: Use centralized URL construction
+                        'url': URLPatterns.drive_file_url(entry_id, view=True),
+                        'path': path,
+                    })
+            depth += 1
+            level = next_level if recursive and depth <= settings['max_depth'] else []
+    
+    logger.info(f"Found {len(files)} files in folder")
+    return files
 
 
 def download_folder_files(folder_url, row_context, logger=None):
@@ -510,7 +623,8 @@ def download_drive_file(file_id, output_filename=None, logger=None):
         logger.info("Retrying direct download URL...")
         response = session.get(download_url, stream=True, timeout=30)
     
-    # Check response
+    # Check response (429/403 and Retry-After slow the google_drive bucket down)
+    report_response('google_drive', response)
     if response.status_code != 200:
         logger.error(f"Error downloading file: HTTP status {response.status_code}")
         return None
@@ -547,31 +661,25 @@ def download_drive_file(file_id, output_filename=None, logger=None):
             return output_path
         
         # Save file
+        total_size = int(response.headers.get('content-length', 0))
+        
+        if total_size == 0:
+            logger.warning("Could not determine file size")
+        else:
+            logger.info(f"File size: {total_size / Constants.BYTES_PER_MB:.2f} MB")
+        
+        # Download via <output>.tmp; a dropped connection keeps it so the retry resumes
         try:
-            total_size = int(response.headers.get('content-length', 0))
-            
-            if total_size == 0:
-                logger.warning("Could not determine file size")
-            else:
-                logger.info(f"File size: {total_size / Constants.BYTES_PER_MB:.2f} MB")
-            
-            # Download to a temporary file first
-            temp_path = f"{output_path}.tmp"
-            
-            # Use centralized download function (DRY consolidation)
-            success = download_file_with_progress(response, temp_path, total_size, logger)
-            if not success:
-                raise Exception("Download failed")
-            
-            # Move to final location
-            os.replace(temp_path, output_path)
-            
+            download_response_resumable(session, response, output_path, logger=logger)
+        except (requests.RequestException, IOError) as e:
+            logger.warning(f"Download of {file_id} interrupted, keeping partial file for resume: {e}")
+            raise
         except Exception as e:
-            # Clean up temp file on error
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
             logger.error(f"Error saving file: {str(e)}")
             return None
+        
+        logger.info(f"Downloaded file to {output_path}")
+        return output_path
 
 def save_metadata(file_id, url, metadata, logger=None):
     """Save file metadata to a JSON file"""
@@ -668,28 +776,19 @@ def process_direct_download_url(url, output_filename=None, logger=None):
             logger.info(f"File already exists: {output_path}")
             return output_path
         
-        # Download to temp file
-        temp_path = f"{output_path}.tmp"
+        # Download via <output>.tmp, resuming a partial file left by an earlier attempt
         total_size = int(response.headers.get('Content-Length', 0))
         
         if total_size > 0:
             logger.info(f"File size: {total_size / Constants.BYTES_PER_MB:.2f} MB")
         
         try:
-            # Use centralized download function (DRY consolidation)
-            success = download_file_with_progress(response, temp_path, total_size, logger)
-            if not success:
-                raise Exception("Download failed")
-            
-            # Move to final location
-            os.replace(temp_path, output_path)
-            logger.success(f"Downloaded file to {output_path}")
+            download_response_resumable(session, response, output_path, logger=logger)
+            logger.info(f"Downloaded file to {output_path}")
             return output_path
             
         except Exception as e:
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
-            logger.error(f"Error saving file: {str(e)}")
+            logger.error(f"Error saving file (partial file kept for resume): {str(e)}")
             return None
 
 
@@ -8,7 +8,9 @@ from pathlib import Path
 try:
     from logging_config import get_logger
     from validation import validate_youtube_url, validate_file_path, ValidationError
-    from retry_utils import retry_subprocess, retry_with_backoff
+    from retry_utils import retry_subprocess, retry_with_backoff, RetryError
+    from yt_dlp_engine import get_yt_dlp_engine
+    from concurrency import run_ordered
     from file_lock import file_lock, safe_file_operation
     from config import get_config, get_youtube_downloads_dir, get_timeout, create_download_dir
     from rate_limiter import rate_limit, wait_for_rate_limit
@@ -19,7 +21,9 @@ try:
 except ImportError:
     from .logging_config import get_logger
     from .validation import validate_youtube_url, validate_file_path, ValidationError
-    from .retry_utils import retry_subprocess, retry_with_backoff
+    from .retry_utils import retry_subprocess, retry_with_backoff, RetryError
+    from .yt_dlp_engine import get_yt_dlp_engine
+    from .concurrency import run_ordered
     from .file_lock import file_lock, safe_file_operation
     from .config import get_config, get_youtube_downloads_dir, get_timeout, create_download_dir
     from .rate_limiter import rate_limit, wait_for_rate_limit
@@ -39,7 +43,13 @@ DOWNLOADS_DIR = get_youtube_downloads_dir()
 
 @rate_limit('youtube')
 def download_single_video(url, video_id=None, title=None, transcript_only=False, resolution=None, output_format=None, yt_dlp_path="yt-dlp", logger=None):
-    """Download a single YouTube video using yt-dlp"""
+    """
+    Download a single YouTube video using yt-dlp.
+
+    With yt_dlp importable the in-process engine extracts the video's info
+    once and reuses it for the transcript and the video; otherwise the
+    yt-dlp command at ``yt_dlp_path`` is run for each step.
+    """
     if not logger:
         logger = globals()['logger']  # Use module-level logger
     
@@ -66,6 +76,16 @@ def download_single_video(url, video_id=None, title=None, transcript_only=False,
     
     downloads_path = create_download_dir(DOWNLOADS_DIR, logger)
     
+    engine = get_yt_dlp_engine()
+    info_dict = None
+    
+    def video_info():
+        """Extract the info dict on first use and share it between steps"""
+        nonlocal info_dict
+        if info_dict is None:
+            info_dict = engine.extract_info(url)
+        return info_dict
+    
     # If video_id and title not provided, get them first
     if not video_id or not title:
         # Command to get video info
@@ -77,19 +97,23 @@ def download_single_video(url, video_id=None, title=None, transcript_only=False,
         ]
         
         # Get video info using centralized error handling
-        @handle_download_operations("get video info", download_type='youtube', 
+        @handle_download_operations("get video info",
                                   return_on_error=(None, None), retry_count=0,
                                   context={'url': url, 'video_id': video_id})
         def get_video_info():
-            result = retry_subprocess(
-                info_cmd,
-                capture_output=True,
-                text=True,
-                max_attempts=3,
-                base_delay=2.0,
-                logger=logger
-            )
-            info = result.stdout.strip().split('\n')
+            if engine:
+                extracted = video_info()
+                info = [extracted.get('id'), extracted.get('title') or ''] if extracted.get('id') else []
+            else:
+                result = retry_subprocess(
+                    info_cmd,
+                    capture_output=True,
+                    text=True,
+                    max_attempts=3,
+                    base_delay=2.0,
+                    logger=logger
+                )
+                info = result.stdout.strip().split('\n')
             if len(info) != 2:
                 error_msg = download_error('YOUTUBE_ERROR', 
                                          video_id=video_id or 'unknown',
@@ -126,13 +150,14 @@ def download_single_video(url, video_id=None, title=None, transcript_only=False,
             logger.info(f"Transcript already exists: {transcript_file}")
             has_transcript = True
         else:
+            sub_langs = config.get('downloads.youtube.subtitle_languages', 'en.*')
             # Command to download subtitles with our specific naming convention
             sub_cmd = [
                 yt_dlp_path,
                 "--skip-download",
                 "--write-subs",
                 "--write-auto-subs",  # Also write automatically generated subtitles
-                "--sub-langs", config.get('downloads.youtube.subtitle_languages', 'en.*'),
+                "--sub-langs", sub_langs,
                 "--sub-format", sub_format,
                 "--convert-subs", sub_format,  # Ensure consistent format
                 "--output", f"{downloads_path}/{video_id}_transcript",  # Use our naming convention directly
@@ -141,12 +166,15 @@ def download_single_video(url, video_id=None, title=None, transcript_only=False,
             
             try:
                 logger.info("Attempting to download transcript...")
-                retry_subprocess(
-                    sub_cmd,
-                    max_attempts=3,
-                    base_delay=2.0,
-                    logger=logger
-                )
+                if engine:
+                    engine.download_subtitles(video_info(), downloads_path, sub_format, sub_langs)
+                else:
+                    retry_subprocess(
+                        sub_cmd,
+                        max_attempts=3,
+                        base_delay=2.0,
+                        logger=logger
+                    )
                 
                 # Look for all subtitle files that yt-dlp might have created
                 # Pattern 1: Our naming with language codes
@@ -168,7 +196,7 @@ def download_single_video(url, video_id=None, title=None, transcript_only=False,
                             source_file = max(subtitle_files, key=lambda f: f.stat().st_size)
                         
                         source_file.rename(transcript_file)
-                        logger.success(f"Saved transcript to {transcript_file}")
+                        logger.info(f"Saved transcript to {transcript_file}")
                     
                     # Clean up any remaining language-coded files
                     for f in subtitle_files:
@@ -179,11 +207,11 @@ def download_single_video(url, video_id=None, title=None, transcript_only=False,
                     has_transcript = True
                 elif transcript_file.exists():
                     # File was created directly with correct name
-                    logger.success(f"Saved transcript to {transcript_file}")
+                    logger.info(f"Saved transcript to {transcript_file}")
                     has_transcript = True
                 else:
                     logger.warning("No transcript found for this video")
-            except subprocess.CalledProcessError as e:
+            except (subprocess.CalledProcessError, RetryError) as e:
                 error_msg = download_error('YOUTUBE_ERROR',
                                          video_id=video_id,
                                          details="Error downloading transcript")
@@ -213,18 +241,21 @@ def download_single_video(url, video_id=None, title=None, transcript_only=False,
         ]
         
         # Download video using centralized error handling
-        @handle_download_operations("download video", download_type='youtube',
+        @handle_download_operations("download video",
                                   return_on_error=None, retry_count=0,
                                   context={'url': url, 'video_id': video_id, 'resolution': resolution})
         def download_video():
             logger.info(f"Downloading video in {resolution}p {output_format} format...")
-            retry_subprocess(
-                video_cmd,
-                max_attempts=3,
-                base_delay=5.0,  # Longer delay for video downloads
-                logger=logger
-            )
-            logger.success(f"Video downloaded to {video_file}")
+            if engine:
+                engine.download_media(video_info(), downloads_path, resolution, output_format)
+            else:
+                retry_subprocess(
+                    video_cmd,
+                    max_attempts=3,
+                    base_delay=5.0,  # Longer delay for video downloads
+                    logger=logger
+                )
+            logger.info(f"Video downloaded to {video_file}")
             return video_file
         
         downloaded_video = download_video()
@@ -401,6 +432,8 @@ def download_video(url, transcript_only=False, resolution="720", output_format="
         # Not in a virtual environment, use command as-is
         yt_dlp_path = "yt-dlp"
     
+    engine = get_yt_dlp_engine()
+    
     # Check if this is a playlist (either synthetic or real YouTube playlist)
     if "watch_videos?video_ids=" in url or "playlist?list=" in url:
         import re
@@ -414,6 +447,19 @@ def download_video(url, transcript_only=False, resolution="720", output_format="
             if not video_ids:
                 logger.error("No valid video IDs found in playlist URL")
                 return None, None
+        elif engine:
+            # Handle real YouTube playlists in-process (flat extraction, no per-video lookups)
+            try:
+                video_ids = engine.playlist_video_ids(url)
+            except RetryError as e:
+                logger.error(f"Failed to get playlist info: {e}")
+                return None, None
+            
+            if not video_ids:
+                logger.error("No videos found in YouTube playlist")
+                return None, None
+            
+            logger.info(f"Found {len(video_ids)} videos in YouTube playlist")
         else:
             # Handle real YouTube playlists (e.g., playlist?list=PLpOu93QMy5fV...)
             # Use yt-dlp's --flat-playlist to get video IDs without downloading
@@ -465,14 +511,15 @@ def download_video(url, transcript_only=False, resolution="720", output_format="
         video_ids = unique_video_ids
         logger.info(f"Found {len(video_ids)} unique videos in playlist URL")
         
-        # Process each video separately
+        # Process each video separately (concurrently on the in-process engine's pool)
         successful_video_files = []
         successful_transcript_files = []
         
-        for i, vid in enumerate(video_ids):
+        def download_one(numbered):
+            i, vid = numbered
             logger.info(f"Processing video {i+1}/{len(video_ids)}: {vid}")
             video_url = f"https://www.youtube.com/watch?v={vid}"
-            video_file, transcript_file = download_single_video(
+            return download_single_video(
                 video_url, 
                 video_id=vid, 
                 title=None,  # Will be fetched inside the function
@@ -482,12 +529,16 @@ def download_video(url, transcript_only=False, resolution="720", output_format="
                 yt_dlp_path=yt_dlp_path,
                 logger=logger
             )
-            
+        
+        def collect(index, numbered, files):
+            video_file, transcript_file = files
             if video_file:
                 successful_video_files.append(video_file)
             if transcript_file:
                 successful_transcript_files.append(transcript_file)
         
+        run_ordered(enumerate(video_ids), download_one, collect, max_workers=engine.max_workers if engine else 1)
+        
         # Return all successful files for playlists
         return successful_video_files, successful_transcript_files
     else:
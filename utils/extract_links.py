@@ -4,7 +4,9 @@ import os
 import json
 import time
 import atexit
+import threading
 import urllib.parse
+from collections import deque
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -14,7 +16,8 @@ try:
     from config import get_config
     from logging_config import get_logger
     from rate_limiter import rate_limit, wait_for_rate_limit
-    from patterns import clean_url, get_selenium_driver, cleanup_selenium_driver, is_google_doc_url
+    from metrics import observe
+    from patterns import clean_url, get_selenium_driver, cleanup_selenium_driver, get_selenium_pool, wait_for_dom_stable, is_google_doc_url
     from error_handling import with_standard_error_handling
     from google_docs_http import extract_google_doc_with_http_fallback
     HAS_HTTP_EXTRACTION = True
@@ -24,7 +27,8 @@ except ImportError:
         from .config import get_config
         from .logging_config import get_logger
         from .rate_limiter import rate_limit, wait_for_rate_limit
-        from .patterns import clean_url, get_selenium_driver, cleanup_selenium_driver, is_google_doc_url
+        from .metrics import observe
+        from .patterns import clean_url, get_selenium_driver, cleanup_selenium_driver, get_selenium_pool, wait_for_dom_stable, is_google_doc_url
         from .error_handling import with_standard_error_handling
         from .google_docs_http import extract_google_doc_with_http_fallback
         HAS_HTTP_EXTRACTION = True
@@ -33,7 +37,8 @@ except ImportError:
         from .config import get_config
         from .logging_config import get_logger
         from .rate_limiter import rate_limit, wait_for_rate_limit
-        from .patterns import clean_url, get_selenium_driver, cleanup_selenium_driver
+        from .metrics import observe
+        from .patterns import clean_url, get_selenium_driver, cleanup_selenium_driver, get_selenium_pool, wait_for_dom_stable
         from .error_handling import with_standard_error_handling
         HAS_HTTP_EXTRACTION = False
 
@@ -56,7 +61,12 @@ GOOGLE_SHEET_CACHE_FILE = os.path.join(CACHE_DIR, "google_sheet_cache.html")
 @with_standard_error_handling("Selenium HTML extraction", "")
 def get_html_with_selenium(url, debug=False):
     """Get HTML using Selenium for JavaScript rendering"""
-    driver = get_selenium_driver()
+    with get_selenium_pool().lease() as driver:
+        return _get_html_with_selenium(url, driver, debug)
+
+
+def _get_html_with_selenium(url, driver, debug=False):
+    """Render ``url`` in a driver checked out from the pool"""
     if not driver:
         logger.error("Failed to initialize Selenium driver")
         return ""
@@ -68,18 +78,8 @@ def get_html_with_selenium(url, debug=False):
         WebDriverWait(driver, 30).until(
             EC.presence_of_element_located((By.TAG_NAME, "body"))
         )
-        # Extra wait for Google Docs to render
-        time.sleep(5)
-        
-        # For Google Docs, try scrolling to ensure all content is loaded
-        if "docs.google.com/document" in url:
-            # Scroll down in small increments to ensure content loads
-            height = driver.execute_script("return document.body.scrollHeight")
-            for i in range(0, height, 300):
-                driver.execute_script(f"window.scrollTo(0, {i});")
-                time.sleep(0.1)
-            # Scroll back to top
-            driver.execute_script("window.scrollTo(0, 0);")
+        # Wait for rendering to settle (Google Docs are also scrolled to load all content)
+        wait_for_dom_stable(driver, scroll="docs.google.com/document" in url)
         
         html = driver.page_source
         
@@ -129,13 +129,18 @@ def extract_google_doc_text(url, driver=None, prefer_http=True):
             logger.warning(f"HTTP extraction error: {str(e)}, falling back to Selenium")
     
     # Existing Selenium implementation continues here...
-    # Use provided driver or get the shared one
-    if driver is None:
-        driver = get_selenium_driver()
-    if not driver:
-        logger.error("Failed to initialize Selenium driver")
-        return ""
-    
+    # Use provided driver, or borrow one from the pool so several docs can render at once
+    if driver is not None:
+        return _extract_google_doc_text_selenium(url, driver)
+    with get_selenium_pool().lease() as driver:
+        if not driver:
+            logger.error("Failed to initialize Selenium driver")
+            return ""
+        return _extract_google_doc_text_selenium(url, driver)
+
+
+def _extract_google_doc_text_selenium(url, driver):
+    """Load a Google Doc in the given driver and extract its text"""
     logger.info(f"Loading Google Doc with enhanced extraction: {url}")
     start_time = time.time()
     driver.get(url)
@@ -147,38 +152,14 @@ def extract_google_doc_text(url, driver=None, prefer_http=True):
     load_time = time.time() - start_time
     logger.info(f"Page loaded in {load_time:.2f} seconds")
     
-    # Dynamic wait for content to stabilize
+    # Event-driven wait for content to stabilize (MutationObserver in the page)
     logger.info("Waiting for content to stabilize...")
-    previous_content_length = 0
-    stable_checks = 0
-    max_wait = 30
-    start_wait = time.time()
-    
-    while time.time() - start_wait < max_wait:
-        try:
-            current_content_length = driver.execute_script("""
-                var content = document.body.innerText || '';
-                var editables = document.querySelectorAll('[contenteditable="true"]');
-                for (var i = 0; i < editables.length; i++) {
-                    content += editables[i].innerText || '';
-                }
-                return content.length;
-            """)
-            
-            if current_content_length > previous_content_length:
-                previous_content_length = current_content_length
-                stable_checks = 0
-                time.sleep(2)
-            elif current_content_length == previous_content_length and current_content_length > 100:
-                stable_checks += 1
-                if stable_checks >= 2:
-                    logger.info(f"Content stabilized at {current_content_length} chars")
-                    break
-                time.sleep(1)
-            else:
-                time.sleep(2)
-        except:
-            time.sleep(2)
+    settle = wait_for_dom_stable(driver, min_chars=100)
+    settle_time = settle['elapsed_ms'] / 1000
+    if settle['stable']:
+        logger.info(f"Content stabilized at {settle['length']} chars in {settle_time:.2f}s")
+    else:
+        logger.warning(f"Content still changing after {settle_time:.2f}s, extracting anyway")
     
     # Enhanced JavaScript-based extraction
     logger.info("Extracting content with JavaScript...")
@@ -260,7 +241,40 @@ def extract_google_doc_text(url, driver=None, prefer_http=True):
     else:
         logger.warning("Quality: Low content volume - may need manual review")
     
+    record_extraction_timing(url, load_time, settle_time, time.time() - start_time, len(text_content), settle['stable'])
     return text_content
+
+
+# Per-document Selenium timings, kept in memory for run summaries
+_extraction_timings = deque(maxlen=1000)
+_extraction_timings_lock = threading.Lock()
+
+def record_extraction_timing(url, load_time, settle_time, total_time, chars, stable):
+    """Record how long one document took to load, settle and extract"""
+    timing = {'url': url, 'load': load_time, 'settle': settle_time, 'total': total_time,
+              'chars': chars, 'stable': stable}
+    with _extraction_timings_lock:
+        _extraction_timings.append(timing)
+    observe('selenium_page_load_seconds', load_time)
+    observe('selenium_settle_seconds', settle_time)
+    observe('selenium_extraction_seconds', total_time)
+    logger.info(f"Doc timing: load {load_time:.2f}s, settle {settle_time:.2f}s, total {total_time:.2f}s ({chars} chars)")
+
+def get_extraction_timing_summary():
+    """Average per-document timings recorded so far in this process"""
+    with _extraction_timings_lock:
+        timings = list(_extraction_timings)
+    if not timings:
+        return {'documents': 0}
+    count = len(timings)
+    return {
+        'documents': count,
+        'avg_load': sum(t['load'] for t in timings) / count,
+        'avg_settle': sum(t['settle'] for t in timings) / count,
+        'avg_total': sum(t['total'] for t in timings) / count,
+        'max_total': max(t['total'] for t in timings),
+        'unstable': sum(1 for t in timings if not t['stable']),
+    }
         # Note: Error handling now provided by @with_standard_error_handling decorator (DRY)
 
 @with_standard_error_handling("Document text extraction with retry", ("", "Failed to extract text"))
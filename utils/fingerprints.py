@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Row Fingerprints - remember what each sheet row and its doc looked like
+
+Incremental FULL MODE runs compare a hash of every sheet row (row_id, name,
+email, type, doc link) with the one stored by the last successful run. Rows
+without a doc that did not change are carried forward as they are. Doc rows
+are checked again, since a doc can be edited while its sheet row stays the
+same: the page HTML is fetched with a conditional GET through the HTTP
+cache, and if its hash matches the last run the row is carried forward
+without a Selenium extraction. Otherwise steps 3-4 run and a hash of the
+extracted text and link set decides whether step 5 (S3 streaming) can be
+skipped because the doc content is the same as last time.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+try:
+    from .config import get_config, load_json_state, ensure_directory
+    from .logging_config import get_logger
+except ImportError:
+    from config import get_config, load_json_state, ensure_directory
+    from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Sheet fields whose change means the row must be processed again
+ROW_FINGERPRINT_FIELDS = ('row_id', 'name', 'email', 'type', 'doc_link')
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def row_fingerprint(person: Dict[str, Any]) -> str:
+    """Hash of the sheet fields of one person"""
+    return _digest([str(person.get(field, '') or '') for field in ROW_FINGERPRINT_FIELDS])
+
+
+def doc_fingerprint(doc_text: str, links: Optional[Dict[str, Iterable[str]]]) -> str:
+    """Hash of a doc's extracted text and its (unordered) link set"""
+    return _digest([doc_text or '', sorted(set((links or {}).get('all_links', [])))])
+
+
+def html_fingerprint(html: str) -> Optional[str]:
+    """Hash of a doc's page HTML (None for an empty page)"""
+    return hashlib.sha256(html.encode('utf-8')).hexdigest() if html else None
+
+
+class FingerprintStore:
+    """
+    JSON file of row_id -> {'row': fingerprint, 'doc': fingerprint, 'html': fingerprint}.
+
+    Doc fingerprints computed on worker threads are staged with ``stage_doc``
+    and only become permanent when the row is committed, so a row whose
+    processing failed keeps its old fingerprints and is retried next run.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        state = load_json_state(str(self.path), {})
+        self._rows = state.get('rows', {})
+        self._staged = {}
+
+    def row_unchanged(self, person: Dict[str, Any]) -> bool:
+        """True if the row looks exactly as it did at the last successful run"""
+        with self._lock:
+            entry = self._rows.get(str(person.get('row_id', '')))
+        return bool(entry) and entry.get('row') == row_fingerprint(person)
+
+    def doc_unchanged(self, row_id: Any, fingerprint: str) -> bool:
+        with self._lock:
+            entry = self._rows.get(str(row_id))
+        return bool(entry) and entry.get('doc') == fingerprint
+
+    def html_unchanged(self, row_id: Any, fingerprint: str) -> bool:
+        with self._lock:
+            entry = self._rows.get(str(row_id))
+        return bool(entry) and entry.get('html') == fingerprint
+
+    def stage_doc(self, row_id: Any, fingerprint: str, html: Optional[str] = None) -> None:
+        """Remember freshly computed doc (and page HTML) fingerprints until the row is committed"""
+        staged = {'doc': fingerprint}
+        if html:
+            staged['html'] = html
+        with self._lock:
+            self._staged[str(row_id)] = staged
+
+    def carry_forward(self, row_id: Any) -> None:
+        """Keep the doc fingerprints of the last run for a row whose doc page did not change"""
+        with self._lock:
+            entry = self._rows.get(str(row_id)) or {}
+            self._staged[str(row_id)] = {key: entry[key] for key in ('doc', 'html') if entry.get(key)}
+
+    def commit(self, person: Dict[str, Any]) -> None:
+        """Record the row (and any staged doc fingerprints) as successfully processed"""
+        row_id = str(person.get('row_id', ''))
+        with self._lock:
+            entry = {'row': row_fingerprint(person)}
+            entry.update(self._staged.pop(row_id, {}))
+            self._rows[row_id] = entry
+
+    def discard(self, row_id: Any) -> None:
+        """Drop staged doc fingerprints and forget the row so it is redone next run"""
+        with self._lock:
+            self._staged.pop(str(row_id), None)
+            self._rows.pop(str(row_id), None)
+
+    def retain(self, row_ids: Iterable[Any]) -> None:
+        """Forget rows that are no longer in the sheet"""
+        keep = {str(row_id) for row_id in row_ids}
+        with self._lock:
+            self._rows = {row_id: entry for row_id, entry in self._rows.items() if row_id in keep}
+
+    def save(self) -> None:
+        """Atomically write the store (a crash mid-write leaves the previous file)"""
+        with self._lock:
+            data = json.dumps({'updated': datetime.now().isoformat(), 'rows': self._rows}, indent=1)
+        try:
+            ensure_directory(self.path.parent)
+            temp_path = self.path.with_name(self.path.name + f".{os.getpid()}.tmp")
+            temp_path.write_text(data)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save fingerprints to {self.path}: {e}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows)
+
+
+def get_fingerprint_store(output_file: Optional[str] = None) -> FingerprintStore:
+    """
+    FingerprintStore kept next to the output CSV (``<output>.fingerprints.json``),
+    since carried-forward records are read back from that CSV.
+    """
+    output_file = output_file or get_config().get('paths.output_csv', 'outputs/output.csv')
+    return FingerprintStore(f"{output_file}.fingerprints.json")
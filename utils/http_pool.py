@@ -9,11 +9,17 @@ Consolidates HTTP request patterns found throughout the codebase:
 - Progress tracking for downloads
 """
 import os
+import json
 import time
+import hashlib
+import threading
 import requests
+from collections import OrderedDict
+from urllib.parse import urlparse
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 from typing import Optional, Dict, Any, Callable, Union, Tuple
+from requests.structures import CaseInsensitiveDict
 import logging
 from io import BytesIO
 from pathlib import Path
@@ -25,6 +31,7 @@ setup_project_imports()
 from utils.config import get_config, is_ssl_verify_enabled, Constants
 from utils.logging_config import get_logger
 from utils.error_handling import handle_network_operations, ErrorMessages, network_error
+from utils.metrics import get_metrics, inc, observe
 
 # Get configuration
 config = get_config()
@@ -32,6 +39,172 @@ config = get_config()
 # Global session instance
 _session = None
 
+
+class HTTPResponseCache:
+    """
+    On-disk cache of GET responses revalidated with ETag / Last-Modified.
+    
+    Each entry is a body file plus a small JSON header file named by the URL's
+    SHA-256. Lookups add If-None-Match / If-Modified-Since to the request; a
+    304 is answered from disk. Total body size is capped by evicting the least
+    recently used entries.
+    """
+    
+    # Response headers kept so a cached response looks like the original
+    KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Content-Disposition')
+    
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> body size, least recently used first
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'bytes_saved': 0}
+        
+        # Rebuild the LRU order from the header files' modification times
+        headers = sorted(self.cache_dir.glob('*.json'), key=lambda path: path.stat().st_mtime)
+        for header_file in headers:
+            body_file = header_file.with_suffix('.body')
+            if body_file.exists():
+                self._entries[header_file.stem] = body_file.stat().st_size
+    
+    @staticmethod
+    def key_for(url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+    
+    def snapshot(self) -> Dict[str, int]:
+        """Counters plus current entry count and size"""
+        with self._lock:
+            return dict(self.stats, entries=len(self._entries), bytes=sum(self._entries.values()))
+    
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """Stored header record for ``url``, or None"""
+        key = self.key_for(url)
+        with self._lock:
+            if key not in self._entries:
+                return None
+        try:
+            return json.loads((self.cache_dir / f"{key}.json").read_text())
+        except (OSError, ValueError):
+            self._drop(key)
+            return None
+    
+    @staticmethod
+    def validators(entry: Dict[str, Any]) -> Dict[str, str]:
+        """Conditional request headers for a stored entry"""
+        headers = {}
+        if entry['headers'].get('ETag'):
+            headers['If-None-Match'] = entry['headers']['ETag']
+        if entry['headers'].get('Last-Modified'):
+            headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+        return headers
+    
+    def cached_response(self, url: str, entry: Dict[str, Any], revalidation: requests.Response) -> Optional[requests.Response]:
+        """Build a 200 response from disk after the server answered 304"""
+        key = self.key_for(url)
+        try:
+            body = (self.cache_dir / f"{key}.body").read_bytes()
+        except OSError:
+            self._drop(key)
+            return None
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = url
+        response._content = body
+        response.encoding = entry.get('encoding')
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        # Servers may send fresher validators with the 304
+        for header in ('ETag', 'Last-Modified'):
+            if revalidation.headers.get(header):
+                response.headers[header] = revalidation.headers[header]
+        response.request = revalidation.request
+        response.elapsed = revalidation.elapsed
+        response.from_cache = True
+        with self._lock:
+            self.stats['hits'] += 1
+            self.stats['bytes_saved'] += len(body)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        try:
+            os.utime(self.cache_dir / f"{key}.json")
+        except OSError:
+            pass
+        return response
+    
+    def store(self, url: str, response: requests.Response) -> bool:
+        """Keep a 200 response that carries a validator; returns True if stored"""
+        with self._lock:
+            self.stats['misses'] += 1
+        headers = {name: response.headers[name] for name in self.KEPT_HEADERS if response.headers.get(name)}
+        body = response.content
+        if response.status_code != 200 or not ('ETag' in headers or 'Last-Modified' in headers) \
+                or len(body) > self.max_bytes:
+            return False
+        
+        key = self.key_for(url)
+        record = {'url': url, 'headers': headers, 'encoding': response.encoding, 'stored_at': time.time()}
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            for path, data in ((self.cache_dir / f"{key}.body", body),
+                               (self.cache_dir / f"{key}.json", json.dumps(record).encode('utf-8'))):
+                temp_path = path.with_name(path.name + suffix)
+                temp_path.write_bytes(data)
+                os.replace(temp_path, path)
+        except OSError as e:
+            get_logger(__name__).debug(f"Could not cache {url}: {e}")
+            return False
+        
+        with self._lock:
+            self._entries[key] = len(body)
+            self._entries.move_to_end(key)
+            self.stats['stores'] += 1
+            evicted = []
+            while sum(self._entries.values()) > self.max_bytes and len(self._entries) > 1:
+                evicted.append(self._entries.popitem(last=False)[0])
+            self.stats['evictions'] += len(evicted)
+        for old_key in evicted:
+            self._remove_files(old_key)
+        return True
+    
+    def clear(self) -> None:
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+        for key in keys:
+            self._remove_files(key)
+    
+    def _drop(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+        self._remove_files(key)
+    
+    def _remove_files(self, key: str) -> None:
+        for suffix in ('.body', '.json'):
+            try:
+                (self.cache_dir / f"{key}{suffix}").unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _cache_from_config() -> Optional[HTTPResponseCache]:
+    """HTTPResponseCache from the http_cache config section (None when disabled)"""
+    if not config.get('http_cache.enabled', True):
+        return None
+    cache_dir = Path(config.get('http_cache.cache_dir', 'cache/http'))
+    if not cache_dir.is_absolute():
+        cache_dir = Path(__file__).parent.parent / cache_dir
+    return HTTPResponseCache(cache_dir, config.get('http_cache.max_bytes', 256 * 1024 * 1024))
+
+
+def _record_response_metrics(response: requests.Response, *args, **kwargs) -> None:
+    """Session response hook: time to headers and status per host"""
+    host = urlparse(response.url).hostname or 'unknown'
+    method = response.request.method if response.request is not None else 'GET'
+    observe('http_request_seconds', response.elapsed.total_seconds(), host=host, method=method)
+    inc('http_requests_total', host=host, method=method, status=response.status_code)
+
+
 class HTTPPool:
     """HTTP connection pool with retry logic and configuration."""
     
@@ -41,7 +214,8 @@ class HTTPPool:
                  max_retries: int = 3,
                  backoff_factor: float = 1.0,
                  status_forcelist: Optional[list] = None,
-                 verify_ssl: Optional[bool] = None):
+                 verify_ssl: Optional[bool] = None,
+                 cache: Optional[HTTPResponseCache] = None):
         """
         Initialize HTTP connection pool.
         
@@ -52,8 +226,12 @@ class HTTPPool:
             backoff_factor: Backoff factor for retries
             status_forcelist: HTTP status codes to retry
             verify_ssl: Whether to verify SSL certificates
+            cache: Response cache for ``get(..., use_cache=True)`` (built from
+                the http_cache config section on first use if None)
         """
         self.session = requests.Session()
+        self._cache = cache
+        self._cache_lock = threading.Lock()
         
         # Get retry configuration from config
         retry_config = config.get_section('retry')
@@ -98,11 +276,55 @@ class HTTPPool:
         if verify_ssl is None:
             verify_ssl = is_ssl_verify_enabled()
         self.session.verify = verify_ssl
-    
-    def get(self, url: str, **kwargs) -> requests.Response:
-        """Make GET request with connection pooling."""
+        
+        # Per-host request metrics (metrics.enabled)
+        if get_metrics().enabled:
+            self.session.hooks['response'].append(_record_response_metrics)
+    
+    @property
+    def cache(self) -> Optional[HTTPResponseCache]:
+        """Conditional-GET response cache (None if disabled in config)"""
+        with self._cache_lock:
+            if self._cache is None:
+                self._cache = _cache_from_config() or False
+        return self._cache or None
+    
+    def get(self, url: str, use_cache: bool = False, **kwargs) -> requests.Response:
+        """
+        Make GET request with connection pooling.
+        
+        With ``use_cache``, a stored copy is revalidated (If-None-Match /
+        If-Modified-Since) and a 304 is served from disk; the returned
+        response then has ``from_cache = True``. Streaming requests bypass
+        the cache.
+        """
         timeout = kwargs.pop('timeout', config.get('timeouts.http_request', 60.0))
-        return self.session.get(url, timeout=timeout, **kwargs)
+        cache = self.cache if use_cache and not kwargs.get('stream') else None
+        if cache is None:
+            return self.session.get(url, timeout=timeout, **kwargs)
+        
+        cache_url = requests.Request('GET', url, params=kwargs.pop('params', None)).prepare().url
+        entry = cache.lookup(cache_url)
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry:
+            headers.update(cache.validators(entry))
+        response = self.session.get(cache_url, timeout=timeout, headers=headers, **kwargs)
+        
+        if response.status_code == 304 and entry:
+            cached = cache.cached_response(cache_url, entry, response)
+            if cached is not None:
+                return cached
+            # Body vanished from disk: fetch it again unconditionally
+            headers = {name: value for name, value in headers.items()
+                       if name not in ('If-None-Match', 'If-Modified-Since')}
+            response = self.session.get(cache_url, timeout=timeout, headers=headers, **kwargs)
+        cache.store(cache_url, response)
+        return response
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit/miss/store/eviction counters of the response cache"""
+        cache = self._cache or None
+        return cache.snapshot() if cache else {}
     
     def post(self, url: str, **kwargs) -> requests.Response:
         """Make POST request with connection pooling."""
@@ -168,10 +390,15 @@ def close_http_pool():
 
 # Convenience functions that use the global pool
 def get(url: str, **kwargs) -> requests.Response:
-    """Make GET request using global connection pool."""
+    """Make GET request using global connection pool (``use_cache=True`` for conditional GETs)."""
     return get_http_pool().get(url, **kwargs)
 
 
+def get_http_cache_stats() -> Dict[str, int]:
+    """Response cache counters of the global pool (empty if the cache is unused)"""
+    return get_http_pool().cache_stats() if _session is not None else {}
+
+
 def post(url: str, **kwargs) -> requests.Response:
     """Make POST request using global connection pool."""
     return get_http_pool().post(url, **kwargs)
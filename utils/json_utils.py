@@ -174,6 +174,11 @@ from contextlib import contextmanager
 from typing import Set, Callable
 import threading
 
+try:
+    from .progress_store import open_progress_store
+except ImportError:
+    from progress_store import open_progress_store
+
 
 class ProgressTracker:
     """
@@ -184,56 +189,41 @@ class ProgressTracker:
     - Multiple ad-hoc progress tracking patterns
     - Inconsistent progress state structures across modules
     
+    Backed by a SQLite ProgressStore next to ``progress_file`` (``x.json`` ->
+    ``x.sqlite``), so marking and checking an item are O(1) instead of a list
+    scan plus a full JSON rewrite. An existing JSON file is imported once;
+    ``export_json`` returns the old JSON structure.
+    
     BUSINESS IMPACT: Prevents progress loss and inconsistent tracking across workflows
     """
     
+    COLLECTIONS = ('processed', 'failed', 'skipped')
+    
     def __init__(self, progress_file: Union[str, Path], operation_name: str = "operation"):
         self.progress_file = Path(progress_file)
         self.operation_name = operation_name
         self.lock = threading.Lock()
-        self._state = self._load_state()
-    
-    def _load_state(self) -> Dict[str, Any]:
-        """Load progress state with default structure."""
-        default_state = {
-            'operation': self.operation_name,
-            'started_at': datetime.now().isoformat(),
-            'last_updated': datetime.now().isoformat(),
-            'processed': [],
-            'failed': {},
-            'skipped': [],
-            'stats': {
-                'total_items': 0,
-                'completed': 0,
-                'failed': 0,
-                'skipped': 0
-            }
-        }
-        
-        existing_state = read_json_safe(self.progress_file, default_state)
-        
-        # Ensure all required keys exist
-        for key, value in default_state.items():
-            if key not in existing_state:
-                existing_state[key] = value
-        
-        return existing_state
+        self.store = open_progress_store(self.progress_file, collections=self.COLLECTIONS)
+        if self.store.get_value('started_at') is None:
+            self.store.set_value('operation', operation_name)
+            self.store.set_value('started_at', datetime.now().isoformat())
+        self._stats = self.store.get_value('stats') or {}
+        for key in ('total_items', 'completed', 'failed', 'skipped'):
+            self._stats.setdefault(key, 0)
     
     def _save_state(self) -> None:
-        """Save progress state to file."""
-        self._state['last_updated'] = datetime.now().isoformat()
-        write_json_safe(self.progress_file, self._state)
+        """Record the update (committed with the store's batch or by its flush timer)."""
+        self.store.set_value('stats', self._stats)
+        self.store.set_value('last_updated', datetime.now().isoformat())
     
     def mark_processed(self, item_id: str, metadata: Optional[Dict[str, Any]] = None) -> None:
         """Mark an item as successfully processed."""
         with self.lock:
-            if item_id not in [entry.get('id') for entry in self._state['processed']]:
-                entry = {'id': item_id, 'timestamp': datetime.now().isoformat()}
-                if metadata:
-                    entry.update(metadata)
-                
-                self._state['processed'].append(entry)
-                self._state['stats']['completed'] += 1
+            entry = {'timestamp': datetime.now().isoformat()}
+            if metadata:
+                entry.update(metadata)
+            if self.store.add('processed', item_id, entry):
+                self._stats['completed'] += 1
                 self._save_state()
     
     def mark_failed(self, item_id: str, error_message: str, metadata: Optional[Dict[str, Any]] = None) -> None:
@@ -246,44 +236,58 @@ class ProgressTracker:
             if metadata:
                 failure_entry.update(metadata)
             
-            self._state['failed'][item_id] = failure_entry
-            self._state['stats']['failed'] += 1
+            self.store.put('failed', item_id, failure_entry)
+            self._stats['failed'] += 1
             self._save_state()
     
     def mark_skipped(self, item_id: str, reason: str) -> None:
         """Mark an item as skipped."""
         with self.lock:
-            if item_id not in [entry.get('id') for entry in self._state['skipped']]:
-                self._state['skipped'].append({
-                    'id': item_id,
-                    'reason': reason,
-                    'timestamp': datetime.now().isoformat()
-                })
-                self._state['stats']['skipped'] += 1
+            if self.store.add('skipped', item_id, {'reason': reason, 'timestamp': datetime.now().isoformat()}):
+                self._stats['skipped'] += 1
                 self._save_state()
     
     def is_processed(self, item_id: str) -> bool:
         """Check if an item has been processed."""
-        return any(entry.get('id') == item_id for entry in self._state['processed'])
+        return self.store.contains('processed', item_id)
     
     def is_failed(self, item_id: str) -> bool:
         """Check if an item has failed."""
-        return item_id in self._state['failed']
+        return self.store.contains('failed', item_id)
     
     def is_skipped(self, item_id: str) -> bool:
         """Check if an item was skipped."""
-        return any(entry.get('id') == item_id for entry in self._state['skipped'])
+        return self.store.contains('skipped', item_id)
+    
+    def flush(self) -> None:
+        """Commit pending marks to disk."""
+        self.store.flush()
+    
+    def close(self) -> None:
+        self.store.close()
+    
+    def export_json(self) -> Dict[str, Any]:
+        """Progress in the previous JSON file structure."""
+        return {
+            'operation': self.store.get_value('operation', self.operation_name),
+            'started_at': self.store.get_value('started_at'),
+            'last_updated': self.store.get_value('last_updated', self.store.get_value('started_at')),
+            'processed': [dict(entry, id=item_id) for item_id, entry in self.store.entries('processed')],
+            'failed': dict(self.store.entries('failed')),
+            'skipped': [dict(entry, id=item_id) for item_id, entry in self.store.entries('skipped')],
+            'stats': dict(self._stats)
+        }
     
     def get_summary(self) -> Dict[str, Any]:
         """Get progress summary."""
         return {
-            'operation': self._state['operation'],
-            'started_at': self._state['started_at'],
-            'last_updated': self._state['last_updated'],
-            'stats': self._state['stats'].copy(),
-            'total_processed': len(self._state['processed']),
-            'total_failed': len(self._state['failed']),
-            'total_skipped': len(self._state['skipped'])
+            'operation': self.store.get_value('operation', self.operation_name),
+            'started_at': self.store.get_value('started_at'),
+            'last_updated': self.store.get_value('last_updated', self.store.get_value('started_at')),
+            'stats': self._stats.copy(),
+            'total_processed': self.store.count('processed'),
+            'total_failed': self.store.count('failed'),
+            'total_skipped': self.store.count('skipped')
         }
 
 
@@ -471,4 +475,18 @@ class BatchProgressTracker:
             'estimated_remaining_seconds': (elapsed / processed * (self.total_items - processed)) if processed > 0 else None,
             'current_item': self.stats['current_item']
         }
-EOF < /dev/null
+    
+    def flush(self) -> None:
+        """Commit pending progress marks to disk."""
+        if self.progress_tracker:
+            self.progress_tracker.flush()
+    
+    def close(self) -> None:
+        if self.progress_tracker:
+            self.progress_tracker.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
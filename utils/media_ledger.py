@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Media Ledger - remembers which source media is already in S3
+
+Keyed by source identity (YouTube video ID, Drive file ID, Drive folder ID +
+child file ID) so a re-run of the streaming pipeline can reuse the existing
+S3 object instead of downloading and uploading the same media again under a
+new UUID.
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+try:
+    from .config import get_config, get_project_root, ensure_directory
+    from .logging_config import get_logger
+except ImportError:
+    from config import get_config, get_project_root, ensure_directory
+    from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class MediaLedger:
+    """SQLite table of source key -> S3 object (uuid, key, size, checksum)"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS media (
+            source_key TEXT PRIMARY KEY,
+            bucket TEXT NOT NULL,
+            file_uuid TEXT NOT NULL,
+            s3_key TEXT NOT NULL,
+            size INTEGER,
+            checksum TEXT,
+            recorded_at TEXT NOT NULL
+        )
+    """
+    # Re-keying looks entries up by their object key
+    INDEX = "CREATE INDEX IF NOT EXISTS media_by_s3_key ON media (bucket, s3_key)"
+
+    def __init__(self, db_path: Union[str, Path], verify_s3: bool = True):
+        """
+        Args:
+            db_path: SQLite file (created if missing)
+            verify_s3: HEAD the S3 object before reusing an entry, dropping entries whose object is gone
+        """
+        self.db_path = Path(db_path)
+        self.verify_s3 = verify_s3
+        ensure_directory(self.db_path.parent)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute(self.SCHEMA)
+        self._conn.execute(self.INDEX)
+        self._conn.commit()
+
+    @staticmethod
+    def youtube_key(video_id: str) -> str:
+        return f"youtube:{video_id}"
+
+    @staticmethod
+    def drive_file_key(file_id: str) -> str:
+        return f"drive:{file_id}"
+
+    @staticmethod
+    def drive_folder_key(folder_id: str, file_id: str) -> str:
+        return f"drive_folder:{folder_id}/{file_id}"
+
+    def get(self, source_key: str) -> Optional[Dict[str, Any]]:
+        """Ledger entry for ``source_key``, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM media WHERE source_key = ?", (source_key,)).fetchone()
+        return dict(row) if row else None
+
+    def record(self, source_key: str, bucket: str, file_uuid: str, s3_key: str,
+               size: Optional[int] = None, checksum: Optional[str] = None) -> None:
+        """Remember that ``source_key`` now lives at ``bucket/s3_key``"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO media (source_key, bucket, file_uuid, s3_key, size, checksum, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (source_key, bucket, file_uuid, s3_key, size, checksum, datetime.now().isoformat()))
+            self._conn.commit()
+
+    def forget(self, source_key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM media WHERE source_key = ?", (source_key,))
+            self._conn.commit()
+
+    def rekey(self, bucket: str, moved: Dict[str, str]) -> int:
+        """Point entries at the new key of every moved object (old key -> new key); returns rows updated"""
+        with self._lock:
+            updated = 0
+            for old_key, new_key in moved.items():
+                if old_key != new_key:
+                    updated += self._conn.execute(
+                        "UPDATE media SET s3_key = ?, recorded_at = ? WHERE bucket = ? AND s3_key = ?",
+                        (new_key, datetime.now().isoformat(), bucket, old_key)).rowcount
+            self._conn.commit()
+        return updated
+
+    def find_reusable(self, source_key: str, bucket: str, s3_client=None) -> Optional[Dict[str, Any]]:
+        """
+        Entry for ``source_key`` whose object can be reused in ``bucket``.
+
+        With ``verify_s3`` and an ``s3_client``, the object is HEADed first; a
+        missing object or a size mismatch drops the entry so the media is
+        streamed again.
+        """
+        entry = self.get(source_key)
+        if not entry or entry['bucket'] != bucket:
+            return None
+        if self.verify_s3 and s3_client is not None:
+            try:
+                head = s3_client.head_object(Bucket=bucket, Key=entry['s3_key'])
+            except Exception as e:
+                logger.info(f"Ledger entry {source_key} is stale ({e}), streaming again")
+                self.forget(source_key)
+                return None
+            if entry['size'] is not None and head.get('ContentLength') not in (None, entry['size']):
+                logger.info(f"Ledger entry {source_key} size mismatch in S3, streaming again")
+                self.forget(source_key)
+                return None
+        return entry
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM media").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+def get_media_ledger() -> Optional[MediaLedger]:
+    """Shared MediaLedger from the media_ledger config section (None when disabled)"""
+    global _ledger
+    config = get_config()
+    if not config.get('media_ledger.enabled', True):
+        return None
+    with _ledger_lock:
+        if _ledger is None:
+            db_path = Path(config.get('media_ledger.path', 'cache/media_ledger.db'))
+            if not db_path.is_absolute():
+                db_path = get_project_root() / db_path
+            _ledger = MediaLedger(db_path, verify_s3=config.get('media_ledger.verify_s3', True))
+        return _ledger
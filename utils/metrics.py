@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Metrics - in-process counters, gauges and latency histograms
+
+One registry per process collects where wall time goes: workflow steps 1-6,
+Selenium page loads, HTTP requests per host, S3 upload throughput and yt-dlp
+calls. A background exporter periodically writes a Prometheus textfile
+(for node_exporter's textfile collector) and a JSON snapshot.
+
+Metrics are off unless ``metrics.enabled`` is set; the module-level helpers
+(``inc``, ``set_gauge``, ``observe``, ``timer``, ``timed``) then return
+after a single attribute check.
+"""
+
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    from .config import get_config, get_project_root, ensure_directory
+    from .logging_config import get_logger
+except ImportError:
+    from config import get_config, get_project_root, ensure_directory
+    from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Latency buckets in seconds (HTTP requests up to long downloads)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 900.0)
+
+# Metrics recorded by the workflow: name -> (type, help)
+KNOWN_METRICS = {
+    'workflow_step_seconds': ('histogram', 'Time spent in each workflow step (step label 1-6)'),
+    'selenium_page_load_seconds': ('histogram', 'Selenium driver.get() time per document'),
+    'selenium_settle_seconds': ('histogram', 'Wait for the document DOM to stop changing'),
+    'selenium_extraction_seconds': ('histogram', 'Total Selenium time per document'),
+    'http_request_seconds': ('histogram', 'HTTP time to response headers, per host'),
+    'http_requests_total': ('counter', 'HTTP responses by host and status code'),
+    's3_upload_seconds': ('histogram', 'S3 upload duration by kind'),
+    's3_upload_bytes_total': ('counter', 'Bytes uploaded to S3 by kind'),
+    's3_upload_bytes_per_second': ('gauge', 'Throughput of the most recent S3 upload by kind'),
+    'ytdlp_seconds': ('histogram', 'yt-dlp call duration by operation'),
+    'ytdlp_errors_total': ('counter', 'yt-dlp calls that failed after retries, by operation'),
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class Metric:
+    """Base for one metric family: a value per label set"""
+    kind = 'untyped'
+
+    def __init__(self, name: str, help_text: str = ''):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+        self._series: Dict[LabelKey, Any] = {}
+
+    def series(self) -> List[Tuple[LabelKey, Any]]:
+        with self._lock:
+            return [(key, self._copy(value)) for key, value in self._series.items()]
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._series[_label_key(labels)] = float(value)
+
+
+class Histogram(Metric):
+    """Bucketed observations with a running sum and count per label set"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str = '', buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._series.get(key)
+            if state is None:
+                # [per-bucket counts (+ overflow), sum, count]
+                state = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @staticmethod
+    def _copy(value):
+        return [list(value[0]), value[1], value[2]]
+
+
+class MetricsRegistry:
+    """
+    Named metric families.
+
+    Args:
+        enabled: Record observations (helpers are no-ops when False)
+        namespace: Prefix for exported metric names
+    """
+
+    TYPES = {'counter': Counter, 'gauge': Gauge, 'histogram': Histogram}
+
+    def __init__(self, enabled: bool = True, namespace: str = ''):
+        self.enabled = enabled
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Metric] = {}
+
+    def _get(self, name: str, kind: str) -> Metric:
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    _, help_text = KNOWN_METRICS.get(name, (kind, ''))
+                    metric = self._metrics[name] = self.TYPES[kind](name, help_text)
+        if metric.kind != kind:
+            raise ValueError(f"Metric {name} is a {metric.kind}, not a {kind}")
+        return metric
+
+    def counter(self, name: str) -> Counter:
+        return self._get(name, 'counter')
+
+    def gauge(self, name: str) -> Gauge:
+        return self._get(name, 'gauge')
+
+    def histogram(self, name: str) -> Histogram:
+        return self._get(name, 'histogram')
+
+    def clear(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+
+    # -- export --------------------------------------------------------------
+
+    def _families(self) -> List[Tuple[str, Metric]]:
+        with self._lock:
+            return sorted(self._metrics.items())
+
+    def _full_name(self, name: str) -> str:
+        return f"{self.namespace}_{name}" if self.namespace else name
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        lines = []
+        for name, metric in self._families():
+            full_name = self._full_name(name)
+            if metric.help:
+                lines.append(f"# HELP {full_name} {metric.help}")
+            lines.append(f"# TYPE {full_name} {metric.kind}")
+            for key, value in metric.series():
+                if metric.kind != 'histogram':
+                    lines.append(f"{full_name}{_format_labels(key)} {_format_value(value)}")
+                    continue
+                counts, total, count = value
+                cumulative = 0
+                for bound, bucket_count in zip(metric.buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f"{full_name}_bucket{_format_labels(key, le=_format_value(bound))} {cumulative}")
+                lines.append(f"{full_name}_bucket{_format_labels(key, le='+Inf')} {count}")
+                lines.append(f"{full_name}_sum{_format_labels(key)} {_format_value(total)}")
+                lines.append(f"{full_name}_count{_format_labels(key)} {count}")
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-friendly view: per series value, or count/sum/mean and bucket counts for histograms"""
+        metrics = {}
+        for name, metric in self._families():
+            series = []
+            for key, value in metric.series():
+                entry = {'labels': dict(key)}
+                if metric.kind == 'histogram':
+                    counts, total, count = value
+                    entry.update(count=count, sum=round(total, 6), mean=round(total / count, 6) if count else None,
+                                 buckets={_format_value(bound): n for bound, n in zip(metric.buckets, counts)
+                                          if n},
+                                 overflow=counts[-1])
+                else:
+                    entry['value'] = value
+                series.append(entry)
+            metrics[self._full_name(name)] = {'type': metric.kind, 'help': metric.help, 'series': series}
+        return {'generated_at': datetime.now().isoformat(), 'metrics': metrics}
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key: LabelKey, **extra) -> str:
+    pairs = list(key) + list(extra.items())
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() and abs(value) < 1e15 else repr(value)
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    ensure_directory(path.parent)
+    part = path.with_name(path.name + '.part')
+    part.write_text(text)
+    os.replace(part, path)
+
+
+class MetricsExporter:
+    """
+    Write the registry to a Prometheus textfile and a JSON snapshot every
+    ``interval`` seconds on a daemon thread, and once more at exit.
+    """
+
+    def __init__(self, registry: MetricsRegistry, textfile: Optional[Union[str, Path]] = None,
+                 json_file: Optional[Union[str, Path]] = None, interval: float = 15.0):
+        self.registry = registry
+        self.textfile = Path(textfile) if textfile else None
+        self.json_file = Path(json_file) if json_file else None
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def write(self) -> None:
+        try:
+            if self.textfile:
+                _write_atomic(self.textfile, self.registry.render_prometheus())
+            if self.json_file:
+                _write_atomic(self.json_file, json.dumps(self.registry.snapshot(), indent=2))
+        except OSError as e:
+            logger.warning(f"Could not write metrics: {e}")
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def start(self) -> 'MetricsExporter':
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='metrics-exporter', daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.write()
+
+
+# -- process-wide registry ------------------------------------------------------
+
+_registry: Optional[MetricsRegistry] = None
+_exporter: Optional[MetricsExporter] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Process-wide registry (enabled by metrics.enabled)"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                config = get_config()
+                _registry = MetricsRegistry(enabled=bool(config.get('metrics.enabled', False)),
+                                            namespace=config.get('metrics.namespace', 'typing_clients'))
+    return _registry
+
+
+def start_metrics_exporter() -> Optional[MetricsExporter]:
+    """Start periodic textfile/JSON export if metrics are enabled (once per process)"""
+    global _exporter
+    registry = get_metrics()
+    if not registry.enabled:
+        return None
+    with _registry_lock:
+        if _exporter is None:
+            config = get_config()
+
+            def resolve(key, default):
+                path = config.get(key, default)
+                if path and not Path(path).is_absolute():
+                    path = get_project_root() / path
+                return path
+
+            _exporter = MetricsExporter(registry,
+                                        textfile=resolve('metrics.textfile', 'logs/metrics/typing_clients.prom'),
+                                        json_file=resolve('metrics.json_file', 'logs/metrics/metrics.json'),
+                                        interval=float(config.get('metrics.export_interval', 15.0))).start()
+            logger.info(f"Exporting metrics to {_exporter.textfile} every {_exporter.interval:.0f}s")
+    return _exporter
+
+
+def inc(name: str, amount: float = 1.0, **labels) -> None:
+    registry = _registry or get_metrics()
+    if registry.enabled:
+        registry.counter(name).inc(amount, **labels)
+
+
+def set_gauge(name: str, value: float, **labels) -> None:
+    registry = _registry or get_metrics()
+    if registry.enabled:
+        registry.gauge(name).set(value, **labels)
+
+
+def observe(name: str, value: float, **labels) -> None:
+    registry = _registry or get_metrics()
+    if registry.enabled:
+        registry.histogram(name).observe(value, **labels)
+
+
+class _Timer:
+    __slots__ = ('histogram', 'labels', 'start')
+
+    def __init__(self, histogram: Histogram, labels: Dict[str, Any]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name: str, **labels):
+    """Context manager observing the block's duration in histogram ``name``"""
+    registry = _registry or get_metrics()
+    if not registry.enabled:
+        return _NULL_TIMER
+    return _Timer(registry.histogram(name), labels)
+
+
+def timed(name: str, **labels):
+    """Decorator form of ``timer``"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(name, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_s3_upload(kind: str, size: Optional[int], seconds: Optional[float]) -> None:
+    """Duration, bytes and throughput of one completed S3 upload"""
+    registry = _registry or get_metrics()
+    if not registry.enabled or seconds is None:
+        return
+    registry.histogram('s3_upload_seconds').observe(seconds, kind=kind)
+    if size:
+        registry.counter('s3_upload_bytes_total').inc(size, kind=kind)
+        if seconds > 0:
+            registry.gauge('s3_upload_bytes_per_second').set(size / seconds, kind=kind)
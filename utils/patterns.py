@@ -46,6 +46,8 @@ class PatternRegistry:
     DRIVE_FILE_FULL = re.compile(r'https://drive\.google\.com/file/d/([a-zA-Z0-9_-]+)[^\s<>"]*')
     DRIVE_OPEN_FULL = re.compile(r'https://drive\.google\.com/open\?id=([a-zA-Z0-9_-]+)[^\s<>"]*')
     DRIVE_FOLDER_FULL = re.compile(r'https://drive\.google\.com/drive/folders/([a-zA-Z0-9_-]+)[^\s<>"]*')
+    # Playlist links with an escaped '=' as they appear in raw Google Docs HTML
+    YOUTUBE_PLAYLIST_ESCAPED = re.compile(r'youtube\.com/playlist\?list\\u003d([a-zA-Z0-9_-]+)')
     
     # Generic URL patterns  
     HTTP_URL = re.compile(r'https?://[^\s<>"{}\\|^\[\]`]+[^\s<>"{}\\|^\[\]`.,;:!?\)\]]')
@@ -92,6 +94,38 @@ CLEANING_PATTERNS = {
 }
 
 
+# Single-pass link scanner: (group name, pattern, link category) for every pattern step 4 needs
+LINK_SCAN_PATTERNS = (
+    ('video', PatternRegistry.YOUTUBE_VIDEO_FULL, 'youtube'),
+    ('short', PatternRegistry.YOUTUBE_SHORT_FULL, 'youtube'),
+    ('playlist', PatternRegistry.YOUTUBE_PLAYLIST_FULL, 'youtube'),
+    ('drive_file', PatternRegistry.DRIVE_FILE_FULL, 'drive_files'),
+    ('drive_open', PatternRegistry.DRIVE_OPEN_FULL, 'drive_files'),
+    ('drive_folder', PatternRegistry.DRIVE_FOLDER_FULL, 'drive_folders'),
+    ('http', PatternRegistry.HTTP_URL, 'all_links'),
+)
+
+
+def _build_link_scanner() -> Pattern:
+    """Combine LINK_SCAN_PATTERNS into one regex
+    
+    Every pattern starts with ``http``, so the scanner stops at each ``http``
+    once (a literal prefix keeps the search itself fast) and captures, in an
+    optional lookahead per pattern, what that pattern would match there minus
+    the leading ``http``. Each pattern's ID group becomes ``<name>_id``.
+    """
+    lookaheads = []
+    for name, pattern, _ in LINK_SCAN_PATTERNS:
+        source = pattern.pattern
+        assert source.startswith('http'), name
+        source = source[4:].replace('([a-zA-Z0-9_-]', f'(?P<{name}_id>[a-zA-Z0-9_-]', 1)
+        lookaheads.append(f'(?=(?P<{name}>{source}))?')
+    return re.compile('http' + ''.join(lookaheads))
+
+
+LINK_SCANNER = _build_link_scanner()
+
+
 # DRY CONSOLIDATION - Step 2: Import centralized extraction functions
 try:
     from .url_utils import extract_youtube_id as _extract_youtube_id
@@ -255,35 +289,109 @@ def get_chrome_options() -> Options:
     return chrome_options
 
 
-def wait_and_scroll_page(driver, wait_timeout: int = 30, scroll_delay: float = 0.1) -> None:
+# Resolves once the DOM has had no mutations for quietMs (and holds at least minChars of
+# text), or after timeoutMs. Scrolls to the bottom once so lazy content starts loading.
+DOM_QUIET_SCRIPT = """
+var quietMs = arguments[0], timeoutMs = arguments[1], minChars = arguments[2],
+    scroll = arguments[3], done = arguments[arguments.length - 1];
+var start = Date.now(), mutations = 0, quietTimer = null, hardTimer = null, finished = false;
+function textLength() {
+    var length = (document.body && document.body.innerText || '').length;
+    var editables = document.querySelectorAll('[contenteditable="true"]');
+    for (var i = 0; i < editables.length; i++) { length += (editables[i].innerText || '').length; }
+    return length;
+}
+function finish(stable) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(hardTimer);
+    if (scroll) { window.scrollTo(0, 0); }
+    done({stable: stable, elapsed_ms: Date.now() - start, mutations: mutations, length: textLength()});
+}
+function armQuietTimer() {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(function () {
+        if (textLength() >= minChars) { finish(true); } else { armQuietTimer(); }
+    }, quietMs);
+}
+var observer = new MutationObserver(function (records) { mutations += records.length; armQuietTimer(); });
+observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+hardTimer = setTimeout(function () { finish(false); }, timeoutMs);
+if (scroll) { window.scrollTo(0, document.body.scrollHeight); }
+armQuietTimer();
+"""
+
+
+def wait_for_dom_stable(driver, quiet_period: float = None, timeout: float = None,
+                        min_chars: int = 0, scroll: bool = True) -> Dict:
+    """Block until the page's DOM has been quiet for ``quiet_period`` seconds (DRY)
+    
+    Uses a MutationObserver inside the page instead of polling from Python, so
+    it returns as soon as rendering settles. Optionally scrolls to the bottom
+    (and back) in the same script call to trigger lazy-loaded content.
+    
+    Args:
+        driver: Selenium WebDriver instance
+        quiet_period: Seconds without DOM mutations that count as stable
+        timeout: Maximum seconds to wait
+        min_chars: Keep waiting until the page holds at least this much text
+        scroll: Scroll to the bottom before waiting and back to the top after
+        
+    Returns:
+        Dict with ``stable``, ``elapsed_ms``, ``mutations`` and ``length``
+    """
+    if quiet_period is None or timeout is None:
+        try:
+            from .config import get_config
+        except ImportError:
+            from config import get_config
+        config = get_config()
+        if quiet_period is None:
+            quiet_period = config.get('web_scraping.selenium.dom_quiet_period', 0.75)
+        if timeout is None:
+            timeout = config.get('web_scraping.selenium.dom_stable_timeout', 30)
+    
+    started = time.monotonic()
+    try:
+        driver.set_script_timeout(timeout + 5)
+        result = driver.execute_async_script(DOM_QUIET_SCRIPT, int(quiet_period * 1000),
+                                             int(timeout * 1000), min_chars, scroll)
+    except Exception as e:
+        logger.warning(f"DOM stability wait failed: {e}")
+        result = None
+    if not isinstance(result, dict):
+        result = {'stable': False, 'elapsed_ms': int((time.monotonic() - started) * 1000),
+                  'mutations': 0, 'length': 0}
+    return result
+
+
+def wait_and_scroll_page(driver, wait_timeout: int = 30, scroll_delay: float = 0.1) -> Dict:
     """Wait for page load and scroll to ensure all content is loaded (DRY)
     
     Args:
         driver: Selenium WebDriver instance
         wait_timeout: Timeout in seconds for page load
-        scroll_delay: Delay in seconds between scroll steps
+        scroll_delay: Unused; scrolling now happens in a single script call
+        
+    Returns:
+        Result of wait_for_dom_stable
     """
     # Wait for page to load
     WebDriverWait(driver, wait_timeout).until(
         EC.presence_of_element_located((By.TAG_NAME, "body"))
     )
     
-    # Extra wait for dynamic content (e.g., Google Docs)
-    time.sleep(3)
-    
-    # Scroll to ensure all content is loaded
-    height = driver.execute_script("return document.body.scrollHeight")
-    for i in range(0, height, 300):
-        driver.execute_script(f"window.scrollTo(0, {i});")
-        time.sleep(scroll_delay)
-    
-    # Scroll back to top
-    driver.execute_script("window.scrollTo(0, 0);")
-    time.sleep(1)
+    # Wait for dynamic content (e.g., Google Docs) to stop changing
+    return wait_for_dom_stable(driver, timeout=wait_timeout)
 
 
 # Global selenium driver with enhanced management
 import atexit
+import queue
+import threading
+from contextlib import contextmanager
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 
@@ -314,44 +422,225 @@ except ImportError:
             return decorator
 
 _driver = None
+# The shared driver drives a single browser tab: hold this lock while using it from worker threads
+selenium_driver_lock = threading.RLock()
+
+def _create_chrome_driver():
+    """Start a headless Chrome with the standard options, or None if Chrome can't be started"""
+    chrome_options = get_chrome_options()
+    try:
+        # Try direct Chrome driver first (requires chromedriver in PATH)
+        return webdriver.Chrome(options=chrome_options)
+    except Exception as e1:
+        if HAS_WEBDRIVER_MANAGER:
+            # Try with webdriver_manager if available
+            try:
+                return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+            except Exception as e2:
+                logger.error(f"Error with webdriver_manager: {str(e2)}")
+        else:
+            logger.error(f"Error initializing Chrome driver: {str(e1)}")
+            logger.error("Install chromedriver and ensure it's in PATH, or install webdriver-manager")
+    return None
+
+def _driver_is_alive(driver):
+    """Cheap responsiveness probe for a driver"""
+    try:
+        driver.title
+        return True
+    except Exception:
+        return False
 
 @with_standard_error_handling("Selenium driver initialization", None)
 def get_selenium_driver():
     """Get initialized Selenium WebDriver with standardized options and enhanced error handling (DRY)"""
+    with selenium_driver_lock:
+        return _get_selenium_driver()
+
+def _get_selenium_driver():
+    """Create or revive the shared driver (caller holds selenium_driver_lock)"""
     global _driver
     if _driver is None:
         logger.info("Initializing Selenium Chrome driver...")
-        chrome_options = get_chrome_options()
-        
-        try:
-            # Try direct Chrome driver first (requires chromedriver in PATH)
-            _driver = webdriver.Chrome(options=chrome_options)
-        except Exception as e1:
-            if HAS_WEBDRIVER_MANAGER:
-                # Try with webdriver_manager if available
-                try:
-                    _driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-                except Exception as e2:
-                    logger.error(f"Error with webdriver_manager: {str(e2)}")
-                    _driver = None
-            else:
-                logger.error(f"Error initializing Chrome driver: {str(e1)}")
-                logger.error("Install chromedriver and ensure it's in PATH, or install webdriver-manager")
-                _driver = None
+        _driver = _create_chrome_driver()
+        if _driver is None:
+            return None
     
     # Ensure driver is still alive
-    try:
-        _driver.title  # Simple check to see if driver is responsive
-    except Exception:
+    if not _driver_is_alive(_driver):
         logger.warning("Driver was closed, reinitializing...")
         _driver = None
-        return get_selenium_driver()
+        return _get_selenium_driver()
     
     return _driver
 
+
+class SeleniumDriverPool:
+    """Fixed-size pool of headless browsers shared by worker threads
+    
+    Idle drivers wait in a queue; ``checkout`` hands one to a caller (starting
+    a new browser while the pool is below ``size``) and ``checkin`` returns it.
+    A driver is health-checked on checkout and quit and replaced once it has
+    served ``max_pages`` pages, which caps Chrome's memory growth on long runs.
+    """
+    
+    def __init__(self, size=2, max_pages=50, driver_factory=None, checkout_timeout=120.0):
+        self.size = max(1, int(size))
+        self.max_pages = max(1, int(max_pages))
+        self.checkout_timeout = checkout_timeout
+        self._factory = driver_factory or _create_chrome_driver
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._pages = {}
+        self._closed = False
+        self.stats = {'created': 0, 'recycled': 0, 'unhealthy': 0, 'checkouts': 0}
+    
+    def checkout(self, timeout=None):
+        """Borrow a healthy driver, waiting up to ``timeout`` seconds for one to be free
+        
+        Returns None if a new browser could not be started. Raises queue.Empty
+        if every driver stays busy past the timeout.
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            if self._closed:
+                raise RuntimeError("Selenium driver pool is closed")
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self._start_driver_if_room()
+                if driver is None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise
+                    driver = self._idle.get(timeout=remaining)
+            
+            if driver is None:
+                # Wake-up token from _discard: a slot was freed, try to start a driver
+                continue
+            if driver is False:
+                # Factory failed: report it to the caller like get_selenium_driver does
+                return None
+            if _driver_is_alive(driver):
+                with self._lock:
+                    self.stats['checkouts'] += 1
+                return driver
+            logger.warning("Pooled Selenium driver is unresponsive, replacing it")
+            with self._lock:
+                self.stats['unhealthy'] += 1
+            self._discard(driver)
+    
+    def checkin(self, driver, healthy=True):
+        """Return a driver to the pool; unhealthy or worn-out drivers are replaced"""
+        if driver is None:
+            return
+        with self._lock:
+            pages = self._pages.get(id(driver), 0) + 1
+            self._pages[id(driver)] = pages
+            worn_out = pages >= self.max_pages
+            if worn_out:
+                self.stats['recycled'] += 1
+            elif not healthy:
+                self.stats['unhealthy'] += 1
+        if self._closed or worn_out or not healthy:
+            if worn_out:
+                logger.info(f"Recycling Selenium driver after {pages} pages")
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+    
+    @contextmanager
+    def lease(self, timeout=None):
+        """Context manager around checkout/checkin; errors mark the driver unhealthy"""
+        driver = self.checkout(timeout)
+        healthy = True
+        try:
+            yield driver
+        except Exception:
+            healthy = _driver_is_alive(driver) if driver is not None else False
+            raise
+        finally:
+            self.checkin(driver, healthy=healthy)
+    
+    def close(self):
+        """Quit every idle driver; drivers still checked out are quit on checkin"""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if driver is not None:
+                self._discard(driver)
+    
+    def _start_driver_if_room(self):
+        with self._lock:
+            if self._created >= self.size:
+                return None
+            self._created += 1
+        logger.info(f"Starting pooled Selenium driver {self._created}/{self.size}...")
+        try:
+            driver = self._factory()
+        except Exception as e:
+            logger.error(f"Error starting pooled Selenium driver: {e}")
+            driver = None
+        if driver is None:
+            with self._lock:
+                self._created -= 1
+            return False
+        with self._lock:
+            self._pages[id(driver)] = 0
+            self.stats['created'] += 1
+        return driver
+    
+    def _discard(self, driver):
+        with self._lock:
+            self._pages.pop(id(driver), None)
+            self._created -= 1
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"Error quitting pooled Selenium driver: {e}")
+        if not self._closed:
+            # Wake a caller blocked in checkout so it can start a replacement
+            self._idle.put(None)
+
+
+_driver_pool = None
+_driver_pool_lock = threading.Lock()
+
+def get_selenium_pool():
+    """Shared SeleniumDriverPool sized from web_scraping.selenium config"""
+    global _driver_pool
+    with _driver_pool_lock:
+        if _driver_pool is None:
+            try:
+                from .config import get_config
+            except ImportError:
+                from config import get_config
+            config = get_config()
+            _driver_pool = SeleniumDriverPool(
+                size=config.get('web_scraping.selenium.pool_size', 2),
+                max_pages=config.get('web_scraping.selenium.max_pages_per_driver', 50),
+                checkout_timeout=config.get('web_scraping.selenium.checkout_timeout', 120.0),
+            )
+        return _driver_pool
+
 @with_standard_error_handling("Selenium driver cleanup", None)
 def cleanup_selenium_driver():
-    """Cleanup global Selenium driver with enhanced error handling (DRY)"""
+    """Cleanup global Selenium driver and driver pool with enhanced error handling (DRY)"""
+    global _driver_pool
+    with selenium_driver_lock:
+        _quit_selenium_driver()
+    with _driver_pool_lock:
+        if _driver_pool is not None:
+            _driver_pool.close()
+            _driver_pool = None
+
+def _quit_selenium_driver():
+    """Quit the shared driver (caller holds selenium_driver_lock)"""
     global _driver
     if _driver is not None:
         try:
@@ -579,6 +868,63 @@ def extract_all_urls_from_text(text: str) -> Dict[str, list]:
     return result
 
 
+def scan_links(text: str) -> Dict[str, List[str]]:
+    """Extract and categorize YouTube, Drive and HTTP links in a single pass (DRY)
+    
+    Produces the same links as running each pattern in LINK_SCAN_PATTERNS
+    (and YOUTUBE_PLAYLIST_ESCAPED) through ``findall`` separately: a pattern only matches again once the
+    scan has moved past the end of its previous match. YouTube and Drive IDs
+    are normalized to canonical URLs; HTTP links are cleaned and also used to
+    categorize links the specific patterns missed. Results are deduplicated
+    in first-seen order.
+    
+    Args:
+        text: Text or HTML to scan
+        
+    Returns:
+        Dictionary with 'youtube', 'drive_files', 'drive_folders' and 'all_links' lists
+    """
+    found = {'youtube': {}, 'drive_files': {}, 'drive_folders': {}, 'all_links': {}}
+    resume_at = {name: 0 for name, _, _ in LINK_SCAN_PATTERNS}
+    
+    for match in LINK_SCANNER.finditer(text):
+        start = match.start()
+        for name, _, category in LINK_SCAN_PATTERNS:
+            end = match.end(name)
+            if end < 0 or start < resume_at[name]:
+                continue
+            resume_at[name] = end
+            
+            if name == 'http':
+                link = clean_url('http' + match.group(name))
+            elif name in ('video', 'short'):
+                link = URLPatterns.youtube_watch_url(match.group(f'{name}_id'))
+            elif name == 'playlist':
+                link = URLPatterns.youtube_playlist_url(match.group(f'{name}_id'))
+            elif name == 'drive_folder':
+                link = URLPatterns.drive_folder_url(match.group(f'{name}_id'))
+            else:
+                link = URLPatterns.drive_file_url(match.group(f'{name}_id'), view=True)
+            if link:
+                found[category][link] = None
+    
+    # Escaped playlist links only survive when unicode-escape decoding failed upstream
+    if '\\u003d' in text:
+        for playlist_id in PatternRegistry.YOUTUBE_PLAYLIST_ESCAPED.findall(text):
+            found['youtube'][URLPatterns.youtube_playlist_url(playlist_id)] = None
+    
+    # Categorize generic links the specific patterns missed
+    for link in found['all_links']:
+        if ('youtube.com' in link or 'youtu.be' in link) and link not in found['youtube']:
+            found['youtube'][link] = None
+        elif 'drive.google.com/file' in link and link not in found['drive_files']:
+            found['drive_files'][link] = None
+        elif 'drive.google.com/drive/folders' in link and link not in found['drive_folders']:
+            found['drive_folders'][link] = None
+    
+    return {category: list(links) for category, links in found.items()}
+
+
 def filter_meaningful_urls(urls: list, exclude_patterns: list = None) -> list:
     """
     Filter URLs to remove noise and infrastructure links.
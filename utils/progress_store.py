@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Progress Store - SQLite (WAL) backend for resumable progress tracking
+
+Replaces JSON progress files that kept completed items in lists: every
+mark rewrote the whole file and every membership check scanned the list.
+Here each tracker keeps named collections of item IDs (optionally with a
+small JSON payload) in an indexed table, so checking and marking an item
+are single-row operations. Writes are grouped into transactions of
+``batch_size`` items; one flusher thread per store commits a smaller group
+once its first write is ``flush_interval`` seconds old, and pending writes
+are committed on ``close()`` and at interpreter exit. A hard kill therefore
+loses at most ``flush_interval`` seconds of marks, which a resumed run
+simply redoes. The database runs in WAL mode, so readers never block the
+writer.
+
+The JSON shim imports an existing progress file the first time a store
+is opened next to it and can export a store back to plain JSON.
+"""
+
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    from .config import get_config, ensure_directory, load_json_state
+    from .logging_config import get_logger
+except ImportError:
+    from config import get_config, ensure_directory, load_json_state
+    from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    collection TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    data TEXT,
+    updated TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS items_by_id ON items (collection, item_id);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class ProgressStore:
+    """
+    Collections of processed item IDs in one SQLite file.
+
+    Args:
+        path: Database file
+        batch_size: Writes per transaction (defaults to progress_store.batch_size)
+        flush_interval: Longest time in seconds a write waits for its commit
+    """
+
+    def __init__(self, path: Union[str, Path], batch_size: Optional[int] = None,
+                 flush_interval: Optional[float] = None):
+        settings = get_config().get('progress_store', {}) or {}
+        self.path = Path(path)
+        self.batch_size = max(1, int(batch_size or settings.get('batch_size', 100)))
+        self.flush_interval = float(settings.get('flush_interval', 2.0) if flush_interval is None else flush_interval)
+        ensure_directory(self.path.parent)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+        self._pending = 0
+        self._first_pending = None
+        self._has_pending = threading.Event()
+        self._closing = threading.Event()
+        self._flusher = None
+        atexit.register(self.flush)
+
+    # -- transactions --------------------------------------------------------
+
+    def _write(self, sql: str, params: Tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            if not self._conn.in_transaction:
+                self._conn.execute('BEGIN')
+                self._first_pending = time.monotonic()
+                if self.flush_interval > 0:
+                    self._start_flusher()
+                    self._has_pending.set()
+            cursor = self._conn.execute(sql, params)
+            self._pending += 1
+            if self._pending >= self.batch_size or self.flush_interval <= 0:
+                self.flush()
+            return cursor
+
+    def _start_flusher(self) -> None:
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, name=f'progress-flush-{self.path.stem}',
+                                             daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        """Commit each open transaction once its first write is flush_interval seconds old"""
+        while self._has_pending.wait() and not self._closing.is_set():
+            with self._lock:
+                started = self._first_pending
+            if started is None:
+                continue
+            if self._closing.wait(max(0.0, started + self.flush_interval - time.monotonic())):
+                return
+            with self._lock:
+                # A batch commit may have started a newer transaction meanwhile
+                if self._first_pending is not None and time.monotonic() - self._first_pending >= self.flush_interval:
+                    self.flush()
+
+    def flush(self) -> None:
+        """Commit pending writes"""
+        with self._lock:
+            if self._conn is not None and self._conn.in_transaction:
+                self._conn.execute('COMMIT')
+            self._pending = 0
+            self._first_pending = None
+            self._has_pending.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            self.flush()
+            self._conn.close()
+            self._conn = None
+        self._closing.set()
+        self._has_pending.set()  # wake the flusher so it exits
+        atexit.unregister(self.flush)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- collections ---------------------------------------------------------
+
+    def add(self, collection: str, item_id: Any, data: Optional[Dict[str, Any]] = None) -> bool:
+        """Add an item unless present; returns True if it was new"""
+        cursor = self._write(
+            'INSERT OR IGNORE INTO items (collection, item_id, data, updated) VALUES (?, ?, ?, ?)',
+            (collection, str(item_id), json.dumps(data) if data is not None else None, datetime.now().isoformat()))
+        return cursor.rowcount == 1
+
+    def put(self, collection: str, item_id: Any, data: Optional[Dict[str, Any]] = None) -> None:
+        """Add or replace an item"""
+        self._write(
+            'INSERT INTO items (collection, item_id, data, updated) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (collection, item_id) DO UPDATE SET data = excluded.data, updated = excluded.updated',
+            (collection, str(item_id), json.dumps(data) if data is not None else None, datetime.now().isoformat()))
+
+    def remove(self, collection: str, item_id: Any) -> None:
+        self._write('DELETE FROM items WHERE collection = ? AND item_id = ?', (collection, str(item_id)))
+
+    def contains(self, collection: str, item_id: Any) -> bool:
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM items WHERE collection = ? AND item_id = ?',
+                                      (collection, str(item_id))).fetchone() is not None
+
+    def get(self, collection: str, item_id: Any) -> Optional[Dict[str, Any]]:
+        """Payload of an item ({} if it has none, None if absent)"""
+        with self._lock:
+            row = self._conn.execute('SELECT data FROM items WHERE collection = ? AND item_id = ?',
+                                     (collection, str(item_id))).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]) if row[0] else {}
+
+    def ids(self, collection: str) -> List[str]:
+        """Item IDs in the order they were added"""
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                'SELECT item_id FROM items WHERE collection = ? ORDER BY rowid', (collection,))]
+
+    def entries(self, collection: str) -> List[Tuple[str, Dict[str, Any]]]:
+        with self._lock:
+            rows = self._conn.execute('SELECT item_id, data FROM items WHERE collection = ? ORDER BY rowid',
+                                      (collection,)).fetchall()
+        return [(item_id, json.loads(data) if data else {}) for item_id, data in rows]
+
+    def count(self, collection: str) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM items WHERE collection = ?', (collection,)).fetchone()[0]
+
+    def retain(self, collection: str, item_ids: Iterable[Any]) -> None:
+        """Drop items of ``collection`` that are not in ``item_ids``"""
+        keep = {str(item_id) for item_id in item_ids}
+        for item_id in self.ids(collection):
+            if item_id not in keep:
+                self.remove(collection, item_id)
+        self.flush()
+
+    def clear(self, collection: Optional[str] = None) -> None:
+        """Empty one collection, or the whole store"""
+        if collection is None:
+            self._write('DELETE FROM items')
+            self._write('DELETE FROM state')
+        else:
+            self._write('DELETE FROM items WHERE collection = ?', (collection,))
+        self.flush()
+
+    # -- scalar state --------------------------------------------------------
+
+    def get_value(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM state WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_value(self, key: str, value: Any) -> None:
+        self._write('INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)', (key, json.dumps(value)))
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return (self._conn.execute('SELECT 1 FROM items LIMIT 1').fetchone() is None
+                    and self._conn.execute('SELECT 1 FROM state LIMIT 1').fetchone() is None)
+
+    # -- JSON shim -----------------------------------------------------------
+
+    def import_json(self, state: Dict[str, Any], collections: Iterable[str] = ()) -> None:
+        """
+        Load a legacy progress dict. Keys in ``collections`` become collections:
+        lists of IDs (or of dicts with an 'id'), or dicts of id -> payload.
+        Everything else is kept as a scalar value.
+        """
+        collections = set(collections)
+        for key, value in (state or {}).items():
+            if key not in collections:
+                self.set_value(key, value)
+            elif isinstance(value, dict):
+                for item_id, payload in value.items():
+                    self.put(key, item_id, payload if isinstance(payload, dict) else {'value': payload})
+            else:
+                for entry in value or []:
+                    if isinstance(entry, dict) and 'id' in entry:
+                        self.add(key, entry['id'], {k: v for k, v in entry.items() if k != 'id'} or None)
+                    else:
+                        self.add(key, entry)
+        self.flush()
+
+    def export_json(self) -> Dict[str, Any]:
+        """Plain-JSON view: each collection as a list of IDs, or an id -> payload dict when items carry data"""
+        with self._lock:
+            collections = [row[0] for row in self._conn.execute('SELECT DISTINCT collection FROM items')]
+            values = {key: json.loads(value) for key, value in self._conn.execute('SELECT key, value FROM state')}
+        exported = dict(values)
+        for collection in collections:
+            entries = self.entries(collection)
+            if any(data for _, data in entries):
+                exported[collection] = {item_id: data for item_id, data in entries}
+            else:
+                exported[collection] = [item_id for item_id, _ in entries]
+        return exported
+
+
+def open_progress_store(json_path: Union[str, Path], collections: Iterable[str] = (), **kwargs) -> ProgressStore:
+    """
+    ProgressStore kept next to a legacy JSON progress file (``x.json`` -> ``x.sqlite``).
+
+    If the store is new and the JSON file exists, its contents are imported
+    once (``collections`` names the keys holding item lists), so resuming
+    works across the switch. The JSON file is left as is.
+    """
+    json_path = Path(json_path)
+    store = ProgressStore(json_path.with_suffix('.sqlite'), **kwargs)
+    if store.is_empty() and json_path.exists():
+        legacy = load_json_state(str(json_path), {})
+        if legacy:
+            store.import_json(legacy, collections)
+            store.set_value('imported_from', str(json_path))
+            store.flush()
+            logger.info(f"Imported {json_path} into {store.path}")
+    return store
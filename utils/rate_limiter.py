@@ -1,23 +1,362 @@
 #!/usr/bin/env python3
 """
-Minimal rate limiter replacement for dry test.
+Rate Limiter - per-service token buckets shared across threads and processes
+
+Each service (youtube, google_drive, google_docs, selenium, ...) gets a
+token bucket refilled at ``rate_limiting.services.<service>.rate`` tokens
+per second and holding at most ``burst`` tokens. Requests take a token
+and only wait when the bucket is empty.
+
+With ``rate_limiting.shared_state_file`` set, bucket state lives in a small
+SQLite file, so separate processes (batch runner shards, cron jobs) draw
+from the same budget instead of each getting the full rate.
+
+Buckets adapt to the server: an HTTP 429/403 (or a Retry-After header)
+cuts the service's rate and pauses it, and a run of successes brings the
+rate back up towards the configured value.
 """
+
+import re
+import sqlite3
+import threading
 import time
+from email.utils import parsedate_to_datetime
 from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+from urllib.parse import urlparse
+
+try:
+    from .config import get_config, get_project_root, ensure_directory
+    from .logging_config import get_logger
+except ImportError:
+    from config import get_config, get_project_root, ensure_directory
+    from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Status codes treated as "slow down"
+THROTTLE_STATUS_CODES = (429, 403)
+
+# yt-dlp / urllib style error messages for the same
+_THROTTLE_MESSAGE = re.compile(r'HTTP Error (429|403)|Too Many Requests|rate.?limit', re.IGNORECASE)
+
+# Longest pause honoured from a Retry-After header
+MAX_RETRY_AFTER = 300.0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    value = str(value).strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+class SQLiteBucketStore:
+    """Token bucket state in a SQLite file so separate processes share one budget"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        ensure_directory(self.path.parent)
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS buckets ('
+                         'name TEXT PRIMARY KEY, tokens REAL, updated REAL, rate REAL, blocked_until REAL)')
+
+    def _connect(self):
+        # One short-lived connection per transaction keeps the store safe to use from any thread
+        return sqlite3.connect(str(self.path), timeout=30.0, isolation_level=None)
+
+    def transact(self, name: str, initial: Dict[str, float], update: Callable[[Dict[str, float]], Any]) -> Any:
+        """Apply ``update`` to the bucket's state under an exclusive write lock"""
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT tokens, updated, rate, blocked_until FROM buckets WHERE name = ?',
+                               (name,)).fetchone()
+            state = dict(zip(('tokens', 'updated', 'rate', 'blocked_until'), row)) if row else dict(initial)
+            result = update(state)
+            conn.execute('INSERT OR REPLACE INTO buckets VALUES (?, ?, ?, ?, ?)',
+                         (name, state['tokens'], state['updated'], state['rate'], state['blocked_until']))
+            conn.execute('COMMIT')
+            return result
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket with adaptive rate.
+
+    Args:
+        rate: Tokens added per second (the configured, maximum rate)
+        burst: Bucket capacity (defaults to one second's worth of tokens)
+        name: Bucket name in a shared store
+        store: SQLiteBucketStore shared with other processes (None keeps state in memory)
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None, name: str = 'default',
+                 store: Optional[SQLiteBucketStore] = None):
+        adaptive = get_config().get('rate_limiting.adaptive', {}) or {}
+        self.base_rate = float(rate)
+        self.burst = int(burst) if burst else max(1, int(round(self.base_rate)))
+        self.name = name
+        self.store = store
+        self.min_rate = self.base_rate * float(adaptive.get('min_rate_fraction', 0.1))
+        self.backoff_factor = float(adaptive.get('backoff_factor', 0.5))
+        self.recovery_factor = float(adaptive.get('recovery_factor', 1.25))
+        self.recovery_successes = int(adaptive.get('recovery_successes', 20))
+        self._lock = threading.Lock()
+        self._state = self._initial_state()
+        self._successes = 0
+
+    def _initial_state(self) -> Dict[str, float]:
+        return {'tokens': float(self.burst), 'updated': time.time(), 'rate': self.base_rate, 'blocked_until': 0.0}
+
+    def _transact(self, update: Callable[[Dict[str, float]], Any]) -> Any:
+        if self.store is not None:
+            try:
+                return self.store.transact(self.name, self._initial_state(), update)
+            except sqlite3.Error as e:
+                logger.warning(f"Shared rate limit state unavailable ({e}), limiting {self.name} per process")
+                self.store = None
+        with self._lock:
+            return update(self._state)
+
+    def _refill(self, state: Dict[str, float], now: float) -> None:
+        # Keep the (possibly shared) rate within the currently configured bounds
+        state['rate'] = min(max(state['rate'], self.min_rate), self.base_rate)
+        elapsed = max(0.0, now - state['updated'])
+        state['tokens'] = min(float(self.burst), state['tokens'] + elapsed * state['rate'])
+        state['updated'] = now
+
+    @property
+    def rate(self) -> float:
+        """Current (possibly reduced) refill rate in tokens per second"""
+        def read(state):
+            self._refill(state, time.time())
+            return state['rate']
+        return self._transact(read)
+
+    def _try_acquire(self, tokens: float) -> float:
+        """Take ``tokens`` if available; otherwise return the seconds until they will be"""
+        def take(state):
+            now = time.time()
+            self._refill(state, now)
+            if now < state['blocked_until']:
+                return state['blocked_until'] - now
+            if state['tokens'] >= tokens:
+                state['tokens'] -= tokens
+                return 0.0
+            return (tokens - state['tokens']) / state['rate']
+        return self._transact(take)
+
+    def acquire(self, tokens: float = 1, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Take ``tokens`` from the bucket.
+
+        Args:
+            tokens: Tokens to take (capped at the burst size)
+            blocking: Wait for tokens instead of returning False
+            timeout: Longest wait in seconds when blocking (None waits indefinitely)
+
+        Returns:
+            True if the tokens were taken
+        """
+        tokens = min(float(tokens), float(self.burst))
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                return True
+            if not blocking:
+                return False
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            # Re-check at least every second so a shared bucket reacts to other processes
+            time.sleep(min(wait, 1.0))
+
+    def throttled(self, retry_after: Optional[float] = None) -> None:
+        """The server asked us to slow down: cut the rate and pause for ``retry_after``"""
+        def slow_down(state):
+            now = time.time()
+            self._refill(state, now)
+            state['rate'] = max(self.min_rate, state['rate'] * self.backoff_factor)
+            state['tokens'] = 0.0
+            if retry_after:
+                state['blocked_until'] = max(state['blocked_until'], now + retry_after)
+            return state['rate']
+
+        with self._lock:
+            self._successes = 0
+        new_rate = self._transact(slow_down)
+        logger.warning(f"Rate limited by {self.name}: now {new_rate:.2f} req/s"
+                       + (f", pausing {retry_after:.0f}s" if retry_after else ""))
+
+    def succeeded(self) -> None:
+        """Count a success; after ``recovery_successes`` in a row, raise the rate again"""
+        with self._lock:
+            self._successes += 1
+            if self._successes < self.recovery_successes:
+                return
+            self._successes = 0
+
+        def speed_up(state):
+            self._refill(state, time.time())
+            state['rate'] = min(self.base_rate, state['rate'] * self.recovery_factor)
+        self._transact(speed_up)
+
+
+class ServiceRateLimiter:
+    """Token buckets per service, configured from ``rate_limiting.services``"""
+
+    def __init__(self, store: Optional[SQLiteBucketStore] = None):
+        self.store = store
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def get_limiter(self, service: str) -> RateLimiter:
+        with self._lock:
+            limiter = self._limiters.get(service)
+            if limiter is None:
+                config = get_config()
+                settings = config.get(f'rate_limiting.services.{service}', {}) or {}
+                default_rate = config.get('rate_limiting.default_rate', 2.0)
+                if service == 'youtube':
+                    default_rate = config.get('downloads.youtube.rate_limit_per_second', default_rate)
+                limiter = RateLimiter(settings.get('rate', default_rate), settings.get('burst'),
+                                      name=service, store=self.store)
+                self._limiters[service] = limiter
+            return limiter
+
+    def acquire(self, service: str, tokens: float = 1, blocking: bool = True,
+                timeout: Optional[float] = None) -> bool:
+        return self.get_limiter(service).acquire(tokens, blocking=blocking, timeout=timeout)
+
+    def wait(self, service: str, tokens: float = 1) -> None:
+        """Block until ``tokens`` are available for ``service``"""
+        self.get_limiter(service).acquire(tokens)
+
+    def report(self, service: str, status_code: Optional[int] = None, retry_after: Optional[float] = None) -> None:
+        """Feed a response status back into the service's bucket"""
+        limiter = self.get_limiter(service)
+        if status_code in THROTTLE_STATUS_CODES or retry_after:
+            limiter.throttled(retry_after)
+        elif status_code is None or status_code < 400:
+            limiter.succeeded()
+
+
+class URLRateLimiter:
+    """Rate limit by the service a URL belongs to"""
+
+    DOMAIN_SERVICES = {
+        'youtube.com': 'youtube',
+        'youtu.be': 'youtube',
+        'drive.google.com': 'google_drive',
+        'drive.usercontent.google.com': 'google_drive',
+        'docs.google.com': 'google_docs',
+    }
+
+    def __init__(self, service_limiter: Optional[ServiceRateLimiter] = None):
+        self.service_limiter = service_limiter or ServiceRateLimiter()
+
+    def get_domain(self, url: str) -> str:
+        """Service name for known hosts, else the host without ``www.``"""
+        host = (urlparse(url).hostname or '').lower()
+        for domain, service in self.DOMAIN_SERVICES.items():
+            if host == domain or host.endswith('.' + domain):
+                return service
+        return host[4:] if host.startswith('www.') else host
+
+    def acquire(self, url: str, tokens: float = 1, blocking: bool = True,
+                timeout: Optional[float] = None) -> bool:
+        return self.service_limiter.acquire(self.get_domain(url), tokens, blocking=blocking, timeout=timeout)
+
+
+_service_limiter = None
+_service_limiter_lock = threading.Lock()
+
+
+def get_service_limiter() -> ServiceRateLimiter:
+    """Process-wide ServiceRateLimiter, sharing state through ``rate_limiting.shared_state_file`` if set"""
+    global _service_limiter
+    with _service_limiter_lock:
+        if _service_limiter is None:
+            store = None
+            state_file = get_config().get('rate_limiting.shared_state_file')
+            if state_file:
+                path = Path(state_file)
+                if not path.is_absolute():
+                    path = get_project_root() / path
+                try:
+                    store = SQLiteBucketStore(path)
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning(f"Could not open {path} ({e}), rate limits apply per process")
+            _service_limiter = ServiceRateLimiter(store)
+        return _service_limiter
+
+
+def throttle_signal(error: BaseException):
+    """
+    Whether an exception means "slow down", and the Retry-After it carried.
+
+    Returns:
+        (throttled, retry_after_seconds)
+    """
+    response = getattr(error, 'response', None)
+    status_code = getattr(response, 'status_code', None)
+    if status_code is not None:
+        headers = getattr(response, 'headers', None) or {}
+        return status_code in THROTTLE_STATUS_CODES, parse_retry_after(headers.get('Retry-After'))
+    return bool(_THROTTLE_MESSAGE.search(str(error))), None
+
+
+def report_response(service: str, response: Any) -> None:
+    """Feed an HTTP response (status and Retry-After) back into ``service``'s bucket"""
+    headers = getattr(response, 'headers', None) or {}
+    get_service_limiter().report(service, getattr(response, 'status_code', None),
+                                 parse_retry_after(headers.get('Retry-After')))
 
 
 def rate_limit(service: str):
-    """Minimal rate limiting decorator."""
+    """
+    Decorator: take a token for ``service`` before each call.
+
+    Exceptions that signal throttling (429/403, Retry-After) slow the
+    service down; successful calls count towards speeding it back up.
+    """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Just add a small delay
-            time.sleep(0.1)
-            return func(*args, **kwargs)
+            limiter = get_service_limiter()
+            limiter.wait(service, 1)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                throttled, retry_after = throttle_signal(e)
+                if throttled:
+                    limiter.report(service, 429, retry_after)
+                raise
+            limiter.report(service)
+            return result
         return wrapper
     return decorator
 
 
 def wait_for_rate_limit(service: str):
-    """Wait for rate limit - minimal implementation."""
-    time.sleep(0.1)
\ No newline at end of file
+    """Block until a request to ``service`` is allowed"""
+    get_service_limiter().wait(service, 1)
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Resumable Download - HTTP Range resume and parallel byte-range segments
+
+Downloads go to ``<output>.tmp`` with a ``<output>.tmp.json`` sidecar that
+records the server's validators (ETag / Last-Modified) and length. When a
+transfer fails the partial file and sidecar are kept, and the next attempt
+asks for the remaining bytes with ``Range`` + ``If-Range``; if the file
+changed on the server in the meantime it answers 200 and the download
+starts over.
+
+Large files on servers that accept ranges can instead be fetched as N
+segments at once into a preallocated ``.tmp`` file. The sidecar then
+tracks each segment's progress so a retry resumes every segment.
+"""
+
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import requests
+
+try:
+    from .config import get_config
+    from .logging_config import get_logger
+except ImportError:
+    from config import get_config
+    from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_CONTENT_RANGE = re.compile(r'bytes (\d+)-(\d+)/(\d+|\*)')
+
+# Network read size: a dropped connection loses at most this much of what was in flight
+READ_SIZE = 256 * 1024
+
+# Save segment progress to the sidecar at most this often (bytes written across all segments)
+SIDECAR_SAVE_INTERVAL = 8 * 1024 * 1024
+
+
+class RangeNotHonoured(Exception):
+    """The server ignored a Range request or the file changed under us"""
+
+
+def _resume_settings() -> Dict[str, Any]:
+    settings = get_config().get('downloads.drive.resume', {}) or {}
+    return {
+        'enabled': settings.get('enabled', True),
+        'segments': int(settings.get('parallel_segments', 4)),
+        'min_size': int(settings.get('parallel_min_size', 104857600)),
+        'timeout': settings.get('timeout', 30),
+    }
+
+
+def _validators(response: requests.Response) -> Dict[str, Any]:
+    """ETag, Last-Modified and length of a full (200) response; length is None when unknown"""
+    headers = response.headers
+    length = headers.get('Content-Length')
+    encoded = headers.get('Content-Encoding', 'identity').lower() not in ('', 'identity')
+    return {
+        'etag': headers.get('ETag'),
+        'last_modified': headers.get('Last-Modified'),
+        'length': int(length) if length and length.isdigit() and not encoded else None,
+    }
+
+
+def _same_resource(state: Dict[str, Any], current: Dict[str, Any]) -> bool:
+    """True if a sidecar describes the same file as ``current`` (needs a validator and a length)"""
+    if not state or state.get('length') is None or state.get('length') != current['length']:
+        return False
+    if state.get('etag') and current['etag']:
+        return state['etag'] == current['etag']
+    if state.get('last_modified') and current['last_modified']:
+        return state['last_modified'] == current['last_modified']
+    return False
+
+
+def _if_range(state: Dict[str, Any]) -> Dict[str, str]:
+    value = state.get('etag') or state.get('last_modified')
+    return {'If-Range': value} if value else {}
+
+
+class ResumableDownload:
+    """
+    One download into ``output_path`` via ``<output_path>.tmp``.
+
+    Args:
+        session: requests session (keeps cookies from the Drive confirmation page)
+        output_path: Final file path (written with os.replace once complete)
+        segments: Parallel segments for large files (None reads downloads.drive.resume)
+        logger: Optional logger
+    """
+
+    def __init__(self, session: requests.Session, output_path: Union[str, Path],
+                 segments: Optional[int] = None, logger=None):
+        self.session = session
+        self.output_path = Path(output_path)
+        self.temp_path = Path(f"{output_path}.tmp")
+        self.sidecar_path = Path(f"{output_path}.tmp.json")
+        self.settings = _resume_settings()
+        self.segments = self.settings['segments'] if segments is None else segments
+        self.logger = logger or globals()['logger']
+        self._state_lock = threading.Lock()
+        self._unsaved = 0
+
+    # -- sidecar -----------------------------------------------------------
+
+    def _load_state(self) -> Dict[str, Any]:
+        if not self.temp_path.exists():
+            return {}
+        try:
+            return json.loads(self.sidecar_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        part = self.sidecar_path.with_name(self.sidecar_path.name + '.part')
+        part.write_text(json.dumps(state))
+        os.replace(part, self.sidecar_path)
+
+    def discard(self) -> None:
+        """Remove the partial file and its sidecar"""
+        for path in (self.temp_path, self.sidecar_path):
+            if path.exists():
+                path.unlink()
+
+    def _finish(self, length: Optional[int]) -> Path:
+        size = self.temp_path.stat().st_size
+        if length is not None and size != length:
+            raise IOError(f"Incomplete download: {size} of {length} bytes")
+        os.replace(self.temp_path, self.output_path)
+        if self.sidecar_path.exists():
+            self.sidecar_path.unlink()
+        return self.output_path
+
+    # -- requests ----------------------------------------------------------
+
+    def _ranged_get(self, url: str, start: int, end: Optional[int], state: Dict[str, Any]) -> requests.Response:
+        """GET bytes start..end (inclusive); raises RangeNotHonoured unless the server answers 206 from ``start``"""
+        headers = {'Range': f"bytes={start}-{'' if end is None else end}"}
+        headers.update(_if_range(state))
+        response = self.session.get(url, headers=headers, stream=True, timeout=self.settings['timeout'])
+        match = _CONTENT_RANGE.match(response.headers.get('Content-Range', ''))
+        if response.status_code == 206 and match and int(match.group(1)) == start:
+            return response
+        response.close()
+        raise RangeNotHonoured(f"HTTP {response.status_code} for bytes={start}-")
+
+    # -- download ----------------------------------------------------------
+
+    def run(self, response: requests.Response) -> Path:
+        """
+        Download the body of ``response`` (a 200 from the server), resuming or
+        splitting into segments when possible.
+
+        Network errors propagate with the partial file kept for the next attempt.
+        """
+        current = _validators(response)
+        url = response.url
+        resumable = self.settings['enabled'] and bool(current['etag'] or current['last_modified'])
+        accepts_ranges = response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+        state = self._load_state() if resumable else {}
+
+        if _same_resource(state, current):
+            response.close()
+            try:
+                if state.get('segments'):
+                    return self._run_segments(url, state)
+                return self._resume_single(url, state)
+            except RangeNotHonoured as e:
+                self.logger.info(f"Cannot resume {self.output_path.name} ({e}), starting over")
+                response = self.session.get(url, stream=True, timeout=self.settings['timeout'])
+                response.raise_for_status()
+                current = _validators(response)
+        elif self.temp_path.exists() or self.sidecar_path.exists():
+            self.logger.info(f"Discarding stale partial download of {self.output_path.name}")
+        self.discard()
+
+        state = dict(current)
+        length = current['length']
+        if (resumable and accepts_ranges and self.segments > 1 and length
+                and length >= self.settings['min_size']):
+            response.close()
+            state['segments'] = self._plan_segments(length)
+            with open(self.temp_path, 'wb') as f:
+                f.truncate(length)
+            self._save_state(state)
+            try:
+                return self._run_segments(url, state)
+            except RangeNotHonoured as e:
+                self.logger.info(f"Parallel segments unavailable ({e}), downloading as one stream")
+                self.discard()
+                response = self.session.get(url, stream=True, timeout=self.settings['timeout'])
+                response.raise_for_status()
+                state = _validators(response)
+
+        if resumable:
+            self._save_state(state)
+        with open(self.temp_path, 'wb') as f:
+            self._copy_body(response, f)
+        return self._finish(state.get('length'))
+
+    def _resume_single(self, url: str, state: Dict[str, Any]) -> Path:
+        offset = self.temp_path.stat().st_size
+        length = state['length']
+        if offset < length:
+            self.logger.info(f"Resuming {self.output_path.name} at {offset:,} of {length:,} bytes")
+            response = self._ranged_get(url, offset, None, state)
+            with open(self.temp_path, 'ab') as f:
+                self._copy_body(response, f)
+        return self._finish(length)
+
+    def _copy_body(self, response: requests.Response, f) -> None:
+        try:
+            for chunk in response.iter_content(chunk_size=READ_SIZE):
+                if chunk:
+                    f.write(chunk)
+        finally:
+            response.close()
+
+    # -- parallel segments -------------------------------------------------
+
+    def _plan_segments(self, length: int) -> List[List[int]]:
+        """[start, end (inclusive), bytes written] for each segment"""
+        size = -(-length // self.segments)
+        return [[start, min(start + size, length) - 1, 0] for start in range(0, length, size)]
+
+    def _run_segments(self, url: str, state: Dict[str, Any]) -> Path:
+        length = state['length']
+        pending = [segment for segment in state['segments'] if segment[0] + segment[2] <= segment[1]]
+        done = length - sum(segment[1] - segment[0] + 1 - segment[2] for segment in pending)
+        self.logger.info(f"Downloading {self.output_path.name} in {len(pending)} segments"
+                         + (f", resuming at {done:,} of {length:,} bytes" if done else ""))
+        stop = threading.Event()
+        fd = os.open(self.temp_path, os.O_WRONLY)
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, len(pending)), thread_name_prefix='segment') as executor:
+                futures = [executor.submit(self._fetch_segment, url, state, segment, fd, stop)
+                           for segment in pending]
+                errors = []
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        stop.set()
+                        errors.append(e)
+        finally:
+            os.close(fd)
+            with self._state_lock:
+                self._save_state(state)
+        if errors:
+            raise errors[0]
+        return self._finish(length)
+
+    def _fetch_segment(self, url: str, state: Dict[str, Any], segment: List[int], fd: int,
+                       stop: threading.Event) -> None:
+        start, end, written = segment
+        response = self._ranged_get(url, start + written, end, state)
+        try:
+            for chunk in response.iter_content(chunk_size=READ_SIZE):
+                if stop.is_set():
+                    return
+                if not chunk:
+                    continue
+                chunk = chunk[:end - start + 1 - segment[2]]
+                os.pwrite(fd, chunk, start + segment[2])
+                with self._state_lock:
+                    segment[2] += len(chunk)
+                    self._unsaved += len(chunk)
+                    if self._unsaved >= SIDECAR_SAVE_INTERVAL:
+                        self._unsaved = 0
+                        self._save_state(state)
+                if segment[0] + segment[2] > end:
+                    return
+        finally:
+            response.close()
+        if segment[0] + segment[2] <= end and not stop.is_set():
+            raise IOError(f"Segment {start}-{end} ended early at {start + segment[2]}")
+
+
+def download_response_resumable(session: requests.Session, response: requests.Response,
+                                output_path: Union[str, Path], segments: Optional[int] = None,
+                                logger=None) -> Path:
+    """
+    Save the body of ``response`` to ``output_path``, resuming an earlier
+    partial download of the same file and using parallel ranges for large files.
+
+    Returns:
+        Path of the completed file
+    """
+    return ResumableDownload(session, output_path, segments=segments, logger=logger).run(response)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+S3 Inventory - verify many expected keys with one listing instead of HEADs
+
+The prefixes that cover the expected keys are listed once with the
+``list_objects_v2`` paginator into an in-memory ``key -> (size, etag)``
+map (1,000 keys per request), and the expected keys are then diffed against
+it in bulk: missing keys, size mismatches and totals.
+
+Storage paths are flat (``files/<uuid>.<ext>``), so the covering prefix is
+usually all of ``files/``. A handful of keys (a targeted ``--rows`` sync) is
+therefore HEADed concurrently instead of listing the whole prefix.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+try:
+    from .config import get_config
+    from .logging_config import get_logger
+except ImportError:
+    from config import get_config
+    from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class InventoryEntry(NamedTuple):
+    """Listed object: size in bytes and ETag (quotes stripped)"""
+    size: int
+    etag: str
+
+
+@dataclass
+class VerificationReport:
+    """Outcome of diffing expected keys against a bucket listing"""
+    verified: List[str] = field(default_factory=list)
+    missing: Set[str] = field(default_factory=set)  # a set, since callers check keys against it
+    size_mismatches: Dict[str, Tuple[int, int]] = field(default_factory=dict)  # key -> (expected, actual)
+    prefixes: List[str] = field(default_factory=list)
+    objects_listed: int = 0
+    objects_headed: int = 0
+    bytes_expected: int = 0
+    bytes_found: int = 0
+
+    def totals(self) -> Dict[str, int]:
+        return {
+            'expected': len(self.verified) + len(self.missing) + len(self.size_mismatches),
+            'verified': len(self.verified),
+            'missing': len(self.missing),
+            'size_mismatches': len(self.size_mismatches),
+            'prefixes_listed': len(self.prefixes),
+            'objects_listed': self.objects_listed,
+            'objects_headed': self.objects_headed,
+            'bytes_expected': self.bytes_expected,
+            'bytes_found': self.bytes_found,
+        }
+
+
+def covering_prefixes(keys: Iterable[str]) -> List[str]:
+    """
+    Smallest set of "directory" prefixes covering ``keys``: each key's path up
+    to its last '/', dropping prefixes already covered by a shorter one.
+    A key without '/' means the whole bucket ('').
+    """
+    directories = sorted({key[:key.rfind('/') + 1] for key in keys})
+    prefixes = []
+    for directory in directories:
+        if not prefixes or not directory.startswith(prefixes[-1]):
+            prefixes.append(directory)
+    return prefixes
+
+
+def list_inventory(s3_client, bucket: str, prefixes: Iterable[str]) -> Dict[str, InventoryEntry]:
+    """``key -> InventoryEntry`` for every object under ``prefixes``"""
+    inventory = {}
+    paginator = s3_client.get_paginator('list_objects_v2')
+    for prefix in prefixes:
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                inventory[obj['Key']] = InventoryEntry(obj['Size'], obj.get('ETag', '').strip('"'))
+    return inventory
+
+
+def head_inventory(s3_client, bucket: str, keys: Iterable[str],
+                   max_workers: Optional[int] = None) -> Dict[str, InventoryEntry]:
+    """``key -> InventoryEntry`` for every key in ``keys`` that exists, from concurrent HEADs"""
+    keys = list(keys)
+    max_workers = max_workers or get_config().get('s3_inventory.head_workers', 16)
+
+    def head(key):
+        try:
+            response = s3_client.head_object(Bucket=bucket, Key=key)
+        except Exception as e:
+            logger.debug(f"HEAD {key} failed: {e}")
+            return None
+        return InventoryEntry(response.get('ContentLength', 0), response.get('ETag', '').strip('"'))
+
+    if not keys:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(keys))),
+                            thread_name_prefix='s3-head') as executor:
+        entries = list(executor.map(head, keys))
+    return {key: entry for key, entry in zip(keys, entries) if entry is not None}
+
+
+def verify_keys(s3_client, bucket: str, expected: Dict[str, Optional[int]],
+                use_listing: Optional[bool] = None) -> VerificationReport:
+    """
+    Check that every key of ``expected`` exists, and has the expected size where one is given.
+
+    Args:
+        s3_client: boto3 S3 client
+        bucket: Bucket name
+        expected: key -> expected size in bytes (None to only check existence)
+        use_listing: True lists the covering prefixes, False HEADs each key; None lists only
+            when there are at least s3_inventory.min_keys_for_listing keys
+    """
+    if use_listing is None:
+        use_listing = len(expected) >= get_config().get('s3_inventory.min_keys_for_listing', 200)
+    if use_listing:
+        report = VerificationReport(prefixes=covering_prefixes(expected))
+        inventory = list_inventory(s3_client, bucket, report.prefixes) if expected else {}
+        report.objects_listed = len(inventory)
+    else:
+        report = VerificationReport()
+        inventory = head_inventory(s3_client, bucket, expected)
+        report.objects_headed = len(expected)
+
+    for key, size in expected.items():
+        entry = inventory.get(key)
+        if size:
+            report.bytes_expected += size
+        if entry is None:
+            report.missing.add(key)
+            continue
+        report.bytes_found += entry.size
+        if size and entry.size != size:
+            report.size_mismatches[key] = (size, entry.size)
+        else:
+            report.verified.append(key)
+
+    source = (f"{report.objects_listed} listed objects under {len(report.prefixes)} prefixes" if use_listing
+              else f"{report.objects_headed} HEAD requests")
+    logger.info(f"Verified {len(expected)} keys against {source}: {len(report.missing)} missing, "
+                f"{len(report.size_mismatches)} size mismatches")
+    return report
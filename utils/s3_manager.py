@@ -10,7 +10,11 @@ Provides both local-then-upload and direct-streaming capabilities.
 """
 
 import os
+import sys
+import hashlib
+import itertools
 import subprocess
+import threading
 import requests
 import boto3
 import pandas as pd
@@ -19,7 +23,9 @@ from io import BytesIO
 import tempfile
 import json
 import re
+import urllib.parse
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple, Union, Callable
 from dataclasses import dataclass
 from enum import Enum
@@ -27,17 +33,27 @@ import mimetypes
 
 # DRY CONSOLIDATION: Simplified import pattern
 try:
-    from .config import get_config, get_s3_bucket
+    from .config import get_config, get_s3_bucket, get_download_chunk_size
     from .logging_config import get_logger
     from .sanitization import sanitize_error_message
     from .database_manager import get_database_manager
     from .yt_dlp_updater import ensure_yt_dlp_updated, get_yt_dlp_command
+    from .content_sniffing import SNIFF_BYTES, PLACEHOLDER_EXTENSION, detect_file_type
+    from .s3_inventory import verify_keys
+    from .metrics import record_s3_upload
 except ImportError:
-    from config import get_config, get_s3_bucket
+    from config import get_config, get_s3_bucket, get_download_chunk_size
     from logging_config import get_logger
     from sanitization import sanitize_error_message
     from database_manager import get_database_manager
     from yt_dlp_updater import ensure_yt_dlp_updated, get_yt_dlp_command
+    from content_sniffing import SNIFF_BYTES, PLACEHOLDER_EXTENSION, detect_file_type
+    from s3_inventory import verify_keys
+    from metrics import record_s3_upload
+
+logger = get_logger(__name__)
+
+_s3_client_lock = threading.Lock()
 
 
 def get_s3_client(region_name: str = 'us-east-1') -> boto3.client:
@@ -72,12 +88,13 @@ def get_s3_client(region_name: str = 'us-east-1') -> boto3.client:
     import os
     aws_profile = os.environ.get('AWS_PROFILE', aws_profile)
     
-    # Create session with profile if specified
-    if aws_profile:
-        session = boto3.Session(profile_name=aws_profile)
-        return session.client('s3', region_name=aws_region)
-    else:
-        return boto3.client('s3', region_name=aws_region)
+    # Create session with profile if specified (client creation is not thread-safe)
+    with _s3_client_lock:
+        if aws_profile:
+            session = boto3.Session(profile_name=aws_profile)
+            return session.client('s3', region_name=aws_region)
+        else:
+            return boto3.client('s3', region_name=aws_region)
 
 
 class UploadMode(Enum):
@@ -99,6 +116,7 @@ class S3Config:
     csv_file: str = 'outputs/output.csv'
     downloads_dir: str = 'downloads'
     create_public_urls: bool = True
+    verify_with_inventory: Optional[bool] = None  # Database sync: True lists the bucket, False HEADs each file, None picks by file count
 
 
 @dataclass
@@ -110,6 +128,155 @@ class UploadResult:
     error: Optional[str] = None
     file_size: Optional[int] = None
     upload_time: Optional[float] = None
+    checksum: Optional[str] = None  # SHA-256 of the uploaded bytes (streaming uploads)
+
+
+# S3 multipart limits
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+S3_MAX_PARTS = 10000
+
+
+def get_multipart_part_size(file_size: Optional[int] = None) -> int:
+    """
+    Pick a multipart part size from the Drive download chunk sizes.
+    
+    Args:
+        file_size: Expected size in bytes (None if the server sent no Content-Length)
+        
+    Returns:
+        Part size in bytes, at least the S3 minimum and small enough to stay under 10,000 parts
+    """
+    if not file_size:
+        # Unknown size: assume a large file so 10,000 parts still covers multi-GB recordings
+        chunk_size = get_download_chunk_size(sys.maxsize)
+    else:
+        chunk_size = get_download_chunk_size(file_size)
+    
+    part_size = max(S3_MIN_PART_SIZE, chunk_size)
+    if file_size:
+        part_size = max(part_size, -(-file_size // S3_MAX_PARTS))
+    return part_size
+
+
+class MultipartStreamUploader:
+    """
+    Upload a stream of byte chunks to S3 without holding the whole object in memory.
+    
+    Incoming chunks are packed into parts of ``part_size`` bytes. Each full part
+    is handed to a small thread pool for ``upload_part`` while the download keeps
+    going. A semaphore caps parts that are filled or in flight at
+    ``max_in_flight``, so peak memory is about ``part_size * (max_in_flight + 1)``
+    whatever the object size. Streams that fit in one part use ``put_object``.
+    """
+    
+    def __init__(self, s3_client, bucket: str, key: str, part_size: int,
+                 max_in_flight: int = 4, extra_args: Optional[Dict] = None):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = max(part_size, S3_MIN_PART_SIZE)
+        self.max_in_flight = max(1, max_in_flight)
+        self.extra_args = dict(extra_args or {})
+        self.bytes_uploaded = 0
+        self.parts_uploaded = 0
+        self._digest = hashlib.sha256()
+    
+    @property
+    def sha256(self) -> str:
+        """Hex SHA-256 of every byte read from the stream so far"""
+        return self._digest.hexdigest()
+    
+    def upload(self, chunks, progress_callback: Optional[Callable[[int], None]] = None) -> int:
+        """
+        Consume ``chunks`` and upload them to S3.
+        
+        Args:
+            chunks: Iterable of bytes (e.g. ``response.iter_content(...)``)
+            progress_callback: Called with the total bytes read so far after each part
+            
+        Returns:
+            Total number of bytes uploaded
+        """
+        chunk_iter = iter(chunks)
+        first_part, exhausted = self._read_part(chunk_iter)
+        
+        if exhausted:
+            # Small object: one request, no multipart bookkeeping
+            self.s3_client.put_object(Bucket=self.bucket, Key=self.key, Body=first_part, **self.extra_args)
+            self.bytes_uploaded = len(first_part)
+            self.parts_uploaded = 1
+            return self.bytes_uploaded
+        
+        upload_id = self.s3_client.create_multipart_upload(
+            Bucket=self.bucket, Key=self.key, **self.extra_args)['UploadId']
+        slots = threading.BoundedSemaphore(self.max_in_flight)
+        futures = []
+        bytes_read = 0
+        
+        def upload_part(part_number, body):
+            try:
+                response = self.s3_client.upload_part(
+                    Bucket=self.bucket, Key=self.key, UploadId=upload_id,
+                    PartNumber=part_number, Body=body)
+                return {'PartNumber': part_number, 'ETag': response['ETag']}
+            finally:
+                slots.release()
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_in_flight,
+                                    thread_name_prefix='s3-part') as executor:
+                part, part_number = first_part, 1
+                while part:
+                    slots.acquire()
+                    futures.append(executor.submit(upload_part, part_number, part))
+                    bytes_read += len(part)
+                    if progress_callback:
+                        progress_callback(bytes_read)
+                    
+                    # Surface part failures early instead of downloading the rest
+                    for future in futures:
+                        if future.done() and future.exception():
+                            raise future.exception()
+                    
+                    if exhausted:
+                        break
+                    part, exhausted = self._read_part(chunk_iter)
+                    part_number += 1
+                
+                parts = [future.result() for future in futures]
+            
+            self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=upload_id,
+                MultipartUpload={'Parts': parts})
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            try:
+                self.s3_client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=upload_id)
+            except Exception as abort_error:
+                logger.warning(f"Failed to abort multipart upload {upload_id}: {abort_error}")
+            raise
+        
+        self.bytes_uploaded = bytes_read
+        self.parts_uploaded = len(parts)
+        return bytes_read
+    
+    def _read_part(self, chunk_iter) -> Tuple[bytes, bool]:
+        """Pack chunks until at least part_size bytes; returns (part, stream_exhausted)"""
+        pieces = []
+        size = 0
+        exhausted = True
+        for chunk in chunk_iter:
+            if not chunk:
+                continue
+            pieces.append(chunk)
+            size += len(chunk)
+            if size >= self.part_size:
+                exhausted = False
+                break
+        part = b''.join(pieces)
+        self._digest.update(part)
+        return part, exhausted
 
 
 class UnifiedS3Manager:
@@ -268,6 +435,7 @@ class UnifiedS3Manager:
             
             upload_time = (datetime.now() - start_time).total_seconds()
             file_size = local_path.stat().st_size
+            record_s3_upload('local_file', file_size, upload_time)
             
             # Generate public URL if requested
             s3_url = None
@@ -289,160 +457,149 @@ class UnifiedS3Manager:
                 error=sanitize_error_message(str(e))
             )
     
-    def stream_youtube_to_s3(self, url: str, s3_key: str, person_name: str) -> UploadResult:
-        """Stream YouTube directly to S3 using named pipe with deadlock protection"""
-        import signal
-        import select
+    def stream_youtube_to_s3(self, url: str, s3_key: str, person_name: str,
+                             timeout: Optional[float] = None) -> UploadResult:
+        """
+        Stream YouTube directly to S3 by reading yt-dlp's stdout into a multipart upload.
+        
+        Thread-safe: no named pipes or signals. A per-call deadline timer kills
+        yt-dlp, which ends the stream and fails the upload.
+        
+        Args:
+            url: YouTube video URL
+            s3_key: Destination key
+            person_name: Used for log context only
+            timeout: Seconds before the download is abandoned (default downloads.youtube.stream_timeout)
+        """
+        from collections import deque
         import time
         
-        sanitized_name = "".join(c for c in person_name if c.isalnum() or c in '-_')[:20]
-        pipe_path = f"/tmp/youtube_{sanitized_name}_{os.getpid()}"
+        config = get_config()
+        timeout = timeout if timeout is not None else config.get('downloads.youtube.stream_timeout', 300)
         process = None
+        watchdog = None
+        timed_out = threading.Event()
+        stderr_tail = deque(maxlen=20)
+        
+        def kill_on_deadline():
+            timed_out.set()
+            if process and process.poll() is None:
+                self.logger.error(f"⏰ YouTube stream for {person_name} exceeded {timeout}s, terminating yt-dlp")
+                process.kill()
         
-        def timeout_handler(signum, frame):
-            raise TimeoutError(f"Named pipe operation timed out after 60 seconds on {pipe_path}")
+        def drain_stderr():
+            # Keep yt-dlp from blocking on a full stderr pipe; remember the tail for errors
+            for line in iter(process.stderr.readline, b''):
+                stderr_tail.append(line.decode('utf-8', errors='ignore').rstrip())
         
         try:
-            # Ensure yt-dlp is updated to latest version (if enabled in config)
-            config = get_config()
+            # Ensure yt-dlp is updated to latest version (if enabled in config; cached per TTL)
             if config.get("downloads.youtube.auto_update_yt_dlp", True):
-                self.logger.info("🔄 Ensuring yt-dlp is up to date...")
                 ensure_yt_dlp_updated()
-            else:
-                self.logger.info("⏭️ Skipping yt-dlp update (disabled in config)")
-            
-            # Create named pipe
-            if os.path.exists(pipe_path):
-                os.remove(pipe_path)
-            os.mkfifo(pipe_path)
-            self.logger.info(f"🔧 PIPE_CREATE: {pipe_path}")
             
             self.logger.info(f"  📥 Streaming YouTube to S3: {s3_key}")
             
-            # Start yt-dlp process - use best video format for mp4 with updated command
-            cmd = get_yt_dlp_command(["-f", "best[ext=mp4]/best", "-o", pipe_path, url])
+            # Single-file mp4 so the output can be written to stdout without merging
+            cmd = get_yt_dlp_command(["-f", "best[ext=mp4]/best", "-o", "-", "--quiet", "--no-warnings", url])
             self.logger.info(f"🚀 PROCESS_START: {' '.join(cmd)}")
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            
-            # Wait for process to actually start and begin writing
-            self.logger.info("⏳ Waiting for yt-dlp to start writing to pipe...")
-            wait_attempts = 0
-            max_wait_attempts = 30  # 15 seconds max
-            
-            while wait_attempts < max_wait_attempts:
-                # Check if process died
-                if process.poll() is not None:
-                    stderr_output = process.stderr.read().decode()
-                    raise RuntimeError(f"yt-dlp process died before writing to pipe. Error: {stderr_output[:200]}")
-                
-                # Check if pipe has data ready (non-blocking)
-                try:
-                    # Open pipe in non-blocking mode to test
-                    pipe_fd = os.open(pipe_path, os.O_RDONLY | os.O_NONBLOCK)
-                    ready, _, _ = select.select([pipe_fd], [], [], 0.1)  # 100ms timeout
-                    os.close(pipe_fd)
-                    
-                    if ready:
-                        self.logger.info("✅ PIPE_READY: yt-dlp started writing to pipe")
-                        break
-                except (OSError, BlockingIOError):
-                    # Pipe not ready yet, continue waiting
-                    pass
-                
-                time.sleep(0.5)
-                wait_attempts += 1
-                
-                if wait_attempts % 10 == 0:  # Log every 5 seconds
-                    self.logger.info(f"⏳ Still waiting for yt-dlp to start... ({wait_attempts/2:.1f}s)")
-            
-            if wait_attempts >= max_wait_attempts:
-                raise TimeoutError(f"yt-dlp did not start writing to pipe within 15 seconds. URL may be invalid: {url}")
-            
-            # Set up timeout protection for the actual pipe read
-            signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(300)  # 5 minute timeout for entire upload
-            
-            # Upload from pipe to S3
             start_time = datetime.now()
-            self.logger.info(f"📖 PIPE_OPEN_ATTEMPT: {pipe_path}")
-            
-            with open(pipe_path, 'rb') as pipe_file:
-                self.logger.info("✅ PIPE_OPEN_SUCCESS: Starting S3 upload")
-                extra_args = {'ContentType': 'video/mp4'}
-                if self.config.add_metadata:
-                    extra_args['Metadata'] = {
-                        'uploaded_at': start_time.isoformat(),
-                        'source': 'typing-clients-ingestion-youtube-stream',
-                        'original_url': url
-                    }
-                
-                self.s3_client.upload_fileobj(
-                    pipe_file,
-                    self.config.bucket_name,
-                    s3_key,
-                    ExtraArgs=extra_args
-                )
-            
-            # Cancel the timeout - upload completed successfully
-            signal.alarm(0)
+            started = time.monotonic()
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             
-            # Wait for yt-dlp process to complete
-            process.wait()
-            upload_time = (datetime.now() - start_time).total_seconds()
+            stderr_thread = threading.Thread(target=drain_stderr, daemon=True)
+            stderr_thread.start()
+            watchdog = threading.Timer(timeout, kill_on_deadline)
+            watchdog.daemon = True
+            watchdog.start()
             
-            self.logger.info(f"✅ PIPE_UPLOAD_COMPLETE: {upload_time:.1f}s")
+            extra_args = {'ContentType': 'video/mp4'}
+            if self.config.add_metadata:
+                extra_args['Metadata'] = {
+                    'uploaded_at': start_time.isoformat(),
+                    'source': 'typing-clients-ingestion-youtube-stream',
+                    'original_url': url
+                }
             
-            if process.returncode == 0:
-                s3_url = f"https://{self.config.bucket_name}.s3.amazonaws.com/{s3_key}"
+            part_size = get_multipart_part_size(None)
+            uploader = MultipartStreamUploader(
+                self.s3_client,
+                self.config.bucket_name,
+                s3_key,
+                part_size=part_size,
+                max_in_flight=config.get('downloads.drive.multipart.max_in_flight_parts', 4),
+                extra_args=extra_args
+            )
+            chunks = iter(lambda: process.stdout.read(1024 * 1024), b'')
+            
+            # Peek first so a failed yt-dlp doesn't leave an empty object in S3
+            first_chunk = next(chunks, b'')
+            if not first_chunk:
+                process.wait()
+                stderr_thread.join(timeout=5)
+                reason = 'timed out' if timed_out.is_set() else f"produced no output (code {process.returncode})"
                 return UploadResult(
-                    success=True,
+                    success=False,
                     s3_key=s3_key,
-                    s3_url=s3_url,
-                    upload_time=upload_time
+                    error=sanitize_error_message(f"yt-dlp {reason}: {' | '.join(stderr_tail)[:200]}")
                 )
-            else:
-                stdout_output = process.stdout.read().decode() if process.stdout else ""
-                stderr_output = process.stderr.read().decode() if process.stderr else ""
-                full_error = f"stdout: {stdout_output[:100]} stderr: {stderr_output[:100]}"
-                self.logger.error(f"❌ yt-dlp failed with return code {process.returncode}: {full_error}")
+            
+            file_size = uploader.upload(itertools.chain([first_chunk], chunks))
+            process.wait()
+            watchdog.cancel()
+            stderr_thread.join(timeout=5)
+            upload_time = time.monotonic() - started
+            
+            if timed_out.is_set() or process.returncode != 0:
+                # The object is truncated: remove it rather than leave a broken video behind
+                self.s3_client.delete_object(Bucket=self.config.bucket_name, Key=s3_key)
+                reason = f"timed out after {timeout}s" if timed_out.is_set() else f"failed (code {process.returncode})"
+                self.logger.error(f"❌ yt-dlp {reason}: {' | '.join(stderr_tail)[:200]}")
                 return UploadResult(
                     success=False,
                     s3_key=s3_key,
-                    error=f"yt-dlp failed (code {process.returncode}): {stderr_output[:100]}"
+                    error=sanitize_error_message(f"yt-dlp {reason}: {' | '.join(stderr_tail)[:100]}")
                 )
+            
+            record_s3_upload('youtube_stream', file_size, upload_time)
+            throughput = file_size / (1024 * 1024) / upload_time if upload_time > 0 else 0.0
+            self.logger.info(f"✅ YOUTUBE_UPLOAD_COMPLETE: {file_size / (1024 * 1024):.1f} MB "
+                             f"in {upload_time:.1f}s ({throughput:.2f} MB/s)")
+            s3_url = f"https://{self.config.bucket_name}.s3.amazonaws.com/{s3_key}"
+            return UploadResult(
+                success=True,
+                s3_key=s3_key,
+                s3_url=s3_url,
+                file_size=file_size,
+                upload_time=upload_time,
+                checksum=uploader.sha256
+            )
                 
         except Exception as e:
-            # Cancel timeout and cleanup process
-            try:
-                signal.alarm(0)
-                if process and process.poll() is None:
-                    self.logger.info("🛑 Terminating yt-dlp process due to error")
-                    process.terminate()
-                    try:
-                        process.wait(timeout=5)
-                    except subprocess.TimeoutExpired:
-                        process.kill()
-            except:
-                pass  # Ignore cleanup errors
-            
-            self.logger.error(f"❌ PIPE_ERROR: {str(e)}")
+            self.logger.error(f"❌ YOUTUBE_STREAM_ERROR: {str(e)}")
             return UploadResult(
                 success=False,
                 s3_key=s3_key,
                 error=sanitize_error_message(str(e))
             )
         finally:
-            # Always cleanup: cancel timeout, cleanup pipe
-            try:
-                signal.alarm(0)
-                if os.path.exists(pipe_path):
-                    self.logger.info(f"🧹 PIPE_CLEANUP: {pipe_path}")
-                    os.remove(pipe_path)
-            except Exception as cleanup_error:
-                self.logger.warning(f"⚠️ Pipe cleanup failed: {cleanup_error}")
+            if watchdog:
+                watchdog.cancel()
+            if process and process.poll() is None:
+                self.logger.info("🛑 Terminating yt-dlp process")
+                process.terminate()
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.kill()
     
     def stream_drive_to_s3(self, drive_id: str, s3_key: str) -> UploadResult:
-        """Stream Drive file directly to S3"""
+        """
+        Stream Drive file directly to S3 as a multipart upload (memory bounded by part size).
+        
+        If ``s3_key`` ends in the ``.bin`` placeholder, the real extension and
+        ContentType are detected from the first bytes and the response headers
+        before uploading; the returned ``UploadResult.s3_key`` is the final key.
+        """
         download_url = f"https://drive.google.com/uc?id={drive_id}&export=download"
         
         try:
@@ -511,24 +668,33 @@ class UnifiedS3Manager:
                 response = session.get(download_url, stream=True)
                 response.raise_for_status()
             
-            # Stream the file content to BytesIO
-            file_obj = BytesIO()
-            file_size = 0
+            # Part size follows the Drive chunk sizes for the advertised file size
+            content_length = int(response.headers.get('Content-Length') or 0) or None
+            part_size = get_multipart_part_size(content_length)
+            read_chunk_size = min(get_download_chunk_size(content_length or sys.maxsize), part_size)
             
-            for chunk in response.iter_content(chunk_size=1024*1024):  # 1MB chunks
-                if chunk:
-                    file_obj.write(chunk)
-                    file_size += len(chunk)
-                    
-                    # Log progress for large files
-                    if file_size > 0 and file_size % (100 * 1024 * 1024) == 0:  # Every 100MB
-                        self.logger.info(f"    Progress: {file_size / (1024 * 1024):.1f} MB downloaded...")
+            chunks = response.iter_content(chunk_size=read_chunk_size)
             
-            file_obj.seek(0)
+            # Buffer the first bytes so the type is known before anything is written to S3
+            head_chunks = []
+            head_size = 0
+            for chunk in chunks:
+                if chunk:
+                    head_chunks.append(chunk)
+                    head_size += len(chunk)
+                    if head_size >= SNIFF_BYTES:
+                        break
+            extension, sniffed_type, original_filename = detect_file_type(
+                b''.join(head_chunks)[:SNIFF_BYTES], response.headers)
             
             # Determine content type from response headers
             response_content_type = response.headers.get('Content-Type', 'application/octet-stream')
-            if response_content_type == 'application/octet-stream':
+            if s3_key.endswith(PLACEHOLDER_EXTENSION) and extension != PLACEHOLDER_EXTENSION:
+                # Placeholder key: use the detected extension and type on the first write
+                s3_key = s3_key[:-len(PLACEHOLDER_EXTENSION)] + extension
+                content_type = sniffed_type
+                self.logger.info(f"    Detected {extension} ({content_type}), uploading as {s3_key}")
+            elif response_content_type == 'application/octet-stream':
                 # Try to guess from s3_key extension
                 content_type = self.get_content_type(s3_key)
             else:
@@ -539,18 +705,36 @@ class UnifiedS3Manager:
                 extra_args['Metadata'] = {
                     'uploaded_at': start_time.isoformat(),
                     'source': 'typing-clients-ingestion-drive-stream',
-                    'drive_id': drive_id,
-                    'original_size': str(file_size)
+                    'drive_id': drive_id
                 }
-            
-            self.s3_client.upload_fileobj(
-                file_obj,
+                if content_length:
+                    extra_args['Metadata']['original_size'] = str(content_length)
+                if original_filename:
+                    # S3 metadata must be ASCII
+                    extra_args['Metadata']['original_filename'] = urllib.parse.quote(original_filename)
+            
+            # Stream the download straight into multipart parts (bounded memory)
+            uploader = MultipartStreamUploader(
+                self.s3_client,
                 self.config.bucket_name,
                 s3_key,
-                ExtraArgs=extra_args
+                part_size=part_size,
+                max_in_flight=get_config().get('downloads.drive.multipart.max_in_flight_parts', 4),
+                extra_args=extra_args
             )
+            next_report = [100 * 1024 * 1024]
+            
+            def report_progress(bytes_read):
+                # Log progress for large files (every 100MB)
+                if bytes_read >= next_report[0]:
+                    self.logger.info(f"    Progress: {bytes_read / (1024 * 1024):.1f} MB streamed...")
+                    next_report[0] += 100 * 1024 * 1024
+            
+            file_size = uploader.upload(itertools.chain(head_chunks, chunks),
+                                        progress_callback=report_progress)
             
             upload_time = (datetime.now() - start_time).total_seconds()
+            record_s3_upload('drive_stream', file_size, upload_time)
             s3_url = f"https://{self.config.bucket_name}.s3.amazonaws.com/{s3_key}"
             
             self.logger.info(f"    ✅ Successfully uploaded {file_size / (1024 * 1024):.1f} MB to S3")
@@ -560,7 +744,8 @@ class UnifiedS3Manager:
                 s3_key=s3_key,
                 s3_url=s3_url,
                 file_size=file_size,
-                upload_time=upload_time
+                upload_time=upload_time,
+                checksum=uploader.sha256
             )
             
         except Exception as e:
@@ -721,66 +906,65 @@ class UnifiedS3Manager:
         db = get_database_manager()
         person_s3_data = {}
         
+        # Collect (row_id, name, files) for the requested people
+        people = []
         if target_rows:
             # Process specific rows
             for row_id in target_rows:
                 person = db.get_person_by_row_id(row_id)
                 if person:
-                    files = db.get_person_files(row_id)
-                    s3_urls = []
-                    
-                    self.logger.info(f"\n📤 Checking files for {person['name']} (Row {row_id})")
-                    self.logger.info(f"  📁 Found {len(files)} files in database")
-                    
-                    for file in files:
-                        s3_key = file['storage_path']
-                        
-                        # Check if file exists in S3
-                        if self.check_s3_exists(s3_key):
-                            s3_url = f"https://{self.config.bucket_name}.s3.amazonaws.com/{s3_key}"
-                            s3_urls.append(s3_url)
-                            self.logger.info(f"  ✅ Verified: {file['original_filename']}")
-                        else:
-                            self.logger.warning(f"  ⚠️  Missing in S3: {s3_key}")
-                            self.upload_report['errors'].append({
-                                'row_id': row_id,
-                                'person': person['name'],
-                                'file_id': str(file['file_id']),
-                                'error': 'File not found in S3'
-                            })
-                    
-                    person_s3_data[row_id] = s3_urls
+                    people.append((row_id, person['name'], db.get_person_files(row_id)))
         else:
             # Process all people with files
-            summary = db.get_person_file_summary()
-            
-            for entry in summary:
+            for entry in db.get_person_file_summary():
                 if entry['total_files'] > 0:
-                    row_id = entry['row_id']
-                    files = db.get_person_files(row_id)
-                    s3_urls = []
-                    
-                    self.logger.info(f"\n📤 Checking files for {entry['name']} (Row {row_id})")
-                    self.logger.info(f"  📁 Found {len(files)} files in database")
-                    
-                    for file in files:
-                        s3_key = file['storage_path']
-                        
-                        # Check if file exists in S3
-                        if self.check_s3_exists(s3_key):
-                            s3_url = f"https://{self.config.bucket_name}.s3.amazonaws.com/{s3_key}"
-                            s3_urls.append(s3_url)
-                            self.logger.info(f"  ✅ Verified: {file['original_filename']}")
-                        else:
-                            self.logger.warning(f"  ⚠️  Missing in S3: {s3_key}")
-                            self.upload_report['errors'].append({
-                                'row_id': row_id,
-                                'person': entry['name'],
-                                'file_id': str(file['file_id']),
-                                'error': 'File not found in S3'
-                            })
-                    
-                    person_s3_data[row_id] = s3_urls
+                    people.append((entry['row_id'], entry['name'], db.get_person_files(entry['row_id'])))
+        
+        # Verify every storage path with one listing, or with concurrent HEADs for a few files
+        expected = {}
+        for _, _, files in people:
+            for file in files:
+                expected[file['storage_path']] = file.get('file_size')
+        report = verify_keys(self.s3_client, self.config.bucket_name, expected,
+                             use_listing=self.config.verify_with_inventory)
+        self.upload_report['verification'] = report.totals()
+        
+        for row_id, name, files in people:
+            s3_urls = []
+            
+            self.logger.info(f"\n📤 Checking files for {name} (Row {row_id})")
+            self.logger.info(f"  📁 Found {len(files)} files in database")
+            
+            for file in files:
+                s3_key = file['storage_path']
+                
+                # Check if file exists in S3 (with the expected size)
+                error = None
+                if s3_key in report.size_mismatches:
+                    expected_size, actual_size = report.size_mismatches[s3_key]
+                    error = f'Size mismatch in S3: expected {expected_size} bytes, found {actual_size}'
+                elif s3_key in report.missing:
+                    error = 'File not found in S3'
+                
+                if error is None:
+                    s3_url = f"https://{self.config.bucket_name}.s3.amazonaws.com/{s3_key}"
+                    s3_urls.append(s3_url)
+                    self.logger.info(f"  ✅ Verified: {file['original_filename']}")
+                else:
+                    self.logger.warning(f"  ⚠️  {error}: {s3_key}")
+                    self.upload_report['errors'].append({
+                        'row_id': row_id,
+                        'person': name,
+                        'file_id': str(file['file_id']),
+                        'error': error
+                    })
+            
+            person_s3_data[row_id] = s3_urls
+        
+        totals = report.totals()
+        self.logger.info(f"\n🔎 Verification: {totals['verified']}/{totals['expected']} files verified, "
+                         f"{totals['missing']} missing, {totals['size_mismatches']} size mismatches "
+                         f"({totals['bytes_found'] / (1024**3):.2f} GB found)")
         
         return person_s3_data
     
@@ -944,6 +1128,9 @@ if __name__ == "__main__":
     parser.add_argument('--no-csv-update', action='store_true', help='Skip CSV update')
     parser.add_argument('--rows', type=str, help='Specific row IDs to process (comma-separated)')
     parser.add_argument('--use-database', action='store_true', help='Use database mode for file sync')
+    parser.add_argument('--verify', choices=['auto', 'inventory', 'head'], default='auto',
+                        help='Database mode: verify files with one bucket listing, a HEAD per file, '
+                             'or whichever suits the number of files (default)')
     
     args = parser.parse_args()
     
@@ -954,7 +1141,8 @@ if __name__ == "__main__":
             bucket_name=args.bucket,
             upload_mode=UploadMode.LOCAL_THEN_UPLOAD,  # Not used for database sync
             organize_by_person=True,
-            update_csv=False  # Database mode doesn't update CSV
+            update_csv=False,  # Database mode doesn't update CSV
+            verify_with_inventory={'auto': None, 'inventory': True, 'head': False}[args.verify]
         )
         manager = UnifiedS3Manager(config)
         
@@ -1103,6 +1291,7 @@ class UnifiedS3Operations:
                 s3_url = f"https://{bucket_name}.s3.amazonaws.com/{s3_key}"
             
             upload_time = (datetime.now() - start_time).total_seconds()
+            record_s3_upload('file', file_size, upload_time)
             
             return UploadResult(
                 success=True,
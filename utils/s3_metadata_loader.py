@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+S3 Metadata Loader - list once, fetch concurrently, cache by ETag
+
+Loads the JSON metadata objects under a prefix (``clients/`` for
+MetadataDownloadProcessor). The prefix is listed once with the paginator;
+objects whose ETag matches the local cache are served from it, and the rest
+are fetched with ``get_object`` on a bounded thread pool. The cache is a
+ProgressStore file (``s3_metadata.cache_path``), so unchanged metadata is
+never downloaded twice across runs.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+try:
+    from .config import get_config, get_project_root
+    from .logging_config import get_logger
+    from .progress_store import ProgressStore
+except ImportError:
+    from config import get_config, get_project_root
+    from logging_config import get_logger
+    from progress_store import ProgressStore
+
+logger = get_logger(__name__)
+
+CACHE_COLLECTION = 'objects'
+
+
+class S3MetadataLoader:
+    """
+    Load JSON objects under ``prefix`` in listing order.
+
+    Args:
+        s3_client: boto3 S3 client
+        bucket: Bucket name
+        prefix: Key prefix to list
+        max_workers: Concurrent get_object calls (defaults to s3_metadata.max_workers)
+        cache_path: ETag cache file; None reads s3_metadata.cache_path, '' disables the cache
+    """
+
+    def __init__(self, s3_client, bucket: str, prefix: str = 'clients/', max_workers: Optional[int] = None,
+                 cache_path: Optional[Union[str, Path]] = None):
+        config = get_config()
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.max_workers = max(1, int(max_workers or config.get('s3_metadata.max_workers', 8)))
+        if cache_path is None:
+            cache_path = config.get('s3_metadata.cache_path', 'cache/s3_metadata.sqlite')
+        if cache_path and not Path(cache_path).is_absolute():
+            cache_path = get_project_root() / cache_path
+        self.cache = ProgressStore(cache_path) if cache_path else None
+        self.stats = {'listed': 0, 'cached': 0, 'fetched': 0, 'errors': 0}
+
+    def list_objects(self) -> List[Dict[str, Any]]:
+        """Every ``.json`` object under the prefix (one paginated listing)"""
+        objects = []
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            objects.extend(obj for obj in page.get('Contents', []) if obj['Key'].endswith('.json'))
+        return objects
+
+    def _fetch(self, obj: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """(metadata, ETag) of one object, or (None, None) if it cannot be read"""
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=obj['Key'])
+            return json.loads(response['Body'].read()), response.get('ETag', obj.get('ETag'))
+        except Exception as e:
+            logger.error(f"Error reading {obj['Key']}: {e}")
+            return None, None
+
+    def load(self, skip: Optional[Callable[[str], bool]] = None) -> List[Dict[str, Any]]:
+        """
+        Metadata dicts (with ``_s3_key`` set) for every listed object.
+
+        Args:
+            skip: Optional predicate on the key; matching objects are neither fetched nor returned
+        """
+        objects = self.list_objects()
+        self.stats['listed'] += len(objects)
+
+        results: Dict[str, Dict[str, Any]] = {}
+        to_fetch = []
+        for obj in objects:
+            key = obj['Key']
+            if skip is not None and skip(key):
+                continue
+            cached = self.cache.get(CACHE_COLLECTION, key) if self.cache else None
+            if cached and cached.get('etag') == obj.get('ETag'):
+                results[key] = cached['metadata']
+                self.stats['cached'] += 1
+            else:
+                to_fetch.append(obj)
+
+        if to_fetch:
+            logger.info(f"Fetching {len(to_fetch)} metadata objects with {self.max_workers} workers "
+                        f"({self.stats['cached']} unchanged in cache)")
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='s3-metadata') as executor:
+                for obj, (metadata, etag) in zip(to_fetch, executor.map(self._fetch, to_fetch)):
+                    if metadata is None:
+                        self.stats['errors'] += 1
+                        continue
+                    results[obj['Key']] = metadata
+                    self.stats['fetched'] += 1
+                    if self.cache and etag:
+                        self.cache.put(CACHE_COLLECTION, obj['Key'], {'etag': etag, 'metadata': metadata})
+
+        if self.cache:
+            # Forget objects that no longer exist
+            self.cache.retain(CACHE_COLLECTION, (obj['Key'] for obj in objects))
+
+        metadata_list = []
+        for obj in objects:
+            metadata = results.get(obj['Key'])
+            if isinstance(metadata, dict):
+                metadata = dict(metadata, _s3_key=obj['Key'])
+                metadata_list.append(metadata)
+        return metadata_list
+
+    def close(self) -> None:
+        if self.cache:
+            self.cache.close()
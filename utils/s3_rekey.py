@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Bulk S3 Re-key - move/re-type many objects and rewrite CSV s3_paths once
+
+Generalises core/fix_s3_extensions.py: operations come from an explicit
+mapping or from a rule applied to a bucket listing. Copies run on a bounded
+thread pool (multipart UploadPartCopy above the 5 GB CopyObject limit),
+sources are removed with batched ``delete_objects`` calls, and every CSV row
+whose ``s3_paths`` mention a moved key is rewritten in a single pass. Media
+ledger entries are moved along so the moved objects are still reused.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+from botocore.exceptions import ClientError
+
+try:
+    from .config import get_config
+    from .logging_config import get_logger
+    from .csv_manager import CSVManager
+    from .content_sniffing import SNIFF_BYTES, PLACEHOLDER_EXTENSION, detect_file_type
+    from .media_ledger import MediaLedger, get_media_ledger
+except ImportError:
+    from config import get_config
+    from logging_config import get_logger
+    from csv_manager import CSVManager
+    from content_sniffing import SNIFF_BYTES, PLACEHOLDER_EXTENSION, detect_file_type
+    from media_ledger import MediaLedger, get_media_ledger
+
+logger = get_logger(__name__)
+
+# S3 limits
+COPY_OBJECT_MAX_SIZE = 5 * 1024 * 1024 * 1024
+DELETE_OBJECTS_MAX_KEYS = 1000
+
+
+@dataclass
+class RekeyOperation:
+    """Move ``old_key`` to ``new_key`` (may be equal to only change ContentType/metadata)"""
+    old_key: str
+    new_key: str
+    content_type: Optional[str] = None
+    metadata: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class RekeyReport:
+    """Outcome of a bulk re-key run"""
+    moved: Dict[str, str] = field(default_factory=dict)  # old key -> new key
+    failed: Dict[str, str] = field(default_factory=dict)  # old key -> error
+    missing: List[str] = field(default_factory=list)
+    deleted: int = 0
+    bytes_copied: int = 0
+    csv_rows_updated: int = 0
+    ledger_entries_updated: int = 0
+
+
+class S3BulkRekeyer:
+    """Copy objects to new keys in parallel, then batch-delete the sources"""
+
+    def __init__(self, s3_client, bucket: str, max_workers: Optional[int] = None,
+                 multipart_threshold: int = COPY_OBJECT_MAX_SIZE, part_size: Optional[int] = None):
+        config = get_config()
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.max_workers = max_workers or config.get('s3_rekey.max_workers', 8)
+        self.multipart_threshold = multipart_threshold
+        self.part_size = part_size or config.get('s3_rekey.copy_part_size', 512 * 1024 * 1024)
+
+    def plan_from_mapping(self, mapping: Dict[str, Union[str, Dict]]) -> List[RekeyOperation]:
+        """
+        Build operations from ``{old_key: new_key}`` or
+        ``{old_key: {'new_key': ..., 'content_type': ..., 'metadata': {...}}}``.
+        """
+        operations = []
+        for old_key, target in mapping.items():
+            if isinstance(target, str):
+                operations.append(RekeyOperation(old_key, target))
+            else:
+                operations.append(RekeyOperation(old_key, target.get('new_key', old_key),
+                                                 target.get('content_type'), dict(target.get('metadata') or {})))
+        return operations
+
+    def plan_from_rule(self, rule: Callable[[Dict], Optional[RekeyOperation]],
+                       prefix: str = '') -> List[RekeyOperation]:
+        """Apply ``rule`` to every object summary under ``prefix``; None means leave it alone"""
+        operations = []
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for summary in page.get('Contents', []):
+                operation = rule(summary)
+                if operation:
+                    operations.append(operation)
+        return operations
+
+    def run(self, operations: Iterable[RekeyOperation], dry_run: bool = False) -> RekeyReport:
+        """Copy every operation concurrently, then delete the sources of the successful ones"""
+        operations = list(operations)
+        report = RekeyReport()
+        if dry_run:
+            for operation in operations:
+                logger.info(f"[dry run] {operation.old_key} -> {operation.new_key}")
+                report.moved[operation.old_key] = operation.new_key
+            return report
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='s3-rekey') as executor:
+            outcomes = list(executor.map(self._copy_safely, operations))
+
+        for operation, (status, detail) in zip(operations, outcomes):
+            if status == 'copied':
+                report.moved[operation.old_key] = operation.new_key
+                report.bytes_copied += detail
+            elif status == 'missing':
+                report.missing.append(operation.old_key)
+            else:
+                report.failed[operation.old_key] = detail
+
+        # Only sources that now live under a different key are deleted
+        stale_keys = [old for old, new in report.moved.items() if old != new]
+        report.deleted = self.delete_keys(stale_keys, report.failed)
+        logger.info(f"Re-keyed {len(report.moved)} objects ({report.bytes_copied / (1024 * 1024):.1f} MB), "
+                    f"deleted {report.deleted}, missing {len(report.missing)}, failed {len(report.failed)}")
+        return report
+
+    def delete_keys(self, keys: List[str], errors: Optional[Dict[str, str]] = None) -> int:
+        """Delete ``keys`` with delete_objects in batches of 1000; returns the number deleted"""
+        deleted = 0
+        for start in range(0, len(keys), DELETE_OBJECTS_MAX_KEYS):
+            batch = keys[start:start + DELETE_OBJECTS_MAX_KEYS]
+            response = self.s3_client.delete_objects(
+                Bucket=self.bucket,
+                Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True})
+            batch_errors = response.get('Errors', [])
+            for error in batch_errors:
+                logger.error(f"Failed to delete {error.get('Key')}: {error.get('Message')}")
+                if errors is not None:
+                    errors[error.get('Key')] = f"delete failed: {error.get('Message')}"
+            deleted += len(batch) - len(batch_errors)
+        return deleted
+
+    def _copy_safely(self, operation: RekeyOperation):
+        try:
+            return 'copied', self.copy(operation)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                logger.warning(f"Source not found: {operation.old_key}")
+                return 'missing', None
+            logger.error(f"Copy failed for {operation.old_key}: {e}")
+            return 'failed', str(e)
+        except Exception as e:
+            logger.error(f"Copy failed for {operation.old_key}: {e}")
+            return 'failed', str(e)
+
+    def copy(self, operation: RekeyOperation) -> int:
+        """Server-side copy with replaced ContentType/metadata; returns the object size"""
+        head = self.s3_client.head_object(Bucket=self.bucket, Key=operation.old_key)
+        size = head['ContentLength']
+        metadata = dict(head.get('Metadata', {}))
+        metadata.update(operation.metadata)
+        content_type = operation.content_type or head.get('ContentType') or 'application/octet-stream'
+        copy_source = {'Bucket': self.bucket, 'Key': operation.old_key}
+
+        if size <= self.multipart_threshold:
+            self.s3_client.copy_object(Bucket=self.bucket, Key=operation.new_key, CopySource=copy_source,
+                                       MetadataDirective='REPLACE', Metadata=metadata, ContentType=content_type)
+        else:
+            self._multipart_copy(operation.new_key, copy_source, size, metadata, content_type)
+        return size
+
+    def _multipart_copy(self, new_key: str, copy_source: Dict, size: int,
+                        metadata: Dict[str, str], content_type: str) -> None:
+        """UploadPartCopy in part_size ranges (CopyObject is capped at 5 GB)"""
+        upload_id = self.s3_client.create_multipart_upload(
+            Bucket=self.bucket, Key=new_key, Metadata=metadata, ContentType=content_type)['UploadId']
+        try:
+            parts = []
+            for part_number, start in enumerate(range(0, size, self.part_size), start=1):
+                end = min(start + self.part_size, size) - 1
+                response = self.s3_client.upload_part_copy(
+                    Bucket=self.bucket, Key=new_key, UploadId=upload_id, PartNumber=part_number,
+                    CopySource=copy_source, CopySourceRange=f"bytes={start}-{end}")
+                parts.append({'PartNumber': part_number, 'ETag': response['CopyPartResult']['ETag']})
+            self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket, Key=new_key, UploadId=upload_id, MultipartUpload={'Parts': parts})
+        except BaseException:
+            self.s3_client.abort_multipart_upload(Bucket=self.bucket, Key=new_key, UploadId=upload_id)
+            raise
+
+
+def sniffed_extension_rule(s3_client, bucket: str) -> Callable[[Dict], Optional[RekeyOperation]]:
+    """Rule for ``plan_from_rule``: give ``.bin`` objects the extension/type their first bytes show"""
+    def rule(summary: Dict) -> Optional[RekeyOperation]:
+        key = summary['Key']
+        if not key.endswith(PLACEHOLDER_EXTENSION):
+            return None
+        head = s3_client.get_object(Bucket=bucket, Key=key, Range=f"bytes=0-{SNIFF_BYTES - 1}")['Body'].read()
+        extension, content_type, _ = detect_file_type(head)
+        if extension == PLACEHOLDER_EXTENSION:
+            return None
+        return RekeyOperation(key, key[:-len(PLACEHOLDER_EXTENSION)] + extension, content_type)
+    return rule
+
+
+def rewrite_csv_s3_paths(moved: Dict[str, str], csv_manager: Optional[CSVManager] = None,
+                         operation_name: str = "s3_rekey") -> int:
+    """
+    Point every ``s3_paths`` entry at its new key in one read and one backed-up write.
+
+    Returns:
+        Number of rows changed
+    """
+    if not moved:
+        return 0
+    csv_manager = csv_manager or CSVManager()
+    df = csv_manager.read_csv_safe()
+    if 's3_paths' not in df.columns:
+        return 0
+
+    rows_updated = 0
+    for index, row in df.iterrows():
+        paths = CSVManager.load_s3_paths(row)
+        if not any(path in moved for path in paths.values()):
+            continue
+        df.at[index, 's3_paths'] = CSVManager.save_s3_paths(
+            {file_uuid: moved.get(path, path) for file_uuid, path in paths.items()})
+        rows_updated += 1
+
+    if rows_updated:
+        # Always back up before rewriting paths, even within the backup rate limit
+        csv_manager.write_csv(df, operation_name, backup=True)
+    logger.info(f"Rewrote s3_paths in {rows_updated} CSV rows")
+    return rows_updated
+
+
+def rewrite_ledger_s3_keys(moved: Dict[str, str], bucket: str, ledger: Optional[MediaLedger] = None) -> int:
+    """
+    Point media ledger entries at the new keys, so the next ingestion run
+    reuses the moved objects instead of streaming them again.
+
+    Returns:
+        Number of ledger entries changed
+    """
+    ledger = ledger or get_media_ledger()
+    if not moved or ledger is None:
+        return 0
+    updated = ledger.rekey(bucket, moved)
+    logger.info(f"Rewrote {updated} media ledger entries")
+    return updated
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Sheet Parser - parse the published Google Sheet once for steps 1 and 2
+
+Step 1 only needs the row count of the people table and step 2 needs each
+row's cell texts plus the first link in the name cell. Both now share one
+parse of the HTML (lxml when installed, BeautifulSoup otherwise), and rows
+are streamed as small tuples instead of repeated ``get_text`` calls on
+soup objects.
+"""
+
+from collections import namedtuple
+from typing import Iterator, Optional
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
+try:
+    from .config import get_config
+    from .logging_config import get_logger
+except ImportError:
+    from config import get_config
+    from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Column holding the name (and the person's doc link)
+NAME_COLUMN = 2
+
+# One <tr>: stripped text of every <td> and the href of the first <a> in the name cell
+SheetRow = namedtuple('SheetRow', ['cells', 'name_href'])
+
+
+class ParsedSheet:
+    """The people table of a sheet page, parsed once"""
+
+    def __init__(self, rows, backend: str):
+        self._rows = rows
+        self.backend = backend
+
+    @property
+    def row_count(self) -> int:
+        """Number of <tr> elements in the table (header included); 0 without a table"""
+        return len(self._rows)
+
+    def iter_rows(self, start: int = 0) -> Iterator[SheetRow]:
+        """Rows as SheetRow tuples, from ``start``"""
+        for index in range(start, len(self._rows)):
+            yield self._rows[index]
+
+
+def _lxml_rows(html_content: str, target_div_id: Optional[str]):
+    document = lxml_html.fromstring(html_content)
+    div = None
+    if target_div_id:
+        div = next(iter(document.xpath('//div[@id=$div_id]', div_id=target_div_id)), None)
+    if div is not None:
+        table = next(div.iter('table'), None)
+    else:
+        # Fallback to any table
+        table = next(iter(document.xpath(
+            '//table[contains(concat(" ", normalize-space(@class), " "), " waffle ")]')), None)
+        if table is None:
+            table = next(document.iter('table'), None)
+    if table is None:
+        return []
+
+    rows = []
+    for tr in table.iter('tr'):
+        tds = list(tr.iter('td'))
+        cells = tuple(''.join(text.strip() for text in td.itertext()) for td in tds)
+        name_href = None
+        if len(tds) > NAME_COLUMN:
+            anchor = next(tds[NAME_COLUMN].iter('a'), None)
+            if anchor is not None:
+                name_href = anchor.get('href')
+        rows.append(SheetRow(cells, name_href))
+    return rows
+
+
+def _soup_rows(html_content: str, target_div_id: Optional[str]):
+    soup = BeautifulSoup(html_content, "html.parser")
+    target_div = soup.find("div", {"id": target_div_id}) if target_div_id else None
+    if target_div:
+        table = target_div.find("table")
+    else:
+        # Fallback to any table
+        table = soup.find("table", {"class": "waffle"})
+        if not table:
+            tables = soup.find_all("table")
+            table = tables[0] if tables else None
+    if not table:
+        return []
+
+    rows = []
+    for tr in table.find_all("tr"):
+        tds = tr.find_all("td")
+        name_href = None
+        if len(tds) > NAME_COLUMN:
+            anchor = tds[NAME_COLUMN].find("a")
+            if anchor is not None and anchor.has_attr("href"):
+                name_href = anchor["href"]
+        rows.append(SheetRow(tuple(td.get_text(strip=True) for td in tds), name_href))
+    return rows
+
+
+# Last parse, so step 2 reuses the tree step 1 built for the same HTML
+_last_parse = (None, None, None)
+
+
+def parse_sheet(html_content: str, target_div_id: Optional[str] = None, use_lxml: bool = True) -> ParsedSheet:
+    """
+    Parse the people table of a published sheet page.
+
+    The table is the first one inside the div with ``target_div_id``
+    (google_sheets.target_div_id by default), else the first "waffle" table,
+    else the first table on the page.
+
+    Args:
+        html_content: Sheet page HTML
+        target_div_id: Id of the div holding the people table
+        use_lxml: Use lxml when installed (output is identical to the BeautifulSoup path)
+    """
+    global _last_parse
+    if target_div_id is None:
+        target_div_id = str(get_config().get("google_sheets.target_div_id"))
+    key = (target_div_id, use_lxml)
+    cached_html, cached_key, cached = _last_parse
+    if cached is not None and cached_key == key and (cached_html is html_content or cached_html == html_content):
+        return cached
+
+    parsed = None
+    if use_lxml and lxml_html is not None:
+        try:
+            parsed = ParsedSheet(_lxml_rows(html_content, target_div_id), 'lxml')
+        except (ValueError, TypeError) as e:
+            logger.debug(f"lxml could not parse the sheet ({e}), using BeautifulSoup")
+    if parsed is None:
+        parsed = ParsedSheet(_soup_rows(html_content, target_div_id), 'html.parser')
+
+    _last_parse = (html_content, key, parsed)
+    return parsed
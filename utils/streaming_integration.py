@@ -10,17 +10,23 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime
 
 try:
-    from .s3_manager import UnifiedS3Manager, S3Config, UploadMode
+    from .s3_manager import UnifiedS3Manager, S3Config, UploadMode, UploadResult
+    from .media_ledger import MediaLedger, get_media_ledger
     from .logging_config import get_logger
     from .download_drive import extract_file_id, list_folder_files
     from .patterns import extract_drive_id, extract_youtube_id
     from .error_handling import with_standard_error_handling
+    from .concurrency import host_slot, run_ordered
+    from .config import get_config
 except ImportError:
-    from s3_manager import UnifiedS3Manager, S3Config, UploadMode
+    from s3_manager import UnifiedS3Manager, S3Config, UploadMode, UploadResult
+    from media_ledger import MediaLedger, get_media_ledger
     from logging_config import get_logger
     from download_drive import extract_file_id, list_folder_files
     from patterns import extract_drive_id, extract_youtube_id
     from error_handling import with_standard_error_handling
+    from concurrency import host_slot, run_ordered
+    from config import get_config
 
 logger = get_logger(__name__)
 
@@ -91,11 +97,8 @@ def stream_extracted_links(person: Dict[str, Any], links: Dict[str, List[str]],
     
     progress = StreamingProgress(total_files)
     
-    # Stream YouTube videos
-    for i, youtube_url in enumerate(links.get('youtube', [])):
-        logger.info(f"\n📹 Streaming YouTube video {i+1}/{len(links.get('youtube', []))}")
-        success = stream_youtube_link(youtube_url, person, s3_results, s3_manager)
-        progress.update(f"YouTube: {youtube_url}", success)
+    # Stream YouTube videos (concurrently, up to downloads.youtube.max_workers)
+    stream_youtube_links(links.get('youtube', []), person, s3_results, s3_manager, progress)
     
     # Stream Google Drive files
     for i, drive_url in enumerate(links.get('drive_files', [])):
@@ -122,41 +125,105 @@ def stream_extracted_links(person: Dict[str, Any], links: Dict[str, List[str]],
 def stream_youtube_link(url: str, person: Dict[str, Any], s3_results: Dict, 
                        s3_manager: UnifiedS3Manager) -> bool:
     """Stream a single YouTube video to S3"""
+    return _record_youtube_result(_stream_youtube_video(url, person, s3_manager), s3_results)
+
+
+def stream_youtube_links(urls: List[str], person: Dict[str, Any], s3_results: Dict,
+                        s3_manager: UnifiedS3Manager, progress: Optional[StreamingProgress] = None,
+                        max_workers: Optional[int] = None) -> int:
+    """
+    Stream several YouTube videos to S3 concurrently.
+    
+    Videos run on a thread pool of ``downloads.youtube.max_workers`` (also capped
+    globally by the youtube.com host limit). Mappings and progress are updated
+    on the calling thread in URL order, so ``s3_results`` needs no locking.
+    
+    Returns:
+        Number of videos streamed successfully
+    """
+    if not urls:
+        return 0
+    if max_workers is None:
+        max_workers = get_config().get('downloads.youtube.max_workers', 4)
+    
+    successes = []
+    total_bytes = [0]
+    start = datetime.now()
+    
+    def commit(i, url, outcome):
+        logger.info(f"\n📹 YouTube video {i+1}/{len(urls)}: {url}")
+        success = _record_youtube_result(outcome, s3_results)
+        if success:
+            successes.append(url)
+            if not outcome.get('reused'):
+                total_bytes[0] += outcome['result'].file_size or 0
+        if progress:
+            progress.update(f"YouTube: {url}", success)
+    
+    run_ordered(urls, lambda url: _stream_youtube_video(url, person, s3_manager), commit,
+                max_workers=min(max_workers, len(urls)),
+                on_error=lambda i, url, e: {'url': url, 'error': str(e)})
+    
+    elapsed = (datetime.now() - start).total_seconds()
+    if total_bytes[0] and elapsed > 0:
+        logger.info(f"   📹 {len(successes)}/{len(urls)} videos, {total_bytes[0] / (1024 * 1024):.1f} MB "
+                    f"in {elapsed:.1f}s ({total_bytes[0] / (1024 * 1024) / elapsed:.2f} MB/s aggregate)")
+    return len(successes)
+
+
+def _stream_youtube_video(url: str, person: Dict[str, Any], s3_manager: UnifiedS3Manager) -> Dict[str, Any]:
+    """Upload one video under a new UUID key, or reuse its ledger entry (safe to run on worker threads)"""
     try:
-        # Extract video ID for logging
         video_id = extract_youtube_id(url)
-        logger.info(f"   YouTube URL: {url}")
-        logger.info(f"   Video ID: {video_id}")
+        source_key = MediaLedger.youtube_key(video_id) if video_id else None
+        entry = _find_in_ledger(source_key, s3_manager)
+        if entry:
+            return {'url': url, 'video_id': video_id, 'file_uuid': entry['file_uuid'], 's3_key': entry['s3_key'],
+                    'result': _ledger_result(entry, s3_manager), 'reused': True}
         
-        # Generate UUID and S3 key
         file_uuid = str(uuid.uuid4())
         # DRY CONSOLIDATION - Step 1: Use centralized S3 key generation
-        from .s3_manager import UnifiedS3Manager
         s3_key = UnifiedS3Manager.generate_uuid_s3_key(file_uuid, '.mp4')
         
-        logger.info(f"   UUID: {file_uuid}")
-        logger.info(f"   S3 Key: {s3_key}")
-        
-        # Stream to S3
-        result = s3_manager.stream_youtube_to_s3(url, s3_key, person['name'])
-        
-        if result.success:
-            # Update mappings
-            description = f"YouTube: {video_id or url}"
-            s3_results['file_uuids'][description] = file_uuid
-            s3_results['s3_paths'][file_uuid] = s3_key
-            
-            logger.info(f"   ✅ Successfully streamed to S3")
-            logger.info(f"   S3 URL: {result.s3_url}")
-            logger.info(f"   Upload time: {result.upload_time:.2f}s")
-            return True
-        else:
-            logger.error(f"   ❌ Failed to stream: {result.error}")
-            return False
-            
+        with host_slot('youtube.com'):
+            result = s3_manager.stream_youtube_to_s3(url, s3_key, person['name'])
+        _record_in_ledger(source_key, s3_manager, file_uuid, result)
+        return {'url': url, 'video_id': video_id, 'file_uuid': file_uuid, 's3_key': s3_key, 'result': result}
     except Exception as e:
-        logger.error(f"   ❌ Error streaming YouTube video: {str(e)}")
+        return {'url': url, 'error': str(e)}
+
+
+def _record_youtube_result(outcome: Dict[str, Any], s3_results: Dict) -> bool:
+    """Log one video's outcome and add its UUID mapping on success"""
+    url = outcome['url']
+    logger.info(f"   YouTube URL: {url}")
+    if 'error' in outcome:
+        logger.error(f"   ❌ Error streaming YouTube video: {outcome['error']}")
         return False
+    
+    result = outcome['result']
+    logger.info(f"   Video ID: {outcome['video_id']}")
+    logger.info(f"   UUID: {outcome['file_uuid']}")
+    logger.info(f"   S3 Key: {outcome['s3_key']}")
+    if not result.success:
+        logger.error(f"   ❌ Failed to stream: {result.error}")
+        return False
+    
+    # Update mappings
+    description = f"YouTube: {outcome['video_id'] or url}"
+    s3_results['file_uuids'][description] = outcome['file_uuid']
+    s3_results['s3_paths'][outcome['file_uuid']] = outcome['s3_key']
+    
+    if outcome.get('reused'):
+        logger.info(f"   ♻️ Already in S3 (media ledger), skipped download")
+        return True
+    logger.info(f"   ✅ Successfully streamed to S3")
+    logger.info(f"   S3 URL: {result.s3_url}")
+    if result.upload_time:
+        size_mb = (result.file_size or 0) / (1024 * 1024)
+        logger.info(f"   Upload time: {result.upload_time:.2f}s ({size_mb:.1f} MB, "
+                    f"{size_mb / result.upload_time:.2f} MB/s)")
+    return True
 
 
 def stream_drive_file(url: str, person: Dict[str, Any], s3_results: Dict, 
@@ -172,23 +239,33 @@ def stream_drive_file(url: str, person: Dict[str, Any], s3_results: Dict,
         logger.info(f"   Drive URL: {url}")
         logger.info(f"   File ID: {file_id}")
         
+        # Reuse the object from a previous run if the ledger has it
+        source_key = MediaLedger.drive_file_key(file_id)
+        entry = _find_in_ledger(source_key, s3_manager)
+        if entry:
+            s3_results['file_uuids'][f"Drive file: {file_id}"] = entry['file_uuid']
+            s3_results['s3_paths'][entry['file_uuid']] = entry['s3_key']
+            logger.info(f"   ♻️ Already in S3 (media ledger): {entry['s3_key']}")
+            return True
+        
         # Generate UUID and S3 key
         file_uuid = str(uuid.uuid4())
-        # Note: Using .bin extension as we don't know file type yet
-        # This can be fixed later with fix_s3_extensions.py if needed
+        # .bin is a placeholder: stream_drive_to_s3 swaps in the detected extension
         s3_key = UnifiedS3Manager.generate_uuid_s3_key(file_uuid, '.bin')
         
         logger.info(f"   UUID: {file_uuid}")
         logger.info(f"   S3 Key: {s3_key}")
         
         # Stream to S3
-        result = s3_manager.stream_drive_to_s3(file_id, s3_key)
+        with host_slot('drive.google.com'):
+            result = s3_manager.stream_drive_to_s3(file_id, s3_key)
+        _record_in_ledger(source_key, s3_manager, file_uuid, result)
         
         if result.success:
             # Update mappings
             description = f"Drive file: {file_id}"
             s3_results['file_uuids'][description] = file_uuid
-            s3_results['s3_paths'][file_uuid] = s3_key
+            s3_results['s3_paths'][file_uuid] = result.s3_key
             
             logger.info(f"   ✅ Successfully streamed to S3")
             logger.info(f"   S3 URL: {result.s3_url}")
@@ -220,7 +297,8 @@ def stream_drive_folder(folder_url: str, person: Dict[str, Any], s3_results: Dic
         logger.info(f"   Folder ID: {folder_id}")
         
         # List folder contents
-        folder_files = list_folder_files(folder_id)
+        with host_slot('drive.google.com'):
+            folder_files = list_folder_files(folder_id)
         if not folder_files:
             logger.warning(f"   ⚠️ No files found in folder or unable to access")
             return 0
@@ -235,11 +313,22 @@ def stream_drive_folder(folder_url: str, person: Dict[str, Any], s3_results: Dic
         # Stream each file in the folder
         for file_info in folder_files:
             file_id = file_info.get('id')
-            file_name = file_info.get('name', 'unknown')
+            file_name = f"{file_info.get('path', '')}{file_info.get('name', 'unknown')}"
             
             logger.info(f"\n   📄 Streaming folder file: {file_name}")
             logger.info(f"      File ID: {file_id}")
             
+            # Reuse the object from a previous run if the ledger has it
+            source_key = MediaLedger.drive_folder_key(folder_id, file_id) if file_id else None
+            entry = _find_in_ledger(source_key, s3_manager)
+            if entry:
+                s3_results['file_uuids'][f"Folder file: {file_name}"] = entry['file_uuid']
+                s3_results['s3_paths'][entry['file_uuid']] = entry['s3_key']
+                logger.info(f"      ♻️ Already in S3 (media ledger): {entry['s3_key']}")
+                streamed_count += 1
+                progress.update(f"Folder: {file_name}", True)
+                continue
+            
             # Generate UUID and S3 key
             file_uuid = str(uuid.uuid4())
             
@@ -254,13 +343,15 @@ def stream_drive_folder(folder_url: str, person: Dict[str, Any], s3_results: Dic
             logger.info(f"      S3 Key: {s3_key}")
             
             # Stream to S3
-            result = s3_manager.stream_drive_to_s3(file_id, s3_key)
+            with host_slot('drive.google.com'):
+                result = s3_manager.stream_drive_to_s3(file_id, s3_key)
+            _record_in_ledger(source_key, s3_manager, file_uuid, result)
             
             if result.success:
                 # Update mappings
                 description = f"Folder file: {file_name}"
                 s3_results['file_uuids'][description] = file_uuid
-                s3_results['s3_paths'][file_uuid] = s3_key
+                s3_results['s3_paths'][file_uuid] = result.s3_key
                 
                 logger.info(f"      ✅ Successfully streamed")
                 streamed_count += 1
@@ -277,6 +368,44 @@ def stream_drive_folder(folder_url: str, person: Dict[str, Any], s3_results: Dic
         return 0
 
 
+def _find_in_ledger(source_key: Optional[str], s3_manager: UnifiedS3Manager) -> Optional[Dict[str, Any]]:
+    """Ledger entry for media already in this bucket, or None (ledger disabled or no entry)"""
+    ledger = get_media_ledger()
+    if ledger is None or not source_key:
+        return None
+    try:
+        return ledger.find_reusable(source_key, s3_manager.config.bucket_name, s3_manager.s3_client)
+    except Exception as e:
+        logger.warning(f"   ⚠️ Media ledger lookup failed for {source_key}: {e}")
+        return None
+
+
+def _record_in_ledger(source_key: Optional[str], s3_manager: UnifiedS3Manager,
+                      file_uuid: str, result: UploadResult) -> None:
+    """Remember a successful upload so later runs can reuse it"""
+    ledger = get_media_ledger()
+    if ledger is None or not source_key or not result.success:
+        return
+    try:
+        ledger.record(source_key, s3_manager.config.bucket_name, file_uuid, result.s3_key,
+                      size=result.file_size, checksum=result.checksum)
+    except Exception as e:
+        # The upload itself succeeded; the next run just won't be able to skip it
+        logger.warning(f"   ⚠️ Could not record {source_key} in media ledger: {e}")
+
+
+def _ledger_result(entry: Dict[str, Any], s3_manager: UnifiedS3Manager) -> UploadResult:
+    """UploadResult describing an object reused from the ledger (nothing transferred)"""
+    return UploadResult(
+        success=True,
+        s3_key=entry['s3_key'],
+        s3_url=f"https://{s3_manager.config.bucket_name}.s3.amazonaws.com/{entry['s3_key']}",
+        file_size=entry['size'],
+        upload_time=0.0,
+        checksum=entry['checksum']
+    )
+
+
 def generate_streaming_report(person: Dict[str, Any], s3_results: Dict, 
                             start_time: datetime) -> Dict[str, Any]:
     """Generate a detailed report of the streaming operation"""
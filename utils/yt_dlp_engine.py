@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+yt-dlp Engine - run yt-dlp in-process instead of one subprocess per step
+
+download_single_video used to start yt-dlp up to three times per video
+(info, subtitles, video), each paying interpreter startup and extractor
+initialisation. The engine keeps a small pool of ``yt_dlp.YoutubeDL``
+instances, extracts a video's info once and reuses that info dict for the
+subtitle and media downloads. ``download_batch`` runs several videos
+concurrently on the same pool.
+
+yt_dlp is optional: when it is not importable ``get_yt_dlp_engine`` returns
+None and callers keep using the yt-dlp command line.
+"""
+
+import copy
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import yt_dlp
+except ImportError:
+    yt_dlp = None
+
+try:
+    from .config import get_config
+    from .logging_config import get_logger
+    from .retry_utils import retry_with_backoff
+    from .rate_limiter import get_service_limiter, throttle_signal
+    from .metrics import inc, timer
+except ImportError:
+    from config import get_config
+    from logging_config import get_logger
+    from retry_utils import retry_with_backoff
+    from rate_limiter import get_service_limiter, throttle_signal
+    from metrics import inc, timer
+
+logger = get_logger(__name__)
+
+# Options shared by every YoutubeDL instance (the CLI equivalents of --quiet --no-warnings --no-progress)
+BASE_PARAMS = {'quiet': True, 'no_warnings': True, 'noprogress': True}
+
+
+def _default_ydl_factory(params: Dict[str, Any]):
+    if yt_dlp is None:
+        raise ImportError("yt_dlp is not installed")
+    return yt_dlp.YoutubeDL(params)
+
+
+def _escape_template(path: Any) -> str:
+    """Escape a directory for use inside a yt-dlp output template"""
+    return str(path).replace('%', '%%')
+
+
+@dataclass
+class VideoDownload:
+    """Result of one video in a batch"""
+    url: str
+    video_id: Optional[str] = None
+    title: Optional[str] = None
+    video_file: Optional[Path] = None
+    subtitle_files: List[Path] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+class YoutubeDLPool:
+    """
+    Reusable YoutubeDL instances, keyed by their options.
+
+    A YoutubeDL object is not safe to share between threads, so ``lease``
+    hands each caller its own instance and takes it back afterwards. At
+    most ``size`` instances are leased at once.
+    """
+
+    def __init__(self, size: int = 4, ydl_factory: Optional[Callable[[Dict[str, Any]], Any]] = None):
+        self.size = max(1, int(size))
+        self._factory = ydl_factory or _default_ydl_factory
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._idle = {}
+        self.stats = {'created': 0, 'reused': 0}
+
+    @staticmethod
+    def _key(params: Dict[str, Any]) -> str:
+        return json.dumps(params, sort_keys=True, default=str)
+
+    @contextmanager
+    def lease(self, params: Dict[str, Any]):
+        """Borrow a YoutubeDL built with ``params`` (blocks while ``size`` are in use)"""
+        key = self._key(params)
+        with self._slots:
+            with self._lock:
+                idle = self._idle.get(key)
+                ydl = idle.pop() if idle else None
+                self.stats['reused' if ydl is not None else 'created'] += 1
+            if ydl is None:
+                ydl = self._factory(copy.deepcopy(params))
+            try:
+                yield ydl
+            finally:
+                with self._lock:
+                    self._idle.setdefault(key, []).append(ydl)
+
+    def close(self) -> None:
+        """Close every idle instance"""
+        with self._lock:
+            instances = [ydl for idle in self._idle.values() for ydl in idle]
+            self._idle.clear()
+        for ydl in instances:
+            close = getattr(ydl, 'close', None)
+            if close:
+                close()
+
+
+class YtDlpEngine:
+    """Extract-once, download-twice front end to a YoutubeDLPool"""
+
+    def __init__(self, pool: Optional[YoutubeDLPool] = None, max_workers: Optional[int] = None,
+                 max_attempts: int = 3, base_delay: float = 2.0):
+        config = get_config()
+        self.max_workers = max_workers or config.get('downloads.youtube.max_workers', 4)
+        self.pool = pool or YoutubeDLPool(config.get('downloads.youtube.ydl_pool_size', self.max_workers))
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+
+    def _run(self, params: Dict[str, Any], action: Callable[[Any], Any], base_delay: Optional[float] = None,
+             operation: str = 'extract_info'):
+        """Run ``action(ydl)`` on a pooled instance, retrying like retry_subprocess did"""
+        @retry_with_backoff(max_attempts=self.max_attempts,
+                            base_delay=self.base_delay if base_delay is None else base_delay,
+                            exceptions=(Exception,), logger=logger)
+        def attempt():
+            with self.pool.lease(dict(BASE_PARAMS, **params)) as ydl:
+                try:
+                    return action(ydl)
+                except Exception as e:
+                    # HTTP 429/403 from YouTube slows every youtube caller down
+                    throttled, retry_after = throttle_signal(e)
+                    if throttled:
+                        get_service_limiter().report('youtube', 429, retry_after)
+                    raise
+
+        with timer('ytdlp_seconds', operation=operation):
+            try:
+                return attempt()
+            except Exception:
+                inc('ytdlp_errors_total', operation=operation)
+                raise
+
+    def extract_info(self, url: str) -> Dict[str, Any]:
+        """Extractor output for ``url`` (formats and subtitles, nothing selected or downloaded)"""
+        return self._run({'skip_download': True},
+                         lambda ydl: ydl.extract_info(url, download=False, process=False))
+
+    def playlist_video_ids(self, url: str) -> List[str]:
+        """Video IDs of a playlist without resolving each entry (--flat-playlist)"""
+        info = self._run({'skip_download': True, 'extract_flat': 'in_playlist'},
+                         lambda ydl: ydl.extract_info(url, download=False), operation='playlist')
+        return [entry['id'] for entry in (info or {}).get('entries') or [] if entry and entry.get('id')]
+
+    def download_subtitles(self, info: Dict[str, Any], output_dir: Any, sub_format: str = 'vtt',
+                           languages: str = 'en.*') -> List[Path]:
+        """
+        Write manual and automatic subtitles as ``<id>_transcript.<lang>.<sub_format>``.
+
+        Returns:
+            Subtitle files written for this video
+        """
+        params = {
+            'skip_download': True,
+            'writesubtitles': True,
+            'writeautomaticsub': True,
+            'subtitleslangs': [lang.strip() for lang in languages.split(',') if lang.strip()],
+            'subtitlesformat': sub_format,
+            'outtmpl': {'default': f"{_escape_template(output_dir)}/%(id)s_transcript.%(ext)s"},
+            'postprocessors': [{'key': 'FFmpegSubtitlesConvertor', 'format': sub_format, 'when': 'before_dl'}],
+        }
+        self._run(params, lambda ydl: ydl.process_ie_result(copy.deepcopy(info), download=True),
+                  operation='subtitles')
+        return sorted(Path(output_dir).glob(f"{info['id']}_transcript.*.{sub_format}"))
+
+    def download_media(self, info: Dict[str, Any], output_dir: Any, resolution: str = '720',
+                       output_format: str = 'mp4') -> Path:
+        """Download the video (best video+audio up to ``resolution``) to ``<id>.<output_format>``"""
+        params = {
+            'format': f"bestvideo[height<={resolution}]+bestaudio/best[height<={resolution}]/best",
+            'merge_output_format': output_format,
+            'outtmpl': {'default': f"{_escape_template(output_dir)}/%(id)s.{output_format}"},
+        }
+        # Longer delay for video downloads
+        self._run(params, lambda ydl: ydl.process_ie_result(copy.deepcopy(info), download=True), base_delay=5.0,
+                  operation='media')
+        return Path(output_dir) / f"{info['id']}.{output_format}"
+
+    def download(self, url: str, output_dir: Any, subtitles: bool = True, media: bool = True,
+                 sub_format: str = 'vtt', languages: str = 'en.*', resolution: str = '720',
+                 output_format: str = 'mp4') -> VideoDownload:
+        """Extract once, then download subtitles and/or media from the same info dict"""
+        result = VideoDownload(url=url)
+        get_service_limiter().wait('youtube')
+        try:
+            info = self.extract_info(url)
+            result.video_id, result.title = info.get('id'), info.get('title')
+            if subtitles:
+                result.subtitle_files = self.download_subtitles(info, output_dir, sub_format, languages)
+            if media:
+                result.video_file = self.download_media(info, output_dir, resolution, output_format)
+        except Exception as e:
+            result.error = str(e)
+            logger.error(f"yt-dlp failed for {url}: {e}")
+        return result
+
+    def download_batch(self, urls: List[str], output_dir: Any, max_workers: Optional[int] = None,
+                       **options) -> List[VideoDownload]:
+        """
+        Download several videos concurrently.
+
+        Args:
+            urls: Video URLs
+            output_dir: Directory for videos and subtitles
+            max_workers: Concurrent videos (defaults to downloads.youtube.max_workers)
+            **options: Passed to ``download``
+
+        Returns:
+            One VideoDownload per URL, in input order (failures carry ``error``)
+        """
+        workers = max(1, min(max_workers or self.max_workers, len(urls) or 1))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='yt-dlp') as executor:
+            return list(executor.map(lambda url: self.download(url, output_dir, **options), urls))
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_yt_dlp_engine() -> Optional[YtDlpEngine]:
+    """
+    Shared engine, or None when yt_dlp is not installed or
+    downloads.youtube.in_process is false (callers then use the CLI).
+    """
+    global _engine
+    if yt_dlp is None or not get_config().get('downloads.youtube.in_process', True):
+        return None
+    with _engine_lock:
+        if _engine is None:
+            _engine = YtDlpEngine()
+        return _engine
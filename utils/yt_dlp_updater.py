@@ -1,16 +1,87 @@
 #!/usr/bin/env python3
 """
 Utility to ensure yt-dlp is always up to date before running downloads
+
+Update checks and binary lookups are cached in-process and on disk for
+downloads.youtube.yt_dlp_check_ttl seconds, so per-video calls are cheap.
+A failed update is retried after downloads.youtube.yt_dlp_retry_after
+seconds instead of on every video.
 """
 
+import os
 import subprocess
 import sys
+import time
 import logging
 from packaging import version
 import importlib.util
+import threading
+
+try:
+    from .config import get_config, load_json_state, save_json_state
+except ImportError:
+    from config import get_config, load_json_state, save_json_state
 
 logger = logging.getLogger(__name__)
 
+# Guards the cached state below
+_update_lock = threading.Lock()
+
+# Held while pip runs; other workers use the installed version instead of queueing behind it
+_update_running = threading.Lock()
+
+# Process-wide cache of the last update check and resolved binary, mirrored on disk
+# so separate runs within the TTL skip PyPI, pip and `yt-dlp --version` entirely
+_state = {}
+_state_loaded = False
+
+
+def _cache_settings():
+    """Get (cache file, TTL seconds) from config"""
+    config = get_config()
+    return (config.get('downloads.youtube.yt_dlp_cache_file', 'cache/yt_dlp_state.json'),
+            config.get('downloads.youtube.yt_dlp_check_ttl', 86400))
+
+
+def _load_state():
+    """Load the on-disk cache once per process (ignored if written by another interpreter)"""
+    global _state, _state_loaded
+    if not _state_loaded:
+        cache_file, _ = _cache_settings()
+        state = load_json_state(cache_file, {})
+        if state.get('python') == sys.executable:
+            _state = state
+        _state_loaded = True
+    return _state
+
+
+def _save_state():
+    """Persist the cache; failures only cost a re-check next run"""
+    cache_file, _ = _cache_settings()
+    _state['python'] = sys.executable
+    try:
+        os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+        save_json_state(cache_file, _state)
+    except (IOError, OSError) as e:
+        logger.debug(f"Could not write yt-dlp cache {cache_file}: {e}")
+
+
+def _is_fresh(key, ttl=None):
+    """Check whether the cached timestamp under ``key`` is within the TTL"""
+    if ttl is None:
+        _, ttl = _cache_settings()
+    checked_at = _load_state().get(key)
+    return checked_at is not None and time.time() - checked_at < ttl
+
+
+def clear_yt_dlp_cache():
+    """Forget cached update checks and binary resolution (in memory and on disk)"""
+    global _state, _state_loaded
+    with _update_lock:
+        _state = {}
+        _state_loaded = True
+        _save_state()
+
 def get_current_yt_dlp_version():
     """Get currently installed yt-dlp version"""
     try:
@@ -94,9 +165,33 @@ def ensure_yt_dlp_updated(force=False, fail_on_error=False):
     Returns:
         bool: True if yt-dlp is ready to use
     """
-    logger.info("🔄 Checking yt-dlp version...")
+    retry_after = get_config().get('downloads.youtube.yt_dlp_retry_after', 3600)
+    with _update_lock:
+        if not force and _is_fresh('update_checked_at'):
+            logger.debug(f"yt-dlp update check cached (v{_state.get('version')})")
+            return True
+        recently_failed = not force and _is_fresh('update_failed_at', retry_after)
     
-    success = update_yt_dlp(force=force)
+    if recently_failed or not _update_running.acquire(blocking=False):
+        # Back off after a failed pip run, and never wait for another worker's
+        logger.debug("Skipping yt-dlp update (failed recently or already running)")
+        success = True
+    else:
+        try:
+            logger.info("🔄 Checking yt-dlp version...")
+            success = update_yt_dlp(force=force)
+        finally:
+            _update_running.release()
+        with _update_lock:
+            if success:
+                # An update can change the binary, so resolve it again next time
+                _state['update_checked_at'] = time.time()
+                _state['version'] = get_current_yt_dlp_version()
+                _state.pop('update_failed_at', None)
+                _state.pop('binary_checked_at', None)
+            else:
+                _state['update_failed_at'] = time.time()
+            _save_state()
     
     if not success:
         error_msg = "Failed to update yt-dlp"
@@ -122,8 +217,28 @@ def ensure_yt_dlp_updated(force=False, fail_on_error=False):
             logger.error(f"❌ {error_msg}")
             return False
 
-def check_yt_dlp_binary():
-    """Check if yt-dlp binary is available and working"""
+def check_yt_dlp_binary(refresh=False):
+    """Check if yt-dlp binary is available and working (found binaries are cached for the TTL)"""
+    with _update_lock:
+        if not refresh and _is_fresh('binary_checked_at'):
+            cached = _state.get('binary')
+            # A vanished absolute path means the cache is stale
+            if cached and (not os.path.isabs(cached) or os.path.exists(cached)):
+                return cached
+        
+        yt_dlp_path = _find_yt_dlp_binary()
+        if yt_dlp_path:
+            _state['binary'] = yt_dlp_path
+            _state['binary_checked_at'] = time.time()
+        else:
+            # Not cached: a yt-dlp installed later in the day is found on the next call
+            _state.pop('binary', None)
+            _state.pop('binary_checked_at', None)
+        _save_state()
+        return yt_dlp_path
+
+def _find_yt_dlp_binary():
+    """Probe the known locations for a working yt-dlp binary"""
     try:
         # Try to find yt-dlp binary
         possible_paths = [